@@ -22,7 +22,7 @@
 bl_info = {
     "name": "A.N.T.Landscape",
     "author": "Jimmy Hazevoet",
-    "version": (0, 1, 8),
+    "version": (0, 1, 9),
     "blender": (2, 80, 0),
     "location": "View3D > Sidebar > Create Tab",
     "description": "Another Noise Tool: Landscape and Displace",
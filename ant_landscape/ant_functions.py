@@ -32,15 +32,14 @@ from bpy.props import (
         IntProperty,
         PointerProperty,
         )
-from math import (
-        sin, cos, pi,
-        )
-from .ant_noise import noise_gen
+from math import pi
+import numpy as np
+from .ant_noise import noise_gen_array
 
 # ------------------------------------------------------------
 # Create a new mesh (object) from verts/edges/faces.
-# verts/edges/faces ... List of vertices/edges/faces for the
-#                    new mesh (as used in from_pydata).
+# verts/edges/faces ... Arrays of vertices (n, 3) and faces (m, 3 or 4)
+#                    for the new mesh, edges are not used.
 # name ... Name of the new mesh (& object)
 
 from bpy_extras import object_utils
@@ -48,77 +47,73 @@ from bpy_extras import object_utils
 def create_mesh_object(context, verts, edges, faces, name):
     # Create new mesh
     mesh = bpy.data.meshes.new(name)
-    # Make a mesh from a list of verts/edges/faces.
-    mesh.from_pydata(verts, [], faces)
+    # Make a mesh from the vertex and face arrays, like from_pydata() does.
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set("co", verts.astype(np.float32).ravel())
+    mesh.loops.add(faces.size)
+    mesh.polygons.add(len(faces))
+    mesh.loops.foreach_set("vertex_index", faces.astype(np.int32).ravel())
+    mesh.polygons.foreach_set("loop_start", np.arange(0, faces.size, faces.shape[1], dtype=np.int32))
+    mesh.polygons.foreach_set("loop_total", np.full(len(faces), faces.shape[1], dtype=np.int32))
     # Update mesh geometry after adding stuff.
-    mesh.update()
+    mesh.update(calc_edges=True)
     return object_utils.object_data_add(context, mesh, operator=None)
 
 
 # Generate XY Grid
 def grid_gen(sub_d_x, sub_d_y, tri, meshsize_x, meshsize_y, props, water_plane, water_level):
-    verts = []
-    faces = []
-    vappend = verts.append
-    fappend = faces.append
-    for i in range (0, sub_d_x):
-        x = meshsize_x * (i / (sub_d_x - 1) - 1 / 2)
-        for j in range(0, sub_d_y):
-            y = meshsize_y * (j / (sub_d_y - 1) - 1 / 2)
-            if not water_plane:
-                z = noise_gen((x, y, 0), props)
-            else:
-                z = water_level
-            vappend((x,y,z))
-
-            if i > 0 and j > 0:
-                A = i * sub_d_y + (j - 1)
-                B = i * sub_d_y + j
-                C = (i - 1) * sub_d_y + j
-                D = (i - 1) * sub_d_y + (j - 1)
-                if not tri:
-                    fappend((A, B, C, D))
-                else:
-                    fappend((A, B, D))
-                    fappend((B, C, D))
+    # Vertices in rows by x
+    verts = np.zeros((sub_d_x, sub_d_y, 3))
+    verts[:, :, 0] = (meshsize_x * (np.arange(sub_d_x) / (sub_d_x - 1) - 1 / 2))[:, np.newaxis]
+    verts[:, :, 1] = meshsize_y * (np.arange(sub_d_y) / (sub_d_y - 1) - 1 / 2)
+    verts = verts.reshape(-1, 3)
+    if not water_plane:
+        verts[:, 2] = noise_gen_array(verts, props)
+    else:
+        verts[:, 2] = water_level
+
+    # Faces between rows i - 1 and i, columns j - 1 and j
+    i, j = np.mgrid[1:sub_d_x, 1:sub_d_y]
+    B = (i * sub_d_y + j).ravel()
+    A = B - 1
+    C = B - sub_d_y
+    D = C - 1
+    if not tri:
+        faces = np.column_stack((A, B, C, D))
+    else:
+        faces = np.column_stack((A, B, D, B, C, D)).reshape(-1, 3)
 
     return verts, faces
 
 
 # Generate UV Sphere
 def sphere_gen(sub_d_x, sub_d_y, tri, meshsize, props, water_plane, water_level):
-    verts = []
-    faces = []
-    vappend = verts.append
-    fappend = faces.append
     sub_d_x += 1
     sub_d_y += 1
-    for i in range(0, sub_d_x):
-        for j in range(0, sub_d_y):
-            u = sin(j * pi * 2 / (sub_d_y - 1)) * cos(-pi / 2 + i * pi / (sub_d_x - 1)) * meshsize / 2
-            v = cos(j * pi * 2 / (sub_d_y - 1)) * cos(-pi / 2 + i * pi / (sub_d_x - 1)) * meshsize / 2
-            w = sin(-pi / 2 + i * pi / (sub_d_x - 1)) * meshsize / 2
-            if water_plane:
-                h = water_level
-            else:
-                h = noise_gen((u, v, w), props) / meshsize
-            vappend(((u + u * h), (v + v * h), (w + w * h)))
-
-    count = 0
-    for i in range (0, sub_d_y * (sub_d_x - 1)):
-        if count < sub_d_y - 1 :
-            A = i + 1
-            B = i
-            C = (i + sub_d_y)
-            D = (i + sub_d_y) + 1
-            if tri:
-                fappend((A, B, D))
-                fappend((B, C, D))
-            else:
-                fappend((A, B, C, D))
-            count = count + 1
-        else:
-            count = 0
+    # Vertices in rows by latitude
+    lon = (np.arange(sub_d_y) * pi * 2 / (sub_d_y - 1))[np.newaxis, :]
+    lat = (-pi / 2 + np.arange(sub_d_x) * pi / (sub_d_x - 1))[:, np.newaxis]
+    verts = np.empty((sub_d_x, sub_d_y, 3))
+    verts[:, :, 0] = np.sin(lon) * np.cos(lat) * meshsize / 2
+    verts[:, :, 1] = np.cos(lon) * np.cos(lat) * meshsize / 2
+    verts[:, :, 2] = np.sin(lat) * meshsize / 2
+    verts = verts.reshape(-1, 3)
+    if water_plane:
+        h = water_level
+    else:
+        h = (noise_gen_array(verts, props) / meshsize)[:, np.newaxis]
+    verts += verts * h
+
+    # Faces between rows i and i + 1, columns j and j + 1
+    i, j = np.mgrid[0:sub_d_x - 1, 0:sub_d_y - 1]
+    B = (i * sub_d_y + j).ravel()
+    A = B + 1
+    C = B + sub_d_y
+    D = C + 1
+    if tri:
+        faces = np.column_stack((A, B, D, B, C, D)).reshape(-1, 3)
+    else:
+        faces = np.column_stack((A, B, C, D))
 
     return verts, faces
 
@@ -154,18 +149,22 @@ class AntLandscapeRefresh(bpy.types.Operator):
             # redraw verts
             mesh = obj.data
 
+            co = np.empty(len(mesh.vertices) * 3)
+            mesh.vertices.foreach_get("co", co)
+            co = co.reshape(-1, 3)
+
             if ob['vert_group'] != "" and ob['vert_group'] in obj.vertex_groups:
                 vertex_group = obj.vertex_groups[ob['vert_group']]
                 gi = vertex_group.index
-                for v in mesh.vertices:
-                    for g in v.groups:
-                        if g.group == gi:
-                            v.co[2] = 0.0
-                            v.co[2] = vertex_group.weight(v.index) * noise_gen(v.co, prop)
+                weights = {v.index: g.weight for v in mesh.vertices for g in v.groups if g.group == gi}
+                index = np.fromiter(weights.keys(), dtype=np.int64, count=len(weights))
+                co[index, 2] = 0.0
+                weight = np.fromiter(weights.values(), dtype=np.float64, count=len(weights))
+                co[index, 2] = weight * noise_gen_array(co[index], prop)
             else:
-                for v in mesh.vertices:
-                    v.co[2] = 0.0
-                    v.co[2] = noise_gen(v.co, prop)
+                co[:, 2] = 0.0
+                co[:, 2] = noise_gen_array(co, prop)
+            mesh.vertices.foreach_set("co", co.astype(np.float32).ravel())
             mesh.update()
         else:
             pass
@@ -38,6 +38,7 @@ from math import (
         floor, sqrt,
         sin, cos, pi,
         )
+import numpy as np
 
 noise_basis_default = "BLENDER"
 noise_basis = [
@@ -487,6 +488,18 @@ def Effect_Function(coords, type, bias, turb, depth, frequency, amplitude):
 # ------------------------------------------------------------
 # landscape_gen
 def noise_gen(coords, props):
+    return noise_gen_function(props)(coords)
+
+
+def noise_gen_array(coords, props):
+    # Same as noise_gen() for an (n, 3) array of coordinates, returns the n values
+    noise = noise_gen_function(props)
+    return np.fromiter(map(noise, coords.tolist()), dtype=np.float64, count=len(coords))
+
+
+# Returns the noise_gen() function of these properties, the properties are
+# read and the origin is computed once for all the coordinates.
+def noise_gen_function(props):
 
     terrain_name = props[0]
     cursor = props[1]
@@ -554,8 +567,6 @@ def noise_gen(coords, props):
     fx_offset = props[63]
     fx_invert = props[64]
 
-    x, y, z = coords
-
     # Origin
     if rseed == 0:
         origin = x_offset, y_offset, z_offset
@@ -575,140 +586,143 @@ def noise_gen(coords, props):
         origin_y = (oy - (oy * 0.5)) + y_offset
         origin_z = oz + z_offset
 
-    ncoords = (x / (nsize * size_x) + origin_x, y / (nsize * size_y) + origin_y, z / (nsize * size_z) + origin_z)
+    def noise(coords):
+        x, y, z = coords
 
-    # Noise type's
-    if ntype in [0, 'multi_fractal']:
-        value = multi_fractal(ncoords, dimension, lacunarity, depth, noise_basis=nbasis) * 0.5
+        ncoords = (x / (nsize * size_x) + origin_x, y / (nsize * size_y) + origin_y, z / (nsize * size_z) + origin_z)
 
-    elif ntype in [1, 'ridged_multi_fractal']:
-        value = ridged_multi_fractal(ncoords, dimension, lacunarity, depth, offset, gain, noise_basis=nbasis) * 0.5
+        # Noise type's
+        if ntype in [0, 'multi_fractal']:
+            value = multi_fractal(ncoords, dimension, lacunarity, depth, noise_basis=nbasis) * 0.5
 
-    elif ntype in [2, 'hybrid_multi_fractal']:
-        value = hybrid_multi_fractal(ncoords, dimension, lacunarity, depth, offset, gain, noise_basis=nbasis) * 0.5
+        elif ntype in [1, 'ridged_multi_fractal']:
+            value = ridged_multi_fractal(ncoords, dimension, lacunarity, depth, offset, gain, noise_basis=nbasis) * 0.5
 
-    elif ntype in [3, 'hetero_terrain']:
-        value = hetero_terrain(ncoords, dimension, lacunarity, depth, offset, noise_basis=nbasis) * 0.25
+        elif ntype in [2, 'hybrid_multi_fractal']:
+            value = hybrid_multi_fractal(ncoords, dimension, lacunarity, depth, offset, gain, noise_basis=nbasis) * 0.5
 
-    elif ntype in [4, 'fractal']:
-        value = fractal(ncoords, dimension, lacunarity, depth, noise_basis=nbasis)
+        elif ntype in [3, 'hetero_terrain']:
+            value = hetero_terrain(ncoords, dimension, lacunarity, depth, offset, noise_basis=nbasis) * 0.25
 
-    elif ntype in [5, 'turbulence_vector']:
-        value = turbulence_vector(ncoords, depth, hardnoise, noise_basis=nbasis, amplitude_scale=amp, frequency_scale=freq)[0]
+        elif ntype in [4, 'fractal']:
+            value = fractal(ncoords, dimension, lacunarity, depth, noise_basis=nbasis)
 
-    elif ntype in [6, 'variable_lacunarity']:
-        value = variable_lacunarity(ncoords, distortion, noise_type1=nbasis, noise_type2=vlbasis)
+        elif ntype in [5, 'turbulence_vector']:
+            value = turbulence_vector(ncoords, depth, hardnoise, noise_basis=nbasis, amplitude_scale=amp, frequency_scale=freq)[0]
 
-    elif ntype in [7, 'marble_noise']:
-        value = marble_noise(
-                        (ncoords[0] - origin_x + x_offset),
-                        (ncoords[1] - origin_y + y_offset),
-                        (ncoords[2] - origin_z + z_offset),
-                        (origin[0] + x_offset, origin[1] + y_offset, origin[2] + z_offset), nsize,
-                        marbleshape, marblebias, marblesharpnes,
-                        distortion, depth, hardnoise, nbasis, amp, freq
-                        )
-    elif ntype in [8, 'shattered_hterrain']:
-        value = shattered_hterrain(ncoords, dimension, lacunarity, depth, offset, distortion, nbasis)
+        elif ntype in [6, 'variable_lacunarity']:
+            value = variable_lacunarity(ncoords, distortion, noise_type1=nbasis, noise_type2=vlbasis)
 
-    elif ntype in [9, 'strata_hterrain']:
-        value = strata_hterrain(ncoords, dimension, lacunarity, depth, offset, distortion, nbasis)
+        elif ntype in [7, 'marble_noise']:
+            value = marble_noise(
+                            (ncoords[0] - origin_x + x_offset),
+                            (ncoords[1] - origin_y + y_offset),
+                            (ncoords[2] - origin_z + z_offset),
+                            (origin[0] + x_offset, origin[1] + y_offset, origin[2] + z_offset), nsize,
+                            marbleshape, marblebias, marblesharpnes,
+                            distortion, depth, hardnoise, nbasis, amp, freq
+                            )
+        elif ntype in [8, 'shattered_hterrain']:
+            value = shattered_hterrain(ncoords, dimension, lacunarity, depth, offset, distortion, nbasis)
 
-    elif ntype in [10, 'ant_turbulence']:
-        value = ant_turbulence(ncoords, depth, hardnoise, nbasis, amp, freq, distortion)
+        elif ntype in [9, 'strata_hterrain']:
+            value = strata_hterrain(ncoords, dimension, lacunarity, depth, offset, distortion, nbasis)
 
-    elif ntype in [11, 'vl_noise_turbulence']:
-        value = vl_noise_turbulence(ncoords, distortion, depth, nbasis, vlbasis, hardnoise, amp, freq)
+        elif ntype in [10, 'ant_turbulence']:
+            value = ant_turbulence(ncoords, depth, hardnoise, nbasis, amp, freq, distortion)
 
-    elif ntype in [12, 'vl_hTerrain']:
-        value = vl_hTerrain(ncoords, dimension, lacunarity, depth, offset, nbasis, vlbasis, distortion)
+        elif ntype in [11, 'vl_noise_turbulence']:
+            value = vl_noise_turbulence(ncoords, distortion, depth, nbasis, vlbasis, hardnoise, amp, freq)
 
-    elif ntype in [13, 'distorted_heteroTerrain']:
-        value = distorted_heteroTerrain(ncoords, dimension, lacunarity, depth, offset, distortion, nbasis, vlbasis)
+        elif ntype in [12, 'vl_hTerrain']:
+            value = vl_hTerrain(ncoords, dimension, lacunarity, depth, offset, nbasis, vlbasis, distortion)
 
-    elif ntype in [14, 'double_multiFractal']:
-        value = double_multiFractal(ncoords, dimension, lacunarity, depth, offset, gain, nbasis, vlbasis)
+        elif ntype in [13, 'distorted_heteroTerrain']:
+            value = distorted_heteroTerrain(ncoords, dimension, lacunarity, depth, offset, distortion, nbasis, vlbasis)
 
-    elif ntype in [15, 'rocks_noise']:
-        value = rocks_noise(ncoords, depth, hardnoise, nbasis, distortion)
+        elif ntype in [14, 'double_multiFractal']:
+            value = double_multiFractal(ncoords, dimension, lacunarity, depth, offset, gain, nbasis, vlbasis)
 
-    elif ntype in [16, 'slick_rock']:
-        value = slick_rock(ncoords,dimension, lacunarity, depth, offset, gain, distortion, nbasis, vlbasis)
+        elif ntype in [15, 'rocks_noise']:
+            value = rocks_noise(ncoords, depth, hardnoise, nbasis, distortion)
 
-    elif ntype in [17, 'planet_noise']:
-        value = planet_noise(ncoords, depth, hardnoise, nbasis)[2] * 0.5 + 0.5
+        elif ntype in [16, 'slick_rock']:
+            value = slick_rock(ncoords,dimension, lacunarity, depth, offset, gain, distortion, nbasis, vlbasis)
 
-    elif ntype in [18, 'blender_texture']:
-        if texture_name != "" and texture_name in bpy.data.textures:
-            value = bpy.data.textures[texture_name].evaluate(ncoords)[3]
-        else:
-            value = 0.0
-    else:
-        value = 0.5
+        elif ntype in [17, 'planet_noise']:
+            value = planet_noise(ncoords, depth, hardnoise, nbasis)[2] * 0.5 + 0.5
 
-    # Effect mix
-    val = value
-    if fx_type in [0,"0"]:
-        fx_mixfactor = -1.0
-        fxval = val
-    else:
-        fxcoords = Trans_Effect((x, y, z), fx_size, (fx_loc_x, fx_loc_y))
-        effect = Effect_Function(fxcoords, fx_type, fx_bias, fx_turb, fx_depth, fx_frequency, fx_amplitude)
-        effect = Height_Scale(effect, fx_height, fx_offset, fx_invert)
-        fxval = Mix_Modes(val, effect, fx_mixfactor, fx_mix_mode)
-    value = fxval
-
-    # Adjust height
-    value = Height_Scale(value, height, height_offset, height_invert)
-
-    # Edge falloff:
-    if not sphere:
-        if falloff:
-            ratio_x, ratio_y = abs(x) * 2 / meshsize_x, abs(y) * 2 / meshsize_y
-            fallofftypes = [0,
-                            sqrt(ratio_y**falloffsize_y),
-                            sqrt(ratio_x**falloffsize_x),
-                            sqrt(ratio_x**falloffsize_x + ratio_y**falloffsize_y)
-                           ]
-            dist = fallofftypes[falloff]
-            value -= edge_level
-            if(dist < 1.0):
-                dist = (dist * dist * (3 - 2 * dist))
-                value = (value - value * dist) + edge_level
+        elif ntype in [18, 'blender_texture']:
+            if texture_name != "" and texture_name in bpy.data.textures:
+                value = bpy.data.textures[texture_name].evaluate(ncoords)[3]
             else:
-                value = edge_level
-
-    # Strata / terrace / layers
-    if stratatype not in [0, "0"]:
-        if stratatype in [1, "1"]:
-            strata = strata / height
-            strata *= 2
-            steps = (sin(value * strata * pi) * (0.1 / strata * pi))
-            value = (value * 0.5 + steps * 0.5) * 2.0
-
-        elif stratatype in [2, "2"]:
-            strata = strata / height
-            steps = -abs(sin(value * strata * pi) * (0.1 / strata * pi))
-            value = (value * 0.5 + steps * 0.5) * 2.0
-
-        elif stratatype in [3, "3"]:
-            strata = strata / height
-            steps = abs(sin(value * strata * pi) * (0.1 / strata * pi))
-            value = (value * 0.5 + steps * 0.5) * 2.0
-
-        elif stratatype in [4, "4"]:
-            strata = strata / height
-            value = int( value * strata ) * 1.0 / strata
-
-        elif stratatype in [5, "5"]:
-            strata = strata / height
-            steps = (int( value * strata ) * 1.0 / strata)
-            value = (value * (1.0 - 0.5) + steps * 0.5)
-
-    # Clamp height min max
-    if (value < minimum):
-        value = minimum
-    if (value > maximum):
-        value = maximum
+                value = 0.0
+        else:
+            value = 0.5
 
-    return value
+        # Effect mix
+        val = value
+        if fx_type in [0,"0"]:
+            fxval = val
+        else:
+            fxcoords = Trans_Effect((x, y, z), fx_size, (fx_loc_x, fx_loc_y))
+            effect = Effect_Function(fxcoords, fx_type, fx_bias, fx_turb, fx_depth, fx_frequency, fx_amplitude)
+            effect = Height_Scale(effect, fx_height, fx_offset, fx_invert)
+            fxval = Mix_Modes(val, effect, fx_mixfactor, fx_mix_mode)
+        value = fxval
+
+        # Adjust height
+        value = Height_Scale(value, height, height_offset, height_invert)
+
+        # Edge falloff:
+        if not sphere:
+            if falloff:
+                ratio_x, ratio_y = abs(x) * 2 / meshsize_x, abs(y) * 2 / meshsize_y
+                fallofftypes = [0,
+                                sqrt(ratio_y**falloffsize_y),
+                                sqrt(ratio_x**falloffsize_x),
+                                sqrt(ratio_x**falloffsize_x + ratio_y**falloffsize_y)
+                               ]
+                dist = fallofftypes[falloff]
+                value -= edge_level
+                if(dist < 1.0):
+                    dist = (dist * dist * (3 - 2 * dist))
+                    value = (value - value * dist) + edge_level
+                else:
+                    value = edge_level
+
+        # Strata / terrace / layers
+        if stratatype not in [0, "0"]:
+            if stratatype in [1, "1"]:
+                layers = strata / height * 2
+                steps = (sin(value * layers * pi) * (0.1 / layers * pi))
+                value = (value * 0.5 + steps * 0.5) * 2.0
+
+            elif stratatype in [2, "2"]:
+                layers = strata / height
+                steps = -abs(sin(value * layers * pi) * (0.1 / layers * pi))
+                value = (value * 0.5 + steps * 0.5) * 2.0
+
+            elif stratatype in [3, "3"]:
+                layers = strata / height
+                steps = abs(sin(value * layers * pi) * (0.1 / layers * pi))
+                value = (value * 0.5 + steps * 0.5) * 2.0
+
+            elif stratatype in [4, "4"]:
+                layers = strata / height
+                value = int( value * layers ) * 1.0 / layers
+
+            elif stratatype in [5, "5"]:
+                layers = strata / height
+                steps = (int( value * layers ) * 1.0 / layers)
+                value = (value * (1.0 - 0.5) + steps * 0.5)
+
+        # Clamp height min max
+        if (value < minimum):
+            value = minimum
+        if (value > maximum):
+            value = maximum
+
+        return value
+
+    return noise
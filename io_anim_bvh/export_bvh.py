@@ -23,6 +23,9 @@
 
 import bpy
 
+# Number of frames formatted at once when writing the motion.
+MOTION_WRITE_CHUNK_SIZE = 4096
+
 
 def write_armature(
         context,
@@ -40,7 +43,7 @@ def write_armature(
         return rot_order_str
 
     from mathutils import Matrix, Euler
-    from math import degrees
+    import numpy as np
 
     file = open(filepath, "w", encoding="utf8", newline="\n")
 
@@ -157,20 +160,16 @@ def write_armature(
             "rest_bone",
             # Blender pose bone.
             "pose_bone",
-            # Blender pose matrix.
-            "pose_mat",
+            # Blender pose matrices, an array of one matrix for each exported frame.
+            "pose_mats",
             # Blender rest matrix (armature space).
             "rest_arm_mat",
             # Blender rest matrix (local space).
             "rest_local_mat",
-            # Pose_mat inverted.
-            "pose_imat",
             # Rest_arm_mat inverted.
             "rest_arm_imat",
             # Rest_local_mat inverted.
             "rest_local_imat",
-            # Last used euler to preserve euler compatibility in between keyframes.
-            "prev_euler",
             # Is the bone disconnected to the parent bone?
             "skip_position",
             "rot_order",
@@ -201,25 +200,19 @@ def write_armature(
 
             self.rot_order = DecoratedBone._eul_order_lookup[self.rot_order_str]
 
-            self.pose_mat = self.pose_bone.matrix
+            self.pose_mats = None
 
             # mat = self.rest_bone.matrix  # UNUSED
             self.rest_arm_mat = self.rest_bone.matrix_local
             self.rest_local_mat = self.rest_bone.matrix
 
             # inverted mats
-            self.pose_imat = self.pose_mat.inverted()
             self.rest_arm_imat = self.rest_arm_mat.inverted()
             self.rest_local_imat = self.rest_local_mat.inverted()
 
             self.parent = None
-            self.prev_euler = Euler((0.0, 0.0, 0.0), self.rot_order_str_reverse)
             self.skip_position = ((self.rest_bone.use_connect or root_transform_only) and self.rest_bone.parent)
 
-        def update_posedata(self):
-            self.pose_mat = self.pose_bone.matrix
-            self.pose_imat = self.pose_mat.inverted()
-
         def __repr__(self):
             if self.parent:
                 return "[\"%s\" child on \"%s\"]\n" % (self.name, self.parent.name)
@@ -239,46 +232,67 @@ def write_armature(
 
     scene = context.scene
     frame_current = scene.frame_current
+    num_frames = max(frame_end - frame_start + 1, 0)
 
-    file.write("MOTION\n")
-    file.write("Frames: %d\n" % (frame_end - frame_start + 1))
-    file.write("Frame Time: %.6f\n" % (1.0 / (scene.render.fps / scene.render.fps_base)))
+    # Sample the pose matrices of all bones for all frames first,
+    # only the evaluation of the scene itself is done frame by frame.
+    pose_bones = obj.pose.bones
+    pose_mats = np.empty((num_frames, len(pose_bones) * 16), dtype=np.float32)
+    for frame_i in range(num_frames):
+        scene.frame_set(frame_start + frame_i)
+        pose_bones.foreach_get("matrix", pose_mats[frame_i])
 
-    for frame in range(frame_start, frame_end + 1):
-        scene.frame_set(frame)
+    scene.frame_set(frame_current)
 
-        for dbone in bones_decorated:
-            dbone.update_posedata()
+    # Matrices are stored column major.
+    pose_mats = pose_mats.reshape(num_frames, len(pose_bones), 4, 4).transpose(1, 0, 3, 2).astype(np.float64)
+    for dbone in bones_decorated:
+        dbone.pose_mats = pose_mats[pose_bones.find(dbone.name)]
+    del pose_mats
 
-        for dbone in bones_decorated:
-            trans = Matrix.Translation(dbone.rest_bone.head_local)
-            itrans = Matrix.Translation(-dbone.rest_bone.head_local)
+    # The motion channels of all bones, for all frames.
+    motion = []
+    for dbone in bones_decorated:
+        trans = np.array(Matrix.Translation(dbone.rest_bone.head_local))
+        itrans = np.array(Matrix.Translation(-dbone.rest_bone.head_local))
+
+        if dbone.parent:
+            mat_final = (np.array(dbone.parent.rest_arm_mat) @ np.linalg.inv(dbone.parent.pose_mats) @
+                         dbone.pose_mats @ np.array(dbone.rest_arm_imat))
+            mat_final = itrans @ mat_final @ trans
+            loc = mat_final[:, :3, 3] + np.array(dbone.rest_bone.head_local - dbone.parent.rest_bone.head_local)
+        else:
+            mat_final = dbone.pose_mats @ np.array(dbone.rest_arm_imat)
+            mat_final = itrans @ mat_final @ trans
+            loc = mat_final[:, :3, 3] + np.array(dbone.rest_bone.head)
 
-            if dbone.parent:
-                mat_final = dbone.parent.rest_arm_mat @ dbone.parent.pose_imat @ dbone.pose_mat @ dbone.rest_arm_imat
-                mat_final = itrans @ mat_final @ trans
-                loc = mat_final.to_translation() + (dbone.rest_bone.head_local - dbone.parent.rest_bone.head_local)
-            else:
-                mat_final = dbone.pose_mat @ dbone.rest_arm_imat
-                mat_final = itrans @ mat_final @ trans
-                loc = mat_final.to_translation() + dbone.rest_bone.head
+        # keep eulers compatible, no jumping on interpolation.
+        # Each euler depends on the previous one, so this conversion is done frame by frame.
+        rot = np.empty((num_frames, 3))
+        prev_euler = Euler((0.0, 0.0, 0.0), dbone.rot_order_str_reverse)
+        for frame_i, mat in enumerate(mat_final[:, :3, :3].tolist()):
+            prev_euler = Matrix(mat).to_euler(dbone.rot_order_str_reverse, prev_euler)
+            rot[frame_i] = prev_euler
 
-            # keep eulers compatible, no jumping on interpolation.
-            rot = mat_final.to_euler(dbone.rot_order_str_reverse, dbone.prev_euler)
+        if not dbone.skip_position:
+            motion.append(loc * global_scale)
 
-            if not dbone.skip_position:
-                file.write("%.6f %.6f %.6f " % (loc * global_scale)[:])
+        motion.append(np.degrees(rot[:, dbone.rot_order]))
 
-            file.write("%.6f %.6f %.6f " % (degrees(rot[dbone.rot_order[0]]), degrees(rot[dbone.rot_order[1]]), degrees(rot[dbone.rot_order[2]])))
+    motion = np.hstack(motion) if motion else np.zeros((num_frames, 0))
 
-            dbone.prev_euler = rot
+    file.write("MOTION\n")
+    file.write("Frames: %d\n" % (frame_end - frame_start + 1))
+    file.write("Frame Time: %.6f\n" % (1.0 / (scene.render.fps / scene.render.fps_base)))
 
-        file.write("\n")
+    # Format the frames in blocks, bounding the size of the temporary strings.
+    line_fmt = "%.6f " * motion.shape[1] + "\n"
+    for frame_i in range(0, num_frames, MOTION_WRITE_CHUNK_SIZE):
+        chunk = motion[frame_i:frame_i + MOTION_WRITE_CHUNK_SIZE]
+        file.write((line_fmt * len(chunk)) % tuple(chunk.ravel().tolist()))
 
     file.close()
 
-    scene.frame_set(frame_current)
-
     print("BVH Exported: %s frames:%d\n" % (filepath, frame_end - frame_start + 1))
 
 
@@ -300,3 +314,95 @@ def save(
     )
 
     return {'FINISHED'}
+
+
+def write_actions(context, directory, actions=None, **kwargs):
+    """
+    Export actions of the active armature, each one to its own BVH file named after it, over its frame range.
+    By default, all actions animating bones are exported. Extra keyword arguments are passed to write_armature().
+    Return the paths of the written files.
+    """
+    import os
+
+    obj = context.object
+    if actions is None:
+        actions = [
+            action for action in bpy.data.actions
+            if any(fcurve.data_path.startswith("pose.bones[") for fcurve in action.fcurves)
+        ]
+
+    if obj.animation_data is None:
+        obj.animation_data_create()
+    action_orig = obj.animation_data.action
+
+    filepaths = []
+    try:
+        for action in actions:
+            obj.animation_data.action = action
+            frame_start, frame_end = action.frame_range
+            filepath = os.path.join(directory, bpy.path.clean_name(action.name) + ".bvh")
+            write_armature(context, filepath, int(frame_start), int(frame_end), **kwargs)
+            filepaths.append(filepath)
+    finally:
+        obj.animation_data.action = action_orig
+
+    return filepaths
+
+
+def main():
+    """
+    Command line entry point, exporting many actions in a single run:
+
+    blender -b file.blend --python export_bvh.py -- [--armature NAME] [--action NAME ...] [--scale SCALE]
+                                                     [--rotate-mode MODE] [--root-transform-only] OUTPUT_DIRECTORY
+    """
+    import argparse
+    import os
+    import sys
+
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+    parser = argparse.ArgumentParser(
+        prog="export_bvh.py",
+        description="Export the actions of an armature to BVH files, one file per action.",
+    )
+    parser.add_argument("directory", help="Output directory")
+    parser.add_argument("--armature", help="Armature object (default: the active object, or the only armature)")
+    parser.add_argument("--action", dest="actions", action="append",
+                        help="Action to export, may be repeated (default: all actions animating bones)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Scale the BVH by this value")
+    parser.add_argument("--rotate-mode", default="NATIVE",
+                        choices=("NATIVE", "XYZ", "XZY", "YXZ", "YZX", "ZXY", "ZYX"), help="Rotation conversion")
+    parser.add_argument("--root-transform-only", action="store_true",
+                        help="Only write out translation channels for the root bone")
+    args = parser.parse_args(argv)
+
+    context = bpy.context
+    if args.armature:
+        obj = bpy.data.objects[args.armature]
+    elif context.object and context.object.type == 'ARMATURE':
+        obj = context.object
+    else:
+        armatures = [obj for obj in context.scene.objects if obj.type == 'ARMATURE']
+        if len(armatures) != 1:
+            parser.error("found %d armatures in the scene, use --armature to choose one" % len(armatures))
+        obj = armatures[0]
+    context.view_layer.objects.active = obj
+
+    actions = None
+    if args.actions:
+        actions = [bpy.data.actions[name] for name in args.actions]
+
+    os.makedirs(args.directory, exist_ok=True)
+    filepaths = write_actions(
+        context, args.directory,
+        actions=actions,
+        global_scale=args.scale,
+        rotate_mode=args.rotate_mode,
+        root_transform_only=args.root_transform_only,
+    )
+    print("BVH Exported %d actions to %r" % (len(filepaths), args.directory))
+
+
+if __name__ == "__main__":
+    main()
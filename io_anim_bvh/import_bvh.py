@@ -20,7 +20,10 @@
 
 # Script copyright (C) Campbell Barton
 
-from math import radians, ceil
+from math import ceil
+import warnings
+
+import numpy as np
 
 import bpy
 from mathutils import Vector, Euler, Matrix
@@ -51,7 +54,7 @@ class BVH_Node:
         'rot_order',
         # Same as above but a string 'XYZ' format..
         'rot_order_str',
-        # A list one tuple's one for each frame: (locx, locy, locz, rotx, roty, rotz),
+        # An array with a row for each frame: (locx, locy, locz, rotx, roty, rotz),
         # euler rotation ALWAYS stored xyz order, even when native used.
         'anim_data',
         # Convenience function, bool, same as: (channels[0] != -1 or channels[1] != -1 or channels[2] != -1).
@@ -92,9 +95,9 @@ class BVH_Node:
 
         self.children = []
 
-        # List of 6 length tuples: (lx, ly, lz, rx, ry, rz)
+        # Rows of (lx, ly, lz, rx, ry, rz), filled by read_bvh(),
         # even if the channels aren't used they will just be zero.
-        self.anim_data = [(0, 0, 0, 0, 0, 0)]
+        self.anim_data = np.zeros((1, 6))
 
     def __repr__(self):
         return (
@@ -115,19 +118,36 @@ def sorted_nodes(bvh_nodes):
 def read_bvh(context, file_path, rotate_mode='XYZ', global_scale=1.0):
     # File loading stuff
     # Open the file for importing
-    file = open(file_path, 'rU')
+    with open(file_path, 'r') as file:
+        file_lines = file.readlines()
 
-    # Separate into a list of lists, each line a list of words.
-    file_lines = file.readlines()
     # Non standard carrage returns?
     if len(file_lines) == 1:
         file_lines = file_lines[0].split('\r')
 
-    # Split by whitespace.
-    file_lines = [ll for ll in [l.split() for l in file_lines] if ll]
+    # Separate into a list of lists, each line a list of words,
+    # up to the MOTION header (and the frame count and time lines following it).
+    # The motion data itself is parsed at once, see below.
+    hierarchy_lines = []
+    motion_header_lines = None
+    motion_lines = []
+    for line_index, line in enumerate(file_lines):
+        words = line.split()
+        if not words:
+            continue
+        hierarchy_lines.append(words)
+        if motion_header_lines is not None:
+            motion_header_lines -= 1
+            if motion_header_lines == 0:
+                motion_lines = file_lines[line_index + 1:]
+                break
+        elif len(words) == 1 and words[0].lower() == 'motion':
+            motion_header_lines = 2
+    file_lines = hierarchy_lines
+    del hierarchy_lines
 
     # Create hierarchy as empties
-    if file_lines[0][0].lower() == 'hierarchy':
+    if file_lines and file_lines[0][0].lower() == 'hierarchy':
         # print 'Importing the BVH Hierarchy for:', file_path
         pass
     else:
@@ -259,8 +279,6 @@ def read_bvh(context, file_path, rotate_mode='XYZ', global_scale=1.0):
             ):
                 bvh_frame_time = float(file_lines[lineIdx][2])
 
-            lineIdx += 1  # Set the cursor to the first frame
-
             break
 
         lineIdx += 1
@@ -274,31 +292,20 @@ def read_bvh(context, file_path, rotate_mode='XYZ', global_scale=1.0):
     # second life expects it, which isn't to spec.
     bvh_nodes_list = sorted_nodes(bvh_nodes)
 
-    while lineIdx < len(file_lines):
-        line = file_lines[lineIdx]
-        for bvh_node in bvh_nodes_list:
-            # for bvh_node in bvh_nodes_serial:
-            lx = ly = lz = rx = ry = rz = 0.0
-            channels = bvh_node.channels
-            anim_data = bvh_node.anim_data
-            if channels[0] != -1:
-                lx = global_scale * float(line[channels[0]])
-
-            if channels[1] != -1:
-                ly = global_scale * float(line[channels[1]])
-
-            if channels[2] != -1:
-                lz = global_scale * float(line[channels[2]])
+    # A (frames x channels) array, plus the column of zeros unused channels (-1) refer to.
+    motion_data = _read_motion(motion_lines, channelIndex + 1)
+    del motion_lines
+    motion_data = np.hstack((motion_data, np.zeros((len(motion_data), 1))))
 
-            if channels[3] != -1 or channels[4] != -1 or channels[5] != -1:
-
-                rx = radians(float(line[channels[3]]))
-                ry = radians(float(line[channels[4]]))
-                rz = radians(float(line[channels[5]]))
-
-            # Done importing motion data #
-            anim_data.append((lx, ly, lz, rx, ry, rz))
-        lineIdx += 1
+    for bvh_node in bvh_nodes_list:
+        # for bvh_node in bvh_nodes_serial:
+        channels = bvh_node.channels
+        # The first frame is the rest pose.
+        anim_data = bvh_node.anim_data = np.zeros((len(motion_data) + 1, 6))
+        anim_data[1:, :3] = global_scale * motion_data[:, channels[:3]]
+        anim_data[1:, 3:] = np.radians(motion_data[:, channels[3:]])
+    # Done importing motion data #
+    del motion_data
 
     # Assign children
     for bvh_node in bvh_nodes_list:
@@ -550,104 +557,71 @@ def bvh_node_dict2armature(
     # used internally by this importer. Frame 1, by convention, is also often
     # the rest pose of the skeleton exported by the motion capture system.
     skip_frame = 1
-    if num_frame > skip_frame:
-        num_frame = num_frame - skip_frame
+    num_frame = max(num_frame - skip_frame, 0)
 
     # Create a shared time axis for all animation curves.
-    time = [float(frame_start)] * num_frame
+    time = np.arange(num_frame, dtype=np.float64)
     if use_fps_scale:
         dt = scene.render.fps * bvh_frame_time
-        for frame_i in range(1, num_frame):
-            time[frame_i] += float(frame_i) * dt
-    else:
-        for frame_i in range(1, num_frame):
-            time[frame_i] += float(frame_i)
+        time *= dt
+    time += frame_start
 
     # print("bvh_frame_time = %f, dt = %f, num_frame = %d"
     #      % (bvh_frame_time, dt, num_frame]))
 
     for i, bvh_node in enumerate(bvh_nodes_list):
         pose_bone, bone, bone_rest_matrix, bone_rest_matrix_inv = bvh_node.temp
+        anim_data = bvh_node.anim_data[skip_frame:skip_frame + num_frame]
 
         if bvh_node.has_loc:
             # Not sure if there is a way to query this or access it in the
             # PoseBone structure.
             data_path = 'pose.bones["%s"].location' % pose_bone.name
 
-            location = [(0.0, 0.0, 0.0)] * num_frame
-            for frame_i in range(num_frame):
-                bvh_loc = bvh_node.anim_data[frame_i + skip_frame][:3]
-
-                bone_translate_matrix = Matrix.Translation(
-                    Vector(bvh_loc) - bvh_node.rest_head_local)
-                location[frame_i] = (bone_rest_matrix_inv @
-                                     bone_translate_matrix).to_translation()
+            # The translation of every frame, in the bone rest space.
+            location = ((anim_data[:, :3] - np.array(bvh_node.rest_head_local)) @
+                        np.array(bone_rest_matrix_inv.to_3x3()).T)
 
             # For each location x, y, z.
             for axis_i in range(3):
-                curve = action.fcurves.new(data_path=data_path, index=axis_i)
-                keyframe_points = curve.keyframe_points
-                keyframe_points.add(num_frame)
-
-                for frame_i in range(num_frame):
-                    keyframe_points[frame_i].co = (
-                        time[frame_i],
-                        location[frame_i][axis_i],
-                    )
+                _add_linear_fcurve(action, data_path, axis_i, time, location[:, axis_i])
 
         if bvh_node.has_rot:
             data_path = None
             rotate = None
 
+            # apply rotation order and convert to XYZ
+            # note that the rot_order_str is reversed.
+            bone_rotation_matrix = _euler_to_matrices(anim_data[:, 3:], bvh_node.rot_order_str[::-1])
+            bone_rotation_matrix = (
+                np.array(bone_rest_matrix_inv.to_3x3()) @
+                bone_rotation_matrix @
+                np.array(bone_rest_matrix.to_3x3())
+            )
+
             if 'QUATERNION' == rotate_mode:
-                rotate = [(1.0, 0.0, 0.0, 0.0)] * num_frame
+                rotate = _matrices_to_quaternions(bone_rotation_matrix)
                 data_path = ('pose.bones["%s"].rotation_quaternion'
                              % pose_bone.name)
             else:
-                rotate = [(0.0, 0.0, 0.0)] * num_frame
+                # Each euler depends on the previous one (to avoid flipping),
+                # so this conversion is done frame by frame.
+                rotate = np.empty((len(bone_rotation_matrix), 3))
+                prev_euler = Euler((0.0, 0.0, 0.0))
+                for frame_i, matrix in enumerate(bone_rotation_matrix.tolist()):
+                    prev_euler = Matrix(matrix).to_euler(pose_bone.rotation_mode, prev_euler)
+                    rotate[frame_i] = prev_euler
                 data_path = ('pose.bones["%s"].rotation_euler' %
                              pose_bone.name)
 
-            prev_euler = Euler((0.0, 0.0, 0.0))
-            for frame_i in range(num_frame):
-                bvh_rot = bvh_node.anim_data[frame_i + skip_frame][3:]
-
-                # apply rotation order and convert to XYZ
-                # note that the rot_order_str is reversed.
-                euler = Euler(bvh_rot, bvh_node.rot_order_str[::-1])
-                bone_rotation_matrix = euler.to_matrix().to_4x4()
-                bone_rotation_matrix = (
-                    bone_rest_matrix_inv @
-                    bone_rotation_matrix @
-                    bone_rest_matrix
-                )
-
-                if len(rotate[frame_i]) == 4:
-                    rotate[frame_i] = bone_rotation_matrix.to_quaternion()
-                else:
-                    rotate[frame_i] = bone_rotation_matrix.to_euler(
-                        pose_bone.rotation_mode, prev_euler)
-                    prev_euler = rotate[frame_i]
-
             # For each euler angle x, y, z (or quaternion w, x, y, z).
-            for axis_i in range(len(rotate[0])):
-                curve = action.fcurves.new(data_path=data_path, index=axis_i)
-                keyframe_points = curve.keyframe_points
-                keyframe_points.add(num_frame)
-
-                for frame_i in range(num_frame):
-                    keyframe_points[frame_i].co = (
-                        time[frame_i],
-                        rotate[frame_i][axis_i],
-                    )
+            for axis_i in range(rotate.shape[1]):
+                _add_linear_fcurve(action, data_path, axis_i, time, rotate[:, axis_i])
 
     for cu in action.fcurves:
         if IMPORT_LOOP:
             pass  # 2.5 doenst have cyclic now?
 
-        for bez in cu.keyframe_points:
-            bez.interpolation = 'LINEAR'
-
     # finally apply matrix
     arm_ob.matrix_world = global_matrix
     bpy.ops.object.transform_apply(location=False, rotation=True, scale=False)
@@ -791,3 +765,87 @@ def _update_scene_duration(
     # Only extend the scene, never shorten it.
     if context.scene.frame_end < bvh_last_frame:
         context.scene.frame_end = bvh_last_frame
+
+
+def _read_motion(lines, num_channels):
+    """Parse the lines of the MOTION section into a (frames x channels) array."""
+    lines = [line for line in lines if not line.isspace()]
+    if not (lines and num_channels):
+        return np.zeros((len(lines), num_channels))
+
+    # Parse all the values at once, this stops at the first malformed value (with a warning).
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        motion_data = np.fromstring(" ".join(lines), sep=" ")
+
+    if len(motion_data) == len(lines) * num_channels:
+        return motion_data.reshape(len(lines), num_channels)
+
+    # Lines with extra values (or malformed ones, to report them): read line by line.
+    return np.array([line.split()[:num_channels] for line in lines], dtype=np.float64)
+
+
+def _euler_to_matrices(eulers, order):
+    """Return the (frames x 3 x 3) rotation matrices of XYZ euler angles, applied in the given order like mathutils.Euler."""
+    cos = np.cos(eulers)
+    sin = np.sin(eulers)
+
+    matrices = None
+    for axis in order:
+        axis_i = 'XYZ'.index(axis)
+        # The two axes of the plane of the rotation.
+        a, b = ((1, 2), (2, 0), (0, 1))[axis_i]
+        axis_matrices = np.zeros((len(eulers), 3, 3))
+        axis_matrices[:, axis_i, axis_i] = 1.0
+        axis_matrices[:, a, a] = cos[:, axis_i]
+        axis_matrices[:, b, b] = cos[:, axis_i]
+        axis_matrices[:, a, b] = -sin[:, axis_i]
+        axis_matrices[:, b, a] = sin[:, axis_i]
+        matrices = axis_matrices if matrices is None else axis_matrices @ matrices
+
+    return matrices
+
+
+def _matrices_to_quaternions(matrices):
+    """Return the (frames x 4) quaternions of rotation matrices, like mathutils.Matrix.to_quaternion()."""
+    m = matrices / np.linalg.norm(matrices, axis=1, keepdims=True)
+    m00, m11, m22 = m[:, 0, 0], m[:, 1, 1], m[:, 2, 2]
+    quats = np.empty((len(m), 4))
+
+    # Pick the most precise formula, depending on the trace and the largest diagonal element.
+    trace = 0.25 * (1.0 + m00 + m11 + m22)
+    use_w = trace > 1e-4
+    use_x = ~use_w & (m00 > m11) & (m00 > m22)
+    use_y = ~use_w & ~use_x & (m11 > m22)
+    use_z = ~use_w & ~use_x & ~use_y
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        s = np.sqrt(trace)
+        q = np.stack((s, (m[:, 2, 1] - m[:, 1, 2]) / (4.0 * s), (m[:, 0, 2] - m[:, 2, 0]) / (4.0 * s),
+                      (m[:, 1, 0] - m[:, 0, 1]) / (4.0 * s)), axis=1)
+        quats[use_w] = q[use_w]
+        s = 2.0 * np.sqrt(1.0 + m00 - m11 - m22)
+        q = np.stack(((m[:, 2, 1] - m[:, 1, 2]) / s, 0.25 * s, (m[:, 0, 1] + m[:, 1, 0]) / s,
+                      (m[:, 0, 2] + m[:, 2, 0]) / s), axis=1)
+        quats[use_x] = q[use_x]
+        s = 2.0 * np.sqrt(1.0 + m11 - m00 - m22)
+        q = np.stack(((m[:, 0, 2] - m[:, 2, 0]) / s, (m[:, 0, 1] + m[:, 1, 0]) / s, 0.25 * s,
+                      (m[:, 1, 2] + m[:, 2, 1]) / s), axis=1)
+        quats[use_y] = q[use_y]
+        s = 2.0 * np.sqrt(1.0 + m22 - m00 - m11)
+        q = np.stack(((m[:, 1, 0] - m[:, 0, 1]) / s, (m[:, 0, 2] + m[:, 2, 0]) / s,
+                      (m[:, 1, 2] + m[:, 2, 1]) / s, 0.25 * s), axis=1)
+        quats[use_z] = q[use_z]
+
+    return quats / np.linalg.norm(quats, axis=1, keepdims=True)
+
+
+def _add_linear_fcurve(action, data_path, index, time, values):
+    """Add an F-Curve with linearly interpolated keyframes of the values at the given times."""
+    curve = action.fcurves.new(data_path=data_path, index=index)
+    keyframe_points = curve.keyframe_points
+    keyframe_points.add(len(time))
+    keyframe_points.foreach_set("co", np.column_stack((time, values)).astype(np.float32).ravel())
+    linear_enum_value = bpy.types.Keyframe.bl_rna.properties['interpolation'].enum_items['LINEAR'].value
+    keyframe_points.foreach_set("interpolation", (linear_enum_value,) * len(time))
+    curve.update()
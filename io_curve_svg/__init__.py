@@ -40,7 +40,10 @@ if "bpy" in locals():
 
 
 import bpy
-from bpy.props import StringProperty
+from bpy.props import (
+    BoolProperty,
+    StringProperty,
+)
 from bpy_extras.io_utils import ImportHelper
 
 
@@ -53,10 +56,18 @@ class ImportSVG(bpy.types.Operator, ImportHelper):
     filename_ext = ".svg"
     filter_glob: StringProperty(default="*.svg", options={'HIDDEN'})
 
+    use_instancing: BoolProperty(
+        name="Instance Repeated Elements",
+        description="Share the curve data of elements used several times "
+                    "(<use> and symbols) between linked duplicates",
+        default=True,
+    )
+
     def execute(self, context):
         from . import import_svg
 
-        return import_svg.load(self, context, filepath=self.filepath)
+        return import_svg.load(self, context, filepath=self.filepath,
+                               use_instancing=self.use_instancing)
 
 
 def menu_func_import(self, context):
@@ -19,10 +19,11 @@
 # <pep8 compliant>
 
 import re
-import xml.dom.minidom
+import xml.etree.ElementTree as ElementTree
 from math import cos, sin, tan, atan2, pi, ceil
 
 import bpy
+import numpy as np
 from mathutils import Vector, Matrix
 
 from . import svg_colors
@@ -30,6 +31,7 @@ from .svg_util import (units,
                        srgb_to_linearrgb,
                        check_points_equal,
                        parse_array_of_floats,
+                       parse_path_data,
                        read_float)
 
 #### Common utilities ####
@@ -37,6 +39,12 @@ from .svg_util import (units,
 SVGEmptyStyles = {'useFill': None,
                   'fill': None}
 
+SVGNamespace = '{http://www.w3.org/2000/svg}'
+XLinkNamespace = '{http://www.w3.org/1999/xlink}'
+
+# Values of bezier points handle types, for foreach_set()
+SVGHandleTypes = {}
+
 
 def SVGCreateCurve(context):
     """
@@ -47,10 +55,30 @@ def SVGCreateCurve(context):
     obj = bpy.data.objects.new("Curve", cu)
 
     context['collection'].objects.link(obj)
+    context['objects'].append(obj)
 
     return obj
 
 
+def SVGCreateInstance(context, instance):
+    """
+    Create linked duplicates of the objects of an instance
+
+    The duplicates share the curve data of the instance objects, they are placed
+    with the current matrix instead of the matrix the instance was created with.
+    """
+
+    matrix, objects = instance
+    matrix = context['matrix'] @ matrix.inverted()
+
+    for ob in objects:
+        obj = ob.copy()
+        obj.matrix_world = matrix @ ob.matrix_world
+
+        context['collection'].objects.link(obj)
+        context['objects'].append(obj)
+
+
 def SVGFinishCurve():
     """
     Finish curve creation
@@ -59,6 +87,44 @@ def SVGFinishCurve():
     pass
 
 
+def SVGTransformCoords(matrix, coords):
+    """
+    Transform a list of SVG-file coords at once, return them as flat array
+    """
+
+    m = np.array(matrix, dtype=np.float64)
+    xy = np.array(coords, dtype=np.float64).reshape(-1, 2)
+
+    return (xy @ m[:3, :2].T + m[:3, 3]).ravel()
+
+
+def SVGSetBezierPoints(spline, matrix, coords, handles_left, handles_right,
+                       handle_left_types, handle_right_types):
+    """
+    Set all bezier points of a new spline at once
+
+    Coordinates are SVG-file coords transformed by matrix, coordinates
+    of VECTOR handles are ignored as Blender calculates them.
+    """
+
+    if not SVGHandleTypes:
+        enum_items = bpy.types.BezierSplinePoint.bl_rna.properties['handle_left_type'].enum_items
+        SVGHandleTypes.update((item.identifier, item.value) for item in enum_items)
+
+    points = spline.bezier_points
+    points.add(len(coords) - 1)
+
+    points.foreach_set('co', SVGTransformCoords(matrix, coords))
+    points.foreach_set('handle_left', SVGTransformCoords(matrix, handles_left))
+    points.foreach_set('handle_right', SVGTransformCoords(matrix, handles_right))
+    points.foreach_set('handle_left_type', [SVGHandleTypes[t] for t in handle_left_types])
+    points.foreach_set('handle_right_type', [SVGHandleTypes[t] for t in handle_right_types])
+
+    # foreach_set() doesn't update the spline,
+    # setting one point does (and calculates the VECTOR handles)
+    points[0].handle_left_type = points[0].handle_left_type
+
+
 def SVGFlipHandle(x, y, x1, y1):
     """
     Flip handle around base point
@@ -403,44 +469,7 @@ class SVGPathData:
         d - the definition of the outline of a shape
         """
 
-        spaces = ' ,\t'
-        commands = {'m', 'l', 'h', 'v', 'c', 's', 'q', '', 't', 'a', 'z'}
-        current_command = ''
-        tokens = []
-
-        i = 0
-        n = len(d)
-        while i < n:
-            c = d[i]
-
-            if c in spaces:
-                pass
-            elif c.lower() in commands:
-                tokens.append(c)
-                current_command = c
-                arg_index = 1
-            elif c in ['-', '.'] or c.isdigit():
-                # Special case for 'a/A' commands.
-                # Arguments 4 and 5 are either 0 or 1 and might not
-                # be separated from the next argument with space or comma.
-                if current_command.lower() == 'a':
-                    if arg_index % 7 in [4,5]:
-                        token = d[i]
-                        last_char = i + 1
-                    else:
-                        token, last_char = read_float(d, i)
-                else:
-                    token, last_char = read_float(d, i)
-
-                arg_index += 1
-                tokens.append(token)
-
-                # in most cases len(token) and (last_char - i) are the same
-                # but with whitespace or ',' prefix they are not.
-
-                i += (last_char - i) - 1
-
-            i += 1
+        tokens = parse_path_data(d)
 
         self._data = tokens
         self._index = 0
@@ -944,14 +973,18 @@ class SVGGeometry:
 
         if hasattr(node, 'getAttribute'):
             defs = context['defines']
+            # When streaming, only referenced geometries are kept
+            references = context.get('references')
 
             attr_id = node.getAttribute('id')
             if attr_id and defs.get('#' + attr_id) is None:
-                defs['#' + attr_id] = self
+                if references is None or '#' + attr_id in references:
+                    defs['#' + attr_id] = self
 
             className = node.getAttribute('class')
             if className and defs.get(className) is None:
-                defs[className] = self
+                if references is None or className in references:
+                    defs[className] = self
 
     def _pushRect(self, rect):
         """
@@ -1071,7 +1104,8 @@ class SVGGeometryContainer(SVGGeometry):
     """
 
     __slots__ = ('_geometries',  # List of chold geometries
-                 '_styles')  # Styles, used for displaying
+                 '_styles',  # Styles, used for displaying
+                 '_streamMatrix')  # Transformation matrix pushed while streaming
 
     def __init__(self, node, context):
         """
@@ -1082,21 +1116,17 @@ class SVGGeometryContainer(SVGGeometry):
 
         self._geometries = []
         self._styles = SVGEmptyStyles
+        self._streamMatrix = None
 
     def parse(self):
         """
         Parse XML node to memory
         """
 
-        if type(self._node) is xml.dom.minidom.Element:
-            self._styles = SVGParseStyles(self._node, self._context)
-
+        self._styles = SVGParseStyles(self._node, self._context)
         self._pushStyle(self._styles)
 
         for node in self._node.childNodes:
-            if type(node) is not xml.dom.minidom.Element:
-                continue
-
             ob = parseAbstractNode(node, self._context)
             if ob is not None:
                 self._geometries.append(ob)
@@ -1118,6 +1148,51 @@ class SVGGeometryContainer(SVGGeometry):
 
         return self._geometries
 
+    def _pushViewport(self):
+        """
+        Push display rectangle and matrix of the node, if any
+        """
+
+        pass
+
+    def _popViewport(self):
+        """
+        Pop display rectangle and matrix of the node, if any
+        """
+
+        pass
+
+    def streamBegin(self, creating):
+        """
+        Begin of the node when the file is streamed
+
+        Instead of parse() and createGeom(), children are parsed and created
+        by the loader in between streamBegin() and streamEnd().
+        """
+
+        self._styles = SVGParseStyles(self._node, self._context)
+        self._pushStyle(self._styles)
+
+        if creating:
+            self._streamMatrix = self.getTransformMatrix()
+            if self._streamMatrix is not None:
+                self._pushMatrix(self._streamMatrix)
+
+            self._pushViewport()
+
+    def streamEnd(self, creating):
+        """
+        End of the node when the file is streamed
+        """
+
+        if creating:
+            self._popViewport()
+
+            if self._streamMatrix is not None:
+                self._popMatrix()
+
+        self._popStyle()
+
 
 class SVGGeometryPATH(SVGGeometry):
     """
@@ -1168,9 +1243,9 @@ class SVGGeometryPATH(SVGGeometry):
         else:
             cu.dimensions = '3D'
 
-        for spline in self._splines:
-            act_spline = None
+        matrix = self._context['matrix']
 
+        for spline in self._splines:
             if spline['closed'] and len(spline['points']) >= 2:
                 first = spline['points'][0]
                 last = spline['points'][-1]
@@ -1183,29 +1258,28 @@ class SVGGeometryPATH(SVGGeometry):
                     first['handle_left_type'] = 'FREE'
                     first['handle_left'] = (first['x'], first['y'])
 
-            for point in spline['points']:
-                co = self._transformCoord((point['x'], point['y']))
+            if not spline['points']:
+                continue
 
-                if act_spline is None:
-                    cu.splines.new('BEZIER')
+            coords = []
+            handles_left = []
+            handles_right = []
+            for point in spline['points']:
+                co = (point['x'], point['y'])
+                coords.append(co)
 
-                    act_spline = cu.splines[-1]
-                    act_spline.use_cyclic_u = spline['closed']
-                else:
-                    act_spline.bezier_points.add(1)
+                handle = point['handle_left']
+                handles_left.append(co if handle is None else handle)
 
-                bezt = act_spline.bezier_points[-1]
-                bezt.co = co
+                handle = point['handle_right']
+                handles_right.append(co if handle is None else handle)
 
-                bezt.handle_left_type = point['handle_left_type']
-                if point['handle_left'] is not None:
-                    handle = point['handle_left']
-                    bezt.handle_left = self._transformCoord(handle)
+            act_spline = cu.splines.new('BEZIER')
+            act_spline.use_cyclic_u = spline['closed']
 
-                bezt.handle_right_type = point['handle_right_type']
-                if point['handle_right'] is not None:
-                    handle = point['handle_right']
-                    bezt.handle_right = self._transformCoord(handle)
+            SVGSetBezierPoints(act_spline, matrix, coords, handles_left, handles_right,
+                               [point['handle_left_type'] for point in spline['points']],
+                               [point['handle_right_type'] for point in spline['points']])
 
         SVGFinishCurve()
 
@@ -1277,7 +1351,25 @@ class SVGGeometryUSE(SVGGeometry):
 
             self._pushMatrix(self.getNodeMatrix())
 
-            geom.createGeom(True)
+            # Referenced geometry only depends on the display rectangle,
+            # the matrix is set on the objects of the instance
+            instances = self._context['instances']
+            key = (ref, rect)
+            instance = instances.get(key) if instances is not None else None
+
+            if instance is not None:
+                SVGCreateInstance(self._context, instance)
+                self._context['instanced'] += 1
+            else:
+                objects = self._context['objects']
+                first = len(objects)
+                cycle = geom._creating
+
+                geom.createGeom(True)
+
+                matrix = self._context['matrix']
+                if instances is not None and not cycle and abs(matrix.determinant()) > 1e-12:
+                    instances[key] = (matrix.copy(), objects[first:])
 
             self._popMatrix()
 
@@ -1700,22 +1792,13 @@ class SVGGeometryPOLY(SVGGeometry):
         else:
             cu.dimensions = '3D'
 
-        spline = None
-
-        for point in self._points:
-            co = self._transformCoord(point)
-
-            if spline is None:
-                cu.splines.new('BEZIER')
-                spline = cu.splines[-1]
-                spline.use_cyclic_u = self._closed
-            else:
-                spline.bezier_points.add(1)
+        if self._points:
+            spline = cu.splines.new('BEZIER')
+            spline.use_cyclic_u = self._closed
 
-            bezt = spline.bezier_points[-1]
-            bezt.co = co
-            bezt.handle_left_type = 'VECTOR'
-            bezt.handle_right_type = 'VECTOR'
+            handle_types = ['VECTOR'] * len(self._points)
+            SVGSetBezierPoints(spline, self._context['matrix'], self._points,
+                               self._points, self._points, handle_types, handle_types)
 
         SVGFinishCurve()
 
@@ -1753,6 +1836,17 @@ class SVGGeometrySVG(SVGGeometryContainer):
         Create real geometries
         """
 
+        self._pushViewport()
+
+        super()._doCreateGeom(False)
+
+        self._popViewport()
+
+    def _pushViewport(self):
+        """
+        Push display rectangle and matrix of the node
+        """
+
         rect = SVGRectFromNode(self._node, self._context)
 
         matrix = self.getNodeMatrix()
@@ -1791,58 +1885,233 @@ class SVGGeometrySVG(SVGGeometryContainer):
         self._pushMatrix(matrix)
         self._pushRect(rect)
 
-        super()._doCreateGeom(False)
+    def _popViewport(self):
+        """
+        Pop display rectangle and matrix of the node
+        """
 
         self._popRect()
         self._popMatrix()
 
 
-class SVGLoader(SVGGeometryContainer):
+class SVGElement:
     """
-    SVG file loader
+    XML node of a streamed SVG file
+
+    Wraps an ElementTree element into the tagName, getAttribute() and
+    childNodes interface used by geometries.
     """
 
-    def getTransformMatrix(self):
+    __slots__ = ('_element',  # ElementTree element
+                 'tagName')  # Tag name, without SVG namespace
+
+    def __init__(self, element):
         """
-        Get matrix created from "transform" attribute
+        Initialize new node
         """
 
-        # SVG document doesn't support transform specification
-        # it can't even hold attributes
+        self._element = element
 
-        return None
+        tag = element.tag
+        if tag.startswith(SVGNamespace):
+            tag = tag[len(SVGNamespace):]
+
+        self.tagName = tag
 
-    def __init__(self, context, filepath, do_colormanage):
+    def getAttribute(self, name):
+        """
+        Get attribute value, empty string if not set
+        """
+
+        if name.startswith('xlink:'):
+            name = XLinkNamespace + name[6:]
+
+        return self._element.get(name, '')
+
+    @property
+    def childNodes(self):
+        """
+        Child nodes of the element
+        """
+
+        return [SVGElement(child) for child in self._element]
+
+
+class SVGStreamLoader:
+    """
+    SVG file loader, creating geometries while reading the file
+
+    Only the matrices, rectangles and styles stacks are kept while reading,
+    and the elements referenced by <use> elements.
+    """
+
+    def __init__(self, context, filepath, do_colormanage, use_instancing=True):
         """
         Initialize SVG loader
         """
-        import os
 
-        svg_name = os.path.basename(filepath)
-        scene = context.scene
-        collection = bpy.data.collections.new(name=svg_name)
-        scene.collection.children.link(collection)
+        self._filepath = filepath
+        self._context = SVGCreateContext(context, filepath, do_colormanage, use_instancing)
+        self._context['references'] = SVGReferences(filepath)
+
+    def _isReferenced(self, node):
+        """
+        Check if node could be used by a <use> element
+        """
+
+        references = self._context['references']
+
+        attr_id = node.getAttribute('id')
+        if attr_id and '#' + attr_id in references:
+            return True
+
+        className = node.getAttribute('class')
+        return bool(className) and className in references
 
-        node = xml.dom.minidom.parse(filepath)
+    def load(self):
+        """
+        Read the file and create its geometries, return the number
+        of <use> elements created as linked duplicates
+        """
 
-        m = Matrix()
-        m = m @ Matrix.Scale(1.0 / 90.0 * 0.3048 / 12.0, 4, Vector((1.0, 0.0, 0.0)))
-        m = m @ Matrix.Scale(-1.0 / 90.0 * 0.3048 / 12.0, 4, Vector((0.0, 1.0, 0.0)))
+        context = self._context
+        context['styles'].append(SVGEmptyStyles)
+        context['style'] = SVGEmptyStyles
 
-        rect = (0, 0)
+        stack = []  # Element and streamed container geometry of open elements
+        skipped = 0  # Depth inside an element which is parsed at its end
+        defining = 0  # Count of open containers which are not created (defs, symbol)
+        deferred = []  # <use> elements referencing elements not read yet
 
-        self._context = {'defines': {},
-                         'transform': [],
-                         'rects': [rect],
-                         'rect': rect,
-                         'matrix': m,
-                         'materials': {},
-                         'styles': [None],
-                         'style': None,
-                         'do_colormanage': do_colormanage,
-                         'collection': collection}
+        for event, element in ElementTree.iterparse(self._filepath, events=('start', 'end')):
+            if event == 'start':
+                if skipped:
+                    skipped += 1
+                    continue
 
-        super().__init__(node, self._context)
+                node = SVGElement(element)
+                geomClass = svgGeometryClasses.get(node.tagName.lower())
+                geom = None
+
+                if (geomClass is not None and issubclass(geomClass, SVGGeometryContainer) and
+                        not self._isReferenced(node)):
+                    geom = geomClass(node, context)
+                    if isinstance(geom, (SVGGeometryDEFS, SVGGeometrySYMBOL)):
+                        defining += 1
+
+                    geom.streamBegin(not defining)
+                else:
+                    skipped = 1
+
+                stack.append((element, geom))
+                continue
+
+            if skipped > 1:
+                skipped -= 1
+                continue
+
+            skipped = 0
+            element, geom = stack.pop()
+
+            if geom is not None:
+                geom.streamEnd(not defining)
+                if isinstance(geom, (SVGGeometryDEFS, SVGGeometrySYMBOL)):
+                    defining -= 1
+
+                element.clear()
+            else:
+                node = SVGElement(element)
+                keep = self._isReferenced(node)
+
+                if keep or not defining:
+                    ob = parseAbstractNode(node, context)
+
+                    if ob is not None and not defining:
+                        ref = node.getAttribute('xlink:href')
+                        if isinstance(ob, SVGGeometryUSE) and context['defines'].get(ref) is None:
+                            deferred.append((ob, context['matrix'], context['transform'][:],
+                                             context['rects'][:], context['styles'][:]))
+                            keep = True
+                        else:
+                            ob.createGeom(False)
+
+                # Referenced and deferred elements are kept by their geometry
+                if not keep:
+                    element.clear()
+
+            # Drop element from its parent, to keep the document tree empty
+            if stack:
+                del stack[-1][0][-1]
+
+        for ob, matrix, transform, rects, styles in deferred:
+            context['matrix'] = matrix
+            context['transform'] = transform
+            context['rects'] = rects
+            context['rect'] = rects[-1]
+            context['styles'] = styles
+            context['style'] = styles[-1]
+
+            ob.createGeom(False)
+
+        return context['instanced']
+
+
+def SVGCreateContext(context, filepath, do_colormanage, use_instancing=True):
+    """
+    Create global SVG context for loading file
+    """
+
+    import os
+
+    svg_name = os.path.basename(filepath)
+    scene = context.scene
+    collection = bpy.data.collections.new(name=svg_name)
+    scene.collection.children.link(collection)
+
+    m = Matrix()
+    m = m @ Matrix.Scale(1.0 / 90.0 * 0.3048 / 12.0, 4, Vector((1.0, 0.0, 0.0)))
+    m = m @ Matrix.Scale(-1.0 / 90.0 * 0.3048 / 12.0, 4, Vector((0.0, 1.0, 0.0)))
+
+    rect = (0, 0)
+
+    return {'defines': {},
+            'transform': [],
+            'rects': [rect],
+            'rect': rect,
+            'matrix': m,
+            'materials': {},
+            'styles': [None],
+            'style': None,
+            'do_colormanage': do_colormanage,
+            'collection': collection,
+            'objects': [],
+            'instances': {} if use_instancing else None,
+            'instanced': 0}
+
+
+def SVGReferences(filepath):
+    """
+    Get references of all <use> elements of SVG file
+    """
+
+    references = set()
+    parents = []
+
+    for event, element in ElementTree.iterparse(filepath, events=('start', 'end')):
+        if event == 'start':
+            parents.append(element)
+            continue
+
+        parents.pop()
+
+        if SVGElement(element).tagName.lower() == 'use':
+            references.add(element.get(XLinkNamespace + 'href', ''))
+
+        element.clear()
+        if parents:
+            del parents[-1][-1]
+
+    return references
 
 
 svgGeometryClasses = {
@@ -1877,31 +2146,35 @@ def parseAbstractNode(node, context):
     return None
 
 
-def load_svg(context, filepath, do_colormanage):
+def load_svg(context, filepath, do_colormanage, use_instancing=True):
     """
-    Load specified SVG file
+    Load specified SVG file, return the number of <use> elements
+    created as linked duplicates
     """
 
     if bpy.ops.object.mode_set.poll():
         bpy.ops.object.mode_set(mode='OBJECT')
 
-    loader = SVGLoader(context, filepath, do_colormanage)
-    loader.parse()
-    loader.createGeom(False)
+    loader = SVGStreamLoader(context, filepath, do_colormanage, use_instancing)
 
+    return loader.load()
 
-def load(operator, context, filepath=""):
+
+def load(operator, context, filepath="", use_instancing=True):
 
     # error in code should raise exceptions but loading
     # non SVG files can give useful messages.
     do_colormanage = context.scene.display_settings.display_device != 'NONE'
     try:
-        load_svg(context, filepath, do_colormanage)
-    except (xml.parsers.expat.ExpatError, UnicodeEncodeError) as e:
+        instanced = load_svg(context, filepath, do_colormanage, use_instancing)
+    except (ElementTree.ParseError, UnicodeEncodeError) as e:
         import traceback
         traceback.print_exc()
 
         operator.report({'WARNING'}, "Unable to parse XML, %s:%s for file %r" % (type(e).__name__, e, filepath))
         return {'CANCELLED'}
 
+    if instanced:
+        operator.report({'INFO'}, "Reused curve data for %d <use> elements" % instanced)
+
     return {'FINISHED'}
@@ -56,6 +56,51 @@ re_match_number_optional_parts = re.compile(match_number_optional_parts)
 array_of_floats_pattern = f"({match_number_optional_parts})|{match_first_comma}|{match_comma_pair}|{match_last_comma}"
 re_array_of_floats_pattern = re.compile(array_of_floats_pattern)
 
+re_path_token = re.compile(r"[MmLlHhVvCcSsQqTtAaZz]|-?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?|[-.]")
+
+
+def parse_path_data(d):
+    """
+    Splits the definition of the outline of a path (its 'd' attribute) into command letters and values, all of
+    them as strings. Any other character separates the values.
+    """
+    if 'a' not in d and 'A' not in d:
+        tokens = re_path_token.findall(d)
+        if '-' in tokens or '.' in tokens:
+            for match in re_path_token.finditer(d):
+                if match.group(0) in {'-', '.'}:
+                    raise Exception('Invalid float value near ' + d[match.start():match.start() + 10])
+        return tokens
+
+    # Special case for 'a/A' commands.
+    # Arguments 4 and 5 are either 0 or 1 and might not
+    # be separated from the next argument with space or comma.
+    tokens = []
+    is_arc = False
+    arg_index = 1
+    pos = 0
+    while True:
+        match = re_path_token.search(d, pos)
+        if match is None:
+            return tokens
+
+        token = match.group(0)
+        if token.isalpha():
+            is_arc = token in {'a', 'A'}
+            arg_index = 1
+            pos = match.end()
+        elif is_arc and arg_index % 7 in {4, 5}:
+            token = token[0]
+            arg_index += 1
+            pos = match.start() + 1
+        elif token in {'-', '.'}:
+            raise Exception('Invalid float value near ' + d[match.start():match.start() + 10])
+        else:
+            arg_index += 1
+            pos = match.end()
+        tokens.append(token)
+
+
 def parse_array_of_floats(text):
     """
     Accepts comma or space separated list of floats (without units) and returns an array
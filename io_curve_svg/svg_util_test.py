@@ -24,9 +24,9 @@
 # XXX Not really nice, but that hack is needed to allow execution of that test
 #     from both automated CTest and by directly running the file manually.
 if __name__ == '__main__':
-    from svg_util import (parse_array_of_floats, read_float, parse_coord,)
+    from svg_util import (parse_array_of_floats, parse_path_data, read_float, parse_coord,)
 else:
-    from .svg_util import (parse_array_of_floats, read_float, parse_coord,)
+    from .svg_util import (parse_array_of_floats, parse_path_data, read_float, parse_coord,)
 import unittest
 
 class ParseArrayOfFloatsTest(unittest.TestCase):
@@ -159,6 +159,40 @@ class ReadFloatTest(unittest.TestCase):
             read_float(".e+1", 0)
 
 
+class ParsePathDataTest(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(parse_path_data(""), [])
+        self.assertEqual(parse_path_data(" \t\n "), [])
+
+    def test_commands_and_values(self):
+        self.assertEqual(parse_path_data("M 10,20 L 30 40 z"),
+                         ["M", "10", "20", "L", "30", "40", "z"])
+        self.assertEqual(parse_path_data("m10-20h5v.5Z"),
+                         ["m", "10", "-20", "h", "5", "v", ".5", "Z"])
+
+    def test_scientific_values(self):
+        self.assertEqual(parse_path_data("L1e3,2.5E-2"), ["L", "1e3", "2.5E-2"])
+
+    def test_missing_fractional(self):
+        self.assertEqual(parse_path_data("L1.2.3"), ["L", "1.2", ".3"])
+
+    def test_other_characters_are_separators(self):
+        self.assertEqual(parse_path_data("L\n1+2"), ["L", "1", "2"])
+
+    def test_arc_flags(self):
+        self.assertEqual(parse_path_data("a25,26 -30 0,1 50,-25"),
+                         ["a", "25", "26", "-30", "0", "1", "50", "-25"])
+        self.assertEqual(parse_path_data("A1 1 0 1110 20 3 3 0 0012 13"),
+                         ["A", "1", "1", "0", "1", "1", "10", "20",
+                          "3", "3", "0", "0", "0", "12", "13"])
+
+    def test_not_a_number(self):
+        with self.assertRaises(Exception):
+            parse_path_data("M 1 -")
+        with self.assertRaises(Exception):
+            parse_path_data("M . 1")
+
+
 class ParseCoordTest(unittest.TestCase):
     def test_empty(self):
         self.assertEqual(parse_coord("", 200), 0)
@@ -34,7 +34,7 @@ except:
 bl_info = {
     "name": "Import AutoCAD DXF Format (.dxf)",
     "author": "Lukas Treyer, Manfred Moitzi (support + dxfgrabber library), Vladimir Elistratov, Bastien Montagne, Remigiusz Fiedler (AKA migius)",
-    "version": (0, 9, 6),
+    "version": (0, 9, 8),
     "blender": (2, 80, 0),
     "location": "File > Import > AutoCAD DXF",
     "description": "Import files in the Autocad DXF format (.dxf)",
@@ -93,6 +93,7 @@ T_ImportText = True
 T_ImportLight = True
 T_ExportAcis = False
 T_MergeLines = True
+T_BatchGeometry = True
 T_OutlinerGroups = True
 T_Bbox = True
 T_CreateNewScene = False
@@ -110,11 +111,11 @@ def is_ref_scene(scene):
 
 def read(report, filename, obj_merge=BY_LAYER, import_text=True, import_light=True, export_acis=True, merge_lines=True,
          do_bbox=True, block_rep=LINKED_OBJECTS, new_scene=None, recenter=False, projDXF=None, projSCN=None,
-         thicknessWidth=True, but_group_by_att=True, dxf_unit_scale=1.0):
+         thicknessWidth=True, but_group_by_att=True, dxf_unit_scale=1.0, batch_geometry=True):
     # import dxf and export nurbs types to sat/sab files
     # because that's how autocad stores nurbs types in a dxf...
     do = Do(filename, obj_merge, import_text, import_light, export_acis, merge_lines, do_bbox, block_rep, recenter,
-            projDXF, projSCN, thicknessWidth, but_group_by_att, dxf_unit_scale)
+            projDXF, projSCN, thicknessWidth, but_group_by_att, dxf_unit_scale, batch_geometry)
 
     errors = do.entities(os.path.basename(filename).replace(".dxf", ""), new_scene)
 
@@ -242,6 +243,13 @@ class IMPORT_OT_dxf(bpy.types.Operator):
             default=T_MergeLines
             )
 
+    batch_geometry: BoolProperty(
+            name="Batch geometry",
+            description="Build the meshes and curves of lines, polygons and faces at once, points shared by several "
+                        "entities are welded (faster for large drawings)",
+            default=T_BatchGeometry
+            )
+
     import_text: BoolProperty(
             name="Import Text",
             description="Import DXF Text Entities MTEXT and TEXT",
@@ -396,6 +404,7 @@ class IMPORT_OT_dxf(bpy.types.Operator):
         sub.enabled = self.merge
         sub.prop(self, "merge_options")
         box.prop(self, "merge_lines")
+        box.prop(self, "batch_geometry")
 
         # general options
         layout.label(text="Line thickness and width:")
@@ -538,7 +547,8 @@ class IMPORT_OT_dxf(bpy.types.Operator):
         else:
             read(self.report, self.filepath, merge_options, self.import_text, self.import_light, self.export_acis,
                  self.merge_lines, self.do_bbox, block_map[self.block_options], scene, self.recenter,
-                 proj_dxf, proj_scn, self.represent_thickness_and_width, self.import_atts, dxf_unit_scale)
+                 proj_dxf, proj_scn, self.represent_thickness_and_width, self.import_atts, dxf_unit_scale,
+                 self.batch_geometry)
 
         if self.outliner_groups:
             display_groups_in_outliner()
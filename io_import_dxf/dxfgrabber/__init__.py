@@ -61,7 +61,12 @@ def readfile_as_asc(filename, options=None):
 def _read_encoded_file(filename, options=None, encoding='utf-8', errors='strict'):
     from .drawing import Drawing
 
-    with io.open(filename, encoding=encoding, errors=errors) as fp:
-        dwg = Drawing(fp, options)
+    if options is not None and (options.get('index_entities') or options.get('dxftypes') is not None or
+                                options.get('layers') is not None):
+        from .tagindex import read_indexed
+        dwg = read_indexed(filename, options, encoding, errors)
+    else:
+        with io.open(filename, encoding=encoding, errors=errors) as fp:
+            dwg = Drawing(fp, options)
     dwg.filename = filename
     return dwg
@@ -7,11 +7,15 @@ __author__ = "mozman <mozman@gmx.at>"
 
 from .tags import stream_tagger
 from .sections import Sections
+from .tagindex import EntityFilter
 
 DEFAULT_OPTIONS = {
     "grab_blocks": True,  # import block definitions True=yes, False=No
     "assure_3d_coords": False,  # guarantees (x, y, z) tuples for ALL coordinates
     "resolve_text_styles": True,  # Text, Attrib, Attdef and MText attributes will be set by the associated text style if necessary
+    "index_entities": False,  # readfile(): index the entities on a first pass, and build them when accessed
+    "dxftypes": None,  # only grab entities of these types (like 'LINE'), None for all
+    "layers": None,  # only grab entities on these layers (case insensitive), None for all
 }
 
 
@@ -34,6 +38,9 @@ class Drawing(object):
         self.linetypes = sections.tables.linetypes
         self.blocks = sections.blocks
         self.entities = sections.entities
+        entity_filter = EntityFilter(options.get('dxftypes'), options.get('layers'))
+        if entity_filter and hasattr(self.entities, 'filter'):
+            self.entities.filter(entity_filter)
         self.objects = sections.objects if ('objects' in sections) else []
         if 'acdsdata' in sections:
             self.acdsdata = sections.acdsdata
@@ -47,9 +54,13 @@ class Drawing(object):
                 resolve_text_styles(block, self.styles)
 
     def modelspace(self):
+        if hasattr(self.entities, 'modelspace'):  # indexed entities
+            return self.entities.modelspace()
         return (entity for entity in self.entities if not entity.paperspace)
 
     def paperspace(self):
+        if hasattr(self.entities, 'paperspace'):  # indexed entities
+            return self.entities.paperspace()
         return (entity for entity in self.entities if entity.paperspace)
 
     def collect_sab_data(self):
@@ -38,6 +38,10 @@ class EntitySection(object):
     def __getitem__(self, index):
         return self._entities[index]
 
+    def filter(self, entity_filter):
+        """ Keep only the entities accepted by the EntityFilter(). """
+        self._entities = [entity for entity in self._entities if entity_filter.accept(entity)]
+
     # end of public interface
 
     def _build(self, tags):
@@ -0,0 +1,265 @@
+# Purpose: index of the entities of a DXF file, to build them lazily
+# License: MIT License
+from __future__ import unicode_literals
+
+import codecs
+import io
+from array import array
+
+from .tags import stream_tagger, TagGroups
+from .dxfentities import EntityTable
+from .entitysection import build_entities
+
+# Entities following a POLYLINE or an INSERT, they are stored along with it.
+SUBENTITY_TYPES = frozenset([b'VERTEX', b'ATTRIB', b'SEQEND'])
+# Types a POLYLINE becomes when built.
+POLYLINE_TYPES = frozenset(['POLYLINE', 'POLYFACE', 'POLYMESH'])
+
+EMPTY_ENTITIES_SECTION = b'  0\nSECTION\n  2\nENTITIES\n  0\nENDSEC\n'
+DECODE_CHUNK_SIZE = 1 << 24
+
+
+class EntityFilter(object):
+    """ Accept entities by type (like 'LINE') and layer name (case insensitive), None accepts all. """
+    def __init__(self, dxftypes=None, layers=None):
+        self.dxftypes = None if dxftypes is None else frozenset(dxftypes)
+        self.layers = None if layers is None else frozenset(layer.lower() for layer in layers)
+
+    def __bool__(self):
+        return self.dxftypes is not None or self.layers is not None
+    __nonzero__ = __bool__
+
+    def accept_type(self, dxftype):
+        """ Can an entity of this type in the file be accepted, once built? """
+        if dxftype not in EntityTable or dxftype in ('SEQEND', 'VERTEX', 'ATTRIB'):
+            return False  # unsupported, or only part of other entities
+        if self.dxftypes is None:
+            return True
+        if dxftype == 'POLYLINE':
+            return not self.dxftypes.isdisjoint(POLYLINE_TYPES)
+        return dxftype in self.dxftypes
+
+    def accept_layer(self, layer):
+        return self.layers is None or layer.lower() in self.layers
+
+    def accept(self, entity):
+        return (self.dxftypes is None or entity.dxftype in self.dxftypes) and self.accept_layer(entity.layer)
+
+
+class EntityIndex(object):
+    """ Byte ranges of the sections of a DXF file, and byte range, type, layer and paperspace flag of the
+    accepted entities of its ENTITIES section. Built by reading the file once, without building any tag.
+    """
+    def __init__(self, stream, encoding, entity_filter):
+        self.sections = []  # (name, start, end), as bytes and byte offsets
+        self.starts = array('q')
+        self.ends = array('q')
+        self.type_ids = array('H')
+        self.layer_ids = array('L')
+        self.paperspace = array('b')
+        self.types = []  # type names by type id
+        self.layers = []  # layer names by layer id
+        self._build(stream, encoding, entity_filter)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def _build(self, stream, encoding, entity_filter):
+        type_ids = {}
+        types_accepted = []
+        layer_ids = {}
+        layers_accepted = []
+
+        def type_id(value):
+            try:
+                return type_ids[value]
+            except KeyError:
+                name = value.decode(encoding, 'ignore')
+                self.types.append(name)
+                types_accepted.append(entity_filter.accept_type(name))
+                return type_ids.setdefault(value, len(self.types) - 1)
+
+        def layer_id(value):
+            try:
+                return layer_ids[value]
+            except KeyError:
+                name = value.decode(encoding, 'ignore')
+                self.layers.append(name)
+                layers_accepted.append(entity_filter.accept_layer(name))
+                return layer_ids.setdefault(value, len(self.layers) - 1)
+
+        def close_entity(end):
+            if types_accepted[self.type_ids[-1]] and layers_accepted[self.layer_ids[-1]]:
+                self.ends.append(end)
+            else:  # rejected
+                for values in (self.starts, self.type_ids, self.layer_ids, self.paperspace):
+                    del values[-1]
+
+        default_layer = layer_id(b'0')
+        pos = 0
+        section_name = section_start = None
+        in_entities = False
+        in_entity = False  # in an entity, with its sub entities
+        in_main_entity = False  # in the tags of the entity itself
+
+        lines = iter(stream)
+        for code in lines:
+            value = next(lines, None)
+            if value is None:
+                break
+            tag_start = pos
+            pos += len(code) + len(value)
+            code = code.strip()
+
+            if code == b'0':
+                value = value.strip()
+                if in_entity:
+                    if value in SUBENTITY_TYPES:
+                        in_main_entity = False
+                        continue
+                    close_entity(tag_start)
+                    in_entity = in_main_entity = False
+
+                if value == b'SECTION':
+                    section_name = None
+                    section_start = tag_start
+                elif value == b'ENDSEC':
+                    self.sections.append((section_name, section_start, pos))
+                    section_start = None
+                    in_entities = False
+                elif value == b'EOF':
+                    break
+                elif in_entities:
+                    self.starts.append(tag_start)
+                    self.type_ids.append(type_id(value))
+                    self.layer_ids.append(default_layer)
+                    self.paperspace.append(0)
+                    in_entity = in_main_entity = True
+
+            elif in_main_entity:
+                if code == b'8':
+                    self.layer_ids[-1] = layer_id(value.rstrip(b'\r\n'))
+                elif code == b'67':
+                    self.paperspace[-1] = int(value) != 0
+
+            elif code == b'2' and section_start is not None and section_name is None:
+                section_name = value.strip()
+                in_entities = section_name == b'ENTITIES'
+
+        if in_entity:
+            close_entity(pos)
+
+
+class IndexedEntitySection(object):
+    """ Entities of the ENTITIES section, built (and kept) when first accessed, from an EntityIndex. """
+    name = 'entities'
+
+    _NOT_BUILT = object()
+
+    def __init__(self, filename, index, drawing, entity_filter, encoding, errors):
+        self._filename = filename
+        self._file = None
+        self._index = index
+        self._drawing = drawing
+        self._filter = entity_filter
+        self._encoding = encoding
+        self._errors = errors
+        self._entities = [self._NOT_BUILT] * len(index)
+
+    def get_entities(self):
+        return list(self)
+
+    # start of public interface
+
+    def __len__(self):
+        """ Count of indexed entities, a few may be rejected when built (POLYLINE types). """
+        return len(self._entities)
+
+    def __iter__(self):
+        return self._iter_indices(range(len(self._entities)))
+
+    def __getitem__(self, index):
+        """ Entity at this index, or None if it is rejected when built. """
+        entity = self._entities[index]
+        if entity is self._NOT_BUILT:
+            entity = self._entities[index] = self._build(index)
+        return entity
+
+    def modelspace(self):
+        paperspace = self._index.paperspace
+        return self._iter_indices(index for index in range(len(self._entities)) if not paperspace[index])
+
+    def paperspace(self):
+        paperspace = self._index.paperspace
+        return self._iter_indices(index for index in range(len(self._entities)) if paperspace[index])
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # end of public interface
+
+    def _iter_indices(self, indices):
+        for index in indices:
+            entity = self[index]
+            if entity is not None:
+                yield entity
+
+    def _build(self, index):
+        if self._file is None:
+            self._file = io.open(self._filename, 'rb')
+        start = self._index.starts[index]
+        self._file.seek(start)
+        text = self._file.read(self._index.ends[index] - start).decode(self._encoding, self._errors)
+        tags = stream_tagger(io.StringIO(text), self._drawing.assure_3d_coords)
+        entities = build_entities(TagGroups(tags))
+        if not entities or not self._filter.accept(entities[0]):
+            return None
+
+        entity = entities[0]
+        drawing = self._drawing
+        if drawing.resolve_text_styles and hasattr(entity, 'resolve_text_style'):
+            entity.resolve_text_style(drawing.styles)
+        if hasattr(drawing, 'acdsdata') and drawing.dxfversion >= 'AC1027' and hasattr(entity, 'set_sab_data'):
+            entity.set_sab_data(drawing.acdsdata.sab_data[entity.handle])
+        return entity
+
+
+def read_indexed(filename, options, encoding, errors):
+    """ Read the DXF file with its entities indexed on a first pass and built lazily, all other sections are read
+    as usual.
+    """
+    from .drawing import Drawing
+
+    entity_filter = EntityFilter(options.get('dxftypes'), options.get('layers'))
+    with io.open(filename, 'rb') as stream:
+        index = EntityIndex(stream, encoding, entity_filter)
+
+        chunks = []
+        for name, start, end in index.sections:
+            if name == b'ENTITIES':
+                if errors == 'strict':  # fail now, like reading all at once, not when building an entity
+                    _check_decoding(stream, start, end, encoding)
+                chunks.append(EMPTY_ENTITIES_SECTION)
+            else:
+                stream.seek(start)
+                chunks.append(stream.read(end - start))
+    text = b''.join(chunks).decode(encoding, errors) + '  0\nEOF\n'
+    del chunks
+
+    drawing = Drawing(io.StringIO(text), options)
+    drawing.entities = IndexedEntitySection(filename, index, drawing, entity_filter, encoding, errors)
+    return drawing
+
+
+def _check_decoding(stream, start, end, encoding):
+    decoder = codecs.getincrementaldecoder(encoding)('strict')
+    stream.seek(start)
+    while start < end:
+        data = stream.read(min(DECODE_CHUNK_SIZE, end - start))
+        if not data:
+            break
+        decoder.decode(data)
+        start += len(data)
+    decoder.decode(b'', final=True)
@@ -0,0 +1,210 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+"""
+Array helpers to build the geometry of many DXF entities at once (see Do.batch_geometry).
+"""
+
+import numpy as np
+
+# entity types that can be accumulated into arrays
+BATCH_MESH_ENTITIES = frozenset(["3DFACE", "SOLID", "TRACE", "POINT"])
+BATCH_CURVE_ENTITIES = frozenset(["LINE", "POLYLINE", "POLYGON", "LWPOLYLINE"])
+
+# decimals coordinates are rounded to before points are welded to one vertex, like in line_merger()
+WELD_PRECISION = 6
+
+
+def points_array(points):
+    """
+    points: sequence of (x, y) or (x, y, z) tuples, possibly mixed
+    returns: (n, 3) float array, missing z coordinates set to 0
+    """
+    try:
+        co = np.array(points, dtype=np.float64)
+    except ValueError:
+        co = None
+    if co is None or co.ndim != 2:
+        co = np.array([tuple(p) + (0.0,) * (3 - len(p)) for p in points], dtype=np.float64).reshape(-1, 3)
+    if co.shape[1] == 3:
+        return co
+    padded = np.zeros((len(co), 3))
+    padded[:, :min(co.shape[1], 3)] = co[:, :3]
+    return padded
+
+
+def weld(coords, precision=WELD_PRECISION):
+    """
+    coords: (n, 3) float array
+    returns: the coordinates of the welded vertices (in order of first appearance) and the vertex index of every
+             coordinate
+    """
+    if not len(coords):
+        return np.empty((0, 3)), np.empty(0, dtype=np.int64)
+    keys = np.round(coords, precision) + 0.0  # + 0.0: -0.0 -> 0.0
+    _unique, firsts, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    order = np.argsort(firsts)
+    ranks = np.empty_like(order)
+    ranks[order] = np.arange(len(order))
+    return coords[firsts[order]], ranks[inverse.reshape(-1)]
+
+
+def bowtie_candidates(quads, tolerance=0.02):
+    """
+    quads: (n, 4, 3) float array of quad faces
+    returns: boolean array of the quads that may intersect themselves (see Do._gen_meshface()). This is a generous
+             pre-selection, the few candidates are tested again with mathutils.
+    """
+    candidates = np.zeros(len(quads), dtype=bool)
+    for i in range(2):
+        a = quads[:, i]
+        b = quads[:, i + 1]
+        c = quads[:, i + 2]
+        d = quads[:, (i + 3) % 4]
+        d1 = b - a
+        d2 = d - c
+        r = a - c
+        a11 = np.einsum('ij,ij->i', d1, d1)
+        a12 = np.einsum('ij,ij->i', d1, d2)
+        a22 = np.einsum('ij,ij->i', d2, d2)
+        denom = a11 * a22 - a12 * a12
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # closest point of the edge line to the opposite edge line, nan for parallel lines (no intersection)
+            t = (a12 * np.einsum('ij,ij->i', d2, r) - a22 * np.einsum('ij,ij->i', d1, r)) / denom
+            p = a + t[:, np.newaxis] * d1
+            on_edge = (np.linalg.norm(p - a, axis=1) + np.linalg.norm(p - b, axis=1) -
+                       np.sqrt(a11)) < tolerance
+        candidates |= on_edge
+    return candidates
+
+
+def merge_segments(starts, ends, precision=WELD_PRECISION):
+    """
+    starts, ends: (n, 3) float arrays of the start and end points of LINE entities
+    returns: the rounded points and the merged polylines as lists of point indices, like line_merger.line_merger()
+    """
+    n = len(starts)
+    if not n:
+        return np.empty((0, 3)), []
+    keys = np.round(np.concatenate((starts, ends)), precision) + 0.0
+    points, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    # segments ordered by point to detect all doubles, without the ones that are not a segment
+    segments = np.sort(np.stack((inverse[:n], inverse[n:]), axis=1), axis=1)
+    segments = np.unique(segments[segments[:, 0] != segments[:, 1]], axis=0)
+
+    # segments of each point: point_segments[offsets[p]:offsets[p + 1]]
+    segment_points = segments.ravel()
+    order = np.argsort(segment_points, kind='stable')
+    point_segments = (order // 2).tolist()
+    offsets = np.searchsorted(segment_points[order], np.arange(len(points) + 1)).tolist()
+    cursors = offsets[:-1]
+    segments = segments.tolist()
+    used = bytearray(len(segments))
+
+    def get_extension_point(point):
+        i = cursors[point]
+        end = offsets[point + 1]
+        while i < end and used[point_segments[i]]:
+            i += 1
+        cursors[point] = i
+        if i == end:
+            return None
+        segment = point_segments[i]
+        used[segment] = 1
+        start_point, end_point = segments[segment]
+        return end_point if start_point == point else start_point
+
+    polylines = []
+    for segment, (start_point, end_point) in enumerate(segments):
+        if used[segment]:
+            continue
+        used[segment] = 1
+        head = [start_point]
+        polyline = [end_point]
+        while True:
+            extension_point = get_extension_point(polyline[-1])
+            if extension_point is None:
+                break
+            polyline.append(extension_point)
+        while True:
+            extension_point = get_extension_point(head[-1])
+            if extension_point is None:
+                break
+            head.append(extension_point)
+        head.reverse()
+        polylines.append(head + polyline)
+    return points, polylines
+
+
+def faces_to_mesh(mesh, verts, faces, edges):
+    """
+    mesh: Blender mesh data, empty
+    verts: (n, 3) float array
+    faces: list of (m, k) int arrays of faces with k vertex indices
+    edges: (e, 2) int array of loose edges
+    Fills the mesh at once, faces that the weld made degenerate or duplicate are removed.
+    """
+    faces = [f for f in faces if len(f)]
+    if faces:
+        loops = np.concatenate([f.ravel() for f in faces])
+        loop_total = np.concatenate([np.full(len(f), f.shape[1], dtype=np.int32) for f in faces])
+    else:
+        loops = np.empty(0, dtype=np.int32)
+        loop_total = np.empty(0, dtype=np.int32)
+    loop_start = np.cumsum(loop_total, dtype=np.int32) - loop_total
+    edges = edges[edges[:, 0] != edges[:, 1]]
+
+    mesh.vertices.add(len(verts))
+    mesh.edges.add(len(edges))
+    mesh.loops.add(len(loops))
+    mesh.polygons.add(len(loop_total))
+
+    mesh.vertices.foreach_set("co", verts.ravel())
+    mesh.edges.foreach_set("vertices", edges.astype(np.int32).ravel())
+    mesh.loops.foreach_set("vertex_index", loops.astype(np.int32))
+    mesh.polygons.foreach_set("loop_start", loop_start)
+    mesh.polygons.foreach_set("loop_total", loop_total)
+
+    mesh.validate()
+    mesh.update(calc_edges=True)
+
+
+def poly_splines(curve, coords, counts, cyclic):
+    """
+    curve: Blender curve data
+    coords: (n, 3) float array, the points of all polygons
+    counts: number of points per polygon
+    cyclic: closed flag per polygon
+    Adds one POLY spline per polygon, its points are set at once.
+    """
+    co = np.ones((len(coords), 4))
+    co[:, :3] = coords
+    co = co.ravel()
+    start = 0
+    for count, is_closed in zip(counts, cyclic):
+        if count < 1:
+            continue
+        spline = curve.splines.new("POLY")
+        spline.use_smooth = False
+        spline.use_cyclic_u = bool(is_closed)
+        spline.points.add(count - 1)
+        spline.points.foreach_set("co", co[start * 4:(start + count) * 4])
+        start += count
@@ -25,8 +25,9 @@ from mathutils import Vector, Matrix, Euler, Color, geometry
 from math import pi, radians, sqrt
 
 import bmesh
+import numpy as np
 from .. import dxfgrabber
-from . import convert, is_, groupsort
+from . import convert, is_, groupsort, batch
 from .line_merger import line_merger
 from ..transverse_mercator import TransverseMercator
 
@@ -95,13 +96,13 @@ class Do:
         "dwg", "combination", "known_blocks", "import_text", "import_light", "export_acis", "merge_lines",
         "do_bounding_boxes", "acis_files", "errors", "block_representation", "recenter", "did_group_instance",
         "objects_before", "pDXF", "pScene", "thickness_and_width", "but_group_by_att", "current_scene",
-        "dxf_unit_scale"
+        "dxf_unit_scale", "batch_geometry"
     )
 
     def __init__(self, dxf_filename, c=BY_LAYER, import_text=True, import_light=True, export_acis=True,
                  merge_lines=True, do_bbox=True, block_rep=LINKED_OBJECTS, recenter=False, pDXF=None, pScene=None,
-                 thicknessWidth=True, but_group_by_att=True, dxf_unit_scale=1.0):
-        self.dwg = dxfgrabber.readfile(dxf_filename, {"assure_3d_coords": True})
+                 thicknessWidth=True, but_group_by_att=True, dxf_unit_scale=1.0, batch_geometry=True):
+        self.dwg = dxfgrabber.readfile(dxf_filename, {"assure_3d_coords": True, "index_entities": True})
         self.combination = c
         self.known_blocks = {}
         self.import_text = import_text
@@ -121,6 +122,7 @@ class Do:
         self.but_group_by_att = but_group_by_att
         self.current_scene = None
         self.dxf_unit_scale = dxf_unit_scale
+        self.batch_geometry = batch_geometry
 
     def proj(self, co, elevation=0):
         """
@@ -172,6 +174,20 @@ class Do:
             else:
                 return Vector((co[0], co[1], co[2] + elevation if len(co) == 3 else elevation))
 
+    def proj_array(self, co, elevation=0):
+        """
+        :param co: (n, 3) float array of coordinates
+        :param elevation: float or (n,) float array (lwpolyline code 38)
+        :return: transformed coordinates as (n, 3) float array, like proj()
+        """
+        co = np.array(co, dtype=np.float64)
+        co[:, 2] += elevation
+        if self.pScene is not None and self.pDXF is not None:
+            return np.array([self.proj(c) for c in co.tolist()], dtype=np.float64).reshape(-1, 3)
+        if self.dxf_unit_scale != 1:
+            co *= self.dxf_unit_scale
+        return co
+
     def georeference(self, scene, center):
         if "latitude" not in scene and "longitude" not in scene:
             if type(self.pScene) is TransverseMercator:
@@ -527,6 +543,31 @@ class Do:
                             bm.faces.new((verts[i], iv, verts[(i + 3) % 4]))
                             bm.faces.new((verts[i + 1], iv, verts[i + 2]))
 
+    def _split_meshface(self, quad):
+        """
+        quad: 4 (projected) points of a face
+        Returns the faces _gen_meshface() would add for it: the quad itself or the triangles of a self intersecting
+        quad. Used by _batched_object_mesh() for the quads batch.bowtie_candidates() selects.
+        """
+        def _is_on_edge(point):
+            return abs(sum((e - point).length for e in (edge1, edge2)) - (edge1 - edge2).length) < 0.01
+
+        verts = [Vector(p) for p in quad]
+        faces = [verts]
+        for i in range(2):
+            edge1 = verts[i]
+            edge2 = verts[i + 1]
+            opposite1 = verts[i + 2]
+            opposite2 = verts[(i + 3) % 4]
+            ii = geometry.intersect_line_line(edge1, edge2, opposite1, opposite2)
+            if ii is not None:
+                if _is_on_edge(ii[0]):
+                    if faces and faces[0] is verts:
+                        faces.pop(0)
+                    faces.append((verts[i], ii[0], verts[(i + 3) % 4]))
+                    faces.append((verts[i + 1], ii[0], verts[i + 2]))
+        return faces
+
     def the3dface(self, en, bm):
         """ f: dxf entity
             bm: Blender bmesh data to which the 3DFACE should be added to.
@@ -1117,6 +1158,49 @@ class Do:
         for polyline in polylines:
             self._poly(polyline, curve, 0, polyline[0] == polyline[-1])
 
+    def _batched_merge_lines(self, lines, curve):
+        """
+        lines: list of LINE entities
+        curve: Blender curve data
+        Like _merge_lines(), with the points welded and the polygons added at once. Returns True if any point is
+        elevated from the z-plane.
+        """
+        starts = batch.points_array([en.start for en in lines])
+        ends = batch.points_array([en.end for en in lines])
+        points, polylines = batch.merge_segments(starts, ends)
+        indices = np.fromiter((i for polyline in polylines for i in polyline), dtype=np.int64)
+        co = self.proj_array(points[indices])
+        batch.poly_splines(curve, co, [len(polyline) for polyline in polylines],
+                           [polyline[0] == polyline[-1] for polyline in polylines])
+        return bool(np.any(co[:, 2] != 0))
+
+    def _batched_polys(self, entities, curve):
+        """
+        entities: list of LINE entities and POLYLINE, POLYGON, LWPOLYLINE entities without bulges
+        curve: Blender curve data
+        Adds the entities like line() and _gen_poly() do, with the points of all of them set at once. Returns True if
+        any point is elevated from the z-plane.
+        """
+        points = []
+        counts = []
+        cyclic = []
+        elevations = []
+        for en in entities:
+            if en.dxftype == "LINE":
+                points.append(en.start)
+                points.append(en.end)
+                counts.append(2)
+                cyclic.append(False)
+                elevations.append(0)
+            else:
+                points.extend(en.points)
+                counts.append(len(en.points))
+                cyclic.append(en.is_closed)
+                elevations.append(en.elevation if en.dxftype == "LWPOLYLINE" else 0)
+        co = self.proj_array(batch.points_array(points), np.repeat(elevations, counts))
+        batch.poly_splines(curve, co, counts, cyclic)
+        return bool(np.any(co[:, 2] != 0))
+
     def _thickness(self, bm, thickness):
         """
         Used for mesh types
@@ -1242,6 +1326,10 @@ class Do:
         name: name of the returned Blender object (String)
         Accumulates all entities into a Blender bmesh and returns a Blender object containing it.
         """
+        entities = list(entities)
+        if self.batch_geometry and all(en.dxftype in batch.BATCH_MESH_ENTITIES for en in entities):
+            return self._batched_object_mesh(entities, scene, name)
+
         d = bpy.data.meshes.new(name)
         bm = bmesh.new()
 
@@ -1270,6 +1358,99 @@ class Do:
             return o
         return None
 
+    def _batched_object_mesh(self, entities, scene, name):
+        """
+        entities: list of 3DFACE, SOLID, TRACE and POINT entities
+        name: name of the returned Blender object (String)
+        Like object_mesh(), but the faces of all entities are gathered in arrays and added to the mesh at once.
+        Points shared by several entities are welded to one vertex.
+        """
+        if not entities:
+            return None
+
+        faces = {}  # point count: point lists of the faces, as the3dface() and solid() pass them to _gen_meshface()
+        loose_points = []  # not projected, like point()
+        for en in entities:
+            if en.dxftype == "POINT":
+                loose_points.append(en.point)
+                continue
+            p = en.points
+            if en.dxftype == "3DFACE":
+                points = p[:3] if p[-1] == p[-2] else p
+            else:
+                points = (p[0], p[1], p[3], p[2])
+            faces.setdefault(len(points), []).append(points)
+
+        polygons = {}  # point count: (n, count, 3) arrays of projected points; 2 for edges, 1 for loose vertices
+        quads = []
+        repeated = []  # faces with a repeated point
+        for count, points in faces.items():
+            if not count:
+                continue
+            points = batch.points_array([c for p in points for c in p]).reshape(-1, count, 3)
+            is_repeated = np.zeros(len(points), dtype=bool)
+            for i in range(count):
+                for j in range(i + 1, count):
+                    is_repeated |= np.all(points[:, i] == points[:, j], axis=1)
+            repeated.extend(points[is_repeated].tolist())
+            projected = self.proj_array(points[~is_repeated].reshape(-1, 3)).reshape(-1, count, 3)
+            if count == 4:
+                quads.append(projected)
+            else:
+                polygons.setdefault(count, []).append(projected)
+
+        # only the last of the same points is kept, see _gen_meshface()
+        for points in repeated:
+            points = [tuple(p) for p in points]
+            points = [p for i, p in enumerate(points) if p not in points[i + 1:]]
+            projected = self.proj_array(batch.points_array(points))[np.newaxis]
+            if len(points) == 4:
+                quads.append(projected)
+            else:
+                polygons.setdefault(len(points), []).append(projected)
+
+        # self intersecting quads are split in triangles
+        for projected in quads:
+            candidates = batch.bowtie_candidates(projected)
+            polygons.setdefault(4, []).append(projected[~candidates])
+            for quad in projected[candidates]:
+                for face in self._split_meshface(quad):
+                    polygons.setdefault(len(face), []).append(np.array([face]))
+
+        if loose_points:
+            polygons.setdefault(1, []).append(batch.points_array(loose_points)[:, np.newaxis])
+
+        polygons = [np.concatenate(polygons[count]) for count in sorted(polygons)]
+        co, index = batch.weld(np.concatenate([p.reshape(-1, 3) for p in polygons]) if polygons else np.empty((0, 3)))
+        faces = []
+        edges = np.empty((0, 2), dtype=index.dtype)
+        start = 0
+        for p in polygons:
+            count = p.shape[1]
+            end = start + p.shape[0] * count
+            if count == 2:
+                edges = index[start:end].reshape(-1, 2)
+            elif count > 2:
+                faces.append(index[start:end].reshape(-1, count))
+            start = end
+        d = bpy.data.meshes.new(name)
+        batch.faces_to_mesh(d, co, faces, edges)
+
+        en = entities[-1]
+        if hasattr(en, "thickness"):
+            if en.thickness != 0 and self.thickness_and_width:
+                bm = bmesh.new()
+                bm.from_mesh(d)
+                self._thickness(bm, en.thickness)
+                bm.to_mesh(d)
+                bm.free()
+        o = bpy.data.objects.new(name, d)
+        if hasattr(en, "extrusion"):
+            self._extrusion(o, en)
+        if hasattr(en, "subdivision_levels"):
+            self._subdivision(o, en)
+        return o
+
     def object_curve(self, entities, scene, name):
         """
         entities: list of DXF entities
@@ -1280,23 +1461,37 @@ class Do:
 
         i = 0
         lines = []
+        polys = []
         for en in entities:
             i += 1
             TYPE = en.dxftype
             if TYPE == "LINE" and self.merge_lines:
                 lines.append(en)
                 continue
+            if self.batch_geometry and TYPE in batch.BATCH_CURVE_ENTITIES:
+                if TYPE == "LINE" or not any([b != 0 for b in en.bulge]):
+                    polys.append(en)
+                    continue
             typefunc = getattr(self, TYPE.lower(), None)
             if typefunc is not None:
                 typefunc(en, d)
             else:
                 self.errors.add(en.dxftype.lower() + " - unknown dxftype")
 
+        is_3d = False
         if len(lines) > 0:
-            self._merge_lines(lines, d)
+            if self.batch_geometry:
+                is_3d = self._batched_merge_lines(lines, d)
+            else:
+                self._merge_lines(lines, d)
+        if len(polys) > 0:
+            is_3d = self._batched_polys(polys, d) or is_3d
 
         if i > 0:
-            self._check3D_object(d)
+            if is_3d:
+                d.dimensions = '3D'
+            elif not self.batch_geometry or i > len(lines) + len(polys):
+                self._check3D_object(d)
             o = bpy.data.objects.new(name, d)
             self._thickness_and_width(o, en, scene)
             self._extrusion(o, en)
@@ -1621,13 +1816,18 @@ class Do:
         if self.recenter:
             self.objects_before += scene.objects[:]
 
-        if self.combination == BY_BLOCK:
-            self.combined_objects((en for en in self.dwg.modelspace()), scene)
-        elif self.combination != SEPARATED:
-            self.combined_objects((en for en in self.dwg.modelspace() if is_.combined_entity(en)), scene)
-            self.separated_entities((en for en in self.dwg.modelspace() if is_.separated_entity(en)), scene)
-        else:
-            self.separated_entities((en for en in self.dwg.modelspace() if en.dxftype != "ATTDEF"), scene)
+        try:
+            if self.combination == BY_BLOCK:
+                self.combined_objects((en for en in self.dwg.modelspace()), scene)
+            elif self.combination != SEPARATED:
+                self.combined_objects((en for en in self.dwg.modelspace() if is_.combined_entity(en)), scene)
+                self.separated_entities((en for en in self.dwg.modelspace() if is_.separated_entity(en)), scene)
+            else:
+                self.separated_entities((en for en in self.dwg.modelspace() if en.dxftype != "ATTDEF"), scene)
+        finally:
+            # indexed entities keep the DXF file open to build them
+            if hasattr(self.dwg.entities, "close"):
+                self.dwg.entities.close()
 
         if self.recenter:
             self._recenter(scene, name)
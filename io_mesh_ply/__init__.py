@@ -21,7 +21,7 @@
 bl_info = {
     "name": "Stanford PLY format",
     "author": "Bruce Merry, Campbell Barton", "Bastien Montagne"
-    "version": (2, 1, 0),
+    "version": (2, 2, 0),
     "blender": (2, 90, 0),
     "location": "File > Import/Export",
     "description": "Import-Export PLY mesh data with UVs and vertex colors",
@@ -46,7 +46,9 @@ from bpy.props import (
     CollectionProperty,
     StringProperty,
     BoolProperty,
+    EnumProperty,
     FloatProperty,
+    IntProperty,
 )
 from bpy_extras.io_utils import (
     ImportHelper,
@@ -80,6 +82,30 @@ class ImportPLY(bpy.types.Operator, ImportHelper):
     filename_ext = ".ply"
     filter_glob: StringProperty(default="*.ply", options={'HIDDEN'})
 
+    decimate_mode: EnumProperty(
+        name="Point Cloud Decimation",
+        description="Reduce the number of points of point clouds (files without faces or edges) while reading them",
+        items=(
+            ('NONE', "None", "Import all points"),
+            ('STRIDE', "Stride", "Only import one point every Stride points"),
+            ('VOXEL', "Voxel Grid", "Only import the first point found in each cell of a grid"),
+        ),
+        default='NONE',
+    )
+    decimate_stride: IntProperty(
+        name="Stride",
+        description="Import one point every this many points",
+        min=1, soft_max=1000,
+        default=10,
+    )
+    decimate_voxel_size: FloatProperty(
+        name="Voxel Size",
+        description="Size of the grid cells, in file units",
+        min=1e-6, soft_max=10.0,
+        default=0.01,
+        precision=4,
+    )
+
     def execute(self, context):
         import os
         from . import import_ply
@@ -94,8 +120,10 @@ class ImportPLY(bpy.types.Operator, ImportHelper):
         if not paths:
             paths.append(self.filepath)
 
+        keywords = self.as_keywords(ignore=("files", "directory", "filepath", "filter_glob", "hide_props_region"))
+
         for path in paths:
-            import_ply.load(self, context, path)
+            import_ply.load(self, context, path, **keywords)
 
         context.window.cursor_set('DEFAULT')
 
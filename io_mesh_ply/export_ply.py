@@ -24,62 +24,91 @@ colors, and texture coordinates per face or per vertex.
 """
 
 
-def _write_binary(fw, ply_verts, ply_faces, mesh_verts):
-    from struct import pack
+def _foreach_get(collection, attr, dtype, size=1):
+    import numpy as np
+
+    data = np.empty(len(collection) * size, dtype=dtype)
+    collection.foreach_get(attr, data)
+    return data.reshape(-1, size) if size > 1 else data
+
+
+def _face_block_binary(ply_faces_len, ply_faces):
+    """
+    Return the face element as an array of bytes ready to be written
+    (an uchar length followed by uint vertex indices per face).
+    """
+    import numpy as np
+
+    if ply_faces_len.size and (ply_faces_len == ply_faces_len[0]).all():
+        length = int(ply_faces_len[0])
+        block = np.empty(len(ply_faces_len), dtype=[("len", "u1"), ("indices", "<u4", (length,))])
+        block["len"] = length
+        block["indices"] = ply_faces.reshape(-1, length)
+        return block
+
+    faces_offset = np.cumsum(1 + ply_faces_len * 4) - (1 + ply_faces_len * 4)
+    first_loop = np.cumsum(ply_faces_len) - ply_faces_len
+    loops_offset = np.repeat(faces_offset + 1 - first_loop * 4, ply_faces_len) + np.arange(len(ply_faces)) * 4
+
+    block = np.empty(len(ply_faces_len) + len(ply_faces) * 4, dtype=np.uint8)
+    block[faces_offset] = ply_faces_len
+    block[loops_offset[:, np.newaxis] + np.arange(4)] = ply_faces.astype("<u4").view(np.uint8).reshape(-1, 4)
+    return block
+
+
+def _write_binary(file, ply_verts, ply_faces_len, ply_faces):
 
     # Vertex data
     # ---------------------------
 
-    for index, normal, uv_coords, color in ply_verts:
-        fw(pack("<3f", *mesh_verts[index].co))
-        if normal is not None:
-            fw(pack("<3f", *normal))
-        if uv_coords is not None:
-            fw(pack("<2f", *uv_coords))
-        if color is not None:
-            fw(pack("<4B", *color))
+    ply_verts.tofile(file)
 
     # Face data
     # ---------------------------
 
-    for pf in ply_faces:
-        length = len(pf)
-        fw(pack("<B%dI" % length, length, *pf))
+    _face_block_binary(ply_faces_len, ply_faces).tofile(file)
+
 
+def _write_ascii(file, ply_verts, ply_faces_len, ply_faces):
+    import numpy as np
 
-def _write_ascii(fw, ply_verts, ply_faces, mesh_verts):
+    fw = file.write
+    # Lines are formatted by chunks.
+    CHUNK_LEN = 4096
 
     # Vertex data
     # ---------------------------
 
-    for index, normal, uv_coords, color in ply_verts:
-        fw(b"%.6f %.6f %.6f" % mesh_verts[index].co[:])
-        if normal is not None:
-            fw(b" %.6f %.6f %.6f" % normal)
-        if uv_coords is not None:
-            fw(b" %.6f %.6f" % uv_coords)
-        if color is not None:
-            fw(b" %u %u %u %u" % color)
-        fw(b"\n")
+    vert_fmt = " ".join(
+        "%u" if ply_verts.dtype[name].kind == "u" else "%.6f"
+        for name in ply_verts.dtype.names
+    ) + "\n"
+    for i in range(0, len(ply_verts), CHUNK_LEN):
+        chunk = ply_verts[i:i + CHUNK_LEN].tolist()
+        fw(((vert_fmt * len(chunk)) % tuple(v for vert in chunk for v in vert)).encode("ascii"))
 
     # Face data
     # ---------------------------
 
-    for pf in ply_faces:
-        fw(b"%d" % len(pf))
-        for index in pf:
-            fw(b" %d" % index)
-        fw(b"\n")
+    # Each face as its length followed by its indices.
+    faces_first_loop = np.cumsum(ply_faces_len) - ply_faces_len
+    values = np.insert(ply_faces, faces_first_loop, ply_faces_len).tolist()
+    faces_len = ply_faces_len.tolist()
+    face_fmts = {}
+    values_start = 0
+    for i in range(0, len(faces_len), CHUNK_LEN):
+        chunk = faces_len[i:i + CHUNK_LEN]
+        for l in chunk:
+            if l not in face_fmts:
+                face_fmts[l] = "%d" + " %d" * l + "\n"
+        values_end = values_start + len(chunk) + sum(chunk)
+        fw(("".join([face_fmts[l] for l in chunk]) % tuple(values[values_start:values_end])).encode("ascii"))
+        values_start = values_end
 
 
 def save_mesh(filepath, mesh, use_ascii, use_normals, use_uv_coords, use_colors):
     import bpy
-
-    def rvec3d(v):
-        return round(v[0], 6), round(v[1], 6), round(v[2], 6)
-
-    def rvec2d(v):
-        return round(v[0], 6), round(v[1], 6)
+    import numpy as np
 
     if use_uv_coords and mesh.uv_layers:
         active_uv_layer = mesh.uv_layers.active.data
@@ -91,66 +120,70 @@ def save_mesh(filepath, mesh, use_ascii, use_normals, use_uv_coords, use_colors)
     else:
         use_colors = False
 
-    # in case
-    color = uvcoord = uvcoord_key = normal = normal_key = None
+    # Loops of all faces, in faces order.
+    faces_loop_start = _foreach_get(mesh.polygons, "loop_start", np.int64)
+    ply_faces_len = _foreach_get(mesh.polygons, "loop_total", np.int64)
+    if ply_faces_len.size and ply_faces_len.max() > 255:
+        raise ValueError("Faces with more than 255 vertices cannot be exported to PLY")
+    faces_first_loop = np.cumsum(ply_faces_len) - ply_faces_len
+    loops = np.repeat(faces_loop_start - faces_first_loop, ply_faces_len) + np.arange(ply_faces_len.sum(), dtype=np.int64)
 
-    mesh_verts = mesh.vertices
-    # vdict = {} # (index, normal, uv) -> new index
-    vdict = [{} for i in range(len(mesh_verts))]
-    ply_verts = []
-    ply_faces = [[] for f in range(len(mesh.polygons))]
-    vert_count = 0
+    loops_vidx = _foreach_get(mesh.loops, "vertex_index", np.int32)[loops]
 
-    for i, f in enumerate(mesh.polygons):
-
-        if use_normals:
-            smooth = f.use_smooth
-            if not smooth:
-                normal = f.normal[:]
-                normal_key = rvec3d(normal)
+    # Each (vertex index, normal, uv, color) combination makes a PLY vertex,
+    # normals and uvs being compared with a precision of 6 digits.
+    verts_fields = [("x", "<f4"), ("y", "<f4"), ("z", "<f4")]
+    keys_fields = [("index", np.int32)]
+    values = [_foreach_get(mesh.vertices, "co", np.float32, 3)[loops_vidx]]
+    keys = [loops_vidx]
 
-        if use_uv_coords:
-            uv = [
-                active_uv_layer[l].uv[:]
-                for l in range(f.loop_start, f.loop_start + f.loop_total)
-            ]
-        if use_colors:
-            col = [
-                active_col_layer[l].color[:]
-                for l in range(f.loop_start, f.loop_start + f.loop_total)
-            ]
-
-        pf = ply_faces[i]
-        for j, vidx in enumerate(f.vertices):
-            v = mesh_verts[vidx]
-
-            if use_normals and smooth:
-                normal = v.normal[:]
-                normal_key = rvec3d(normal)
-
-            if use_uv_coords:
-                uvcoord = uv[j][0], uv[j][1]
-                uvcoord_key = rvec2d(uvcoord)
-
-            if use_colors:
-                color = col[j]
-                color = (
-                    int(color[0] * 255.0),
-                    int(color[1] * 255.0),
-                    int(color[2] * 255.0),
-                    int(color[3] * 255.0),
-                )
-            key = normal_key, uvcoord_key, color
-
-            vdict_local = vdict[vidx]
-            pf_vidx = vdict_local.get(key)  # Will be None initially
-
-            if pf_vidx is None:  # Same as vdict_local.has_key(key)
-                pf_vidx = vdict_local[key] = vert_count
-                ply_verts.append((vidx, normal, uvcoord, color))
-                vert_count += 1
-
-            pf.append(pf_vidx)
+    if use_normals:
+        verts_fields += [("nx", "<f4"), ("ny", "<f4"), ("nz", "<f4")]
+        keys_fields.append(("normal", np.float64, (3,)))
+        smooth = np.repeat(_foreach_get(mesh.polygons, "use_smooth", bool), ply_faces_len)
+        normals = np.where(
+            smooth[:, np.newaxis],
+            _foreach_get(mesh.vertices, "normal", np.float32, 3)[loops_vidx],
+            np.repeat(_foreach_get(mesh.polygons, "normal", np.float32, 3), ply_faces_len, axis=0),
+        )
+        values.append(normals)
+        keys.append(np.round(normals.astype(np.float64), 6) + 0.0)
+
+    if use_uv_coords:
+        verts_fields += [("s", "<f4"), ("t", "<f4")]
+        keys_fields.append(("uv", np.float64, (2,)))
+        uvs = _foreach_get(active_uv_layer, "uv", np.float32, 2)[loops]
+        values.append(uvs)
+        keys.append(np.round(uvs.astype(np.float64), 6) + 0.0)
+
+    if use_colors:
+        verts_fields += [("red", "u1"), ("green", "u1"), ("blue", "u1"), ("alpha", "u1")]
+        keys_fields.append(("color", np.uint8, (4,)))
+        colors = _foreach_get(active_col_layer, "color", np.float32, 4)[loops]
+        colors = np.clip(colors * 255.0, 0.0, 255.0).astype(np.uint8)
+        values.append(colors)
+        keys.append(colors)
+
+    loops_key = np.empty(len(loops), dtype=keys_fields)
+    for (name, *_), key in zip(keys_fields, keys):
+        loops_key[name] = key
+
+    # Sorting gives the index of the first loop of each PLY vertex,
+    # keep them in order of first use.
+    loops_key = loops_key.view(np.dtype((np.void, loops_key.dtype.itemsize)))
+    _, verts_loop, ply_faces = np.unique(loops_key, return_index=True, return_inverse=True)
+    order = np.argsort(verts_loop)
+    remap = np.empty_like(order)
+    remap[order] = np.arange(len(order))
+    ply_faces = remap[ply_faces.reshape(-1)]
+    verts_loop = verts_loop[order]
+
+    ply_verts = np.empty(len(verts_loop), dtype=verts_fields)
+    names = iter(ply_verts.dtype.names)
+    for value in values:
+        value = value[verts_loop]
+        for i in range(value.shape[1]):
+            ply_verts[next(names)] = value[:, i]
 
     with open(filepath, "wb") as file:
         fw = file.write
@@ -196,9 +229,9 @@ def save_mesh(filepath, mesh, use_ascii, use_normals, use_uv_coords, use_colors)
         # ---------------------------
 
         if use_ascii:
-            _write_ascii(fw, ply_verts, ply_faces, mesh_verts)
+            _write_ascii(file, ply_verts, ply_faces_len, ply_faces)
         else:
-            _write_binary(fw, ply_verts, ply_faces, mesh_verts)
+            _write_binary(file, ply_verts, ply_faces_len, ply_faces)
 
 
 def save(
@@ -19,6 +19,99 @@
 # <pep8 compliant>
 
 
+# Struct format characters to NumPy type codes (without byte order).
+NUMPY_TYPES = {
+    'b': 'i1',
+    'B': 'u1',
+    'h': 'i2',
+    'H': 'u2',
+    'i': 'i4',
+    'I': 'u4',
+    'f': 'f4',
+    'd': 'f8',
+}
+
+# Number of lines of ascii files parsed at once.
+ASCII_CHUNK_LINES = 1 << 16
+
+# Number of points of point clouds decimated at once.
+DECIMATE_CHUNK_POINTS = 1 << 22
+
+
+def _expand_starts(starts, lengths, stride):
+    """
+    Offsets of all items of lists of *lengths* items of size *stride*, starting at *starts*.
+    """
+    import numpy as np
+
+    total = int(lengths.sum())
+    first = np.cumsum(lengths) - lengths
+    return np.repeat(starts - first * stride, lengths) + np.arange(total, dtype=np.int64) * stride
+
+
+def _gather(data, offsets, num_type):
+    """
+    Read values of type *num_type* at (unaligned) byte *offsets* of *data*.
+    """
+    import numpy as np
+
+    size = num_type.itemsize
+    return data[offsets[:, np.newaxis] + np.arange(size)].view(num_type).reshape(-1)
+
+
+def _copy_views(column, buffer):
+    """
+    Copy the arrays of *column* which are views of *buffer*.
+    """
+    import numpy as np
+
+    if isinstance(column, tuple):
+        return tuple(_copy_views(c, buffer) for c in column)
+    base = column
+    while isinstance(base, np.ndarray):
+        base = base.base
+    if isinstance(base, memoryview):
+        base = base.obj
+    return column.copy() if base is buffer else column
+
+
+def _parse_ascii_chunk(props, list_props, lines):
+    """
+    Parse ascii element lines, with at most one list property.
+
+    - returns a list of arrays (float64) for scalar properties, and of
+      (lengths, values) tuples for the list one.
+    """
+    import numpy as np
+    from itertools import chain
+
+    if not list_props:
+        values = np.array(b" ".join(lines).split(), dtype=np.float64).reshape(len(lines), len(props))
+        return [values[:, i] for i in range(len(props))]
+
+    rows = [l.split() for l in lines]
+    row_lengths = np.fromiter(map(len, rows), dtype=np.int64, count=len(rows))
+    values = np.array(list(chain.from_iterable(rows)), dtype=np.float64)
+    row_starts = np.cumsum(row_lengths) - row_lengths
+
+    list_index = list_props[0]
+    num_before = list_index
+    num_after = len(props) - list_index - 1
+    lengths = values[row_starts + num_before].astype(np.int64)
+    if (row_lengths != num_before + 1 + lengths + num_after).any():
+        raise ValueError("Invalid number of values in ascii line")
+
+    columns = []
+    for i in range(len(props)):
+        if i < list_index:
+            columns.append(values[row_starts + i])
+        elif i > list_index:
+            columns.append(values[row_starts + num_before + lengths + i - list_index])
+        else:
+            columns.append((lengths, values[_expand_starts(row_starts + num_before + 1, lengths, 1)]))
+    return columns
+
+
 class ElementSpec:
     __slots__ = (
         "name",
@@ -42,6 +135,166 @@ class ElementSpec:
                 return i
         return -1
 
+    def numpy_dtype(self, format):
+        """
+        Structured dtype of a whole element (fields named after the property indices),
+        None if some properties are not of fixed size.
+        """
+        import numpy as np
+
+        if any(p.list_type is not None or p.numeric_type == 's' for p in self.properties):
+            return None
+        return np.dtype([("p%d" % i, p.numpy_type(format)) for i, p in enumerate(self.properties)])
+
+    def columns_from_rows(self, format, rows):
+        """
+        Convert rows as returned by load() to the columns returned by load_arrays().
+        """
+        import numpy as np
+        from itertools import chain
+
+        columns = {}
+        for i, p in enumerate(self.properties):
+            column = [row[i] for row in rows]
+            if p.numeric_type == 's':
+                columns[p.name] = column
+            elif p.list_type is None:
+                columns[p.name] = np.array(column, dtype=p.numpy_type(format))
+            else:
+                columns[p.name] = (
+                    np.fromiter(map(len, column), dtype=np.int64, count=len(column)),
+                    np.array(list(chain.from_iterable(column)), dtype=p.numpy_type(format)),
+                )
+        return columns
+
+    def _load_arrays_legacy(self, format, stream):
+        return self.columns_from_rows(format, [self.load(format, stream) for i in range(self.count)])
+
+    def _load_arrays_binary(self, format, buffer, offset):
+        import struct
+        import numpy as np
+
+        props = self.properties
+        dtype = self.numpy_dtype(format)
+        if dtype is not None:
+            # Fixed-size element, directly map the whole block (zero-copy).
+            data = np.frombuffer(buffer, dtype=dtype, count=self.count, offset=offset)
+            columns = {p.name: data["p%d" % i] for i, p in enumerate(props)}
+            return columns, offset + dtype.itemsize * self.count
+
+        # Assume all lists have the same length as in the first element (pure triangle
+        # or quad meshes), this can be checked in a vectorized way.
+        fields = []
+        pos = offset
+        for i, p in enumerate(props):
+            if p.list_type is None:
+                fields.append(("p%d" % i, p.numpy_type(format)))
+                pos += p.numpy_type(format).itemsize
+            else:
+                count_type = p.numpy_type(format, p.list_type)
+                length = int(np.frombuffer(buffer, dtype=count_type, count=1, offset=pos)[0]) if self.count else 0
+                fields.append(("c%d" % i, count_type))
+                fields.append(("p%d" % i, p.numpy_type(format), (length,)))
+                pos += count_type.itemsize + p.numpy_type(format).itemsize * length
+        dtype = np.dtype(fields)
+        if offset + dtype.itemsize * self.count <= len(buffer):
+            data = np.frombuffer(buffer, dtype=dtype, count=self.count, offset=offset)
+            if all((data["c%d" % i] == dtype["p%d" % i].shape[0]).all()
+                   for i, p in enumerate(props) if p.list_type is not None):
+                columns = {}
+                for i, p in enumerate(props):
+                    values = data["p%d" % i]
+                    if p.list_type is None:
+                        columns[p.name] = values
+                    else:
+                        columns[p.name] = (np.full(self.count, values.shape[1], dtype=np.int64), values.reshape(-1))
+                return columns, offset + dtype.itemsize * self.count
+
+        # Variable lengths, only walk the file to find where each list starts, and
+        # gather all values at once afterwards.
+        layout = []
+        for p in props:
+            size = p.numpy_type(format).itemsize
+            if p.list_type is None:
+                layout.append((None, size))
+            else:
+                layout.append((struct.Struct(format + p.list_type), size))
+        starts = [[] for p in props]
+        lengths = [[] for p in props]
+        pos = offset
+        for _i in range(self.count):
+            for (count_struct, size), p_starts, p_lengths in zip(layout, starts, lengths):
+                if count_struct is None:
+                    p_starts.append(pos)
+                    pos += size
+                else:
+                    length = count_struct.unpack_from(buffer, pos)[0]
+                    pos += count_struct.size
+                    p_starts.append(pos)
+                    p_lengths.append(length)
+                    pos += size * length
+
+        data = np.frombuffer(buffer, dtype=np.uint8, count=pos - offset, offset=offset)
+        columns = {}
+        for p, p_starts, p_lengths in zip(props, starts, lengths):
+            num_type = p.numpy_type(format)
+            p_starts = np.array(p_starts, dtype=np.int64) - offset
+            if p.list_type is None:
+                columns[p.name] = _gather(data, p_starts, num_type)
+            else:
+                p_lengths = np.array(p_lengths, dtype=np.int64)
+                columns[p.name] = (p_lengths, _gather(data, _expand_starts(p_starts, p_lengths, num_type.itemsize), num_type))
+        return columns, pos
+
+    def _load_arrays_ascii(self, stream):
+        import numpy as np
+        from itertools import islice
+
+        props = self.properties
+        list_props = [i for i, p in enumerate(props) if p.list_type is not None]
+        if len(list_props) > 1 or any(p.numeric_type == 's' for p in props):
+            return self._load_arrays_legacy(b'ascii', stream)
+
+        chunks = []
+        remaining = self.count
+        while remaining:
+            lines = list(islice(stream, min(remaining, ASCII_CHUNK_LINES)))
+            if not lines:
+                raise ValueError("Unexpected end of file in element %r" % self.name)
+            remaining -= len(lines)
+            chunks.append(_parse_ascii_chunk(props, list_props, lines))
+
+        columns = {}
+        for i, p in enumerate(props):
+            num_type = p.numpy_type(b'ascii')
+            if p.list_type is None:
+                columns[p.name] = np.concatenate([c[i] for c in chunks] + [np.empty(0)]).astype(num_type)
+            else:
+                columns[p.name] = (
+                    np.concatenate([c[i][0] for c in chunks] + [np.empty(0, dtype=np.int64)]),
+                    np.concatenate([c[i][1] for c in chunks] + [np.empty(0)]).astype(num_type),
+                )
+        return columns
+
+    def load_arrays(self, format, stream, buffer, offset):
+        """
+        Load all the element rows as columns, a dict mapping property names to
+        NumPy arrays for scalar properties, and to (lengths, values) tuples of
+        arrays for list properties (values being all the lists concatenated).
+
+        In binary files fixed-size elements are views of *buffer*, the file
+        mapped in memory, from *offset*.
+
+        - returns a tuple(columns, offset of the next element).
+        """
+        if format == b'ascii':
+            return self._load_arrays_ascii(stream), None
+        if any(p.numeric_type == 's' for p in self.properties):
+            stream.seek(offset)
+            columns = self._load_arrays_legacy(format, stream)
+            return columns, stream.tell()
+        return self._load_arrays_binary(format, buffer, offset)
+
 
 class PropertySpec:
     __slots__ = (
@@ -101,6 +354,12 @@ class PropertySpec:
         else:
             return self.read_format(format, 1, self.numeric_type, stream)[0]
 
+    def numpy_type(self, format, num_type=None):
+        import numpy as np
+
+        byteorder = '=' if format == b'ascii' else format
+        return np.dtype(byteorder + NUMPY_TYPES[num_type or self.numeric_type])
+
 
 class ObjectSpec:
     __slots__ = ("specs",)
@@ -117,6 +376,31 @@ class ObjectSpec:
             for i in self.specs
         }
 
+    def load_arrays(self, format, stream):
+        """
+        Load all elements as columns of NumPy arrays (see ElementSpec.load_arrays).
+        """
+        import mmap
+
+        buffer = offset = None
+        if format != b'ascii':
+            buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+            offset = stream.tell()
+
+        obj = {}
+        for i in self.specs:
+            obj[i.name], offset = i.load_arrays(format, stream, buffer, offset)
+
+        if buffer is not None:
+            # Copy the columns still viewing the mapped file, so that it can be
+            # unmapped (and is not kept locked) once read.
+            obj = {
+                name: {key: _copy_views(column, buffer) for key, column in columns.items()}
+                for name, columns in obj.items()
+            }
+            buffer.close()
+        return obj
+
 
 def read(filepath):
     import re
@@ -244,13 +528,139 @@ def read(filepath):
             print("Invalid header ('end_header' line not found!)")
             return invalid_ply
 
-        obj = obj_spec.load(format_specs[format], plyf)
+        obj = obj_spec.load_arrays(format_specs[format], plyf)
 
     return obj_spec, obj, texture
 
 
-def load_ply_mesh(filepath, ply_name):
+def _tristrips_to_triangles(lengths, indices):
+    """
+    Return the (N, 3) array of the triangles of strips of given *lengths*.
+    """
+    import numpy as np
+
+    num_tris = np.maximum(lengths - 2, 0)
+    strip_starts = np.cumsum(lengths) - lengths
+    first = _expand_starts(strip_starts, num_tris, 1)
+    return indices[first[:, np.newaxis] + np.arange(3)]
+
+
+def _fix_faces_order(loops_vert_idx, faces_loop_start, faces_loop_total):
+    """
+    Rotate triangles and quads ending with vertex 0, return the new loops vertex indices.
+    """
+    import numpy as np
+
+    # EVIL EEKADOODLE - face order annoyance.
+    order = np.arange(len(loops_vert_idx))
+
+    starts = faces_loop_start[faces_loop_total == 4]
+    starts = starts[(loops_vert_idx[starts + 2] == 0) | (loops_vert_idx[starts + 3] == 0)]
+    for i in range(4):
+        order[starts + i] = starts + (i + 2) % 4
+
+    starts = faces_loop_start[faces_loop_total == 3]
+    starts = starts[loops_vert_idx[starts + 2] == 0]
+    for i in range(3):
+        order[starts + i] = starts + (i + 1) % 3
+
+    return loops_vert_idx[order]
+
+
+def _vertex_colors(vertex, keep=slice(None)):
+    """
+    Return the (N, 4) float array of vertex colors (only for *keep* vertices), or None.
+    """
+    import numpy as np
+
+    color_names = (b'red', b'green', b'blue', b'alpha')
+    if not all(name in vertex for name in color_names[:3]):
+        if any(name in vertex for name in color_names):
+            print("Warning: At least one obligatory color channel is missing, ignoring vertex colors.")
+        return None
+
+    # ignore alpha if not present, if not a float assume uchar
+    colors = np.ones((len(vertex[b'red'][keep]), 4), dtype=np.float32)
+    for i, name in enumerate(color_names):
+        if name in vertex:
+            channel = vertex[name][keep]
+            colors[:, i] = channel if channel.dtype.kind == 'f' else channel / 255.0
+    return colors
+
+
+def _decimate_voxel_grid(x, y, z, voxel_size):
+    """
+    Return the sorted indices of the first point found in each cell of a grid of *voxel_size*.
+    """
+    import numpy as np
+
+    bounds_min = np.array([c.min() for c in (x, y, z)], dtype=np.float64)
+    bounds_max = np.array([c.max() for c in (x, y, z)], dtype=np.float64)
+    dims = np.floor((bounds_max - bounds_min) / voxel_size).astype(np.int64) + 1
+    if float(dims[0]) * float(dims[1]) * float(dims[2]) >= 2.0 ** 63:
+        raise ValueError("Voxel size %r is too small for the point cloud extent" % voxel_size)
+
+    # Work by chunks, so that only the points kept so far need to stay in memory.
+    keys, first = [], []
+    for start in range(0, len(x), DECIMATE_CHUNK_POINTS):
+        chunk = slice(start, start + DECIMATE_CHUNK_POINTS)
+        cells = [
+            np.minimum(np.floor((c[chunk] - c_min) / voxel_size).astype(np.int64), dim - 1)
+            for c, c_min, dim in zip((x, y, z), bounds_min, dims)
+        ]
+        chunk_keys, chunk_first = np.unique((cells[0] * dims[1] + cells[1]) * dims[2] + cells[2], return_index=True)
+        keys.append(chunk_keys)
+        first.append(chunk_first + start)
+    if not keys:
+        return np.empty(0, dtype=np.int64)
+
+    # Chunks are in file order, so the first occurrence of each key is the first point of its cell.
+    _, index = np.unique(np.concatenate(keys), return_index=True)
+    return np.sort(np.concatenate(first)[index])
+
+
+def load_ply_point_cloud(vertex, ply_name, decimate_mode='NONE', decimate_stride=1, decimate_voxel_size=0.01):
+    """
+    Create a mesh of loose vertices from *vertex* columns, in bulk, optionally decimated.
+    """
     import bpy
+    import numpy as np
+
+    x, y, z = vertex[b'x'], vertex[b'y'], vertex[b'z']
+    num_points = len(x)
+
+    if decimate_mode == 'STRIDE':
+        keep = slice(None, None, decimate_stride)
+    elif decimate_mode == 'VOXEL' and num_points:
+        keep = _decimate_voxel_grid(x, y, z, decimate_voxel_size)
+    else:
+        keep = slice(None)
+
+    # Only kept points are copied out of the mapped file.
+    co = np.empty((len(x[keep]), 3), dtype=np.float32)
+    for i, c in enumerate((x, y, z)):
+        co[:, i] = c[keep]
+    if decimate_mode != 'NONE':
+        print("Decimated point cloud from %d to %d points" % (num_points, len(co)))
+
+    mesh = bpy.data.meshes.new(name=ply_name)
+    mesh.vertices.add(len(co))
+    mesh.vertices.foreach_set("co", co.ravel())
+
+    colors = _vertex_colors(vertex, keep)
+    if colors is not None and hasattr(mesh, "attributes"):
+        # Face-corner colors are of no use without faces, store them on points.
+        col_attr = mesh.attributes.new("Col", 'FLOAT_COLOR', 'POINT')
+        col_attr.data.foreach_set("color", colors.ravel())
+
+    mesh.update()
+
+    return mesh
+
+
+def load_ply_mesh(filepath, ply_name, decimate_mode='NONE', decimate_stride=1, decimate_voxel_size=0.01):
+    import bpy
+    import numpy as np
 
     obj_spec, obj, texture = read(filepath)
     # XXX28: use texture
@@ -258,145 +668,73 @@ def load_ply_mesh(filepath, ply_name):
         print("Invalid file")
         return
 
-    uvindices = colindices = None
-    colmultiply = None
+    vertex = obj[b'vertex']
+
+    if not any(name in obj for name in (b'face', b'tristrips', b'edge')):
+        return load_ply_point_cloud(vertex, ply_name, decimate_mode, decimate_stride, decimate_voxel_size)
+    if decimate_mode != 'NONE':
+        print("Warning: Decimation is only supported for point clouds, ignoring it.")
+    num_verts = len(vertex[b'x'])
 
     # TODO import normals
-    # noindices = None
-
-    for el in obj_spec.specs:
-        if el.name == b'vertex':
-            vindices_x, vindices_y, vindices_z = el.index(b'x'), el.index(b'y'), el.index(b'z')
-            # noindices = (el.index('nx'), el.index('ny'), el.index('nz'))
-            # if -1 in noindices: noindices = None
-            uvindices = (el.index(b's'), el.index(b't'))
-            if -1 in uvindices:
-                uvindices = None
-            # ignore alpha if not present
-            if el.index(b'alpha') == -1:
-                colindices = el.index(b'red'), el.index(b'green'), el.index(b'blue')
-            else:
-                colindices = el.index(b'red'), el.index(b'green'), el.index(b'blue'), el.index(b'alpha')
-            if -1 in colindices:
-                if any(idx > -1 for idx in colindices):
-                    print("Warning: At least one obligatory color channel is missing, ignoring vertex colors.")
-                colindices = None
-            else:  # if not a float assume uchar
-                colmultiply = [1.0 if el.properties[i].numeric_type in {'f', 'd'} else (1.0 / 255.0) for i in colindices]
-
-        elif el.name == b'face':
-            findex = el.index(b'vertex_indices')
-        elif el.name == b'tristrips':
-            trindex = el.index(b'vertex_indices')
-        elif el.name == b'edge':
-            eindex1, eindex2 = el.index(b'vertex1'), el.index(b'vertex2')
-
-    mesh_faces = []
-    mesh_uvs = []
-    mesh_colors = []
-
-    def add_face(vertices, indices, uvindices, colindices):
-        mesh_faces.append(indices)
-        if uvindices:
-            mesh_uvs.extend([(vertices[index][uvindices[0]], vertices[index][uvindices[1]]) for index in indices])
-        if colindices:
-            if len(colindices) == 3:
-                mesh_colors.extend([
-                    (
-                        vertices[index][colindices[0]] * colmultiply[0],
-                        vertices[index][colindices[1]] * colmultiply[1],
-                        vertices[index][colindices[2]] * colmultiply[2],
-                        1.0,
-                    )
-                    for index in indices
-                ])
-            elif len(colindices) == 4:
-                mesh_colors.extend([
-                    (
-                        vertices[index][colindices[0]] * colmultiply[0],
-                        vertices[index][colindices[1]] * colmultiply[1],
-                        vertices[index][colindices[2]] * colmultiply[2],
-                        vertices[index][colindices[3]] * colmultiply[3],
-                    )
-                    for index in indices
-                ])
-
-    if uvindices or colindices:
-        # If we have Cols or UVs then we need to check the face order.
-        add_face_simple = add_face
 
-        # EVIL EEKADOODLE - face order annoyance.
-        def add_face(vertices, indices, uvindices, colindices):
-            if len(indices) == 4:
-                if indices[2] == 0 or indices[3] == 0:
-                    indices = indices[2], indices[3], indices[0], indices[1]
-            elif len(indices) == 3:
-                if indices[2] == 0:
-                    indices = indices[1], indices[2], indices[0]
+    uvs = None
+    if b's' in vertex and b't' in vertex:
+        uvs = np.column_stack((vertex[b's'], vertex[b't']))
 
-            add_face_simple(vertices, indices, uvindices, colindices)
+    colors = _vertex_colors(vertex)
 
-    verts = obj[b'vertex']
+    loops_vert_idx = []
+    faces_loop_total = []
 
-    if b'face' in obj:
-        for f in obj[b'face']:
-            ind = f[findex]
-            add_face(verts, ind, uvindices, colindices)
+    if b'face' in obj and b'vertex_indices' in obj[b'face']:
+        lengths, indices = obj[b'face'][b'vertex_indices']
+        faces_loop_total.append(lengths)
+        loops_vert_idx.append(indices)
 
-    if b'tristrips' in obj:
-        for t in obj[b'tristrips']:
-            ind = t[trindex]
-            len_ind = len(ind)
-            for j in range(len_ind - 2):
-                add_face(verts, (ind[j], ind[j + 1], ind[j + 2]), uvindices, colindices)
+    if b'tristrips' in obj and b'vertex_indices' in obj[b'tristrips']:
+        tris = _tristrips_to_triangles(*obj[b'tristrips'][b'vertex_indices'])
+        faces_loop_total.append(np.full(len(tris), 3, dtype=np.int64))
+        loops_vert_idx.append(tris.reshape(-1))
 
-    mesh = bpy.data.meshes.new(name=ply_name)
+    loops_vert_idx = np.concatenate(loops_vert_idx + [np.empty(0)]).astype(np.int32)
+    faces_loop_total = np.concatenate(faces_loop_total + [np.empty(0)]).astype(np.int32)
+    faces_loop_start = (np.cumsum(faces_loop_total) - faces_loop_total).astype(np.int32)
 
-    mesh.vertices.add(len(obj[b'vertex']))
+    if uvs is not None or colors is not None:
+        # If we have Cols or UVs then we need to check the face order.
+        loops_vert_idx = _fix_faces_order(loops_vert_idx, faces_loop_start, faces_loop_total)
 
-    mesh.vertices.foreach_set("co", [a for v in obj[b'vertex'] for a in (v[vindices_x], v[vindices_y], v[vindices_z])])
+    mesh = bpy.data.meshes.new(name=ply_name)
+
+    mesh.vertices.add(num_verts)
+    mesh.vertices.foreach_set("co", np.column_stack((vertex[b'x'], vertex[b'y'], vertex[b'z'])).astype(np.float32).ravel())
 
     if b'edge' in obj:
-        mesh.edges.add(len(obj[b'edge']))
-        mesh.edges.foreach_set("vertices", [a for e in obj[b'edge'] for a in (e[eindex1], e[eindex2])])
-
-    if mesh_faces:
-        loops_vert_idx = []
-        faces_loop_start = []
-        faces_loop_total = []
-        lidx = 0
-        for f in mesh_faces:
-            nbr_vidx = len(f)
-            loops_vert_idx.extend(f)
-            faces_loop_start.append(lidx)
-            faces_loop_total.append(nbr_vidx)
-            lidx += nbr_vidx
+        edge = obj[b'edge']
+        mesh.edges.add(len(edge[b'vertex1']))
+        mesh.edges.foreach_set("vertices", np.column_stack((edge[b'vertex1'], edge[b'vertex2'])).astype(np.int32).ravel())
 
+    if len(faces_loop_total):
         mesh.loops.add(len(loops_vert_idx))
-        mesh.polygons.add(len(mesh_faces))
+        mesh.polygons.add(len(faces_loop_total))
 
         mesh.loops.foreach_set("vertex_index", loops_vert_idx)
         mesh.polygons.foreach_set("loop_start", faces_loop_start)
         mesh.polygons.foreach_set("loop_total", faces_loop_total)
 
-        if uvindices:
+        if uvs is not None:
             uv_layer = mesh.uv_layers.new()
-            for i, uv in enumerate(uv_layer.data):
-                uv.uv = mesh_uvs[i]
+            uv_layer.data.foreach_set("uv", uvs[loops_vert_idx].astype(np.float32).ravel())
 
-        if colindices:
+        if colors is not None:
             vcol_lay = mesh.vertex_colors.new()
-
-            for i, col in enumerate(vcol_lay.data):
-                col.color[0] = mesh_colors[i][0]
-                col.color[1] = mesh_colors[i][1]
-                col.color[2] = mesh_colors[i][2]
-                col.color[3] = mesh_colors[i][3]
+            vcol_lay.data.foreach_set("color", colors[loops_vert_idx].ravel())
 
     mesh.update()
     mesh.validate()
 
-    if texture and uvindices:
+    if texture and uvs is not None:
         pass
         # TODO add support for using texture.
 
@@ -428,14 +766,14 @@ def load_ply_mesh(filepath, ply_name):
     return mesh
 
 
-def load_ply(filepath):
+def load_ply(filepath, decimate_mode='NONE', decimate_stride=1, decimate_voxel_size=0.01):
     import time
     import bpy
 
     t = time.time()
     ply_name = bpy.path.display_name_from_filepath(filepath)
 
-    mesh = load_ply_mesh(filepath, ply_name)
+    mesh = load_ply_mesh(filepath, ply_name, decimate_mode, decimate_stride, decimate_voxel_size)
     if not mesh:
         return {'CANCELLED'}
 
@@ -452,5 +790,5 @@ def load_ply(filepath):
     return {'FINISHED'}
 
 
-def load(operator, context, filepath=""):
-    return load_ply(filepath)
+def load(operator, context, filepath="", decimate_mode='NONE', decimate_stride=1, decimate_voxel_size=0.01):
+    return load_ply(filepath, decimate_mode, decimate_stride, decimate_voxel_size)
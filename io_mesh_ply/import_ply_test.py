@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if __name__ == '__main__':
+    from import_ply import (load_ply_mesh, read,)
+else:
+    from .import_ply import (load_ply_mesh, read,)
+import mmap
+import os
+import sys
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+import numpy as np
+
+
+# Minimal stand-in for the bpy mesh data filled by the import.
+
+class FakeCollection:
+    def __init__(self):
+        self.count = 0
+        self.values = {}
+
+    def __len__(self):
+        return self.count
+
+    def add(self, count):
+        self.count += count
+
+    def foreach_set(self, attr, seq):
+        self.values[attr] = np.array(seq)
+
+
+class FakeLayers(list):
+    def new(self):
+        layer = types.SimpleNamespace(data=FakeCollection())
+        self.append(layer)
+        return layer
+
+
+def fake_mesh_new(name):
+    return types.SimpleNamespace(vertices=FakeCollection(), loops=FakeCollection(), polygons=FakeCollection(),
+                                 uv_layers=FakeLayers(), update=lambda: None, validate=lambda: None)
+
+
+fake_bpy = types.ModuleType("bpy")
+fake_bpy.data = types.SimpleNamespace(meshes=types.SimpleNamespace(new=fake_mesh_new))
+
+
+TEXTURED_PLY = """ply
+format ascii 1.0
+comment TextureFile texture.png
+element vertex 4
+property float x
+property float y
+property float z
+property float s
+property float t
+element face 2
+property list uchar int vertex_indices
+end_header
+0 0 0 0 0
+1 0 0 1 0
+1 1 0 1 1
+0 1 0 0 1
+3 0 1 2
+3 0 2 3
+"""
+
+
+@mock.patch.dict(sys.modules, {"bpy": fake_bpy})
+class LoadPlyMeshTest(unittest.TestCase):
+    def load(self, text):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "test.ply")
+            with open(filepath, "w") as f:
+                f.write(text)
+            return load_ply_mesh(filepath, "test")
+
+    def test_textured(self):
+        mesh = self.load(TEXTURED_PLY)
+        self.assertEqual(len(mesh.vertices), 4)
+        self.assertEqual(len(mesh.polygons), 2)
+        np.testing.assert_array_equal(mesh.loops.values["vertex_index"], (0, 1, 2, 0, 2, 3))
+        self.assertEqual(len(mesh.uv_layers), 1)
+        np.testing.assert_array_equal(mesh.uv_layers[0].data.values["uv"],
+                                      (0, 0, 1, 0, 1, 1, 0, 0, 1, 1, 0, 1))
+
+    def test_untextured(self):
+        text = TEXTURED_PLY.replace("comment TextureFile texture.png\n", "")
+        mesh = self.load(text)
+        self.assertEqual(len(mesh.polygons), 2)
+        self.assertEqual(len(mesh.uv_layers), 1)
+
+
+class RecordingMmap(mmap.mmap):
+    instances = []
+
+    def __new__(cls, *args, **kwargs):
+        mm = super().__new__(cls, *args, **kwargs)
+        cls.instances.append(mm)
+        return mm
+
+
+class ReadBinaryTest(unittest.TestCase):
+    def test_mmap_closed(self):
+        header = (b"ply\nformat binary_little_endian 1.0\nelement vertex 3\n"
+                  b"property float x\nproperty float y\nproperty float z\n"
+                  b"element face 1\nproperty list uchar int vertex_indices\nend_header\n")
+        co = np.arange(9, dtype='<f4')
+        face = np.array([(3, (0, 1, 2))], dtype=[("n", "u1"), ("v", "<i4", (3,))])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "test.ply")
+            with open(filepath, "wb") as f:
+                f.write(header + co.tobytes() + face.tobytes())
+            RecordingMmap.instances.clear()
+            with mock.patch.object(mmap, "mmap", RecordingMmap):
+                obj_spec, obj, texture = read(filepath)
+
+        self.assertEqual(len(RecordingMmap.instances), 1)
+        self.assertTrue(RecordingMmap.instances[0].closed)
+        np.testing.assert_array_equal(obj[b'vertex'][b'y'], (1, 4, 7))
+        lengths, indices = obj[b'face'][b'vertex_indices']
+        np.testing.assert_array_equal(lengths, (3,))
+        np.testing.assert_array_equal(indices, (0, 1, 2))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -21,7 +21,7 @@
 bl_info = {
     "name": "STL format",
     "author": "Guillaume Bouchard (Guillaum)",
-    "version": (1, 1, 3),
+    "version": (1, 2, 0),
     "blender": (2, 81, 6),
     "location": "File > Import-Export",
     "description": "Import-Export STL files",
@@ -38,11 +38,6 @@ Import-Export STL files (binary or ascii)
 
 - Import automatically remove the doubles.
 - Export can export with/without modifiers applied
-
-Issues:
-
-Import:
-    - Does not handle endien
 """
 
 if "bpy" in locals():
@@ -108,6 +103,14 @@ class ImportSTL(Operator, ImportHelper):
         description="Use (import) facet normals (note that this will still give flat shading)",
         default=False,
     )
+    merge_tolerance: FloatProperty(
+        name="Merge Distance",
+        description="Merge vertices closer than this distance, in file units "
+                    "(0 only merges exactly equal vertices)",
+        min=0.0, soft_max=0.1,
+        default=0.0,
+        precision=6,
+    )
 
     def execute(self, context):
         import os
@@ -140,7 +143,7 @@ class ImportSTL(Operator, ImportHelper):
 
         for path in paths:
             objName = bpy.path.display_name_from_filepath(path)
-            tris, tri_nors, pts = stl_utils.read_stl(path)
+            tris, tri_nors, pts = stl_utils.read_stl(path, self.merge_tolerance)
             tri_nors = tri_nors if self.use_facet_normal else None
             blender_utils.create_and_link_mesh(objName, tris, tri_nors, pts, global_matrix)
 
@@ -200,6 +203,7 @@ class STL_PT_import_geometry(bpy.types.Panel):
         operator = sfile.active_operator
 
         layout.prop(operator, "use_facet_normal")
+        layout.prop(operator, "merge_tolerance")
 
 
 @orientation_helper(axis_forward='Y', axis_up='Z')
@@ -285,17 +289,29 @@ class ExportSTL(Operator, ExportHelper):
             to_up=self.axis_up,
         ).to_4x4() @ Matrix.Scale(global_scale, 4)
 
+        # Binary files are written in bulk from arrays, ascii ones face by face.
+        if self.ascii:
+            faces_from_mesh = blender_utils.faces_from_mesh
+        else:
+            faces_from_mesh = blender_utils.faces_array_from_mesh
+
         if self.batch_mode == 'OFF':
-            faces = itertools.chain.from_iterable(
-                    blender_utils.faces_from_mesh(ob, global_matrix, self.use_mesh_modifiers)
-                    for ob in data_seq)
+            if self.ascii:
+                faces = itertools.chain.from_iterable(
+                        faces_from_mesh(ob, global_matrix, self.use_mesh_modifiers)
+                        for ob in data_seq)
+            else:
+                import numpy as np
+                faces = np.concatenate(
+                    [faces_from_mesh(ob, global_matrix, self.use_mesh_modifiers) for ob in data_seq] +
+                    [np.empty((0, 3, 3), dtype=np.float32)])
 
             stl_utils.write_stl(faces=faces, **keywords)
         elif self.batch_mode == 'OBJECT':
             prefix = os.path.splitext(self.filepath)[0]
             keywords_temp = keywords.copy()
             for ob in data_seq:
-                faces = blender_utils.faces_from_mesh(ob, global_matrix, self.use_mesh_modifiers)
+                faces = faces_from_mesh(ob, global_matrix, self.use_mesh_modifiers)
                 keywords_temp["filepath"] = prefix + bpy.path.clean_name(ob.name) + ".stl"
                 stl_utils.write_stl(faces=faces, **keywords_temp)
 
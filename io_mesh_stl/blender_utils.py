@@ -21,36 +21,46 @@
 
 def create_and_link_mesh(name, faces, face_nors, points, global_matrix):
     """
-    Create a blender mesh and object called name from a list of
+    Create a blender mesh and object called name from an array of
     *points* and *faces* and link it in the current scene.
     """
 
-    import array
-    from itertools import chain
+    import numpy as np
     import bpy
 
-    mesh = bpy.data.meshes.new(name)
-    mesh.from_pydata(points, [], faces)
+    faces = np.asarray(faces, dtype=np.int32).reshape(-1, 3)
+    points = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+    num_faces = len(faces)
 
-    if face_nors:
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(points))
+    mesh.vertices.foreach_set("co", points.ravel())
+    mesh.loops.add(num_faces * 3)
+    mesh.loops.foreach_set("vertex_index", faces.ravel())
+    mesh.polygons.add(num_faces)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, num_faces * 3, 3, dtype=np.int32))
+    mesh.polygons.foreach_set("loop_total", np.full(num_faces, 3, dtype=np.int32))
+    mesh.update(calc_edges=True)
+
+    if face_nors is not None:
         # Note: we store 'temp' normals in loops, since validate() may alter final mesh,
         #       we can only set custom lnors *after* calling it.
         mesh.create_normals_split()
-        lnors = tuple(chain(*chain(*zip(face_nors, face_nors, face_nors))))
-        mesh.loops.foreach_set("normal", lnors)
+        lnors = np.repeat(np.asarray(face_nors, dtype=np.float32).reshape(-1, 3), 3, axis=0)
+        mesh.loops.foreach_set("normal", lnors.ravel())
 
     mesh.transform(global_matrix)
 
     # update mesh to allow proper display
     mesh.validate(clean_customdata=False)  # *Very* important to not remove lnors here!
 
-    if face_nors:
-        clnors = array.array('f', [0.0] * (len(mesh.loops) * 3))
+    if face_nors is not None:
+        clnors = np.empty(len(mesh.loops) * 3, dtype=np.float32)
         mesh.loops.foreach_get("normal", clnors)
 
-        mesh.polygons.foreach_set("use_smooth", [True] * len(mesh.polygons))
+        mesh.polygons.foreach_set("use_smooth", np.ones(len(mesh.polygons), dtype=bool))
 
-        mesh.normals_split_custom_set(tuple(zip(*(iter(clnors),) * 3)))
+        mesh.normals_split_custom_set(clnors.reshape(-1, 3))
         mesh.use_auto_smooth = True
         mesh.show_edge_sharp = True
         mesh.free_normals_split()
@@ -63,41 +73,38 @@ def create_and_link_mesh(name, faces, face_nors, points, global_matrix):
     obj.select_set(True)
 
 
-def faces_from_mesh(ob, global_matrix, use_mesh_modifiers=False):
+def _mesh_owner_get(ob, use_mesh_modifiers):
     """
-    From an object, return a generator over a list of faces.
-
-    Each faces is a list of his vertexes. Each vertex is a tuple of
-    his coordinate.
-
-    use_mesh_modifiers
-        Apply the preview modifier to the returned liste
-
-    triangulate
-        Split the quad into two triangles
+    Return the object (evaluated if *use_mesh_modifiers*) to get the mesh of *ob* from.
     """
 
-    import bpy
-
     # get the editmode data
     if ob.mode == "EDIT":
         ob.update_from_editmode()
 
     # get the modifiers
     if use_mesh_modifiers:
+        import bpy
         depsgraph = bpy.context.evaluated_depsgraph_get()
-        mesh_owner = ob.evaluated_get(depsgraph)
-    else:
-        mesh_owner = ob
+        return ob.evaluated_get(depsgraph)
+
+    return ob
+
+
+def _mesh_get(mesh_owner, ob, global_matrix):
+    """
+    Return the triangulated mesh of *mesh_owner* in global space, or None.
+    Call mesh_owner.to_mesh_clear() once done with it.
+    """
 
     # Object.to_mesh() is not guaranteed to return a mesh.
     try:
         mesh = mesh_owner.to_mesh()
     except RuntimeError:
-        return
+        return None
 
     if mesh is None:
-        return
+        return None
 
     mat = global_matrix @ ob.matrix_world
     mesh.transform(mat)
@@ -105,9 +112,57 @@ def faces_from_mesh(ob, global_matrix, use_mesh_modifiers=False):
         mesh.flip_normals()
     mesh.calc_loop_triangles()
 
+    return mesh
+
+
+def faces_from_mesh(ob, global_matrix, use_mesh_modifiers=False):
+    """
+    From an object, return a generator over a list of faces.
+
+    Each faces is a list of his vertexes. Each vertex is a tuple of
+    his coordinate.
+
+    use_mesh_modifiers
+        Apply the preview modifier to the returned liste
+
+    triangulate
+        Split the quad into two triangles
+    """
+
+    mesh_owner = _mesh_owner_get(ob, use_mesh_modifiers)
+    mesh = _mesh_get(mesh_owner, ob, global_matrix)
+    if mesh is None:
+        return
+
     vertices = mesh.vertices
 
     for tri in mesh.loop_triangles:
         yield [vertices[index].co.copy() for index in tri.vertices]
 
     mesh_owner.to_mesh_clear()
+
+
+def faces_array_from_mesh(ob, global_matrix, use_mesh_modifiers=False):
+    """
+    From an object, return a (N, 3, 3) float32 array of its triangles,
+    each triangle being the coordinates of its 3 vertices.
+
+    use_mesh_modifiers
+        Apply the preview modifier to the returned array
+    """
+
+    import numpy as np
+
+    mesh_owner = _mesh_owner_get(ob, use_mesh_modifiers)
+    mesh = _mesh_get(mesh_owner, ob, global_matrix)
+    if mesh is None:
+        return np.empty((0, 3, 3), dtype=np.float32)
+
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    tri_verts = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", tri_verts)
+
+    mesh_owner.to_mesh_clear()
+
+    return co.reshape(-1, 3)[tri_verts].reshape(-1, 3, 3)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if __name__ == '__main__':
+    from blender_utils import (faces_from_mesh, faces_array_from_mesh,)
+    import stl_utils
+else:
+    from .blender_utils import (faces_from_mesh, faces_array_from_mesh,)
+    from . import stl_utils
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+
+# Minimal stand-ins for the bpy types used by the export, with numpy
+# arrays as matrices and vertex coordinates.
+
+class FakeMatrix:
+    def __init__(self, array):
+        self.array = np.asarray(array, dtype=np.float64)
+
+    def __matmul__(self, other):
+        return FakeMatrix(self.array @ other.array)
+
+    @property
+    def is_negative(self):
+        return np.linalg.det(self.array[:3, :3]) < 0.0
+
+
+class FakeVertex:
+    def __init__(self, co):
+        self.co = co
+
+
+class FakeTriangle:
+    def __init__(self, vertices):
+        self.vertices = vertices
+
+
+class FakeCollection(list):
+    def __init__(self, items, attr, size):
+        super().__init__(items)
+        self.attr = attr
+        self.size = size
+
+    def foreach_get(self, attr, seq):
+        assert attr == self.attr
+        seq[:] = np.array([getattr(item, attr) for item in self], dtype=seq.dtype).ravel()
+
+
+class FakeMesh:
+    def __init__(self, co, polygons):
+        self.co = np.asarray(co, dtype=np.float64)
+        self.polygons = polygons
+        self.vertices = self.loop_triangles = None
+        self.flipped = False
+
+    def transform(self, matrix):
+        co = np.hstack((self.co, np.ones((len(self.co), 1)))) @ matrix.array.T
+        self.co = co[:, :3]
+
+    def flip_normals(self):
+        self.flipped = True
+        self.polygons = [poly[::-1] for poly in self.polygons]
+
+    def calc_loop_triangles(self):
+        tris = [(poly[0], poly[i], poly[i + 1]) for poly in self.polygons for i in range(1, len(poly) - 1)]
+        self.vertices = FakeCollection([FakeVertex(co) for co in self.co], "co", 3)
+        self.loop_triangles = FakeCollection([FakeTriangle(tri) for tri in tris], "vertices", 3)
+
+
+class FakeObject:
+    mode = "OBJECT"
+
+    def __init__(self, mesh, matrix_world):
+        self.mesh = mesh
+        self.matrix_world = FakeMatrix(matrix_world)
+        self.cleared = False
+
+    def to_mesh(self):
+        return self.mesh
+
+    def to_mesh_clear(self):
+        self.cleared = True
+
+
+def cube_object(matrix_world=np.identity(4)):
+    co = [(x, y, z) for x in (0.0, 1.0) for y in (0.0, 2.0) for z in (0.0, 3.0)]
+    polygons = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+    return FakeObject(FakeMesh(co, polygons), matrix_world)
+
+
+class FacesFromMeshTest(unittest.TestCase):
+    global_matrix = FakeMatrix(np.diag((2.0, 2.0, 2.0, 1.0)))
+
+    def test_generator_and_array(self):
+        ob = cube_object()
+        faces = [[co[:] for co in face] for face in faces_from_mesh(ob, self.global_matrix)]
+        self.assertTrue(ob.cleared)
+        self.assertEqual(len(faces), 12)
+
+        faces_array = faces_array_from_mesh(cube_object(), self.global_matrix)
+        self.assertEqual(faces_array.dtype, np.float32)
+        self.assertEqual(faces_array.shape, (12, 3, 3))
+        np.testing.assert_allclose(faces_array, faces)
+        np.testing.assert_allclose(faces_array.max(axis=(0, 1)), (2.0, 4.0, 6.0))
+
+    def test_negative_matrix(self):
+        ob = cube_object(np.diag((-1.0, 1.0, 1.0, 1.0)))
+        faces_array = faces_array_from_mesh(ob, self.global_matrix)
+        self.assertTrue(ob.mesh.flipped)
+        np.testing.assert_allclose(faces_array.min(axis=(0, 1)), (-2.0, 0.0, 0.0))
+
+    def test_no_mesh(self):
+        ob = cube_object()
+        ob.mesh = None
+        self.assertEqual(list(faces_from_mesh(ob, self.global_matrix)), [])
+        self.assertEqual(faces_array_from_mesh(ob, self.global_matrix).shape, (0, 3, 3))
+
+    # The header version is read from bpy.
+    @mock.patch.object(stl_utils, "_header_version", lambda: "test")
+    def test_export(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "cube.stl")
+            results = []
+            for faces in (faces_from_mesh(cube_object(), self.global_matrix),
+                          faces_array_from_mesh(cube_object(), self.global_matrix)):
+                stl_utils.write_stl(filepath=filepath, faces=faces)
+                results.append(stl_utils.read_stl(filepath))
+
+        (tris, tri_nors, pts), (tris_array, tri_nors_array, pts_array) = results
+        self.assertEqual(len(tris), 12)
+        self.assertEqual(len(pts), 8)
+        np.testing.assert_array_equal(tris, tris_array)
+        np.testing.assert_array_equal(tri_nors, tri_nors_array)
+        np.testing.assert_array_equal(pts, pts_array)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -26,8 +26,6 @@ Used as a blender script, it load all the stl files in the scene:
 blender --python stl_utils.py -- file1.stl file2.stl file3.stl ...
 """
 
-# TODO: endien
-
 
 class ListDict(dict):
     """
@@ -70,6 +68,16 @@ BINARY_HEADER = 80
 BINARY_STRIDE = 12 * 4 + 2
 
 
+def _binary_dtype():
+    import numpy as np
+    # Packed (unaligned) layout, matches BINARY_STRIDE.
+    return np.dtype([
+        ('normal', '<f4', (3,)),
+        ('points', '<f4', (3, 3)),
+        ('attr', '<u2'),
+    ])
+
+
 def _header_version():
     import bpy
     return "Exported from Blender-" + bpy.app.version_string
@@ -104,39 +112,43 @@ def _is_ascii_file(data):
 
 
 def _binary_read(data):
-    # Skip header...
+    """
+    Read all the facets of a binary stl file at once.
+
+    - returns a tuple(triangles' normals, triangles' points).
+
+      triangles' normals
+          A (N, 3) float32 array.
 
+      triangles' points
+          A (N, 3, 3) float32 array, the 3 corners of each triangle.
+    """
     import os
     import struct
+    import numpy as np
 
+    # Skip header...
     data.seek(BINARY_HEADER)
     size = struct.unpack('<I', data.read(4))[0]
 
+    # Use seek() method to get size of the file.
+    data.seek(0, os.SEEK_END)
+    file_size = data.tell() - (BINARY_HEADER + 4)
+    # Reset to after-the-size in the file.
+    data.seek(BINARY_HEADER + 4)
+
     if size == 0:
         # Workaround invalid crap.
-        data.seek(0, os.SEEK_END)
-        file_size = data.tell()
-        # Reset to after-the-size in the file.
-        data.seek(BINARY_HEADER + 4)
-
-        file_size -= BINARY_HEADER + 4
         size = file_size // BINARY_STRIDE
         print("WARNING! Reported size (facet number) is 0, inferring %d facets from file size." % size)
+    elif size * BINARY_STRIDE > file_size:
+        size = file_size // BINARY_STRIDE
+        print("WARNING! File is truncated, only reading %d facets." % size)
 
-    # We read 4096 elements at once, avoids too much calls to read()!
-    CHUNK_LEN = 4096
-    chunks = [CHUNK_LEN] * (size // CHUNK_LEN)
-    chunks.append(size % CHUNK_LEN)
+    # Read the whole facet block in one go, fields are always little-endian.
+    facets = np.fromfile(data, dtype=_binary_dtype(), count=size)
 
-    unpack = struct.Struct('<12f').unpack_from
-    for chunk_len in chunks:
-        if chunk_len == 0:
-            continue
-        buf = data.read(BINARY_STRIDE * chunk_len)
-        for i in range(chunk_len):
-            # read the normal and points coordinates of each triangle
-            pt = unpack(buf, BINARY_STRIDE * i)
-            yield pt[:3], (pt[3:6], pt[6:9], pt[9:])
+    return facets['normal'], facets['points']
 
 
 def _ascii_read(data):
@@ -166,35 +178,35 @@ def _ascii_read(data):
             yield curr_nor, [tuple(map(float, l_item.split()[1:])) for l_item in (l, data.readline(), data.readline())]
 
 
-def _binary_write(filepath, faces):
-    import struct
-    import itertools
-    from mathutils.geometry import normal
+def _faces_normals(faces):
+    """
+    Compute the normals of a (N, 3, 3) array of triangles.
+    """
+    import numpy as np
+
+    nors = np.cross(faces[:, 1] - faces[:, 0], faces[:, 2] - faces[:, 0])
+    lengths = np.linalg.norm(nors, axis=1)
+    # Degenerated triangles get a null normal, like mathutils.geometry.normal().
+    lengths[lengths == 0.0] = 1.0
+    nors /= lengths[:, np.newaxis]
+    return nors
 
-    with open(filepath, 'wb') as data:
-        fw = data.write
-        # header
-        # we write padding at header beginning to avoid to
-        # call len(list(faces)) which may be expensive
-        fw(struct.calcsize('<80sI') * b'\0')
 
-        # 3 vertex == 9f
-        pack = struct.Struct('<9f').pack
+def _binary_write(filepath, faces):
+    import struct
+    import numpy as np
 
-        # number of vertices written
-        nb = 0
+    if not isinstance(faces, np.ndarray):
+        faces = np.array([[v[:] for v in face] for face in faces], dtype=np.float32)
+    faces = faces.reshape(-1, 3, 3)
 
-        for face in faces:
-            # calculate face normal
-            # write normal + vertexes + pad as attributes
-            fw(struct.pack('<3f', *normal(*face)) + pack(*itertools.chain.from_iterable(face)))
-            # attribute byte count (unused)
-            fw(b'\0\0')
-            nb += 1
+    facets = np.zeros(len(faces), dtype=_binary_dtype())
+    facets['points'] = faces
+    facets['normal'] = _faces_normals(faces.astype(np.float64))
 
-        # header, with correct value now
-        data.seek(0)
-        fw(struct.pack('<80sI', _header_version().encode('ascii'), nb))
+    with open(filepath, 'wb') as data:
+        data.write(struct.pack('<80sI', _header_version().encode('ascii'), len(facets)))
+        facets.tofile(data)
 
 
 def _ascii_write(filepath, faces):
@@ -223,7 +235,8 @@ def write_stl(filepath="", faces=(), ascii=False):
        output filepath
 
     faces
-       iterable of tuple of 3 vertex, vertex is tuple of 3 coordinates as float
+       iterable of tuple of 3 vertex, vertex is tuple of 3 coordinates as float,
+       or a (N, 3, 3) array of floats (much faster for binary files)
 
     ascii
        save the file in ascii format (very huge)
@@ -231,65 +244,178 @@ def write_stl(filepath="", faces=(), ascii=False):
     (_ascii_write if ascii else _binary_write)(filepath, faces)
 
 
-def read_stl(filepath):
+def _ascii_read_arrays(data):
+    """
+    Gather the facets of an ascii stl file into the same arrays as _binary_read().
+    """
+    import numpy as np
+
+    nors, pts = [], []
+    for nor, pt in _ascii_read(data):
+        nors.append(nor)
+        pts.append(pt)
+
+    return (np.array(nors, dtype=np.float32).reshape(-1, 3),
+            np.array(pts, dtype=np.float32).reshape(-1, 3, 3))
+
+
+# Quantized coordinates are packed in a single int64 key when they fit
+# in that many bits per axis, else whole rows are compared.
+WELD_PACK_BITS = 21
+
+
+def _weld_keys(points, tolerance):
+    """
+    Return a (N, 3) array of keys, equal for points to be merged,
+    or None if the points cannot be quantized with *tolerance*.
+    """
+    import numpy as np
+
+    if tolerance <= 0.0:
+        # Bit-exact comparison, adding 0.0 turns -0.0 into 0.0. Bit patterns are
+        # unsigned so that their offsets in weld_points() cannot overflow.
+        points = np.ascontiguousarray(points + points.dtype.type(0.0))
+        return points.view(np.dtype('<u%d' % points.dtype.itemsize))
+
+    scaled = points.astype(np.float64) / tolerance
+    if not np.isfinite(scaled).all() or np.abs(scaled).max() >= 2.0 ** 62:
+        return None
+    return np.floor(scaled + 0.5).astype(np.int64)
+
+
+def _weld_points_listdict(points, tolerance=0.0):
+    """
+    Fallback of weld_points(), merging points one at a time through a ListDict.
+    """
+    import math
+    import numpy as np
+
+    def quantize(c):
+        c /= tolerance
+        return math.floor(c + 0.5) if math.isfinite(c) else c
+
+    if tolerance <= 0.0:
+        # -0.0 and 0.0 are already equal as Python floats.
+        keys = map(tuple, points.tolist())
+    else:
+        keys = (tuple(map(quantize, pt)) for pt in points.tolist())
+
+    welded, first = ListDict(), []
+    indices = np.empty(len(points), dtype=np.int32)
+    for i, key in enumerate(keys):
+        index = welded.add(key)
+        if index == len(first):
+            first.append(i)
+        indices[i] = index
+
+    return indices, points[np.array(first, dtype=np.intp)]
+
+
+def weld_points(points, tolerance=0.0):
+    """
+    Merge the points of a (N, 3) array which are equal, or which fall
+    into the same cell of a grid of size *tolerance* (note that two points
+    closer than *tolerance* but on both sides of a cell boundary are not
+    merged).
+
+    The whole array is handled at once by sorting quantized coordinates,
+    the ListDict based version is only used when coordinates are too big
+    for the given tolerance.
+
+    - returns a tuple(indices, unique points), each point being replaced
+      by the first one merged with it, in order of first appearance (like
+      a ListDict would do).
+    """
+    import numpy as np
+
+    if len(points) == 0:
+        return np.empty(0, dtype=np.int32), points
+
+    keys = _weld_keys(points, tolerance)
+    if keys is None:
+        return _weld_points_listdict(points, tolerance)
+
+    # Pack each point in a single integer, sorting it is way faster than sorting rows.
+    keys = keys - keys.min(axis=0)
+    if keys.max() < (1 << WELD_PACK_BITS):
+        keys = keys.astype(np.int64)
+        records = (keys[:, 0] << (2 * WELD_PACK_BITS)) | (keys[:, 1] << WELD_PACK_BITS) | keys[:, 2]
+    else:
+        # Too sparse, replace each axis by its rank among the distinct values of
+        # that axis, combining them two at a time (ranks are always < len(points)).
+        records = np.unique(keys[:, 0], return_inverse=True)[1].ravel()
+        for axis in (1, 2):
+            values, column = np.unique(keys[:, axis], return_inverse=True)
+            records = records * len(values) + column.ravel()
+            if axis != 2:
+                records = np.unique(records, return_inverse=True)[1].ravel()
+    _, first, inverse = np.unique(records, return_index=True, return_inverse=True)
+
+    # np.unique sorts its output, restore order of first appearance.
+    order = np.argsort(first)
+    remap = np.empty_like(order)
+    remap[order] = np.arange(len(order))
+
+    return remap[inverse.ravel()].astype(np.int32), points[first[order]]
+
+
+def read_stl(filepath, merge_tolerance=0.0):
     """
     Return the triangles and points of an stl binary file.
 
+    Points closer than *merge_tolerance* are merged (see weld_points()),
+    only exactly equal points are merged by default.
+
     Please note that this process can take lot of time if the file is
     huge (~1m30 for a 1 Go stl file on an quad core i7).
 
     - returns a tuple(triangles, triangles' normals, points).
 
       triangles
-          A list of triangles, each triangle as a tuple of 3 index of
+          A (N, 3) int32 array, each triangle as 3 indices of
           point in *points*.
 
       triangles' normals
-          A list of vectors3 (tuples, xyz).
+          A (N, 3) float32 array of vectors (xyz).
 
       points
-          An indexed list of points, each point is a tuple of 3 float
-          (xyz).
+          A (M, 3) float32 array of points (xyz).
 
     Example of use:
 
        >>> tris, tri_nors, pts = read_stl(filepath)
-       >>> pts = list(pts)
        >>>
        >>> # print the coordinate of the triangle n
-       >>> print(pts[i] for i in tris[n])
+       >>> print(pts[tris[n]])
     """
     import time
     start_time = time.process_time()
 
-    tris, tri_nors, pts = [], [], ListDict()
-
     with open(filepath, 'rb') as data:
         # check for ascii or binary
-        gen = _ascii_read if _is_ascii_file(data) else _binary_read
+        read = _ascii_read_arrays if _is_ascii_file(data) else _binary_read
+        tri_nors, tri_pts = read(data)
 
-        for nor, pt in gen(data):
-            # Add the triangle and the point.
-            # If the point is already in the list of points, the
-            # index returned by pts.add() will be the one from the
-            # first equal point inserted.
-            tris.append([pts.add(p) for p in pt])
-            tri_nors.append(nor)
+    # Equal points are merged, each triangle pointing to the index of
+    # the first equal point found in the file.
+    tris, pts = weld_points(tri_pts.reshape(-1, 3), merge_tolerance)
+    tris = tris.reshape(-1, 3)
 
     print('Import finished in %.4f sec.' % (time.process_time() - start_time))
 
-    return tris, tri_nors, pts.list
+    return tris, tri_nors, pts
 
 
 if __name__ == '__main__':
     import sys
     import bpy
+    from mathutils import Matrix
     from io_mesh_stl import blender_utils
 
     filepaths = sys.argv[sys.argv.index('--') + 1:]
 
     for filepath in filepaths:
         objName = bpy.path.display_name(filepath)
-        tris, pts = read_stl(filepath)
+        tris, tri_nors, pts = read_stl(filepath)
 
-        blender_utils.create_and_link_mesh(objName, tris, pts)
+        blender_utils.create_and_link_mesh(objName, tris, None, pts, Matrix())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+"""
+Benchmark of the STL vertex welding, sorting based weld_points() against
+the ListDict fallback, on synthetic binary files (does not need Blender):
+
+python3 stl_utils_benchmark.py [--tolerance 0.0] [--no-listdict] 1000000 10000000
+"""
+
+# XXX Not really nice, but that hack is needed to allow execution of that
+#     benchmark from both Blender's python and by directly running the file.
+if __name__ == '__main__':
+    import stl_utils
+else:
+    from . import stl_utils
+
+
+def grid_faces(num_tris):
+    """
+    Return a (N, 3, 3) array of the triangles of a wavy square grid, with
+    about *num_tris* triangles, most points being shared by 6 triangles.
+    """
+    import numpy as np
+
+    size = max(1, int((num_tris / 2) ** 0.5))
+    x, y = np.meshgrid(np.linspace(0.0, 1.0, size + 1), np.linspace(0.0, 1.0, size + 1))
+    pts = np.stack((x, y, np.sin(x * 10.0) * np.cos(y * 10.0) * 0.1), axis=-1)
+    pts = pts.astype(np.float32).reshape(-1, 3)
+
+    idx = np.arange((size + 1) * (size + 1)).reshape(size + 1, size + 1)
+    a, b, c, d = idx[:-1, :-1].ravel(), idx[:-1, 1:].ravel(), idx[1:, 1:].ravel(), idx[1:, :-1].ravel()
+    tris = np.concatenate((np.stack((a, b, c), axis=-1), np.stack((a, c, d), axis=-1)))
+
+    return pts[tris]
+
+
+def write_binary(filepath, faces):
+    import struct
+    import numpy as np
+
+    facets = np.zeros(len(faces), dtype=stl_utils._binary_dtype())
+    facets['points'] = faces
+    with open(filepath, 'wb') as data:
+        data.write(struct.pack('<80sI', b'stl_utils_benchmark', len(facets)))
+        facets.tofile(data)
+
+
+def bench(num_tris, tolerance, use_listdict):
+    import os
+    import tempfile
+    import time
+
+    faces = grid_faces(num_tris)
+    fd, filepath = tempfile.mkstemp(suffix=".stl")
+    os.close(fd)
+    try:
+        write_binary(filepath, faces)
+        del faces
+
+        t = time.perf_counter()
+        with open(filepath, 'rb') as data:
+            _nors, pts = stl_utils._binary_read(data)
+        pts = pts.reshape(-1, 3)
+        print("%d triangles (%.1f MiB):" % (len(pts) // 3, os.path.getsize(filepath) / (1 << 20)))
+        print("    read:              %8.3f sec" % (time.perf_counter() - t))
+
+        t = time.perf_counter()
+        tris, welded = stl_utils.weld_points(pts, tolerance)
+        print("    weld_points:       %8.3f sec, %d points" % (time.perf_counter() - t, len(welded)))
+
+        if use_listdict:
+            t = time.perf_counter()
+            tris_ld, welded_ld = stl_utils._weld_points_listdict(pts, tolerance)
+            print("    ListDict fallback: %8.3f sec, %d points" % (time.perf_counter() - t, len(welded_ld)))
+            assert (tris == tris_ld).all()
+    finally:
+        os.remove(filepath)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark STL vertex welding.")
+    parser.add_argument("sizes", type=int, nargs="*", default=[1000000, 10000000],
+                        help="Number of triangles of the synthetic files")
+    parser.add_argument("--tolerance", type=float, default=0.0, help="Merge distance")
+    parser.add_argument("--no-listdict", dest="use_listdict", action="store_false",
+                        help="Skip the (slow) ListDict fallback")
+    args = parser.parse_args()
+
+    for num_tris in args.sizes:
+        bench(num_tris, args.tolerance, args.use_listdict)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if __name__ == '__main__':
+    from stl_utils import (weld_points, _weld_points_listdict,)
+else:
+    from .stl_utils import (weld_points, _weld_points_listdict,)
+import unittest
+
+import numpy as np
+
+
+class WeldPointsTest(unittest.TestCase):
+
+    def assertSameWeld(self, points, tolerance=0.0):
+        indices, welded = weld_points(points, tolerance)
+        indices_ld, welded_ld = _weld_points_listdict(points, tolerance)
+        np.testing.assert_array_equal(indices, indices_ld)
+        np.testing.assert_array_equal(welded, welded_ld)
+        self.assertEqual(welded.dtype, points.dtype)
+        return indices, welded
+
+    def test_exact(self):
+        points = np.array([[0, 0, 0], [1, 2, 3], [0, 0, 0], [-0.0, 0, 0], [1, 2, 3.5]], dtype=np.float32)
+        indices, welded = self.assertSameWeld(points)
+        self.assertEqual(indices.tolist(), [0, 1, 0, 0, 2])
+
+    def test_exact_float64(self):
+        # Bit patterns of negative and positive doubles span the whole 64 bits range.
+        points = np.array([[1.0, 0, 0], [-1.0, 0, 0], [1.0, 0, 0], [2.0, 0, 0]])
+        indices, welded = self.assertSameWeld(points)
+        self.assertEqual(indices.tolist(), [0, 1, 0, 2])
+        self.assertEqual(welded.tolist(), [[1.0, 0, 0], [-1.0, 0, 0], [2.0, 0, 0]])
+
+    def test_exact_float64_sparse(self):
+        points = np.array([[1e300, -1e-300, 0], [-1e300, 1e-300, 5], [1e300, -1e-300, 0]])
+        indices, welded = self.assertSameWeld(points)
+        self.assertEqual(indices.tolist(), [0, 1, 0])
+
+    def test_tolerance(self):
+        points = np.array([[0, 0, 0], [0.004, 0, 0], [0.006, 0, 0], [-1000, 0, 0.001]], dtype=np.float32)
+        indices, welded = self.assertSameWeld(points, 0.01)
+        self.assertEqual(indices.tolist(), [0, 0, 1, 2])
+
+    def test_empty(self):
+        indices, welded = weld_points(np.empty((0, 3), dtype=np.float32))
+        self.assertEqual(len(indices), 0)
+        self.assertEqual(len(welded), 0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -21,7 +21,7 @@
 bl_info = {
     "name": "FBX format",
     "author": "Campbell Barton, Bastien Montagne, Jens Restemeier",
-    "version": (4, 22, 0),
+    "version": (4, 25, 0),
     "blender": (2, 90, 0),
     "location": "File > Import-Export",
     "description": "FBX IO meshes, UV's, vertex colors, materials, textures, cameras, lamps and actions",
@@ -47,6 +47,7 @@ from bpy.props import (
         StringProperty,
         BoolProperty,
         FloatProperty,
+        IntProperty,
         EnumProperty,
         CollectionProperty,
         )
@@ -610,6 +611,19 @@ class ExportFBX(bpy.types.Operator, ExportHelper):
             description="Create a dir for each exported file",
             default=True,
             )
+    compression_level: IntProperty(
+            name="Compression Level",
+            description="Compression level of array data (0 to store it uncompressed, "
+                        "higher levels give smaller files but are slower to export)",
+            min=0, max=9,
+            default=1,
+            )
+    compression_min_size: IntProperty(
+            name="Compression Threshold",
+            description="Arrays smaller than this (in bytes) are stored uncompressed",
+            min=0, soft_max=4096,
+            default=128,
+            )
     use_metadata: BoolProperty(
             name="Use Metadata",
             default=True,
@@ -675,6 +689,11 @@ class FBX_PT_export_main(bpy.types.Panel):
         row.prop(operator, "batch_mode")
         sub = row.row(align=True)
         sub.prop(operator, "use_batch_own_dir", text="", icon='NEWFOLDER')
+        col = layout.column(align=True)
+        col.prop(operator, "compression_level")
+        sub = col.row(align=True)
+        sub.enabled = (operator.compression_level > 0)
+        sub.prop(operator, "compression_min_size")
 
 
 class FBX_PT_export_include(bpy.types.Panel):
@@ -25,8 +25,10 @@ try:
 except:
     import data_types
 
+from concurrent.futures import Future
 from struct import pack
 import array
+import os
 import zlib
 
 _BLOCK_SENTINEL_LENGTH = 13
@@ -45,6 +47,57 @@ _FOOT_ID = b'\xfa\xbc\xab\x09\xd0\xc8\xd4\x66\xb1\x76\xfb\x83\x1c\xf7\x26\x7e'
 # Awful exceptions: those "classes" of elements seem to need block sentinel even when having no children and some props.
 _ELEMS_ID_ALWAYS_BLOCK_SENTINEL = {b"AnimationStack", b"AnimationLayer"}
 
+# Arrays compression settings, see init_compression().
+# mimic behavior of fbxconverter (also common sense): small arrays are not worth compressing.
+_ARRAY_COMPRESSION_LEVEL = 1
+_ARRAY_COMPRESSION_MIN_SIZE = 128
+# Arrays bigger than that (in bytes) are compressed in worker threads, if available.
+_ARRAY_THREADED_MIN_SIZE = 1 << 16
+_compression_executor = None
+
+
+def init_compression(level=1, min_size=128, use_threads=True, num_threads=None):
+    """
+    Set how arrays added from now on get compressed.
+
+    ``level`` is the zlib compression level (0 stores all arrays uncompressed), arrays which raw data is not bigger
+    than ``min_size`` bytes are never compressed. With ``use_threads``, big arrays are compressed in a pool of
+    worker threads (zlib releases the GIL), their data being only awaited when the element gets written.
+    Call end_compression() once done.
+    """
+    global _ARRAY_COMPRESSION_LEVEL, _ARRAY_COMPRESSION_MIN_SIZE, _compression_executor
+    import os
+
+    end_compression()
+
+    _ARRAY_COMPRESSION_LEVEL = level
+    _ARRAY_COMPRESSION_MIN_SIZE = min_size
+    if use_threads and level > 0:
+        if num_threads is None:
+            num_threads = os.cpu_count() or 1
+        # Not worth it (and only slower) with a single CPU.
+        if num_threads > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            _compression_executor = ThreadPoolExecutor(max_workers=num_threads)
+
+
+def end_compression():
+    """
+    Stop compression worker threads (if any), and restore default compression settings.
+    """
+    global _ARRAY_COMPRESSION_LEVEL, _ARRAY_COMPRESSION_MIN_SIZE, _compression_executor
+
+    if _compression_executor is not None:
+        _compression_executor.shutdown(wait=True)
+        _compression_executor = None
+    _ARRAY_COMPRESSION_LEVEL = 1
+    _ARRAY_COMPRESSION_MIN_SIZE = 128
+
+
+def _compress_array(length, data, level):
+    data = zlib.compress(data, level)
+    return pack('<3I', length, 1, len(data)) + data
+
 
 class FBXElem:
     __slots__ = (
@@ -141,17 +194,14 @@ class FBXElem:
             data.byteswap()
         data = data.tobytes()
 
-        # mimic behavior of fbxconverter (also common sense)
-        # we could make this configurable.
-        encoding = 0 if len(data) <= 128 else 1
-        if encoding == 0:
-            pass
-        elif encoding == 1:
-            data = zlib.compress(data, 1)
-
-        comp_len = len(data)
-
-        data = pack('<3I', length, encoding, comp_len) + data
+        level = _ARRAY_COMPRESSION_LEVEL
+        if level <= 0 or len(data) <= _ARRAY_COMPRESSION_MIN_SIZE:
+            data = pack('<3I', length, 0, len(data)) + data
+        elif _compression_executor is not None and len(data) > _ARRAY_THREADED_MIN_SIZE:
+            # Resolved in _calc_props_length().
+            data = _compression_executor.submit(_compress_array, length, data, level)
+        else:
+            data = _compress_array(length, data, level)
 
         self.props_type.append(prop_type)
         self.props.append(data)
@@ -189,6 +239,30 @@ class FBXElem:
     # -------------------------
     # internal helper functions
 
+    def _calc_props_length(self):
+        """
+        Wait for arrays still being compressed, and compute the size of props.
+        """
+        props = self.props
+        props_length = 0
+        for i, data in enumerate(props):
+            if isinstance(data, Future):
+                props[i] = data = data.result()
+            # 1 byte for the prop type
+            props_length += 1 + len(data)
+        self._props_length = props_length
+        return props_length
+
+    def _write_head(self, write, end_offset):
+        write(pack('<3I', end_offset, len(self.props), self._props_length))
+
+        write(bytes((len(self.id),)))
+        write(self.id)
+
+        for i, data in enumerate(self.props):
+            write(bytes((self.props_type[i],)))
+            write(data)
+
     def _calc_offsets(self, offset, is_last):
         """
         Call before writing, calculates fixed offsets.
@@ -198,13 +272,7 @@ class FBXElem:
 
         offset += 12  # 3 uints
         offset += 1 + len(self.id)  # len + idname
-
-        props_length = 0
-        for data in self.props:
-            # 1 byte for the prop type
-            props_length += 1 + len(data)
-        self._props_length = props_length
-        offset += props_length
+        offset += self._calc_props_length()
 
         offset = self._calc_offsets_children(offset, is_last)
 
@@ -227,14 +295,7 @@ class FBXElem:
         assert(self._end_offset != -1)
         assert(self._props_length != -1)
 
-        write(pack('<3I', self._end_offset, len(self.props), self._props_length))
-
-        write(bytes((len(self.id),)))
-        write(self.id)
-
-        for i, data in enumerate(self.props):
-            write(bytes((self.props_type[i],)))
-            write(data)
+        self._write_head(write, self._end_offset)
 
         self._write_children(write, tell, is_last)
 
@@ -254,6 +315,26 @@ class FBXElem:
                 write(_BLOCK_SENTINEL_DATA)
 
 
+def _write_timedate_hack_elem(elem):
+    if elem.id == b'FileId':
+        assert(elem.props_type[0] == b'R'[0])
+        assert(len(elem.props_type) == 1)
+        elem.props.clear()
+        elem.props_type.clear()
+
+        elem.add_bytes(_FILE_ID)
+        return True
+    elif elem.id == b'CreationTime':
+        assert(elem.props_type[0] == b'S'[0])
+        assert(len(elem.props_type) == 1)
+        elem.props.clear()
+        elem.props_type.clear()
+
+        elem.add_string(_TIME_ID)
+        return True
+    return False
+
+
 def _write_timedate_hack(elem_root):
     # perform 2 changes
     # - set the FileID
@@ -261,21 +342,7 @@ def _write_timedate_hack(elem_root):
 
     ok = 0
     for elem in elem_root.elems:
-        if elem.id == b'FileId':
-            assert(elem.props_type[0] == b'R'[0])
-            assert(len(elem.props_type) == 1)
-            elem.props.clear()
-            elem.props_type.clear()
-
-            elem.add_bytes(_FILE_ID)
-            ok += 1
-        elif elem.id == b'CreationTime':
-            assert(elem.props_type[0] == b'S'[0])
-            assert(len(elem.props_type) == 1)
-            elem.props.clear()
-            elem.props_type.clear()
-
-            elem.add_string(_TIME_ID)
+        if _write_timedate_hack_elem(elem):
             ok += 1
 
         if ok == 2:
@@ -285,6 +352,26 @@ def _write_timedate_hack(elem_root):
         print("Missing fields!")
 
 
+def _write_footer(write, tell, version):
+    write(_FOOT_ID)
+    write(b'\x00' * 4)
+
+    # padding for alignment (values between 1 & 16 observed)
+    # if already aligned to 16, add a full 16 bytes padding.
+    ofs = tell()
+    pad = ((ofs + 15) & ~15) - ofs
+    if pad == 0:
+        pad = 16
+
+    write(b'\0' * pad)
+
+    write(pack('<I', version))
+
+    # unknown magic (always the same)
+    write(b'\0' * 120)
+    write(b'\xf8\x5a\x8c\x6a\xde\xf5\xd9\x7e\xec\xe9\x0c\xe3\x75\x8f\x29\x0b')
+
+
 def write(fn, elem_root, version):
     assert(elem_root.id == b'')
 
@@ -302,20 +389,186 @@ def write(fn, elem_root, version):
         elem_root._calc_offsets_children(tell(), False)
         elem_root._write_children(write, tell, False)
 
-        write(_FOOT_ID)
-        write(b'\x00' * 4)
+        _write_footer(write, tell, version)
 
-        # padding for alignment (values between 1 & 16 observed)
-        # if already aligned to 16, add a full 16 bytes padding.
-        ofs = tell()
-        pad = ((ofs + 15) & ~15) - ofs
-        if pad == 0:
-            pad = 16
 
-        write(b'\0' * pad)
+class _StreamFrame:
+    __slots__ = (
+        "elem",
+        "head_offset",  # byte offset of the element header, to patch its end offset once closed.
+        "pending",  # last child (FBXElem, or closed _StreamFrame) not yet finalized, since we don't know yet if it is last.
+        "has_children",
+        )
+
+    def __init__(self, elem, head_offset):
+        self.elem = elem
+        self.head_offset = head_offset
+        self.pending = None
+        self.has_children = False
 
-        write(pack('<I', version))
 
-        # unknown magic (always the same)
-        write(b'\0' * 120)
-        write(b'\xf8\x5a\x8c\x6a\xde\xf5\xd9\x7e\xec\xe9\x0c\xe3\x75\x8f\x29\x0b')
+class StreamWriter:
+    """
+    Write an FBX binary file while its elements tree is being generated.
+
+    Children of the currently open element are written (and released) each time write_children() is called,
+    so only the elements not yet written have to be kept in memory. Elements opened with begin_elem() have their
+    header written immediately, their end offset is patched once they get closed with end_elem().
+
+    The file is written next to its destination and only replaces it once successfully closed, so that a failed
+    export does not leave an existing file truncated.
+
+    Typical usage::
+
+        with StreamWriter(fn, elem_root, version) as writer:
+            ...  # Add some children to elem_root.
+            writer.write_children(elem_root)
+            elem = elem_empty(elem_root, b"Objects")
+            writer.begin_elem(elem)
+            ...  # Add some children to elem.
+            writer.write_children(elem)
+            writer.end_elem(elem)
+    """
+    __slots__ = (
+        "_file",
+        "_fn",
+        "_tmp_fn",
+        "_version",
+        "_stack",
+        "_timedate_ok",
+        )
+
+    def __init__(self, fn, elem_root, version):
+        assert(elem_root.id == b'')
+
+        self._fn = fn
+        self._tmp_fn = fn + ".tmp"
+        self._file = open(self._tmp_fn, 'wb')
+        self._version = version
+        self._stack = [_StreamFrame(elem_root, None)]
+        self._timedate_ok = 0
+
+        self._file.write(_HEAD_MAGIC)
+        self._file.write(pack('<I', version))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def discard(self):
+        """
+        Close and remove the partially written file, leaving the destination untouched.
+        """
+        self._file.close()
+        if os.path.exists(self._tmp_fn):
+            os.remove(self._tmp_fn)
+
+    def _timedate_hack(self, elem):
+        if len(self._stack) == 1 and _write_timedate_hack_elem(elem):
+            self._timedate_ok += 1
+
+    def _flush_pending(self, frame, is_last):
+        pending = frame.pending
+        if pending is None:
+            return
+        frame.pending = None
+        f = self._file
+
+        if isinstance(pending, _StreamFrame):
+            # Already written element, only needs its optional sentinel and end offset.
+            elem = pending.elem
+            if not pending.has_children and (not elem.props or elem.id in _ELEMS_ID_ALWAYS_BLOCK_SENTINEL):
+                if not is_last:
+                    f.write(_BLOCK_SENTINEL_DATA)
+            end_offset = f.tell()
+            f.seek(pending.head_offset)
+            f.write(pack('<I', end_offset))
+            f.seek(end_offset)
+        else:
+            self._timedate_hack(pending)
+            pending._calc_offsets(f.tell(), is_last)
+            pending._write(f.write, f.tell, is_last)
+
+    def write_children(self, elem):
+        """
+        Write (and remove from elem) all children of given (open) element but the last one,
+        which is kept until we know whether it has any following sibling.
+        """
+        frame = self._stack[-1]
+        assert(frame.elem is elem)
+
+        children = elem.elems
+        if not children:
+            return
+        elem.elems = []
+        for child in children:
+            assert(child.id != b'')
+            self._flush_pending(frame, False)
+            frame.pending = child
+        frame.has_children = True
+
+    def begin_elem(self, elem):
+        """
+        Write the header of given element, which must be the last child of current open element.
+        Its children will be written by further calls to write_children(elem) and end_elem(elem).
+        """
+        frame = self._stack[-1]
+        parent = frame.elem
+        assert(parent.elems and parent.elems[-1] is elem)
+
+        parent.elems.pop()
+        self.write_children(parent)
+        self._flush_pending(frame, False)
+        frame.has_children = True
+
+        self._timedate_hack(elem)
+        f = self._file
+        head_offset = f.tell()
+        elem._calc_props_length()
+        elem._write_head(f.write, 0)  # End offset is patched in _flush_pending().
+        self._stack.append(_StreamFrame(elem, head_offset))
+
+    def end_elem(self, elem):
+        """
+        Write all remaining children of given (open) element, and close it.
+        """
+        frame = self._stack[-1]
+        assert(frame.elem is elem and len(self._stack) > 1)
+
+        self.write_children(elem)
+        self._flush_pending(frame, True)
+        if frame.has_children:
+            self._file.write(_BLOCK_SENTINEL_DATA)
+
+        self._stack.pop()
+        # We only know whether that element is the last one of its parent's children later on.
+        self._stack[-1].pending = frame
+
+    def close(self):
+        """
+        Write all remaining children of root element and the file footer, then move the file to its destination.
+        """
+        assert(len(self._stack) == 1)
+        frame = self._stack[0]
+        f = self._file
+
+        try:
+            self.write_children(frame.elem)
+            self._flush_pending(frame, True)
+            # Root element always ends with a sentinel (see write()).
+            f.write(_BLOCK_SENTINEL_DATA)
+
+            if self._timedate_ok != 2:
+                print("Missing fields!")
+
+            _write_footer(f.write, f.tell, self._version)
+            f.close()
+            os.replace(self._tmp_fn, self._fn)
+        except BaseException:
+            self.discard()
+            raise
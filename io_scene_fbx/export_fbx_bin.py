@@ -29,6 +29,8 @@ import time
 
 from itertools import zip_longest, chain
 
+import numpy as np
+
 if "bpy" in locals():
     import importlib
     if "encode_bin" in locals():
@@ -1725,7 +1727,11 @@ def fbx_data_animation_elements(root, scene_data):
     fps = scene.render.fps / scene.render.fps_base
 
     def keys_to_ktimes(keys):
-        return (int(v) for v in convert_sec_to_ktime_iter((f / fps for f, _v in keys)))
+        ktimes = convert_sec_to_ktime(keys[:, 0] / fps).astype(np.int64)
+        return array.array(data_types.ARRAY_INT64, ktimes.tobytes())
+
+    def keys_to_values(keys):
+        return array.array(data_types.ARRAY_FLOAT32, keys[:, 1].astype(np.float32).tobytes())
 
     # Animation stacks.
     for astack_key, alayers, alayer_key, name, f_start, f_end in animations:
@@ -1770,7 +1776,7 @@ def fbx_data_animation_elements(root, scene_data):
                                             def_value, animatable=True)
 
                     # Only create Animation curve if needed!
-                    if keys:
+                    if len(keys):
                         acurve = elem_data_single_int64(root, b"AnimationCurve", get_fbx_uuid_from_key(acurve_key))
                         acurve.add_string(fbx_name_class(b"", b"AnimCurve"))
                         acurve.add_string(b"")
@@ -1792,7 +1798,7 @@ def fbx_data_animation_elements(root, scene_data):
                         elem_data_single_float64(acurve, b"Default", def_value)
                         elem_data_single_int32(acurve, b"KeyVer", FBX_ANIM_KEY_VERSION)
                         elem_data_single_int64_array(acurve, b"KeyTime", keys_to_ktimes(keys))
-                        elem_data_single_float32_array(acurve, b"KeyValueFloat", (v for _f, v in keys))
+                        elem_data_single_float32_array(acurve, b"KeyValueFloat", keys_to_values(keys))
                         elem_data_single_int32_array(acurve, b"KeyAttrFlags", keyattr_flags)
                         elem_data_single_float32_array(acurve, b"KeyAttrDataFloat", keyattr_datafloat)
                         elem_data_single_int32_array(acurve, b"KeyAttrRefCount", (nbr_keys,))
@@ -1950,6 +1956,10 @@ def fbx_animations_do(scene_data, ref_id, f_start, f_end, start_zero, objects=No
     else:
         objects = scene_data.objects
 
+    perfmon = PerfMon()
+    perfmon.level_up()
+    perfmon.step("FBX export animation: preparing...")
+
     back_currframe = scene.frame_current
     animdata_ob = {}
     p_rots = {}
@@ -1985,36 +1995,77 @@ def fbx_animations_do(scene_data, ref_id, f_start, f_end, start_zero, objects=No
         acnode = AnimationCurveNodeWrapper(cam_key, 'CAMERA_FOCAL', force_key, force_sek, (cam.lens,))
         animdata_cameras[cam_key] = (acnode, cam)
 
+    # All sampled frames, and preallocated arrays for all sampled values.
+    frames = []
     currframe = f_start
     while currframe <= f_end:
-        real_currframe = currframe - f_start if start_zero else currframe
+        frames.append(currframe)
+        currframe += bake_step
+    nbr_frames = len(frames)
+    real_frames = np.array(frames, dtype=np.float64)
+    if start_zero:
+        real_frames -= f_start
+
+    ob_items = tuple(animdata_ob.items())
+    shape_items = tuple(animdata_shapes.values())
+    camera_items = tuple(animdata_cameras.values())
+    # loc, rot (radians), scale.
+    ob_values = np.empty((nbr_frames, len(ob_items), 9), dtype=np.float64)
+    shape_values = np.empty((nbr_frames, len(shape_items)), dtype=np.float64)
+    camera_values = np.empty((nbr_frames, len(camera_items)), dtype=np.float64)
+
+    perfmon.step("FBX export animation: baking %d frames of %d objects..." % (nbr_frames, len(ob_items)))
+
+    for frame_idx, currframe in enumerate(frames):
         scene.frame_set(int(currframe), subframe=currframe - int(currframe))
 
         for dp_obj in ob_obj.dupli_list_gen(depsgraph):
             pass  # Merely updating dupli matrix of ObjectWrapper...
-        for ob_obj, (anim_loc, anim_rot, anim_scale) in animdata_ob.items():
+        frame_ob_values = ob_values[frame_idx]
+        for ob_idx, (ob_obj, _anims) in enumerate(ob_items):
             # We compute baked loc/rot/scale for all objects (rot being euler-compat with previous value!).
             p_rot = p_rots.get(ob_obj, None)
             loc, rot, scale, _m, _mr = ob_obj.fbx_object_tx(scene_data, rot_euler_compat=p_rot)
             p_rots[ob_obj] = rot
-            anim_loc.add_keyframe(real_currframe, loc)
-            anim_rot.add_keyframe(real_currframe, tuple(convert_rad_to_deg_iter(rot)))
-            anim_scale.add_keyframe(real_currframe, scale)
-        for anim_shape, me, shape in animdata_shapes.values():
-            anim_shape.add_keyframe(real_currframe, (shape.value * 100.0,))
-        for anim_camera, camera in animdata_cameras.values():
-            anim_camera.add_keyframe(real_currframe, (camera.lens,))
-        currframe += bake_step
+            frame_ob_values[ob_idx] = (*loc, *rot, *scale)
+        frame_shape_values = shape_values[frame_idx]
+        for shape_idx, (_anim_shape, me, shape) in enumerate(shape_items):
+            frame_shape_values[shape_idx] = shape.value
+        frame_camera_values = camera_values[frame_idx]
+        for camera_idx, (_anim_camera, camera) in enumerate(camera_items):
+            frame_camera_values[camera_idx] = camera.lens
 
     scene.frame_set(back_currframe, subframe=0.0)
 
+    perfmon.step("FBX export animation: simplifying curves...")
+
+    ob_values[..., 3:6] *= convert_rad_to_deg(1.0)
+    shape_values *= 100.0
+    for ob_idx, (_ob_obj, (anim_loc, anim_rot, anim_scale)) in enumerate(ob_items):
+        anim_loc.set_keyframes(real_frames, ob_values[:, ob_idx, 0:3])
+        anim_rot.set_keyframes(real_frames, ob_values[:, ob_idx, 3:6])
+        anim_scale.set_keyframes(real_frames, ob_values[:, ob_idx, 6:9])
+    for shape_idx, (anim_shape, _me, _shape) in enumerate(shape_items):
+        anim_shape.set_keyframes(real_frames, shape_values[:, shape_idx:shape_idx + 1])
+    for camera_idx, (anim_camera, _camera) in enumerate(camera_items):
+        anim_camera.set_keyframes(real_frames, camera_values[:, camera_idx:camera_idx + 1])
+    del ob_values, shape_values, camera_values
+
+    # All curves are simplified together, much faster than one by one.
+    AnimationCurveNodeWrapper.simplify_all(
+        chain(chain.from_iterable(anims for anims in animdata_ob.values()),
+              (anim_shape for anim_shape, _me, _shape in shape_items),
+              (anim_camera for anim_camera, _camera in camera_items)),
+        simplify_fac, bake_step, force_keep)
+
+    perfmon.step("FBX export animation: generating curves data...")
+
     animations = {}
 
     # And now, produce final data (usable by FBX export code)
     # Objects-like loc/rot/scale...
     for ob_obj, anims in animdata_ob.items():
         for anim in anims:
-            anim.simplify(simplify_fac, bake_step, force_keep)
             if not anim:
                 continue
             for obj_key, group_key, group, fbx_group, fbx_gname in anim.get_final_data(scene, ref_id, force_keep):
@@ -2023,8 +2074,6 @@ def fbx_animations_do(scene_data, ref_id, f_start, f_end, start_zero, objects=No
 
     # And meshes' shape keys.
     for channel_key, (anim_shape, me, shape) in animdata_shapes.items():
-        final_keys = {}
-        anim_shape.simplify(simplify_fac, bake_step, force_keep)
         if not anim_shape:
             continue
         for elem_key, group_key, group, fbx_group, fbx_gname in anim_shape.get_final_data(scene, ref_id, force_keep):
@@ -2033,14 +2082,14 @@ def fbx_animations_do(scene_data, ref_id, f_start, f_end, start_zero, objects=No
 
     # And cameras' lens keys.
     for cam_key, (anim_camera, camera) in animdata_cameras.items():
-        final_keys = {}
-        anim_camera.simplify(simplify_fac, bake_step, force_keep)
         if not anim_camera:
             continue
         for elem_key, group_key, group, fbx_group, fbx_gname in anim_camera.get_final_data(scene, ref_id, force_keep):
             anim_data = animations.setdefault(elem_key, ("dummy_unused_key", {}))
             anim_data[1][fbx_group] = (group_key, group, fbx_gname)
 
+    perfmon.level_down()
+
     astack_key = get_blender_anim_stack_key(scene, ref_id)
     alayer_key = get_blender_anim_layer_key(scene, ref_id)
     name = (get_blenderID_name(ref_id) if ref_id else scene.name).encode()
@@ -2524,7 +2573,7 @@ def fbx_data_from_scene(scene, depsgraph, settings):
                 for _acnode_key, acnode, _acnode_name in alayer.values():
                     nbr_acnodes += 1
                     for _acurve_key, _dval, acurve, acurve_valid in acnode.values():
-                        if acurve:
+                        if len(acurve):
                             nbr_acurves += 1
 
         templates[b"AnimationStack"] = fbx_template_def_animstack(scene, settings, nbr_users=nbr_astacks)
@@ -2656,7 +2705,7 @@ def fbx_data_from_scene(scene, depsgraph, settings):
                 # Animcurvenode -> object property.
                 connections.append((b"OP", acurvenode_id, elem_id, fbx_prop.encode()))
                 for fbx_item, (acurve_key, default_value, acurve, acurve_valid) in acurves.items():
-                    if acurve:
+                    if len(acurve):
                         # Animcurve -> Animcurvenode.
                         connections.append((b"OP", get_fbx_uuid_from_key(acurve_key), acurvenode_id, fbx_item.encode()))
 
@@ -2863,28 +2912,39 @@ def fbx_definitions_elements(root, scene_data):
     fbx_templates_generate(definitions, scene_data.templates)
 
 
-def fbx_objects_elements(root, scene_data):
+def fbx_objects_elements(root, scene_data, writer=None):
     """
     Data (objects, geometry, material, textures, armatures, etc.).
+    If a stream writer is given, generated elements are written (and freed) as we go.
     """
     perfmon = PerfMon()
     perfmon.level_up()
     objects = elem_empty(root, b"Objects")
 
+    if writer is not None:
+        writer.begin_elem(objects)
+        write_children = writer.write_children
+    else:
+        def write_children(_elem):
+            pass
+
     perfmon.step("FBX export fetch empties (%d)..." % len(scene_data.data_empties))
 
     for empty in scene_data.data_empties:
         fbx_data_empty_elements(objects, empty, scene_data)
+        write_children(objects)
 
     perfmon.step("FBX export fetch lamps (%d)..." % len(scene_data.data_lights))
 
     for lamp in scene_data.data_lights:
         fbx_data_light_elements(objects, lamp, scene_data)
+        write_children(objects)
 
     perfmon.step("FBX export fetch cameras (%d)..." % len(scene_data.data_cameras))
 
     for cam in scene_data.data_cameras:
         fbx_data_camera_elements(objects, cam, scene_data)
+        write_children(objects)
 
     perfmon.step("FBX export fetch meshes (%d)..."
                  % len({me_key for me_key, _me, _free in scene_data.data_meshes.values()}))
@@ -2892,6 +2952,7 @@ def fbx_objects_elements(root, scene_data):
     done_meshes = set()
     for me_obj in scene_data.data_meshes:
         fbx_data_mesh_elements(objects, me_obj, scene_data, done_meshes)
+        write_children(objects)
     del done_meshes
 
     perfmon.step("FBX export fetch objects (%d)..." % len(scene_data.objects))
@@ -2900,10 +2961,12 @@ def fbx_objects_elements(root, scene_data):
         if ob_obj.is_dupli:
             continue
         fbx_data_object_elements(objects, ob_obj, scene_data)
+        write_children(objects)
         for dp_obj in ob_obj.dupli_list_gen(scene_data.depsgraph):
             if dp_obj not in scene_data.objects:
                 continue
             fbx_data_object_elements(objects, dp_obj, scene_data)
+            write_children(objects)
 
     perfmon.step("FBX export fetch remaining...")
 
@@ -2911,24 +2974,32 @@ def fbx_objects_elements(root, scene_data):
         if not (ob_obj.is_object and ob_obj.type == 'ARMATURE'):
             continue
         fbx_data_armature_elements(objects, ob_obj, scene_data)
+        write_children(objects)
 
     if scene_data.data_leaf_bones:
         fbx_data_leaf_bone_elements(objects, scene_data)
+        write_children(objects)
 
     for ma in scene_data.data_materials:
         fbx_data_material_elements(objects, ma, scene_data)
+        write_children(objects)
 
     for blender_tex_key in scene_data.data_textures:
         fbx_data_texture_file_elements(objects, blender_tex_key, scene_data)
+        write_children(objects)
 
     for vid in scene_data.data_videos:
         fbx_data_video_elements(objects, vid, scene_data)
+        write_children(objects)
 
     perfmon.step("FBX export fetch animations...")
     start_time = time.process_time()
 
     fbx_data_animation_elements(objects, scene_data)
 
+    if writer is not None:
+        writer.end_elem(objects)
+
     perfmon.level_down()
 
 
@@ -3000,6 +3071,8 @@ def save_single(operator, scene, depsgraph, filepath="",
                 use_custom_props=False,
                 bake_space_transform=False,
                 armature_nodetype='NULL',
+                compression_level=1,
+                compression_min_size=128,
                 **kwargs
                 ):
 
@@ -3080,31 +3153,38 @@ def save_single(operator, scene, depsgraph, filepath="",
 
     root = elem_empty(None, b"")  # Root element has no id, as it is not saved per se!
 
-    # Mostly FBXHeaderExtension and GlobalSettings.
-    fbx_header_elements(root, scene_data)
+    # Big arrays get compressed in worker threads while we keep generating data.
+    encode_bin.init_compression(compression_level, compression_min_size)
 
-    # Documents and References are pretty much void currently.
-    fbx_documents_elements(root, scene_data)
-    fbx_references_elements(root, scene_data)
+    # Elements are written to the file as soon as they are generated, instead of keeping the whole tree in memory.
+    try:
+        with encode_bin.StreamWriter(filepath, root, FBX_VERSION) as writer:
+            # Mostly FBXHeaderExtension and GlobalSettings.
+            fbx_header_elements(root, scene_data)
 
-    # Templates definitions.
-    fbx_definitions_elements(root, scene_data)
+            # Documents and References are pretty much void currently.
+            fbx_documents_elements(root, scene_data)
+            fbx_references_elements(root, scene_data)
 
-    # Actual data.
-    fbx_objects_elements(root, scene_data)
+            # Templates definitions.
+            fbx_definitions_elements(root, scene_data)
+            writer.write_children(root)
 
-    # How data are inter-connected.
-    fbx_connections_elements(root, scene_data)
+            # Actual data.
+            fbx_objects_elements(root, scene_data, writer)
 
-    # Animation.
-    fbx_takes_elements(root, scene_data)
+            # How data are inter-connected.
+            fbx_connections_elements(root, scene_data)
+            writer.write_children(root)
+
+            # Animation.
+            fbx_takes_elements(root, scene_data)
+    finally:
+        encode_bin.end_compression()
 
     # Cleanup!
     fbx_scene_data_cleanup(scene_data)
 
-    # And we are down, we can write the whole thing!
-    encode_bin.write(filepath, root, FBX_VERSION)
-
     # Clear cached ObjectWrappers!
     ObjectWrapper.cache_clear()
 
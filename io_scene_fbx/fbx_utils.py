@@ -28,6 +28,8 @@ from collections import namedtuple
 from collections.abc import Iterable
 from itertools import zip_longest, chain
 
+import numpy as np
+
 import bpy
 import bpy_extras
 from bpy.types import Object, Bone, PoseBone, DepsgraphObjectInstance
@@ -723,9 +725,10 @@ class AnimationCurveNodeWrapper:
     """
     This class provides a same common interface for all (FBX-wise) AnimationCurveNode and AnimationCurve elements,
     and easy API to handle those.
+    Sampled keyframes are stored as NumPy arrays (frames, and values/write flags of shape (frames, channels)).
     """
     __slots__ = (
-        'elem_keys', '_keys', 'default_values', 'fbx_group', 'fbx_gname', 'fbx_props',
+        'elem_keys', '_frames', '_values', '_write', 'default_values', 'fbx_group', 'fbx_gname', 'fbx_props',
         'force_keying', 'force_startend_keying')
 
     kinds = {
@@ -744,7 +747,9 @@ class AnimationCurveNodeWrapper:
         self.fbx_props = [self.kinds[kind][2]]
         self.force_keying = force_keying
         self.force_startend_keying = force_startend_keying
-        self._keys = []  # (frame, values, write_flags)
+        self._frames = None
+        self._values = None
+        self._write = None
         if default_values is not ...:
             assert(len(default_values) == len(self.fbx_props[0]))
             self.default_values = default_values
@@ -753,7 +758,7 @@ class AnimationCurveNodeWrapper:
 
     def __bool__(self):
         # We are 'True' if we do have some validated keyframes...
-        return bool(self._keys) and (True in ((True in k[2]) for k in self._keys))
+        return self._write is not None and bool(self._write.any())
 
     def add_group(self, elem_key, fbx_group, fbx_gname, fbx_props):
         """
@@ -766,83 +771,110 @@ class AnimationCurveNodeWrapper:
         self.fbx_gname.append(fbx_gname)
         self.fbx_props.append(fbx_props)
 
-    def add_keyframe(self, frame, values):
+    def set_keyframes(self, frames, values):
         """
-        Add a new keyframe to all curves of the group.
+        Set all sampled keyframes of all curves of the group at once,
+        values being an array of shape (len(frames), number of curves).
         """
-        assert(len(values) == len(self.fbx_props[0]))
-        self._keys.append((frame, values, [True] * len(values)))  # write everything by default.
+        values = np.asarray(values, dtype=np.float64)
+        assert(values.shape == (len(frames), len(self.fbx_props[0])))
+        self._frames = np.asarray(frames, dtype=np.float64)
+        self._values = values
+        self._write = np.ones(values.shape, dtype=bool)  # write everything by default.
 
-    def simplify(self, fac, step, force_keep=False):
+    @staticmethod
+    def _simplify_write_flags(values, fac):
         """
-        Simplifies sampled curves by only enabling samples when:
-            * their values relatively differ from the previous sample ones.
+        Compute which samples to write for each column of values (a (frames, curves) array), by only enabling
+        samples when their values relatively differ from the previous sample (or previous written) ones.
         """
-        if not self._keys:
-            return
-
-        if fac == 0.0:
-            return
-
         # So that, with default factor and step values (1), we get:
         min_reldiff_fac = fac * 1.0e-3  # min relative value evolution: 0.1% of current 'order of magnitude'.
         min_absdiff_fac = 0.1  # A tenth of reldiff...
-        keys = self._keys
-
-        p_currframe, p_key, p_key_write = keys[0]
-        p_keyed = list(p_key)
-        are_keyed = [False] * len(p_key)
-        for currframe, key, key_write in keys:
-            for idx, (val, p_val) in enumerate(zip(key, p_key)):
-                key_write[idx] = False
-                p_keyedval = p_keyed[idx]
-                if val == p_val:
-                    # Never write keyframe when value is exactly the same as prev one!
-                    continue
-                # This is contracted form of relative + absolute-near-zero difference:
-                #     absdiff = abs(a - b)
-                #     if absdiff < min_reldiff_fac * min_absdiff_fac:
-                #         return False
-                #     return (absdiff / ((abs(a) + abs(b)) / 2)) > min_reldiff_fac
-                # Note that we ignore the '/ 2' part here, since it's not much significant for us.
-                if abs(val - p_val) > (min_reldiff_fac * max(abs(val) + abs(p_val), min_absdiff_fac)):
-                    # If enough difference from previous sampled value, key this value *and* the previous one!
-                    key_write[idx] = True
-                    p_key_write[idx] = True
-                    p_keyed[idx] = val
-                    are_keyed[idx] = True
-                elif abs(val - p_keyedval) > (min_reldiff_fac * max((abs(val) + abs(p_keyedval)), min_absdiff_fac)):
-                    # Else, if enough difference from previous keyed value, key this value only!
-                    key_write[idx] = True
-                    p_keyed[idx] = val
-                    are_keyed[idx] = True
-            p_currframe, p_key, p_key_write = currframe, key, key_write
-
-        # If we write nothing (action doing nothing) and are in 'force_keep' mode, we key everything! :P
-        # See T41766.
-        # Also, it seems some importers (e.g. UE4) do not handle correctly armatures where some bones
-        # are not animated, but are children of animated ones, so added an option to systematically force writing
-        # one key in this case.
-        # See T41719, T41605, T41254...
-        if self.force_keying or (force_keep and not self):
-            are_keyed[:] = [True] * len(are_keyed)
-
-        # If we did key something, ensure first and last sampled values are keyed as well.
-        if self.force_startend_keying:
-            for idx, is_keyed in enumerate(are_keyed):
-                if is_keyed:
-                    keys[0][2][idx] = keys[-1][2][idx] = True
+
+        # This is contracted form of relative + absolute-near-zero difference:
+        #     absdiff = abs(a - b)
+        #     if absdiff < min_reldiff_fac * min_absdiff_fac:
+        #         return False
+        #     return (absdiff / ((abs(a) + abs(b)) / 2)) > min_reldiff_fac
+        # Note that we ignore the '/ 2' part here, since it's not much significant for us.
+        def differ(vals, p_vals):
+            return (np.abs(vals - p_vals) >
+                    (min_reldiff_fac * np.maximum(np.abs(vals) + np.abs(p_vals), min_absdiff_fac)))
+
+        # Never write keyframe when value is exactly the same as prev one!
+        changed = np.zeros(values.shape, dtype=bool)
+        changed[1:] = values[1:] != values[:-1]
+        # If enough difference from previous sampled value, key this value *and* the previous one!
+        # That check is independent from previous results, so it can be done for all samples at once.
+        key_prev = np.zeros(values.shape, dtype=bool)
+        key_prev[1:] = changed[1:] & differ(values[1:], values[:-1])
+
+        # Else, if enough difference from previous keyed value, key this value only!
+        # This one depends on previous keyed value, so we can only process all curves of a sample at once.
+        key_write = key_prev.copy()
+        p_keyed = values[0].copy()
+        for i in range(1, len(values)):
+            val = values[i]
+            write = key_write[i]  # A view, updated in place.
+            write |= changed[i] & differ(val, p_keyed)
+            np.copyto(p_keyed, val, where=write)
+        key_write[:-1] |= key_prev[1:]
+        return key_write
+
+    @classmethod
+    def simplify_all(cls, acnodes, fac, step, force_keep=False):
+        """
+        Same as simplify(), but for many wrappers at once (all their samples being processed as a single array,
+        which is much faster than doing it for each wrapper separately).
+        """
+        acnodes = [acnode for acnode in acnodes if acnode._write is not None and len(acnode._frames)]
+        if not acnodes or fac == 0.0:
+            return
+
+        # Wrappers with the same amount of samples can be processed together (usually all of them are).
+        by_len = {}
+        for acnode in acnodes:
+            by_len.setdefault(len(acnode._frames), []).append(acnode)
+        for group in by_len.values():
+            key_write = cls._simplify_write_flags(np.hstack([acnode._values for acnode in group]), fac)
+            col = 0
+            for acnode in group:
+                nbr_curves = acnode._values.shape[1]
+                acnode._write = key_write[:, col:col + nbr_curves]
+                col += nbr_curves
+
+        for acnode in acnodes:
+            are_keyed = acnode._write.any(axis=0)
+            # If we write nothing (action doing nothing) and are in 'force_keep' mode, we key everything! :P
+            # See T41766.
+            # Also, it seems some importers (e.g. UE4) do not handle correctly armatures where some bones
+            # are not animated, but are children of animated ones, so added an option to systematically force writing
+            # one key in this case.
+            # See T41719, T41605, T41254...
+            if acnode.force_keying or (force_keep and not acnode):
+                are_keyed[:] = True
+
+            # If we did key something, ensure first and last sampled values are keyed as well.
+            if acnode.force_startend_keying:
+                acnode._write[0] |= are_keyed
+                acnode._write[-1] |= are_keyed
+
+    def simplify(self, fac, step, force_keep=False):
+        """
+        Simplifies sampled curves by only enabling samples when:
+            * their values relatively differ from the previous sample ones.
+        """
+        self.simplify_all((self,), fac, step, force_keep)
 
     def get_final_data(self, scene, ref_id, force_keep=False):
         """
         Yield final anim data for this 'curvenode' (for all curvenodes defined).
         force_keep is to force to keep a curve even if it only has one valid keyframe.
+        Keyframes of each curve are given as a (keys, 2) array of (frame, value) items.
         """
-        curves = [[] for k in self._keys[0][1]]
-        for currframe, key, key_write in self._keys:
-            for curve, val, wrt in zip(curves, key, key_write):
-                if wrt:
-                    curve.append((currframe, val))
+        curves = [np.stack((self._frames[write], values[write]), axis=1)
+                  for values, write in zip(self._values.T, self._write.T)]
 
         force_keep = force_keep or self.force_keying
         for elem_key, fbx_group, fbx_gname, fbx_props in \
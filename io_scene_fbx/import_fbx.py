@@ -33,6 +33,7 @@ if "bpy" in locals():
         importlib.reload(fbx_utils)
 
 import bpy
+import numpy as np
 from mathutils import Matrix, Euler, Vector
 
 # -----
@@ -785,81 +786,75 @@ def blen_read_geom_layerinfo(fbx_layer):
         )
 
 
-def blen_read_geom_array_setattr(generator, blen_data, blen_attr, fbx_data, stride, item_size, descr, xform):
-    """Generic fbx_layer to blen_data setter, generator is expected to yield tuples (ble_idx, fbx_idx)."""
-    max_idx = len(blen_data) - 1
-    print_error = True
+def blen_read_geom_array_foreach_set(blen_data, blen_attr, item_size, blen_idx, values):
+    """Write values (a (len(blen_idx), item_size) array) to blen_data items at blen_idx, with a single foreach_set."""
+    if isinstance(blen_data, np.ndarray):
+        blen_data[blen_idx] = values.reshape(blen_data[blen_idx].shape)
+        return
 
-    def check_skip(blen_idx, fbx_idx):
-        nonlocal print_error
-        if fbx_idx < 0:  # Negative values mean 'skip'.
-            return True
-        if blen_idx > max_idx:
-            if print_error:
-                print("ERROR: too much data in this layer, compared to elements in mesh, skipping!")
-                print_error = False
-            return True
-        return False
+    if values.dtype.kind == 'f':
+        values = values.astype(np.float32, copy=False)
+    elif values.dtype.kind != 'b':
+        values = values.astype(np.int32, copy=False)
 
-    if xform is not None:
-        if isinstance(blen_data, list):
-            if item_size == 1:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    blen_data[blen_idx] = xform(fbx_data[fbx_idx])
-            else:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    blen_data[blen_idx] = xform(fbx_data[fbx_idx:fbx_idx + item_size])
-        else:
-            if item_size == 1:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    setattr(blen_data[blen_idx], blen_attr, xform(fbx_data[fbx_idx]))
-            else:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    setattr(blen_data[blen_idx], blen_attr, xform(fbx_data[fbx_idx:fbx_idx + item_size]))
+    blen_len = len(blen_data)
+    if len(blen_idx) == blen_len and (blen_idx == np.arange(blen_len)).all():
+        data = values
     else:
-        if isinstance(blen_data, list):
-            if item_size == 1:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    blen_data[blen_idx] = fbx_data[fbx_idx]
-            else:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    blen_data[blen_idx] = fbx_data[fbx_idx:fbx_idx + item_size]
-        else:
-            if item_size == 1:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    setattr(blen_data[blen_idx], blen_attr, fbx_data[fbx_idx])
-            else:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    setattr(blen_data[blen_idx], blen_attr, fbx_data[fbx_idx:fbx_idx + item_size])
+        # Keep current values of items not in blen_idx.
+        data = np.empty((blen_len, item_size), dtype=values.dtype)
+        blen_data.foreach_get(blen_attr, data.ravel())
+        data[blen_idx] = values.reshape(-1, item_size)
+    blen_data.foreach_set(blen_attr, np.ascontiguousarray(data).ravel())
+
+
+def blen_read_geom_array_setattr(indices, blen_data, blen_attr, fbx_data, stride, item_size, descr, xform):
+    """Generic fbx_layer to blen_data setter, indices are expected to be a pair of (blen_idx, fbx_idx) arrays."""
+    blen_idx, fbx_idx = indices
+    fbx_data = np.asarray(fbx_data)
+
+    # Negative values mean 'skip'.
+    valid = (fbx_idx >= 0) & (fbx_idx + item_size <= len(fbx_data))
+    too_much = blen_idx >= len(blen_data)
+    if (valid & too_much).any():
+        print("ERROR: too much data in this layer, compared to elements in mesh, skipping!")
+    valid &= ~too_much
+    if not valid.all():
+        blen_idx = blen_idx[valid]
+        fbx_idx = fbx_idx[valid]
+
+    if item_size == 1:
+        values = fbx_data[fbx_idx]
+    else:
+        values = fbx_data[fbx_idx[:, np.newaxis] + np.arange(item_size)]
 
-    for blen_idx, fbx_idx in generator:
-        if check_skip(blen_idx, fbx_idx):
-            continue
-        _process(blen_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx)
+    if xform is not None:
+        values = xform(values)
 
+    blen_read_geom_array_foreach_set(blen_data, blen_attr, item_size, blen_idx, values)
 
-# generic generators.
+
+# generic index generators, returning (blen_idx, fbx_idx) arrays.
 def blen_read_geom_array_gen_allsame(data_len):
-    return zip(*(range(data_len), (0,) * data_len))
+    return np.arange(data_len), np.zeros(data_len, dtype=np.int64)
 
 
 def blen_read_geom_array_gen_direct(fbx_data, stride):
-    fbx_data_len = len(fbx_data)
-    return zip(*(range(fbx_data_len // stride), range(0, fbx_data_len, stride)))
+    fbx_data_len = len(fbx_data) // stride
+    return np.arange(fbx_data_len), np.arange(0, fbx_data_len * stride, stride)
 
 
 def blen_read_geom_array_gen_indextodirect(fbx_layer_index, stride):
-    return ((bi, fi * stride) for bi, fi in enumerate(fbx_layer_index))
+    fbx_layer_index = np.asarray(fbx_layer_index, dtype=np.int64)
+    return np.arange(len(fbx_layer_index)), fbx_layer_index * stride
 
 
 def blen_read_geom_array_gen_direct_looptovert(mesh, fbx_data, stride):
     fbx_data_len = len(fbx_data) // stride
-    loops = mesh.loops
-    for p in mesh.polygons:
-        for lidx in p.loop_indices:
-            vidx = loops[lidx].vertex_index
-            if vidx < fbx_data_len:
-                yield lidx, vidx * stride
+    loops_vidx = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loops_vidx)
+    lidx = np.flatnonzero(loops_vidx < fbx_data_len)
+    return lidx, loops_vidx[lidx].astype(np.int64) * stride
 
 
 # generic error printers.
@@ -1131,7 +1126,7 @@ def blen_read_geom_layer_smooth(fbx_obj, mesh):
             fbx_layer_data, None,
             fbx_layer_mapping, fbx_layer_ref,
             1, 1, layer_id,
-            xform=lambda s: not s,
+            xform=np.logical_not,
             )
         # We only set sharp edges here, not face smoothing itself...
         mesh.use_auto_smooth = True
@@ -1150,8 +1145,6 @@ def blen_read_geom_layer_smooth(fbx_obj, mesh):
         return False
 
 def blen_read_geom_layer_edge_crease(fbx_obj, mesh):
-    from math import sqrt
-
     fbx_layer = elem_find_first(fbx_obj, b'LayerElementEdgeCrease')
 
     if fbx_layer is None:
@@ -1188,7 +1181,7 @@ def blen_read_geom_layer_edge_crease(fbx_obj, mesh):
             1, 1, layer_id,
             # Blender squares those values before sending them to OpenSubdiv, when other softwares don't,
             # so we need to compensate that to get similar results through FBX...
-            xform=sqrt,
+            xform=np.sqrt,
             )
     else:
         print("warning layer %r mapping type unsupported: %r" % (fbx_layer.id, fbx_layer_mapping))
@@ -1218,17 +1211,19 @@ def blen_read_geom_layer_normal(fbx_obj, mesh, xform=None):
              (mesh.polygons, "Polygons", True, blen_read_geom_array_mapped_polygon),
              (mesh.vertices, "Vertices", True, blen_read_geom_array_mapped_vert))
     for blen_data, blen_data_type, is_fake, func in tries:
-        bdata = [None] * len(blen_data) if is_fake else blen_data
+        bdata = np.zeros((len(blen_data), 3), dtype=np.float32) if is_fake else blen_data
         if func(mesh, bdata, "normal",
                 fbx_layer_data, fbx_layer_index, fbx_layer_mapping, fbx_layer_ref, 3, 3, layer_id, xform, True):
             if blen_data_type == "Polygons":
-                for pidx, p in enumerate(mesh.polygons):
-                    for lidx in range(p.loop_start, p.loop_start + p.loop_total):
-                        mesh.loops[lidx].normal[:] = bdata[pidx]
+                poly_loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+                mesh.polygons.foreach_get("loop_total", poly_loop_totals)
+                # Polygons' loops are contiguous and in polygons order.
+                mesh.loops.foreach_set("normal", np.repeat(bdata, poly_loop_totals, axis=0).ravel())
             elif blen_data_type == "Vertices":
-                # We have to copy vnors to lnors! Far from elegant, but simple.
-                for l in mesh.loops:
-                    l.normal[:] = bdata[l.vertex_index]
+                # We have to copy vnors to lnors!
+                loops_vidx = np.empty(len(mesh.loops), dtype=np.int32)
+                mesh.loops.foreach_get("vertex_index", loops_vidx)
+                mesh.loops.foreach_set("normal", bdata[loops_vidx].ravel())
             return True
 
     blen_read_geom_array_error_mapping("normal", fbx_layer_mapping)
@@ -1237,9 +1232,6 @@ def blen_read_geom_layer_normal(fbx_obj, mesh, xform=None):
 
 
 def blen_read_geom(fbx_tmpl, fbx_obj, settings):
-    from itertools import chain
-    import array
-
     # Vertices are in object space, but we are post-multiplying all transforms with the inverse of the
     # global matrix, so we need to apply the global matrix to the vertices to get the correct result.
     geom_mat_co = settings.global_matrix if settings.bake_space_transform else None
@@ -1257,11 +1249,9 @@ def blen_read_geom(fbx_tmpl, fbx_obj, settings):
     fbx_polys = elem_prop_first(elem_find_first(fbx_obj, b'PolygonVertexIndex'))
     fbx_edges = elem_prop_first(elem_find_first(fbx_obj, b'Edges'))
 
-    if geom_mat_co is not None:
-        def _vcos_transformed_gen(raw_cos, m=None):
-            # Note: we could most likely get much better performances with numpy, but will leave this as TODO for now.
-            return chain(*(m @ Vector(v) for v in zip(*(iter(raw_cos),) * 3)))
-        fbx_verts = array.array(fbx_verts.typecode, _vcos_transformed_gen(fbx_verts, geom_mat_co))
+    if geom_mat_co is not None and fbx_verts is not None:
+        m = np.array(geom_mat_co, dtype=np.float64)
+        fbx_verts = (np.asarray(fbx_verts).reshape(-1, 3) @ m[:3, :3].T + m[:3, 3]).ravel()
 
     if fbx_verts is None:
         fbx_verts = ()
@@ -1270,21 +1260,16 @@ def blen_read_geom(fbx_tmpl, fbx_obj, settings):
 
     mesh = bpy.data.meshes.new(name=elem_name_utf8)
     mesh.vertices.add(len(fbx_verts) // 3)
-    mesh.vertices.foreach_set("co", fbx_verts)
+    mesh.vertices.foreach_set("co", np.asarray(fbx_verts, dtype=np.float32))
 
     if fbx_polys:
-        mesh.loops.add(len(fbx_polys))
-        poly_loop_starts = []
-        poly_loop_totals = []
-        poly_loop_prev = 0
-        for i, l in enumerate(mesh.loops):
-            index = fbx_polys[i]
-            if index < 0:
-                poly_loop_starts.append(poly_loop_prev)
-                poly_loop_totals.append((i - poly_loop_prev) + 1)
-                poly_loop_prev = i + 1
-                index ^= -1
-            l.vertex_index = index
+        polys = np.asarray(fbx_polys)
+        mesh.loops.add(len(polys))
+        # Last index of each polygon is negative (bitwise-not of the actual vertex index).
+        poly_loop_ends = np.flatnonzero(polys < 0)
+        poly_loop_starts = np.concatenate(([0], poly_loop_ends + 1))[:-1].astype(np.int32)
+        poly_loop_totals = (poly_loop_ends + 1 - poly_loop_starts).astype(np.int32)
+        mesh.loops.foreach_set("vertex_index", np.where(polys < 0, ~polys, polys).astype(np.int32))
 
         mesh.polygons.add(len(poly_loop_starts))
         mesh.polygons.foreach_set("loop_start", poly_loop_starts)
@@ -1338,14 +1323,16 @@ def blen_read_geom(fbx_tmpl, fbx_obj, settings):
         if geom_mat_no is None:
             ok_normals = blen_read_geom_layer_normal(fbx_obj, mesh)
         else:
+            m = np.array(geom_mat_no.to_3x3(), dtype=np.float64)
+
             def nortrans(v):
-                return geom_mat_no @ Vector(v)
+                return v @ m.T
             ok_normals = blen_read_geom_layer_normal(fbx_obj, mesh, nortrans)
 
     mesh.validate(clean_customdata=False)  # *Very* important to not remove lnors here!
 
     if ok_normals:
-        clnors = array.array('f', [0.0] * (len(mesh.loops) * 3))
+        clnors = np.empty(len(mesh.loops) * 3, dtype=np.float32)
         mesh.loops.foreach_get("normal", clnors)
 
         if not ok_smooth:
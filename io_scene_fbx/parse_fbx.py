@@ -30,7 +30,9 @@ __all__ = (
 
 from struct import unpack
 import array
+import os
 import zlib
+from concurrent.futures import ThreadPoolExecutor
 
 from . import data_types
 
@@ -39,6 +41,14 @@ from . import data_types
 _BLOCK_SENTINEL_LENGTH = ...
 _BLOCK_SENTINEL_DATA = ...
 read_fbx_elem_uint = ...
+# Compressed arrays at least that big (in bytes) may be decompressed after the whole tree is read,
+# smaller ones are not worth it. None when all arrays are decompressed while reading.
+_ARRAY_DEFER_MIN_SIZE = None
+_ARRAY_DEFER_MIN_SIZE_DEFAULT = 1 << 14
+# Whether deferred arrays are decompressed on first access, instead of after reading the whole tree.
+_ARRAY_LAZY = False
+# Compressed arrays not decompressed yet, as (props, index) pairs.
+_deferred_arrays = []
 _IS_BIG_ENDIAN = (__import__("sys").byteorder != 'little')
 _HEAD_MAGIC = b'Kaydara FBX Binary\x20\x20\x00\x1a\x00'
 from collections import namedtuple
@@ -64,6 +74,63 @@ def read_string_ubyte(read):
     return data
 
 
+def _decode_array(data, length, array_type, array_stride, array_byteswap):
+    assert(length * array_stride == len(data))
+
+    data_array = array.array(array_type, data)
+    if array_byteswap and _IS_BIG_ENDIAN:
+        data_array.byteswap()
+    return data_array
+
+
+class _CompressedArray:
+    """
+    A compressed array property, not decompressed yet.
+    """
+    __slots__ = (
+        "data",
+        "length",
+        "array_type",
+        "array_stride",
+        "array_byteswap",
+        )
+
+    def __init__(self, data, length, array_type, array_stride, array_byteswap):
+        self.data = data
+        self.length = length
+        self.array_type = array_type
+        self.array_stride = array_stride
+        self.array_byteswap = array_byteswap
+
+    def decompress(self):
+        # Note: zlib releases the GIL, so this can run in parallel threads.
+        return _decode_array(zlib.decompress(self.data), self.length,
+                             self.array_type, self.array_stride, self.array_byteswap)
+
+
+class _LazyProps(list):
+    """
+    Element properties, decompressing array properties on first access.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self[i] for i in range(*key.indices(len(self)))]
+        value = list.__getitem__(self, key)
+        if value.__class__ is _CompressedArray:
+            value = value.decompress()
+            list.__setitem__(self, key, value)
+        return value
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self):
+        return repr(list(self))
+
+
 def unpack_array(read, array_type, array_stride, array_byteswap):
     length = read_uint(read)
     encoding = read_uint(read)
@@ -74,14 +141,11 @@ def unpack_array(read, array_type, array_stride, array_byteswap):
     if encoding == 0:
         pass
     elif encoding == 1:
+        if _ARRAY_DEFER_MIN_SIZE is not None and comp_len >= _ARRAY_DEFER_MIN_SIZE:
+            return _CompressedArray(data, length, array_type, array_stride, array_byteswap)
         data = zlib.decompress(data)
 
-    assert(length * array_stride == len(data))
-
-    data_array = array.array(array_type, data)
-    if array_byteswap and _IS_BIG_ENDIAN:
-        data_array.byteswap()
-    return data_array
+    return _decode_array(data, length, array_type, array_stride, array_byteswap)
 
 
 read_data_dict = {
@@ -141,6 +205,12 @@ def read_elem(read, tell, use_namedtuple):
         data_type = read(1)[0]
         elem_props_data[i] = read_data_dict[data_type](read)
         elem_props_type[i] = data_type
+        if elem_props_data[i].__class__ is _CompressedArray:
+            _deferred_arrays.append((elem_props_data, i))
+
+    if _ARRAY_LAZY and _deferred_arrays:
+        elem_props_data = _LazyProps(elem_props_data)
+        _deferred_arrays.clear()
 
     if tell() < end_offset:
         while tell() < (end_offset - _BLOCK_SENTINEL_LENGTH):
@@ -171,8 +241,36 @@ def parse_version(fn):
         return read_uint(read)
 
 
-def parse(fn, use_namedtuple=True):
+def _decompress_deferred_arrays(num_threads):
+    if num_threads is None:
+        num_threads = os.cpu_count() or 1
+    if num_threads <= 1:
+        for props, i in _deferred_arrays:
+            props[i] = props[i].decompress()
+        return
+
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        arrays = executor.map(lambda prop: prop[0][prop[1]].decompress(), _deferred_arrays)
+        for (props, i), data_array in zip(_deferred_arrays, arrays):
+            props[i] = data_array
+
+
+def parse(fn, use_namedtuple=True, array_decompression='THREADS', num_threads=None):
+    """
+    Parse a binary FBX file, return the root element and the FBX version.
+
+    array_decompression
+        How compressed array properties are decompressed:
+        - 'INLINE': while reading the file,
+        - 'THREADS': all at once after reading the file, in *num_threads* threads,
+        - 'LAZY': on first access of the property.
+    """
+    global _ARRAY_DEFER_MIN_SIZE, _ARRAY_LAZY
+
     root_elems = []
+    _deferred_arrays.clear()
+    _ARRAY_DEFER_MIN_SIZE = None if array_decompression == 'INLINE' else _ARRAY_DEFER_MIN_SIZE_DEFAULT
+    _ARRAY_LAZY = (array_decompression == 'LAZY')
 
     with open(fn, 'rb') as f:
         read = f.read
@@ -190,5 +288,11 @@ def parse(fn, use_namedtuple=True):
                 break
             root_elems.append(elem)
 
+    try:
+        if _deferred_arrays:
+            _decompress_deferred_arrays(num_threads)
+    finally:
+        _deferred_arrays.clear()
+
     args = (b'', [], bytearray(0), root_elems)
     return FBXElem(*args) if use_namedtuple else args, fbx_version
@@ -0,0 +1,71 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+"""
+Usage
+=====
+
+   blender -b --factory-startup --python parse_fbx_benchmark.py -- [FILES]...
+
+Time the parsing of each binary FBX file given (e.g. the files used with
+fbx2json), with each way of decompressing array properties:
+
+* 'INLINE': while reading the file (previous behavior),
+* 'THREADS': in a thread pool, once the file is read,
+* 'LAZY': on first access (timed once for the parsing alone, and once
+  accessing all properties afterwards).
+"""
+
+
+def _access_all(elem):
+    for prop in elem.props:
+        pass
+    for sub_elem in elem.elems:
+        _access_all(sub_elem)
+
+
+def bench(fn, repeat=3):
+    import os
+    import time
+    from io_scene_fbx import parse_fbx
+
+    print("%s (%.1f MiB):" % (fn, os.path.getsize(fn) / (1 << 20)))
+    for array_decompression, access in (('INLINE', False), ('THREADS', False), ('LAZY', False), ('LAZY', True)):
+        timings = []
+        for i in range(repeat):
+            t = time.perf_counter()
+            elem_root, _version = parse_fbx.parse(fn, array_decompression=array_decompression)
+            if access:
+                _access_all(elem_root)
+            timings.append(time.perf_counter() - t)
+            del elem_root
+        print("    %-8s%-13s %8.3f sec (best of %d)" % (
+            array_decompression, " + access" if access else "", min(timings), repeat))
+
+
+def main():
+    import sys
+
+    for arg in sys.argv[sys.argv.index('--') + 1 if '--' in sys.argv else 1:]:
+        bench(arg)
+
+
+if __name__ == '__main__':
+    main()
@@ -15,7 +15,7 @@
 bl_info = {
     'name': 'glTF 2.0 format',
     'author': 'Julien Duroure, Scurest, Norbert Nopper, Urs Hanselmann, Moritz Becher, Benjamin Schmithüsen, Jim Eckerlein, and many external contributors',
-    "version": (1, 7, 7),
+    "version": (1, 7, 12),
     'blender': (2, 91, 0),
     'location': 'File > Import-Export',
     'description': 'Import-Export as glTF 2.0',
@@ -279,6 +279,27 @@ class ExportGLTF2_Base:
         default=False,
     )
 
+    export_extract_threads: IntProperty(
+        name='Extraction Threads',
+        description=(
+            'Number of threads building mesh primitives while the scene is gathered '
+            '(0 = one per CPU, 1 = build them one after the other)'
+        ),
+        default=0,
+        min=0,
+        max=64
+    )
+
+    export_cache_directory: StringProperty(
+        name='Cache Directory',
+        description=(
+            'Folder keeping extracted meshes and encoded images between exports, '
+            'reused as long as they do not change. Leave empty to disable'
+        ),
+        default='',
+        subtype='DIR_PATH'
+    )
+
     export_cameras: BoolProperty(
         name='Cameras',
         description='Export cameras',
@@ -526,6 +547,8 @@ class ExportGLTF2_Base:
         export_settings['gltf_tangents'] = self.export_tangents and self.export_normals
         export_settings['gltf_loose_edges'] = self.use_mesh_edges
         export_settings['gltf_loose_points'] = self.use_mesh_vertices
+        export_settings['gltf_extract_threads'] = self.export_extract_threads
+        export_settings['gltf_cache_directory'] = bpy.path.abspath(self.export_cache_directory)
 
         if self.is_draco_available:
             export_settings['gltf_draco_mesh_compression'] = self.export_draco_mesh_compression_enable
@@ -655,6 +678,7 @@ class GLTF_PT_export_main(bpy.types.Panel):
         if operator.export_format == 'GLTF_SEPARATE':
             layout.prop(operator, 'export_texture_dir', icon='FILE_FOLDER')
         layout.prop(operator, 'export_copyright')
+        layout.prop(operator, 'export_cache_directory')
         layout.prop(operator, 'will_save_settings')
 
 
@@ -751,6 +775,8 @@ class GLTF_PT_export_geometry(bpy.types.Panel):
         col.prop(operator, 'use_mesh_edges')
         col.prop(operator, 'use_mesh_vertices')
 
+        layout.prop(operator, 'export_extract_threads')
+
         layout.prop(operator, 'export_materials')
         col = layout.column()
         col.active = operator.export_materials == "EXPORT"
@@ -1034,6 +1060,26 @@ class ImportGLTF2(Operator, ImportHelper):
         default=True,
     )
 
+    import_use_mmap: BoolProperty(
+        name='Memory-Map Buffers',
+        description=(
+            'Map .glb and .bin files in memory instead of reading them, '
+            'reduces memory usage when importing very large files'
+        ),
+        default=False,
+    )
+
+    import_accessor_cache_size: IntProperty(
+        name='Accessor Cache Size',
+        description=(
+            'Maximum memory used to keep decoded vertex data shared between primitives (in MB), '
+            'least recently used data is discarded first'
+        ),
+        default=1024,
+        min=0,
+        subtype='UNSIGNED',
+    )
+
     def draw(self, context):
         layout = self.layout
 
@@ -1045,6 +1091,8 @@ class ImportGLTF2(Operator, ImportHelper):
         layout.prop(self, 'import_shading')
         layout.prop(self, 'guess_original_bind_pose')
         layout.prop(self, 'bone_heuristic')
+        layout.prop(self, 'import_use_mmap')
+        layout.prop(self, 'import_accessor_cache_size')
 
     def execute(self, context):
         return self.import_gltf2(context)
@@ -1073,6 +1121,7 @@ class ImportGLTF2(Operator, ImportHelper):
         from .io.imp.gltf2_io_gltf import glTFImporter, ImportError
         from .blender.imp.gltf2_blender_gltf import BlenderGlTF
 
+        gltf_importer = None
         try:
             gltf_importer = glTFImporter(filename, import_settings)
             gltf_importer.read()
@@ -1093,6 +1142,11 @@ class ImportGLTF2(Operator, ImportHelper):
             self.report({'ERROR'}, e.args[0])
             return {'CANCELLED'}
 
+        finally:
+            # Unlock the memory-mapped files (.glb, .bin)
+            if gltf_importer is not None:
+                gltf_importer.close()
+
     def set_debug_log(self):
         import logging
         if bpy.app.debug_value == 0:
@@ -20,9 +20,12 @@ import traceback
 from io_scene_gltf2.blender.com import gltf2_blender_json
 from io_scene_gltf2.blender.exp import gltf2_blender_export_keys
 from io_scene_gltf2.blender.exp import gltf2_blender_gather
+from io_scene_gltf2.blender.exp import gltf2_blender_gather_cache
+from io_scene_gltf2.blender.exp import gltf2_blender_gather_primitives
 from io_scene_gltf2.blender.exp.gltf2_blender_gltf2_exporter import GlTF2Exporter
-from io_scene_gltf2.io.com.gltf2_io_debug import print_console, print_newline
+from io_scene_gltf2.io.com.gltf2_io_debug import print_console, print_newline, profile_stages_end
 from io_scene_gltf2.io.exp import gltf2_io_export
+from io_scene_gltf2.io.exp.gltf2_io_export_cache import ExportCache
 from io_scene_gltf2.io.exp import gltf2_io_draco_compression_extension
 from io_scene_gltf2.io.exp.gltf2_io_user_extensions import export_user_extensions
 
@@ -59,6 +62,10 @@ def save(context, export_settings):
 
 
 def __export(export_settings):
+    gltf2_blender_gather_cache.reset_cache_stats()
+    export_settings['gltf_export_cache'] = None
+    if export_settings.get('gltf_cache_directory'):
+        export_settings['gltf_export_cache'] = ExportCache(export_settings['gltf_cache_directory'])
     exporter = GlTF2Exporter(export_settings)
     __gather_gltf(exporter, export_settings)
     buffer = __create_buffer(exporter, export_settings)
@@ -68,11 +75,38 @@ def __export(export_settings):
     export_user_extensions('gather_gltf_hook', export_settings, exporter.glTF)
     exporter.traverse_extensions()
 
+    __print_stats(exporter, export_settings)
+
     return json, buffer
 
 
+def __print_stats(exporter, export_settings):
+    hits = misses = 0
+    for name, (func_hits, func_misses) in sorted(gltf2_blender_gather_cache.get_cache_stats().items()):
+        print_console('DEBUG', "Cache {}: {} hits, {} misses".format(name, func_hits, func_misses))
+        hits += func_hits
+        misses += func_misses
+    print_console('INFO', "Gather cache: {} hits, {} misses".format(hits, misses))
+
+    view_hits, view_misses, saved_byte_length, accessor_hits = exporter.dedup_stats
+    print_console('INFO', "Buffer views: {} written, {} deduplicated ({} bytes saved), {} shared accessors".format(
+        view_misses, view_hits, saved_byte_length, accessor_hits))
+
+    if export_settings['gltf_export_cache'] is not None:
+        for kind, (kind_hits, kind_misses) in sorted(export_settings['gltf_export_cache'].stats.items()):
+            print_console('INFO', "Export cache {}: {} hits, {} misses ({:.0%} hit rate)".format(
+                kind, kind_hits, kind_misses, kind_hits / (kind_hits + kind_misses)))
+
+
 def __gather_gltf(exporter, export_settings):
-    active_scene_idx, scenes, animations = gltf2_blender_gather.gather_gltf2(export_settings)
+    # Mesh primitives are built in worker threads while the scene is gathered, and filled in before use
+    gltf2_blender_gather_primitives.begin_deferred_extraction(export_settings)
+    try:
+        active_scene_idx, scenes, animations = gltf2_blender_gather.gather_gltf2(export_settings)
+        gltf2_blender_gather_primitives.resolve_deferred_primitives(export_settings)
+    finally:
+        gltf2_blender_gather_primitives.end_deferred_extraction()
+    profile_stages_end('primitives extraction')
 
     if export_settings['gltf_draco_mesh_compression']:
         gltf2_io_draco_compression_extension.encode_scene_primitives(scenes, export_settings)
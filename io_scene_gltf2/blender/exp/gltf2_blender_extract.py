@@ -12,17 +12,32 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
+
 import numpy as np
 from mathutils import Vector
 
 from . import gltf2_blender_export_keys
-from ...io.com.gltf2_io_debug import print_console
+from ...io.com.gltf2_io_debug import print_console, profile_stage
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_skins
 
 
 def extract_primitives(glTF, blender_mesh, library, blender_object, blender_vertex_groups, modifiers, export_settings):
     """Extract primitives from a mesh."""
+    snapshot = snapshot_primitives(
+        glTF, blender_mesh, library, blender_object, blender_vertex_groups, modifiers, export_settings)
+    return build_primitives(snapshot)
+
+
+def snapshot_primitives(glTF, blender_mesh, library, blender_object, blender_vertex_groups, modifiers, export_settings):
+    """
+    Copy out of Blender all the data the primitives of a mesh are built from.
+
+    This is the only part of the extraction accessing Blender data, so it must run on the main thread.
+    The snapshot only holds NumPy arrays and plain values, build_primitives() can be run on it from any thread.
+    """
     print_console('INFO', 'Extracting primitive: ' + blender_mesh.name)
+    start_time = time.perf_counter()
 
     use_normals = export_settings[gltf2_blender_export_keys.NORMALS]
     if use_normals:
@@ -85,11 +100,118 @@ def extract_primitives(glTF, blender_mesh, library, blender_object, blender_vert
 
     use_materials = export_settings[gltf2_blender_export_keys.MATERIALS]
 
+    snapshot = {
+        'name': blender_mesh.name,
+        'use_normals': use_normals,
+        'use_tangents': use_tangents,
+        'use_morph_normals': use_morph_normals,
+        'use_morph_tangents': use_morph_tangents,
+        'num_morphs': len(key_blocks),
+        'vert_joints': None,
+        'vert_weights': None,
+        'normals': None,
+        'morph_normals': [],
+        'tangents': None,
+        'bitangent_signs': None,
+    }
+
     # Fetch vert positions and bone data (joint,weights)
 
-    locs, morph_locs = __get_positions(blender_mesh, key_blocks, armature, blender_object, export_settings)
+    snapshot['locs'], snapshot['morph_locs'] = __get_positions(
+        blender_mesh, key_blocks, armature, blender_object, export_settings)
     if skin:
-        vert_bones, num_joint_sets = __get_bone_data(blender_mesh, skin, blender_vertex_groups)
+        snapshot['vert_joints'], snapshot['vert_weights'] = __get_bone_data(blender_mesh, skin, blender_vertex_groups)
+
+    # Fetch all the per-loop data, the dots are built from it in build_primitives()
+
+    vidxs = np.empty(len(blender_mesh.loops), dtype=np.uint32)
+    blender_mesh.loops.foreach_get('vertex_index', vidxs)
+    snapshot['vertex_index'] = vidxs
+
+    if use_normals:
+        kbs = key_blocks if use_morph_normals else []
+        snapshot['normals'], snapshot['morph_normals'] = __get_normals(
+            blender_mesh, kbs, armature, blender_object, export_settings
+        )
+
+    if use_tangents:
+        snapshot['tangents'] = __get_tangents(blender_mesh, armature, blender_object, export_settings)
+        snapshot['bitangent_signs'] = __get_bitangent_signs(blender_mesh, armature, blender_object, export_settings)
+
+    snapshot['uvs'] = [__get_uvs(blender_mesh, uv_i) for uv_i in range(tex_coord_max)]
+    snapshot['colors'] = [__get_colors(blender_mesh, col_i) for col_i in range(color_max)]
+
+    # Calculate triangles, they are sorted into primitives by material in build_primitives()
+
+    blender_mesh.calc_loop_triangles()
+    loop_indices = np.empty(len(blender_mesh.loop_triangles) * 3, dtype=np.uint32)
+    blender_mesh.loop_triangles.foreach_get('loops', loop_indices)
+    snapshot['loop_indices'] = loop_indices
+
+    if use_materials == "NONE": # Only for None. For placeholder and export, keep primitives
+        # Put all vertices into one primitive
+        snapshot['loop_material_idxs'] = None
+        material_idxs = [-1] if len(loop_indices) else []
+    else:
+        tri_material_idxs = np.empty(len(blender_mesh.loop_triangles), dtype=np.uint32)
+        blender_mesh.loop_triangles.foreach_get('material_index', tri_material_idxs)
+        snapshot['loop_material_idxs'] = np.repeat(tri_material_idxs, 3)  # material index for every loop
+        material_idxs = list(np.unique(tri_material_idxs))
+
+    # Loose geometry
+
+    snapshot['loose_edge_idxs'] = None
+    if export_settings['gltf_loose_edges']:
+        # Find loose edges
+        loose_edges = [e for e in blender_mesh.edges if e.is_loose]
+        blender_idxs = [vi for e in loose_edges for vi in e.vertices]
+        if blender_idxs:
+            snapshot['loose_edge_idxs'] = np.array(blender_idxs, dtype=np.uint32)
+
+    snapshot['loose_point_idxs'] = None
+    if export_settings['gltf_loose_points']:
+        # Find loose points
+        verts_in_edge = set(vi for e in blender_mesh.edges for vi in e.vertices)
+        blender_idxs = [
+            vi for vi, _ in enumerate(blender_mesh.vertices)
+            if vi not in verts_in_edge
+        ]
+        if blender_idxs:
+            snapshot['loose_point_idxs'] = np.array(blender_idxs, dtype=np.uint32)
+
+    # The (material, mode) of every primitive build_primitives() is going to return, in order
+    layout = [(material_idx, None) for material_idx in material_idxs]
+    if snapshot['loose_edge_idxs'] is not None:
+        layout.append((0, 1))  # LINES
+    if snapshot['loose_point_idxs'] is not None:
+        layout.append((0, 0))  # POINTS
+    snapshot['layout'] = layout
+
+    profile_stage('snapshot', time.perf_counter() - start_time)
+
+    return snapshot
+
+
+def build_primitives(snapshot):
+    """
+    Build the primitives of a mesh from its snapshot.
+
+    Only works on the NumPy arrays of the snapshot and never touches Blender data, so it is safe to
+    call from worker threads.
+    """
+    start_time = time.perf_counter()
+
+    use_normals = snapshot['use_normals']
+    use_tangents = snapshot['use_tangents']
+    use_morph_normals = snapshot['use_morph_normals']
+    use_morph_tangents = snapshot['use_morph_tangents']
+    num_morphs = snapshot['num_morphs']
+    tex_coord_max = len(snapshot['uvs'])
+    color_max = len(snapshot['colors'])
+    locs = snapshot['locs']
+    morph_locs = snapshot['morph_locs']
+    vert_joints = snapshot['vert_joints']
+    vert_weights = snapshot['vert_weights']
 
     # In Blender there is both per-vert data, like position, and also per-loop
     # (loop=corner-of-poly) data, like normals or UVs. glTF only has per-vert
@@ -118,81 +240,58 @@ def extract_primitives(glTF, blender_mesh, library, blender_object, blender_vert
             ('color%da' % col_i, np.float32),
         ]
     if use_morph_normals:
-        for morph_i, _ in enumerate(key_blocks):
+        for morph_i in range(num_morphs):
             dot_fields += [
                 ('morph%dnx' % morph_i, np.float32),
                 ('morph%dny' % morph_i, np.float32),
                 ('morph%dnz' % morph_i, np.float32),
             ]
 
-    dots = np.empty(len(blender_mesh.loops), dtype=np.dtype(dot_fields))
+    dots = np.empty(len(snapshot['vertex_index']), dtype=np.dtype(dot_fields))
 
-    vidxs = np.empty(len(blender_mesh.loops))
-    blender_mesh.loops.foreach_get('vertex_index', vidxs)
-    dots['vertex_index'] = vidxs
-    del vidxs
+    dots['vertex_index'] = snapshot['vertex_index']
 
     if use_normals:
-        kbs = key_blocks if use_morph_normals else []
-        normals, morph_normals = __get_normals(
-            blender_mesh, kbs, armature, blender_object, export_settings
-        )
+        normals = snapshot['normals']
         dots['nx'] = normals[:, 0]
         dots['ny'] = normals[:, 1]
         dots['nz'] = normals[:, 2]
-        del normals
-        for morph_i, ns in enumerate(morph_normals):
+        for morph_i, ns in enumerate(snapshot['morph_normals']):
             dots['morph%dnx' % morph_i] = ns[:, 0]
             dots['morph%dny' % morph_i] = ns[:, 1]
             dots['morph%dnz' % morph_i] = ns[:, 2]
-        del morph_normals
 
     if use_tangents:
-        tangents = __get_tangents(blender_mesh, armature, blender_object, export_settings)
+        tangents = snapshot['tangents']
         dots['tx'] = tangents[:, 0]
         dots['ty'] = tangents[:, 1]
         dots['tz'] = tangents[:, 2]
-        del tangents
-        signs = __get_bitangent_signs(blender_mesh, armature, blender_object, export_settings)
-        dots['tw'] = signs
-        del signs
+        dots['tw'] = snapshot['bitangent_signs']
 
-    for uv_i in range(tex_coord_max):
-        uvs = __get_uvs(blender_mesh, uv_i)
+    for uv_i, uvs in enumerate(snapshot['uvs']):
         dots['uv%dx' % uv_i] = uvs[:, 0]
         dots['uv%dy' % uv_i] = uvs[:, 1]
-        del uvs
 
-    for col_i in range(color_max):
-        colors = __get_colors(blender_mesh, col_i)
+    for col_i, colors in enumerate(snapshot['colors']):
         dots['color%dr' % col_i] = colors[:, 0]
         dots['color%dg' % col_i] = colors[:, 1]
         dots['color%db' % col_i] = colors[:, 2]
         dots['color%da' % col_i] = colors[:, 3]
-        del colors
 
-    # Calculate triangles and sort them into primitives.
+    # Sort triangles into primitives.
 
-    blender_mesh.calc_loop_triangles()
-    loop_indices = np.empty(len(blender_mesh.loop_triangles) * 3, dtype=np.uint32)
-    blender_mesh.loop_triangles.foreach_get('loops', loop_indices)
+    loop_indices = snapshot['loop_indices']
+    loop_material_idxs = snapshot['loop_material_idxs']
 
     prim_indices = {}  # maps material index to TRIANGLES-style indices into dots
 
-    if use_materials == "NONE": # Only for None. For placeholder and export, keep primitives
-        # Put all vertices into one primitive
-        prim_indices[-1] = loop_indices
-
-    else:
-        # Bucket by material index.
-
-        tri_material_idxs = np.empty(len(blender_mesh.loop_triangles), dtype=np.uint32)
-        blender_mesh.loop_triangles.foreach_get('material_index', tri_material_idxs)
-        loop_material_idxs = np.repeat(tri_material_idxs, 3)  # material index for every loop
-        unique_material_idxs = np.unique(tri_material_idxs)
-        del tri_material_idxs
-
-        for material_idx in unique_material_idxs:
+    for material_idx, mode in snapshot['layout']:
+        if mode is not None:
+            continue
+        if loop_material_idxs is None:
+            prim_indices[material_idx] = loop_indices
+        else:
+            # Bucket by material index.
             prim_indices[material_idx] = loop_indices[loop_material_idxs == material_idx]
 
     # Create all the primitives.
@@ -202,12 +301,10 @@ def extract_primitives(glTF, blender_mesh, library, blender_object, blender_vert
     for material_idx, dot_indices in prim_indices.items():
         # Extract just dots used by this primitive, deduplicate them, and
         # calculate indices into this deduplicated list.
+        # (The snapshot layout only lists non empty primitives.)
         prim_dots = dots[dot_indices]
         prim_dots, indices = np.unique(prim_dots, return_inverse=True)
 
-        if len(prim_dots) == 0:
-            continue
-
         # Now just move all the data for prim_dots into attribute arrays
 
         attributes = {}
@@ -235,7 +332,7 @@ def extract_primitives(glTF, blender_mesh, library, blender_object, blender_vert
             attributes['TANGENT'] = tangents
 
         if use_morph_normals:
-            for morph_i, _ in enumerate(key_blocks):
+            for morph_i in range(num_morphs):
                 ns = np.empty((len(prim_dots), 3), dtype=np.float32)
                 ns[:, 0] = prim_dots['morph%dnx' % morph_i]
                 ns[:, 1] = prim_dots['morph%dny' % morph_i]
@@ -259,23 +356,8 @@ def extract_primitives(glTF, blender_mesh, library, blender_object, blender_vert
             colors[:, 3] = prim_dots['color%da' % color_i]
             attributes['COLOR_%d' % color_i] = colors
 
-        if skin:
-            joints = [[] for _ in range(num_joint_sets)]
-            weights = [[] for _ in range(num_joint_sets)]
-
-            for vi in blender_idxs:
-                bones = vert_bones[vi]
-                for j in range(0, 4 * num_joint_sets):
-                    if j < len(bones):
-                        joint, weight = bones[j]
-                    else:
-                        joint, weight = 0, 0.0
-                    joints[j//4].append(joint)
-                    weights[j//4].append(weight)
-
-            for i, (js, ws) in enumerate(zip(joints, weights)):
-                attributes['JOINTS_%d' % i] = js
-                attributes['WEIGHTS_%d' % i] = ws
+        if vert_joints is not None:
+            __set_joints_and_weights(attributes, blender_idxs, vert_joints, vert_weights)
 
         primitives.append({
             'attributes': attributes,
@@ -283,95 +365,61 @@ def extract_primitives(glTF, blender_mesh, library, blender_object, blender_vert
             'material': material_idx,
         })
 
-    if export_settings['gltf_loose_edges']:
-        # Find loose edges
-        loose_edges = [e for e in blender_mesh.edges if e.is_loose]
-        blender_idxs = [vi for e in loose_edges for vi in e.vertices]
+    if snapshot['loose_edge_idxs'] is not None:
+        # Export one glTF vert per unique Blender vert in a loose edge
+        blender_idxs, indices = np.unique(snapshot['loose_edge_idxs'], return_inverse=True)
 
-        if blender_idxs:
-            # Export one glTF vert per unique Blender vert in a loose edge
-            blender_idxs = np.array(blender_idxs, dtype=np.uint32)
-            blender_idxs, indices = np.unique(blender_idxs, return_inverse=True)
-
-            attributes = {}
-
-            attributes['POSITION'] = locs[blender_idxs]
-
-            for morph_i, vs in enumerate(morph_locs):
-                attributes['MORPH_POSITION_%d' % morph_i] = vs[blender_idxs]
-
-            if skin:
-                joints = [[] for _ in range(num_joint_sets)]
-                weights = [[] for _ in range(num_joint_sets)]
-
-                for vi in blender_idxs:
-                    bones = vert_bones[vi]
-                    for j in range(0, 4 * num_joint_sets):
-                        if j < len(bones):
-                            joint, weight = bones[j]
-                        else:
-                            joint, weight = 0, 0.0
-                        joints[j//4].append(joint)
-                        weights[j//4].append(weight)
-
-                for i, (js, ws) in enumerate(zip(joints, weights)):
-                    attributes['JOINTS_%d' % i] = js
-                    attributes['WEIGHTS_%d' % i] = ws
-
-            primitives.append({
-                'attributes': attributes,
-                'indices': indices,
-                'mode': 1,  # LINES
-                'material': 0,
-            })
+        attributes = {}
 
-    if export_settings['gltf_loose_points']:
-        # Find loose points
-        verts_in_edge = set(vi for e in blender_mesh.edges for vi in e.vertices)
-        blender_idxs = [
-            vi for vi, _ in enumerate(blender_mesh.vertices)
-            if vi not in verts_in_edge
-        ]
+        attributes['POSITION'] = locs[blender_idxs]
 
-        if blender_idxs:
-            blender_idxs = np.array(blender_idxs, dtype=np.uint32)
+        for morph_i, vs in enumerate(morph_locs):
+            attributes['MORPH_POSITION_%d' % morph_i] = vs[blender_idxs]
 
-            attributes = {}
+        if vert_joints is not None:
+            __set_joints_and_weights(attributes, blender_idxs, vert_joints, vert_weights)
+
+        primitives.append({
+            'attributes': attributes,
+            'indices': indices,
+            'mode': 1,  # LINES
+            'material': 0,
+        })
 
-            attributes['POSITION'] = locs[blender_idxs]
+    if snapshot['loose_point_idxs'] is not None:
+        blender_idxs = snapshot['loose_point_idxs']
 
-            for morph_i, vs in enumerate(morph_locs):
-                attributes['MORPH_POSITION_%d' % morph_i] = vs[blender_idxs]
+        attributes = {}
 
-            if skin:
-                joints = [[] for _ in range(num_joint_sets)]
-                weights = [[] for _ in range(num_joint_sets)]
+        attributes['POSITION'] = locs[blender_idxs]
 
-                for vi in blender_idxs:
-                    bones = vert_bones[vi]
-                    for j in range(0, 4 * num_joint_sets):
-                        if j < len(bones):
-                            joint, weight = bones[j]
-                        else:
-                            joint, weight = 0, 0.0
-                        joints[j//4].append(joint)
-                        weights[j//4].append(weight)
+        for morph_i, vs in enumerate(morph_locs):
+            attributes['MORPH_POSITION_%d' % morph_i] = vs[blender_idxs]
 
-                for i, (js, ws) in enumerate(zip(joints, weights)):
-                    attributes['JOINTS_%d' % i] = js
-                    attributes['WEIGHTS_%d' % i] = ws
+        if vert_joints is not None:
+            __set_joints_and_weights(attributes, blender_idxs, vert_joints, vert_weights)
 
-            primitives.append({
-                'attributes': attributes,
-                'mode': 0,  # POINTS
-                'material': 0,
-            })
+        primitives.append({
+            'attributes': attributes,
+            'mode': 0,  # POINTS
+            'material': 0,
+        })
 
-    print_console('INFO', 'Primitives created: %d' % len(primitives))
+    print_console('INFO', 'Primitives created: %d (%s)' % (len(primitives), snapshot['name']))
+    profile_stage('build', time.perf_counter() - start_time)
 
     return primitives
 
 
+def __set_joints_and_weights(attributes, blender_idxs, vert_joints, vert_weights):
+    # One JOINTS_n/WEIGHTS_n pair for every set of 4 influences
+    joints = vert_joints[blender_idxs]
+    weights = vert_weights[blender_idxs]
+    for i in range(vert_joints.shape[1] // 4):
+        attributes['JOINTS_%d' % i] = joints[:, 4 * i:4 * i + 4].reshape(-1).tolist()
+        attributes['WEIGHTS_%d' % i] = weights[:, 4 * i:4 * i + 4].reshape(-1).tolist()
+
+
 def __get_positions(blender_mesh, key_blocks, armature, blender_object, export_settings):
     locs = np.empty(len(blender_mesh.vertices) * 3, dtype=np.float32)
     source = key_blocks[0].relative_key.data if key_blocks else blender_mesh.vertices
@@ -572,7 +620,15 @@ def __get_bone_data(blender_mesh, skin, blender_vertex_groups):
     # How many joint sets do we need? 1 set = 4 influences
     num_joint_sets = (max_num_influences + 3) // 4
 
-    return vert_bones, num_joint_sets
+    # Pad to (vert, influence) arrays, missing influences are joint 0 with weight 0
+    vert_joints = np.zeros((len(vert_bones), 4 * num_joint_sets), dtype=np.uint32)
+    vert_weights = np.zeros((len(vert_bones), 4 * num_joint_sets), dtype=np.float64)
+    for vi, bones in enumerate(vert_bones):
+        for j, (joint, weight) in enumerate(bones):
+            vert_joints[vi, j] = joint
+            vert_weights[vi, j] = weight
+
+    return vert_joints, vert_weights
 
 
 def __zup2yup(array):
@@ -16,6 +16,24 @@ import functools
 import bpy
 from io_scene_gltf2.blender.exp import gltf2_blender_get
 
+# Those types are cached by name.
+__by_name = {bpy.types.Object, bpy.types.Scene, bpy.types.Material, bpy.types.Action, bpy.types.Mesh,
+             bpy.types.PoseBone}
+
+
+# Hit/miss statistics of all cached functions, by function name: [hits, misses].
+__cache_stats = {}
+
+
+def get_cache_stats():
+    """Return the hits and misses counts of all cached functions that were called, by function name."""
+    return {name: tuple(stats) for name, stats in __cache_stats.items() if stats[0] or stats[1]}
+
+
+def reset_cache_stats():
+    for stats in __cache_stats.values():
+        stats[:] = [0, 0]
+
 
 def cached(func):
     """
@@ -25,6 +43,10 @@ def cached(func):
     :param func: the function to be decorated. It will have a static __cache member afterwards
     :return:
     """
+    stats = __cache_stats.setdefault(func.__module__ + "." + func.__name__, [0, 0])
+    func.__cache = {}
+    func.__export_settings = None
+
     @functools.wraps(func)
     def wrapper_cached(*args, **kwargs):
         assert len(args) >= 2 and 0 <= len(kwargs) <= 1, "Wrong signature for cached function"
@@ -39,34 +61,30 @@ def cached(func):
             export_settings = args[-1]
             cache_key_args = args[:-1]
 
-        __by_name = [bpy.types.Object, bpy.types.Scene, bpy.types.Material, bpy.types.Action, bpy.types.Mesh, bpy.types.PoseBone]
-
         # we make a tuple from the function arguments so that they can be used as a key to the cache
-        cache_key = ()
-        for i in cache_key_args:
-            if type(i) in __by_name:
-                cache_key += (i.name,)
-            else:
-                cache_key += (i,)
-        for i in cache_key_kwargs.values():
-            if type(i) in __by_name:
-                cache_key += (i.name,)
-            else:
-                cache_key += (i,)
+        cache_key = tuple(i.name if type(i) in __by_name else i for i in cache_key_args)
+        if cache_key_kwargs:
+            cache_key += tuple(i.name if type(i) in __by_name else i for i in cache_key_kwargs.values())
 
         # invalidate cache if export settings have changed
-        if not hasattr(func, "__export_settings") or export_settings != func.__export_settings:
-            func.__cache = {}
+        # (comparing the whole settings is only needed when we get another dict than the previous one).
+        if export_settings is not func.__export_settings:
+            if export_settings != func.__export_settings:
+                func.__cache = {}
             func.__export_settings = export_settings
         # use or fill cache
-        if cache_key in func.__cache:
-            return func.__cache[cache_key]
+        cache = func.__cache
+        if cache_key in cache:
+            stats[0] += 1
+            return cache[cache_key]
         else:
-            result = func(*args)
-            func.__cache[cache_key] = result
+            stats[1] += 1
+            result = func(*args, **kwargs)
+            cache[cache_key] = result
             return result
     return wrapper_cached
 
+
 def bonecache(func):
 
     def reset_cache_bonecache():
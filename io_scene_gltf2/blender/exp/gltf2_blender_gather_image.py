@@ -80,7 +80,7 @@ def __filter_image(sockets, export_settings):
 @cached
 def __gather_buffer_view(image_data, mime_type, name, export_settings):
     if export_settings[gltf2_blender_export_keys.FORMAT] != 'GLTF_SEPARATE':
-        return gltf2_io_binary_data.BinaryData(data=image_data.encode(mime_type))
+        return gltf2_io_binary_data.BinaryData(data=__encode_image(image_data, mime_type, export_settings))
     return None
 
 
@@ -140,7 +140,7 @@ def __gather_uri(image_data, mime_type, name, export_settings):
     if export_settings[gltf2_blender_export_keys.FORMAT] == 'GLTF_SEPARATE':
         # as usual we just store the data in place instead of already resolving the references
         return gltf2_io_image_data.ImageData(
-            data=image_data.encode(mime_type=mime_type),
+            data=__encode_image(image_data, mime_type, export_settings),
             mime_type=mime_type,
             name=name
         )
@@ -148,6 +148,19 @@ def __gather_uri(image_data, mime_type, name, export_settings):
     return None
 
 
+def __encode_image(image_data, mime_type, export_settings):
+    export_cache = export_settings.get('gltf_export_cache')
+    key = image_data.cache_key(mime_type, export_cache) if export_cache is not None else None
+    if key is None:
+        return image_data.encode(mime_type)
+
+    data = export_cache.get_image(key)
+    if data is None:
+        data = image_data.encode(mime_type)
+        export_cache.put_image(key, data)
+    return data
+
+
 def __get_image_data(sockets, export_settings) -> ExportImage:
     # For shared resources, such as images, we just store the portion of data that is needed in the glTF property
     # in a helper class. During generation of the glTF in the exporter these will then be combined to actual binary
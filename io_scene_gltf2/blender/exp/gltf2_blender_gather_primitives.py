@@ -13,6 +13,9 @@
 # limitations under the License.
 
 import bpy
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Tuple
 import numpy as np
 
@@ -27,7 +30,13 @@ from io_scene_gltf2.blender.exp import gltf2_blender_gather_materials
 from io_scene_gltf2.io.com import gltf2_io
 from io_scene_gltf2.io.exp import gltf2_io_binary_data
 from io_scene_gltf2.io.com import gltf2_io_constants
-from io_scene_gltf2.io.com.gltf2_io_debug import print_console
+from io_scene_gltf2.io.com.gltf2_io_debug import print_console, profile_stage
+
+
+# When set by begin_deferred_extraction(), the primitives are built by this pool. Until
+# resolve_deferred_primitives() is called, the gathered primitives have no attributes, indices nor targets yet.
+__extract_executor = None
+__deferred_primitives = []
 
 
 @cached
@@ -76,6 +85,8 @@ def gather_primitives(
             mode=internal_primitive['mode'],
             targets=internal_primitive['targets']
         )
+        if 'deferred_users' in internal_primitive:
+            internal_primitive['deferred_users'].append(primitive)
         primitives.append(primitive)
 
     return primitives
@@ -92,24 +103,112 @@ def __gather_cache_primitives(
     """
     Gather parts that are identical for instances, i.e. excluding materials
     """
-    primitives = []
-
-    blender_primitives = gltf2_blender_extract.extract_primitives(
+    snapshot = gltf2_blender_extract.snapshot_primitives(
         None, blender_mesh, library, blender_object, vertex_groups, modifiers, export_settings)
 
-    for internal_primitive in blender_primitives:
-        primitive = {
-            "attributes": __gather_attributes(internal_primitive, blender_mesh, modifiers, export_settings),
-            "indices": __gather_indices(internal_primitive, blender_mesh, modifiers, export_settings),
-            "mode": internal_primitive.get('mode'),
-            "material": internal_primitive.get('material'),
-            "targets": __gather_targets(internal_primitive, blender_mesh, modifiers, export_settings)
-        }
-        primitives.append(primitive)
+    export_cache = export_settings.get('gltf_export_cache')
+
+    if __extract_executor is None:
+        blender_primitives = __build_primitives(snapshot, export_cache)
+        return [__gather_primitive(internal_primitive, export_settings) for internal_primitive in blender_primitives]
+
+    # Only the layout is known for now, the content is filled in by resolve_deferred_primitives().
+    # The dicts are shared by all the MeshPrimitives using them, so they are updated in place.
+    primitives = []
+    for material, mode in snapshot['layout']:
+        primitives.append({
+            "attributes": {},
+            "indices": None,
+            "mode": mode,
+            "material": material,
+            "targets": [] if export_settings[MORPH] else None,
+            "deferred_users": []
+        })
+
+    future = __extract_executor.submit(__build_primitives, snapshot, export_cache)
+    __deferred_primitives.append((future, primitives))
 
     return primitives
 
-def __gather_indices(blender_primitive, blender_mesh, modifiers, export_settings):
+
+def __build_primitives(snapshot, export_cache):
+    if export_cache is None:
+        return gltf2_blender_extract.build_primitives(snapshot)
+
+    # The primitives only depend on the snapshot (the mesh name aside), so it is the cache key.
+    h = export_cache.new_hash()
+    export_cache.hash_value(h, {key: value for key, value in snapshot.items() if key != 'name'})
+    key = h.hexdigest()
+
+    blender_primitives = export_cache.get_primitives(key)
+    if blender_primitives is None:
+        blender_primitives = gltf2_blender_extract.build_primitives(snapshot)
+        export_cache.put_primitives(key, blender_primitives)
+    return blender_primitives
+
+
+def begin_deferred_extraction(export_settings):
+    """Build the mesh primitives in worker threads, while the rest of the scene is gathered."""
+    global __extract_executor
+
+    num_threads = export_settings.get('gltf_extract_threads', 0)
+    if num_threads == 0:
+        num_threads = os.cpu_count() or 1
+    if num_threads <= 1:
+        return
+
+    # User extensions hooks expect complete primitives when they are called
+    if export_settings.get('gltf_user_extensions'):
+        return
+
+    __extract_executor = ThreadPoolExecutor(max_workers=num_threads)
+
+
+def resolve_deferred_primitives(export_settings):
+    """Wait for the primitives built in worker threads, and fill them in, in the order they were gathered."""
+    while __deferred_primitives:
+        future, primitives = __deferred_primitives.pop(0)
+
+        start_time = time.perf_counter()
+        blender_primitives = future.result()
+        profile_stage('wait', time.perf_counter() - start_time)
+
+        assert len(blender_primitives) == len(primitives)
+        for primitive, internal_primitive in zip(primitives, blender_primitives):
+            gathered = __gather_primitive(internal_primitive, export_settings)
+            primitive['attributes'].update(gathered['attributes'])
+            primitive['indices'] = gathered['indices']
+            if gathered['targets'] is not None:
+                primitive['targets'].extend(gathered['targets'])
+            for mesh_primitive in primitive.pop('deferred_users'):
+                mesh_primitive.indices = gathered['indices']
+
+
+def end_deferred_extraction():
+    global __extract_executor
+
+    for future, _primitives in __deferred_primitives:
+        future.cancel()
+    __deferred_primitives.clear()
+    if __extract_executor is not None:
+        __extract_executor.shutdown(wait=True)
+        __extract_executor = None
+
+
+def __gather_primitive(internal_primitive, export_settings):
+    start_time = time.perf_counter()
+    primitive = {
+        "attributes": __gather_attributes(internal_primitive, export_settings),
+        "indices": __gather_indices(internal_primitive, export_settings),
+        "mode": internal_primitive.get('mode'),
+        "material": internal_primitive.get('material'),
+        "targets": __gather_targets(internal_primitive, export_settings)
+    }
+    profile_stage('gather', time.perf_counter() - start_time)
+    return primitive
+
+
+def __gather_indices(blender_primitive, export_settings):
     indices = blender_primitive.get('indices')
     if indices is None:
         return None
@@ -144,57 +243,53 @@ def __gather_indices(blender_primitive, blender_mesh, modifiers, export_settings
     )
 
 
-def __gather_attributes(blender_primitive, blender_mesh, modifiers, export_settings):
+def __gather_attributes(blender_primitive, export_settings):
     return gltf2_blender_gather_primitive_attributes.gather_primitive_attributes(blender_primitive, export_settings)
 
 
-def __gather_targets(blender_primitive, blender_mesh, modifiers, export_settings):
+def __gather_targets(blender_primitive, export_settings):
     if export_settings[MORPH]:
         targets = []
-        if blender_mesh.shape_keys is not None:
-            morph_index = 0
-            for blender_shape_key in blender_mesh.shape_keys.key_blocks:
-                if blender_shape_key == blender_shape_key.relative_key:
-                    continue
-
-                if blender_shape_key.mute is True:
-                    continue
-
-                target_position_id = 'MORPH_POSITION_' + str(morph_index)
-                target_normal_id = 'MORPH_NORMAL_' + str(morph_index)
-                target_tangent_id = 'MORPH_TANGENT_' + str(morph_index)
-
-                if blender_primitive["attributes"].get(target_position_id) is not None:
-                    target = {}
-                    internal_target_position = blender_primitive["attributes"][target_position_id]
-                    target["POSITION"] = gltf2_blender_gather_primitive_attributes.array_to_accessor(
-                        internal_target_position,
-                        component_type=gltf2_io_constants.ComponentType.Float,
-                        data_type=gltf2_io_constants.DataType.Vec3,
-                        include_max_and_min=True,
-                    )
-
-                    if export_settings[NORMALS] \
-                            and export_settings[MORPH_NORMAL] \
-                            and blender_primitive["attributes"].get(target_normal_id) is not None:
-
-                        internal_target_normal = blender_primitive["attributes"][target_normal_id]
-                        target['NORMAL'] = gltf2_blender_gather_primitive_attributes.array_to_accessor(
-                            internal_target_normal,
-                            component_type=gltf2_io_constants.ComponentType.Float,
-                            data_type=gltf2_io_constants.DataType.Vec3,
-                        )
-
-                    if export_settings[TANGENTS] \
-                            and export_settings[MORPH_TANGENT] \
-                            and blender_primitive["attributes"].get(target_tangent_id) is not None:
-                        internal_target_tangent = blender_primitive["attributes"][target_tangent_id]
-                        target['TANGENT'] = gltf2_blender_gather_primitive_attributes.array_to_accessor(
-                            internal_target_tangent,
-                            component_type=gltf2_io_constants.ComponentType.Float,
-                            data_type=gltf2_io_constants.DataType.Vec3,
-                        )
-                    targets.append(target)
-                    morph_index += 1
+        # One MORPH_POSITION_n attribute was extracted for every exported (not basis, not muted) shape key
+        morph_index = 0
+        while True:
+            target_position_id = 'MORPH_POSITION_' + str(morph_index)
+            target_normal_id = 'MORPH_NORMAL_' + str(morph_index)
+            target_tangent_id = 'MORPH_TANGENT_' + str(morph_index)
+
+            if blender_primitive["attributes"].get(target_position_id) is None:
+                break
+
+            target = {}
+            internal_target_position = blender_primitive["attributes"][target_position_id]
+            target["POSITION"] = gltf2_blender_gather_primitive_attributes.array_to_accessor(
+                internal_target_position,
+                component_type=gltf2_io_constants.ComponentType.Float,
+                data_type=gltf2_io_constants.DataType.Vec3,
+                include_max_and_min=True,
+            )
+
+            if export_settings[NORMALS] \
+                    and export_settings[MORPH_NORMAL] \
+                    and blender_primitive["attributes"].get(target_normal_id) is not None:
+
+                internal_target_normal = blender_primitive["attributes"][target_normal_id]
+                target['NORMAL'] = gltf2_blender_gather_primitive_attributes.array_to_accessor(
+                    internal_target_normal,
+                    component_type=gltf2_io_constants.ComponentType.Float,
+                    data_type=gltf2_io_constants.DataType.Vec3,
+                )
+
+            if export_settings[TANGENTS] \
+                    and export_settings[MORPH_TANGENT] \
+                    and blender_primitive["attributes"].get(target_tangent_id) is not None:
+                internal_target_tangent = blender_primitive["attributes"][target_tangent_id]
+                target['TANGENT'] = gltf2_blender_gather_primitive_attributes.array_to_accessor(
+                    internal_target_tangent,
+                    component_type=gltf2_io_constants.ComponentType.Float,
+                    data_type=gltf2_io_constants.DataType.Vec3,
+                )
+            targets.append(target)
+            morph_index += 1
         return targets
     return None
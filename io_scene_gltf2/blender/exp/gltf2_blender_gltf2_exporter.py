@@ -72,6 +72,11 @@ class GlTF2Exporter:
 
         self.__buffer = gltf2_io_buffer.Buffer()
         self.__images = {}
+        # Index of already referenced child of root properties, by id.
+        self.__references = {}
+        # Index of already referenced accessors, by content (buffer view index, type, count...).
+        self.__accessors = {}
+        self.__accessor_hits = 0
 
         # mapping of all glTFChildOfRootProperty types to their corresponding root level arrays
         self.__childOfRootPropertyTypeLookup = {
@@ -116,7 +121,11 @@ class GlTF2Exporter:
         return self.__gltf
 
     def finalize_buffer(self, output_path=None, buffer_name=None, is_glb=False):
-        """Finalize the glTF and write buffers."""
+        """
+        Finalize the glTF and write buffers.
+
+        For GLB files, the buffer is returned instead, to be streamed into the BIN chunk.
+        """
         if self.__finalized:
             raise RuntimeError("Tried to finalize buffers for finalized glTF file")
 
@@ -125,7 +134,7 @@ class GlTF2Exporter:
                 uri = None
             elif output_path and buffer_name:
                 with open(output_path + buffer_name, 'wb') as f:
-                    f.write(self.__buffer.to_bytes())
+                    self.__buffer.write_to(f)
                 uri = buffer_name
             else:
                 uri = self.__buffer.to_embed_string()
@@ -142,7 +151,7 @@ class GlTF2Exporter:
         self.__finalized = True
 
         if is_glb:
-            return self.__buffer.to_bytes()
+            return self.__buffer
 
     def add_draco_extension(self):
         """
@@ -210,7 +219,37 @@ class GlTF2Exporter:
             # The object is not of a child of root --> don't convert to reference
             return property
 
-        return self.__append_unique_and_get_index(gltf_list, property)
+        # Those properties only compare by identity, no need to search the whole list.
+        index = self.__references.get(id(property))
+        if index is None:
+            index = self.__append_unique_and_get_index(gltf_list, property)
+            self.__references[id(property)] = index
+        return index
+
+    @staticmethod
+    def __accessor_content_key(accessor: gltf2_io.Accessor):
+        """
+        Return a key identifying the data of an (already traversed) accessor, or None if it cannot be shared.
+        """
+        if (not isinstance(accessor.buffer_view, int) or accessor.sparse is not None
+                or accessor.extensions is not None or accessor.extras is not None):
+            return None
+        return (
+            accessor.buffer_view,
+            accessor.byte_offset,
+            accessor.component_type,
+            accessor.count,
+            accessor.type,
+            accessor.normalized,
+            accessor.name,
+            tuple(accessor.max) if accessor.max is not None else None,
+            tuple(accessor.min) if accessor.min is not None else None,
+        )
+
+    @property
+    def dedup_stats(self):
+        """Return (buffer views hits, buffer views misses, saved bytes, shared accessors) of deduplication."""
+        return self.__buffer.view_stats + (self.__accessor_hits,)
 
     @staticmethod
     def __append_unique_and_get_index(target: list, obj):
@@ -285,6 +324,17 @@ class GlTF2Exporter:
         # traverse nodes of a child of root property type and add them to the glTF root
         if type(node) in self.__childOfRootPropertyTypeLookup:
             node = __traverse_property(node)
+            # accessors using the same (deduplicated) buffer view with same layout can be shared too
+            if type(node) is gltf2_io.Accessor:
+                key = self.__accessor_content_key(node)
+                if key is not None:
+                    idx = self.__accessors.get(key)
+                    if idx is None:
+                        idx = self.__to_reference(node)
+                        self.__accessors[key] = idx
+                    elif self.__references.get(id(node)) != idx:
+                        self.__accessor_hits += 1
+                    return idx
             idx = self.__to_reference(node)
             # child of root properties are only present at root level --> replace with index in upper level
             return idx
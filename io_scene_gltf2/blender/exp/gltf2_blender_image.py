@@ -104,11 +104,41 @@ class ExportImage:
             len(set(fill.image.name for fill in self.fills.values())) == 1
         )
 
+    def cache_key(self, mime_type: Optional[str], export_cache) -> Optional[str]:
+        """Returns the key of the encoded image in the export cache, made from
+        the pixels of the images used. Returns None when the image file can be
+        copied as is, as that is cheaper than fetching its pixels.
+        """
+        file_format = _file_format(mime_type)
+        if self.__on_happy_path() and _can_copy_file(self.blender_image(), file_format):
+            return None
+
+        h = export_cache.new_hash()
+        h.update(('image %s %s' % (file_format, Channel.A in self.fills)).encode())
+
+        images = []
+        for dst_chan, fill in sorted(self.fills.items()):
+            if isinstance(fill, FillImage):
+                if fill.image not in images:
+                    images.append(fill.image)
+                h.update(b'fill %d %d %d' % (dst_chan, fill.src_chan, images.index(fill.image)))
+            else:
+                h.update(b'white %d' % dst_chan)
+
+        for image in images:
+            # Settings used when saving the image, and its pixels
+            h.update(repr((
+                tuple(image.size), image.channels, image.depth, image.is_float,
+                image.colorspace_settings.name, image.alpha_mode,
+            )).encode())
+            pixels = np.empty(image.size[0] * image.size[1] * image.channels, np.float32)
+            image.pixels.foreach_get(pixels)
+            h.update(pixels.data)
+
+        return h.hexdigest()
+
     def encode(self, mime_type: Optional[str]) -> bytes:
-        self.file_format = {
-            "image/jpeg": "JPEG",
-            "image/png": "PNG"
-        }.get(mime_type, "PNG")
+        self.file_format = _file_format(mime_type)
 
         # Happy path = we can just use an existing Blender image
         if self.__on_happy_path():
@@ -179,15 +209,12 @@ class ExportImage:
     def __encode_from_image(self, image: bpy.types.Image) -> bytes:
         # See if there is an existing file we can use.
         data = None
-        if image.source == 'FILE' and image.file_format == self.file_format and \
-                not image.is_dirty:
+        if _can_copy_file(image, self.file_format):
             if image.packed_file is not None:
                 data = image.packed_file.data
             else:
-                src_path = bpy.path.abspath(image.filepath_raw)
-                if os.path.isfile(src_path):
-                    with open(src_path, 'rb') as f:
-                        data = f.read()
+                with open(bpy.path.abspath(image.filepath_raw), 'rb') as f:
+                    data = f.read()
         # Check magic number is right
         if data:
             if self.file_format == 'PNG':
@@ -204,6 +231,20 @@ class ExportImage:
             return _encode_temp_image(tmp_image, self.file_format)
 
 
+def _file_format(mime_type: Optional[str]) -> str:
+    return {
+        "image/jpeg": "JPEG",
+        "image/png": "PNG"
+    }.get(mime_type, "PNG")
+
+
+def _can_copy_file(image: bpy.types.Image, file_format: str) -> bool:
+    """Whether the file of the image may be used as is (if its magic number is right)."""
+    if image.source != 'FILE' or image.file_format != file_format or image.is_dirty:
+        return False
+    return image.packed_file is not None or os.path.isfile(bpy.path.abspath(image.filepath_raw))
+
+
 def _encode_temp_image(tmp_image: bpy.types.Image, file_format: str) -> bytes:
     with tempfile.TemporaryDirectory() as tmpdirname:
         tmpfilename = tmpdirname + '/img'
@@ -223,7 +223,7 @@ def do_primitives(gltf, mesh_idx, skin_idx, mesh, ob):
 
     # Accessors are cached in case they are shared between primitives; clear
     # the cache now that all prims are done.
-    gltf.decode_accessor_cache = {}
+    gltf.clear_decode_accessor_cache()
 
     if gltf.import_settings['merge_vertices']:
         vert_locs, vert_normals, vert_joints, vert_weights, \
@@ -18,6 +18,7 @@
 
 import time
 import logging
+import threading
 
 #
 # Globals
@@ -30,6 +31,8 @@ g_profile_started = False
 g_profile_start = 0.0
 g_profile_end = 0.0
 g_profile_delta = 0.0
+g_profile_stages = {}
+g_profile_stages_lock = threading.Lock()
 
 #
 # Functions
@@ -114,6 +117,28 @@ def profile_end(label=None):
     print_console('PROFILE', output)
 
 
+def profile_stage(stage, delta):
+    """Accumulate the time spent in a stage, can be called from worker threads."""
+    with g_profile_stages_lock:
+        total, count = g_profile_stages.get(stage, (0.0, 0))
+        g_profile_stages[stage] = (total + delta, count + 1)
+
+
+def profile_stages_end(label=None):
+    """Print out and reset the time accumulated by each stage."""
+    global g_profile_stages
+
+    with g_profile_stages_lock:
+        stages = g_profile_stages
+        g_profile_stages = {}
+
+    for stage, (total, count) in stages.items():
+        output = 'Stage ' + stage + ': ' + str(total) + ' (' + str(count) + ' calls)'
+        if label is not None:
+            output = output + ' (' + label + ')'
+        print_console('PROFILE', output)
+
+
 # TODO: need to have a unique system for logging importer/exporter
 # TODO: this logger is used for importer, but in io and in blender part, but is written here in a _io_ file
 class Log:
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import base64
+import hashlib
 
 from io_scene_gltf2.io.com import gltf2_io
 from io_scene_gltf2.io.exp import gltf2_io_binary_data
@@ -22,19 +23,42 @@ class Buffer:
     """Class representing binary data for use in a glTF file as 'buffer' property."""
 
     def __init__(self, buffer_index=0):
-        self.__data = bytearray(b"")
+        # Data of the views in order, padding included. Kept as separate chunks, so that the buffer
+        # can be written to a file without being concatenated first.
+        self.__chunks = []
+        self.__byte_length = 0
         self.__buffer_index = buffer_index
+        # Already added views, by content hash of their data.
+        self.__views = {}
+        self.__view_hits = 0
+        self.__view_misses = 0
+        self.__saved_byte_length = 0
 
     def add_and_get_view(self, binary_data: gltf2_io_binary_data.BinaryData) -> gltf2_io.BufferView:
-        """Add binary data to the buffer. Return a glTF BufferView."""
-        offset = len(self.__data)
-        self.__data.extend(binary_data.data)
+        """
+        Add binary data to the buffer. Return a glTF BufferView.
+
+        Data identical to some already added one (e.g. from instanced meshes) is not added again,
+        the existing BufferView is returned instead.
+        """
+        content_key = (binary_data.byte_length, hashlib.blake2b(binary_data.data, digest_size=16).digest())
+        buffer_view = self.__views.get(content_key)
+        if buffer_view is not None:
+            self.__view_hits += 1
+            self.__saved_byte_length += binary_data.byte_length
+            return buffer_view
+        self.__view_misses += 1
+
+        offset = self.__byte_length
+        self.__chunks.append(binary_data.data)
 
         length = binary_data.byte_length
 
         # offsets should be a multiple of 4 --> therefore add padding if necessary
         padding = (4 - (length % 4)) % 4
-        self.__data.extend(b"\x00" * padding)
+        if padding:
+            self.__chunks.append(b"\x00" * padding)
+        self.__byte_length += length + padding
 
         buffer_view = gltf2_io.BufferView(
             buffer=self.__buffer_index,
@@ -46,17 +70,30 @@ class Buffer:
             name=None,
             target=None
         )
+        self.__views[content_key] = buffer_view
         return buffer_view
 
+    @property
+    def view_stats(self):
+        """Return (hits, misses, saved byte length) of the buffer views deduplication."""
+        return self.__view_hits, self.__view_misses, self.__saved_byte_length
+
     @property
     def byte_length(self):
-        return len(self.__data)
+        return self.__byte_length
 
     def to_bytes(self):
-        return self.__data
+        return b"".join(self.__chunks)
+
+    def write_to(self, file):
+        """Write the buffer to a binary file object, one view at a time."""
+        for chunk in self.__chunks:
+            file.write(chunk)
 
     def to_embed_string(self):
-        return 'data:application/octet-stream;base64,' + base64.b64encode(self.__data).decode('ascii')
+        return 'data:application/octet-stream;base64,' + base64.b64encode(self.to_bytes()).decode('ascii')
 
     def clear(self):
-        self.__data = b""
+        self.__chunks = []
+        self.__byte_length = 0
+        self.__views = {}
@@ -77,16 +77,17 @@ def save_gltf(gltf, export_settings, encoder, glb_buffer):
             file.close()
 
     else:
-        file = open(export_settings['gltf_filepath'], "wb")
-
         gltf_data = gltf_encoded.encode()
+        del gltf_encoded
+
+        # The BIN chunk is either bytes, or a Buffer streaming its views to the file.
         binary = glb_buffer
 
         length_gltf = len(gltf_data)
         spaces_gltf = (4 - (length_gltf & 3)) & 3
         length_gltf += spaces_gltf
 
-        length_bin = len(binary)
+        length_bin = binary.byte_length if hasattr(binary, 'write_to') else len(binary)
         zeros_bin = (4 - (length_bin & 3)) & 3
         length_bin += zeros_bin
 
@@ -94,24 +95,27 @@ def save_gltf(gltf, export_settings, encoder, glb_buffer):
         if length_bin > 0:
             length += 8 + length_bin
 
-        # Header (Version 2)
-        file.write('glTF'.encode())
-        file.write(struct.pack("I", 2))
-        file.write(struct.pack("I", length))
-
-        # Chunk 0 (JSON)
-        file.write(struct.pack("I", length_gltf))
-        file.write('JSON'.encode())
-        file.write(gltf_data)
-        file.write(b' ' * spaces_gltf)
-
-        # Chunk 1 (BIN)
-        if length_bin > 0:
-            file.write(struct.pack("I", length_bin))
-            file.write('BIN\0'.encode())
-            file.write(binary)
-            file.write(b'\0' * zeros_bin)
-
-        file.close()
+        with open(export_settings['gltf_filepath'], "wb") as file:
+            # Header (Version 2)
+            file.write('glTF'.encode())
+            file.write(struct.pack("I", 2))
+            file.write(struct.pack("I", length))
+
+            # Chunk 0 (JSON)
+            file.write(struct.pack("I", length_gltf))
+            file.write('JSON'.encode())
+            file.write(gltf_data)
+            file.write(b' ' * spaces_gltf)
+            del gltf_data
+
+            # Chunk 1 (BIN)
+            if length_bin > 0:
+                file.write(struct.pack("I", length_bin))
+                file.write('BIN\0'.encode())
+                if hasattr(binary, 'write_to'):
+                    binary.write_to(file)
+                else:
+                    file.write(binary)
+                file.write(b'\0' * zeros_bin)
 
     return True
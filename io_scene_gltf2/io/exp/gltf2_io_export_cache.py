@@ -0,0 +1,166 @@
+# Copyright 2018-2021 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+from io_scene_gltf2.io.com.gltf2_io_debug import print_console
+
+# Bump when the content of the cached entries changes, so that older entries are never used.
+CACHE_VERSION = 1
+
+
+class ExportCache:
+    """
+    On-disk cache of the expensive export results, reused by later exports.
+
+    Entries are stored by content: mesh primitives by a hash of the data they are built from (which
+    already reflects the export settings in use), encoded images by a hash of their pixels and
+    encoding parameters. Unchanged meshes and textures are thus reused byte for byte, and entries
+    never need to be invalidated. Lookups and stores may be done from worker threads.
+    """
+
+    def __init__(self, directory):
+        self.__directory = directory
+        self.__lock = threading.Lock()
+        self.__stats = {}  # kind -> [hits, misses]
+
+    @staticmethod
+    def new_hash():
+        h = hashlib.blake2b(digest_size=20)
+        h.update(b'glTF-export-cache %d' % CACHE_VERSION)
+        return h
+
+    @staticmethod
+    def hash_value(h, value):
+        """Feed NumPy arrays, nested lists/tuples/dicts and plain values to a hash."""
+        if isinstance(value, np.ndarray):
+            h.update(('array %s %s' % (value.dtype.str, value.shape)).encode())
+            h.update(np.ascontiguousarray(value).data)
+        elif isinstance(value, (list, tuple)):
+            h.update(b'list %d' % len(value))
+            for item in value:
+                ExportCache.hash_value(h, item)
+        elif isinstance(value, dict):
+            h.update(b'dict %d' % len(value))
+            for key in sorted(value):
+                h.update(str(key).encode())
+                ExportCache.hash_value(h, value[key])
+        else:
+            h.update(repr(value).encode())
+
+    def get_primitives(self, key):
+        """Return the cached primitives (as returned by build_primitives) for the key, or None."""
+        path = self.__path('primitives', key, '.npz')
+        primitives = None
+        if os.path.isfile(path):
+            try:
+                primitives = _load_primitives(path)
+            except Exception as e:
+                print_console('WARNING', 'Could not read export cache entry {}: {}'.format(path, e))
+        self.__count('primitives', primitives is not None)
+        return primitives
+
+    def put_primitives(self, key, primitives):
+        self.__write(self.__path('primitives', key, '.npz'), lambda f: _save_primitives(f, primitives))
+
+    def get_image(self, key):
+        """Return the cached encoded image for the key, or None."""
+        path = self.__path('images', key, '.bin')
+        data = None
+        if os.path.isfile(path):
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            except OSError as e:
+                print_console('WARNING', 'Could not read export cache entry {}: {}'.format(path, e))
+        self.__count('images', data is not None)
+        return data
+
+    def put_image(self, key, data):
+        self.__write(self.__path('images', key, '.bin'), lambda f: f.write(data))
+
+    @property
+    def stats(self):
+        """Return {kind: (hits, misses)} of the lookups done so far."""
+        with self.__lock:
+            return {kind: tuple(counts) for kind, counts in self.__stats.items()}
+
+    def __count(self, kind, hit):
+        with self.__lock:
+            counts = self.__stats.setdefault(kind, [0, 0])
+            counts[0 if hit else 1] += 1
+
+    def __path(self, kind, key, extension):
+        return os.path.join(self.__directory, kind, key + extension)
+
+    def __write(self, path, write):
+        # Write to a temporary file first, so that an interrupted export never leaves a truncated entry.
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    write(f)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        except OSError as e:
+            print_console('WARNING', 'Could not write export cache entry {}: {}'.format(path, e))
+
+
+def _save_primitives(file, primitives):
+    # Everything is stored as arrays, plus a JSON description of how to put them back together,
+    # so that loading never needs to unpickle anything.
+    arrays = {}
+    description = []
+    for i, primitive in enumerate(primitives):
+        entry = {
+            'material': int(primitive['material']),
+            'mode': primitive.get('mode'),
+            'has_indices': 'indices' in primitive,
+            'attributes': [],
+        }
+        for name, value in primitive['attributes'].items():
+            entry['attributes'].append([name, isinstance(value, list)])
+            arrays['%d/%s' % (i, name)] = np.asarray(value)
+        if 'indices' in primitive:
+            arrays['%d/indices' % i] = primitive['indices']
+        description.append(entry)
+    arrays['description'] = np.array(json.dumps(description))
+    np.savez(file, **arrays)
+
+
+def _load_primitives(path):
+    primitives = []
+    with np.load(path, allow_pickle=False) as arrays:
+        for i, entry in enumerate(json.loads(str(arrays['description']))):
+            attributes = {}
+            for name, is_list in entry['attributes']:
+                value = arrays['%d/%s' % (i, name)]
+                attributes[name] = value.tolist() if is_list else value
+            primitive = {'attributes': attributes}
+            if entry['has_indices']:
+                primitive['indices'] = arrays['%d/indices' % i]
+            if entry['mode'] is not None:
+                primitive['mode'] = entry['mode']
+            primitive['material'] = entry['material']
+            primitives.append(primitive)
+    return primitives
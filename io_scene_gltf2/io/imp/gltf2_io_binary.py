@@ -74,17 +74,23 @@ class BinaryData():
 
     @staticmethod
     def decode_accessor(gltf, accessor_idx, cache=False):
-        """Decodes accessor to 2D numpy array (count x num_components)."""
-        if accessor_idx in gltf.decode_accessor_cache:
-            return gltf.accessor_cache[accessor_idx]
+        """
+        Decodes accessor to 2D numpy array (count x num_components).
+
+        The array may be a read-only view on the buffer (or memory-mapped file) data.
+        When cache is set, it is kept in gltf LRU cache of decoded accessors.
+        """
+        array = gltf.get_cached_accessor(accessor_idx)
+        if array is not None:
+            return array
 
         accessor = gltf.data.accessors[accessor_idx]
         array = BinaryData.decode_accessor_obj(gltf, accessor)
 
         if cache:
-            gltf.accessor_cache[accessor_idx] = array
             # Prevent accidentally modifying cached arrays
             array.flags.writeable = False
+            gltf.cache_accessor(accessor_idx, array)
 
         return array
 
@@ -115,6 +121,10 @@ class BinaryData():
                     count=accessor.count * component_nb,
                 )
                 array = array.reshape(accessor.count, component_nb)
+                # Views on memory-mapped data are kept as-is (zero-copy), unless misaligned
+                # (offsets are only required to be multiple of the component size, not always respected).
+                if not array.flags.aligned:
+                    array = array.copy()
 
             else:
                 # The data looks like
@@ -135,7 +145,10 @@ class BinaryData():
                     array,
                     shape=(accessor.count, component_nb),
                     strides=(stride, bytes_per_elem),
+                    writeable=False,
                 )
+                if not array.flags.aligned:
+                    array = array.copy()
 
         else:
             # No buffer view; initialize to zeros
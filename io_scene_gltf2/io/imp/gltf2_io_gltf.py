@@ -16,8 +16,10 @@ from ..com.gltf2_io import gltf_from_dict
 from ..com.gltf2_io_debug import Log
 import logging
 import json
+import mmap
 import struct
 import base64
+from collections import OrderedDict
 from os.path import dirname, join, isfile
 from urllib.parse import unquote
 
@@ -37,11 +39,22 @@ class glTFImporter():
         self.glb_buffer = None
         self.buffers = {}
         self.accessor_cache = {}
-        self.decode_accessor_cache = {}
+        # Decoded accessors (numpy arrays), least recently used first.
+        self.decode_accessor_cache = OrderedDict()
+        self.decode_accessor_cache_size = 0
+        self.mmaps = []
 
         if 'loglevel' not in self.import_settings.keys():
             self.import_settings['loglevel'] = logging.ERROR
 
+        # Memory-map the .glb file and external .bin files instead of reading them,
+        # accessors are then decoded as views on the mapped data whenever possible.
+        self.use_mmap = self.import_settings.get('import_use_mmap', False)
+        # Byte budget of the decoded accessors cache (None for no limit).
+        self.decode_accessor_cache_budget = self.import_settings.get('import_accessor_cache_size', None)
+        if self.decode_accessor_cache_budget is not None:
+            self.decode_accessor_cache_budget *= 1024 * 1024
+
         log = Log(import_settings['loglevel'])
         self.log = log.logger
         self.log_handler = log.hdlr
@@ -139,8 +152,7 @@ class glTFImporter():
         if not isfile(self.filename):
             raise ImportError("Please select a file")
 
-        with open(self.filename, 'rb') as f:
-            content = memoryview(f.read())
+        content = self.read_file(self.filename, self.use_mmap)
 
         if content[:4] == b'glTF':
             gltf, self.glb_buffer = self.load_glb(content)
@@ -162,7 +174,7 @@ class glTFImporter():
         buffer = self.data.buffers[buffer_idx]
 
         if buffer.uri:
-            data = self.load_uri(buffer.uri)
+            data = self.load_uri(buffer.uri, self.use_mmap)
             if data is None:
                 raise ImportError("Missing resource, '" + buffer.uri + "'.")
             self.buffers[buffer_idx] = data
@@ -173,7 +185,7 @@ class glTFImporter():
             if buffer_idx == 0 and self.glb_buffer is not None:
                 self.buffers[buffer_idx] = self.glb_buffer
 
-    def load_uri(self, uri):
+    def load_uri(self, uri, use_mmap=False):
         """Loads a URI."""
         sep = ';base64,'
         if uri.startswith('data:'):
@@ -184,8 +196,71 @@ class glTFImporter():
 
         path = join(dirname(self.filename), unquote(uri))
         try:
-            with open(path, 'rb') as f_:
-                return memoryview(f_.read())
+            return self.read_file(path, use_mmap)
         except Exception:
             self.log.error("Couldn't read file: " + path)
             return None
+
+    def read_file(self, path, use_mmap=False):
+        """Read (or memory-map) a whole file, as a memoryview."""
+        with open(path, 'rb') as f:
+            if use_mmap:
+                try:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    # Empty files cannot be mapped.
+                    return memoryview(b'')
+                self.mmaps.append(mm)
+                return memoryview(mm)
+            return memoryview(f.read())
+
+    def close(self):
+        """Release the buffers, and close the memory-mapped files once nothing uses them anymore."""
+        self.buffers = {}
+        self.glb_buffer = None
+        self.accessor_cache = {}
+        self.clear_decode_accessor_cache()
+
+        mmaps, self.mmaps = self.mmaps, []
+        for retry in (False, True):
+            still_used = []
+            for mm in mmaps:
+                try:
+                    mm.close()
+                except BufferError:
+                    still_used.append(mm)
+            if not still_used or retry:
+                break
+            # Views on the mapped data may only be referenced by cycles.
+            import gc
+            gc.collect()
+            mmaps = still_used
+
+        for mm in still_used:
+            # Unmapped (and the file handle closed) when garbage collected
+            self.log.warning("A memory-mapped glTF buffer is still in use, it is not closed yet")
+
+    def get_cached_accessor(self, accessor_idx):
+        """Return the cached decoded accessor, or None."""
+        array = self.decode_accessor_cache.get(accessor_idx)
+        if array is not None:
+            self.decode_accessor_cache.move_to_end(accessor_idx)
+        return array
+
+    def cache_accessor(self, accessor_idx, array):
+        """Cache a decoded accessor, evicting least recently used ones when over budget."""
+        if accessor_idx in self.decode_accessor_cache:
+            self.decode_accessor_cache_size -= self.decode_accessor_cache.pop(accessor_idx).nbytes
+        budget = self.decode_accessor_cache_budget
+        if budget is not None and array.nbytes > budget:
+            return
+        self.decode_accessor_cache[accessor_idx] = array
+        self.decode_accessor_cache_size += array.nbytes
+        if budget is not None:
+            while self.decode_accessor_cache_size > budget:
+                _idx, evicted = self.decode_accessor_cache.popitem(last=False)
+                self.decode_accessor_cache_size -= evicted.nbytes
+
+    def clear_decode_accessor_cache(self):
+        self.decode_accessor_cache.clear()
+        self.decode_accessor_cache_size = 0
@@ -20,6 +20,8 @@
 
 import os
 
+import numpy as np
+
 import bpy
 from mathutils import Matrix, Vector, Color
 from bpy_extras import io_utils, node_shader_utils
@@ -234,6 +236,51 @@ def write_nurb(fw, ob, ob_mat):
     return tot_verts
 
 
+# Number of lines formatted at once by the bulk writers, bounds the size of the temporary strings.
+WRITE_CHUNK_SIZE = 1 << 16
+
+
+def write_rows(fw, line_fmt, rows):
+    """Write one line per row of the 2D array, formatting its values with line_fmt."""
+    for i in range(0, len(rows), WRITE_CHUNK_SIZE):
+        chunk = rows[i:i + WRITE_CHUNK_SIZE]
+        fw((line_fmt * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+
+def write_faces(fw, loop_fmt, faces_loop_total, loops_values):
+    """Write one 'f' line per face, formatting the values of each of its loops (rows of loops_values) with loop_fmt."""
+    face_fmts = {}
+    loop_start = 0
+    faces_loop_total = faces_loop_total.tolist()
+    for i in range(0, len(faces_loop_total), WRITE_CHUNK_SIZE):
+        chunk = faces_loop_total[i:i + WRITE_CHUNK_SIZE]
+        for loop_total in set(chunk).difference(face_fmts):
+            face_fmts[loop_total] = 'f' + loop_fmt * loop_total + '\n'
+        loop_end = loop_start + sum(chunk)
+        fw(''.join([face_fmts[loop_total] for loop_total in chunk]) %
+           tuple(loops_values[loop_start:loop_end].ravel().tolist()))
+        loop_start = loop_end
+
+
+def round_keys(values, digits):
+    """Integer keys of the values rounded to the given number of digits, to compare them."""
+    return np.rint(values.astype(np.float64) * (10 ** digits)).astype(np.int64)
+
+
+def unique_rows(rows):
+    """
+    Deduplicate the rows of a 2D array, keeping them in order of first appearance.
+    Return the index of the first appearance of each unique row, and the unique row index of every row.
+    """
+    if not len(rows):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    _unique, firsts, inverse = np.unique(rows, axis=0, return_index=True, return_inverse=True)
+    order = np.argsort(firsts)
+    ranks = np.empty_like(order)
+    ranks[order] = np.arange(len(order))
+    return firsts[order], ranks[inverse.reshape(-1)]
+
+
 def write_file(filepath, objects, depsgraph, scene,
                EXPORT_TRI=False,
                EXPORT_EDGES=False,
@@ -263,13 +310,7 @@ def write_file(filepath, objects, depsgraph, scene,
     if EXPORT_GLOBAL_MATRIX is None:
         EXPORT_GLOBAL_MATRIX = Matrix()
 
-    def veckey3d(v):
-        return round(v.x, 4), round(v.y, 4), round(v.z, 4)
-
-    def veckey2d(v):
-        return round(v[0], 4), round(v[1], 4)
-
-    def findVertexGroupName(face, vWeightMap):
+    def findVertexGroupName(face_verts, vWeightMap):
         """
         Searches the vertexDict to see what groups is assigned to a given face.
         We use a frequency system in order to sort out the name because a given vertex can
@@ -279,7 +320,7 @@ def write_file(filepath, objects, depsgraph, scene,
         of vertices is the face's group
         """
         weightDict = {}
-        for vert_index in face.vertices:
+        for vert_index in face_verts:
             vWeights = vWeightMap[vert_index]
             for vGroupName, weight in vWeights:
                 weightDict[vGroupName] = weightDict.get(vGroupName, 0.0) + weight
@@ -306,8 +347,6 @@ def write_file(filepath, objects, depsgraph, scene,
             # Initialize totals, these are updated each object
             totverts = totuvco = totno = 1
 
-            face_vert_index = 1
-
             # A Dict of Materials
             # (material.name, image.name):matname_imagename # matname_imagename has gaps removed.
             mtl_dict = {}
@@ -367,38 +406,34 @@ def write_file(filepath, objects, depsgraph, scene,
 
                         if EXPORT_UV:
                             faceuv = len(me.uv_layers) > 0
-                            if faceuv:
-                                uv_layer = me.uv_layers.active.data[:]
                         else:
                             faceuv = False
 
-                        me_verts = me.vertices[:]
-
-                        # Make our own list so it can be sorted to reduce context switching
-                        face_index_pairs = [(face, index) for index, face in enumerate(me.polygons)]
+                        num_verts = len(me.vertices)
+                        num_faces = len(me.polygons)
+                        num_loops = len(me.loops)
 
                         if EXPORT_EDGES:
                             edges = me.edges
                         else:
                             edges = []
 
-                        if not (len(face_index_pairs) + len(edges) + len(me.vertices)):  # Make sure there is something to write
+                        if not (num_faces + len(edges) + num_verts):  # Make sure there is something to write
                             # clean up
                             ob_for_convert.to_mesh_clear()
                             continue  # dont bother with this mesh.
 
-                        if EXPORT_NORMALS and face_index_pairs:
+                        if EXPORT_NORMALS and num_faces:
                             me.calc_normals_split()
                             # No need to call me.free_normals_split later, as this mesh is deleted anyway!
 
-                        loops = me.loops
-
-                        if (EXPORT_SMOOTH_GROUPS or EXPORT_SMOOTH_GROUPS_BITFLAGS) and face_index_pairs:
+                        if (EXPORT_SMOOTH_GROUPS or EXPORT_SMOOTH_GROUPS_BITFLAGS) and num_faces:
                             smooth_groups, smooth_groups_tot = me.calc_smooth_groups(use_bitflags=EXPORT_SMOOTH_GROUPS_BITFLAGS)
                             if smooth_groups_tot <= 1:
                                 smooth_groups, smooth_groups_tot = (), 0
                         else:
                             smooth_groups, smooth_groups_tot = (), 0
+                        smooth_groups = np.array(smooth_groups, dtype=np.int64)
 
                         materials = me.materials[:]
                         material_names = [m.name if m else None for m in materials]
@@ -408,28 +443,51 @@ def write_file(filepath, objects, depsgraph, scene,
                             materials = [None]
                             material_names = [name_compat(None)]
 
+                        faces_material = np.empty(num_faces, dtype=np.int64)
+                        me.polygons.foreach_get("material_index", faces_material)
+                        faces_smooth = np.empty(num_faces, dtype=bool)
+                        me.polygons.foreach_get("use_smooth", faces_smooth)
+                        faces_loop_start = np.empty(num_faces, dtype=np.int64)
+                        me.polygons.foreach_get("loop_start", faces_loop_start)
+                        faces_loop_total = np.empty(num_faces, dtype=np.int64)
+                        me.polygons.foreach_get("loop_total", faces_loop_total)
+                        loops_vert = np.empty(num_loops, dtype=np.int64)
+                        me.loops.foreach_get("vertex_index", loops_vert)
+
                         # Sort by Material, then images
                         # so we dont over context switch in the obj file.
                         if EXPORT_KEEP_VERT_ORDER:
-                            pass
+                            faces_order = np.arange(num_faces)
                         else:
+                            # Note: lexsort is stable, and sorts by its last key first.
                             if len(materials) > 1:
-                                if smooth_groups:
-                                    sort_func = lambda a: (a[0].material_index,
-                                                           smooth_groups[a[1]] if a[0].use_smooth else False)
+                                if smooth_groups_tot:
+                                    sort_keys = (np.where(faces_smooth, smooth_groups, 0), faces_material)
                                 else:
-                                    sort_func = lambda a: (a[0].material_index,
-                                                           a[0].use_smooth)
+                                    sort_keys = (faces_smooth, faces_material)
                             else:
                                 # no materials
-                                if smooth_groups:
-                                    sort_func = lambda a: smooth_groups[a[1] if a[0].use_smooth else False]
+                                if smooth_groups_tot:
+                                    sort_keys = (smooth_groups[np.where(faces_smooth, np.arange(num_faces), 0)],)
                                 else:
-                                    sort_func = lambda a: a[0].use_smooth
+                                    sort_keys = (faces_smooth,)
+
+                            faces_order = np.lexsort(sort_keys)
 
-                            face_index_pairs.sort(key=sort_func)
+                            del sort_keys
 
-                            del sort_func
+                        # From now on, faces and their loops are in the order they are written.
+                        faces_material = np.minimum(faces_material[faces_order], len(materials) - 1)
+                        faces_smooth_group = faces_smooth[faces_order].astype(np.int64)
+                        if smooth_groups_tot:
+                            faces_smooth_group = np.where(faces_smooth_group, smooth_groups[faces_order], 0)
+                        faces_loop_start = faces_loop_start[faces_order]
+                        faces_loop_total = faces_loop_total[faces_order]
+                        faces_loop_offset = np.zeros(num_faces + 1, dtype=np.int64)
+                        np.cumsum(faces_loop_total, out=faces_loop_offset[1:])
+                        loops_order = (np.arange(faces_loop_offset[-1], dtype=np.int64) +
+                                       np.repeat(faces_loop_start - faces_loop_offset[:-1], faces_loop_total))
+                        loops_vert = loops_vert[loops_order]
 
                         # Set the default mat to no material and no image.
                         contextMat = 0, 0  # Can never be this, so we will label a new material the first chance we get.
@@ -451,92 +509,100 @@ def write_file(filepath, objects, depsgraph, scene,
                         subprogress2.step()
 
                         # Vert
-                        for v in me_verts:
-                            fw('v %.6f %.6f %.6f\n' % v.co[:])
+                        verts_co = np.empty(num_verts * 3, dtype=np.float32)
+                        me.vertices.foreach_get("co", verts_co)
+                        write_rows(fw, 'v %.6f %.6f %.6f\n', verts_co.reshape(-1, 3))
+                        del verts_co
 
                         subprogress2.step()
 
                         # UV
                         if faceuv:
-                            # in case removing some of these dont get defined.
-                            uv = f_index = uv_index = uv_key = uv_val = uv_ls = None
-
-                            uv_face_mapping = [None] * len(face_index_pairs)
-
-                            uv_dict = {}
-                            uv_get = uv_dict.get
-                            for f, f_index in face_index_pairs:
-                                uv_ls = uv_face_mapping[f_index] = []
-                                for uv_index, l_index in enumerate(f.loop_indices):
-                                    uv = uv_layer[l_index].uv
-                                    # include the vertex index in the key so we don't share UV's between vertices,
-                                    # allowed by the OBJ spec but can cause issues for other importers, see: T47010.
-
-                                    # this works too, shared UV's for all verts
-                                    #~ uv_key = veckey2d(uv)
-                                    uv_key = loops[l_index].vertex_index, veckey2d(uv)
-
-                                    uv_val = uv_get(uv_key)
-                                    if uv_val is None:
-                                        uv_val = uv_dict[uv_key] = uv_unique_count
-                                        fw('vt %.6f %.6f\n' % uv[:])
-                                        uv_unique_count += 1
-                                    uv_ls.append(uv_val)
-
-                            del uv_dict, uv, f_index, uv_index, uv_ls, uv_get, uv_key, uv_val
-                            # Only need uv_unique_count and uv_face_mapping
+                            uv_co = np.empty(num_loops * 2, dtype=np.float32)
+                            me.uv_layers.active.data.foreach_get("uv", uv_co)
+                            uv_co = uv_co.reshape(-1, 2)[loops_order]
+
+                            # include the vertex index in the key so we don't share UV's between vertices,
+                            # allowed by the OBJ spec but can cause issues for other importers, see: T47010.
+
+                            # this works too, shared UV's for all verts
+                            #~ uv_keys = round_keys(uv_co, 4)
+                            uv_keys = np.column_stack((loops_vert, round_keys(uv_co, 4)))
+
+                            uv_firsts, loops_uv = unique_rows(uv_keys)
+                            write_rows(fw, 'vt %.6f %.6f\n', uv_co[uv_firsts])
+                            uv_unique_count = len(uv_firsts)
+
+                            del uv_co, uv_keys, uv_firsts
+                            # Only need uv_unique_count and loops_uv
 
                         subprogress2.step()
 
                         # NORMAL, Smooth/Non smoothed.
                         if EXPORT_NORMALS:
-                            no_key = no_val = None
-                            normals_to_idx = {}
-                            no_get = normals_to_idx.get
-                            loops_to_normals = [0] * len(loops)
-                            for f, f_index in face_index_pairs:
-                                for l_idx in f.loop_indices:
-                                    no_key = veckey3d(loops[l_idx].normal)
-                                    no_val = no_get(no_key)
-                                    if no_val is None:
-                                        no_val = normals_to_idx[no_key] = no_unique_count
-                                        fw('vn %.4f %.4f %.4f\n' % no_key)
-                                        no_unique_count += 1
-                                    loops_to_normals[l_idx] = no_val
-                            del normals_to_idx, no_get, no_key, no_val
-                        else:
-                            loops_to_normals = []
+                            loops_no = np.empty(num_loops * 3, dtype=np.float32)
+                            me.loops.foreach_get("normal", loops_no)
+                            loops_no = loops_no.reshape(-1, 3)[loops_order]
+                            no_firsts, loops_no_idx = unique_rows(round_keys(loops_no, 4))
+                            # Written rounded, as the dict-based writer used to.
+                            write_rows(fw, 'vn %.4f %.4f %.4f\n', loops_no[no_firsts])
+                            no_unique_count = len(no_firsts)
+
+                            del loops_no, no_firsts
 
                         subprogress2.step()
 
                         # XXX
+                        faces_vgroup = None
                         if EXPORT_POLYGROUPS:
                             # Retrieve the list of vertex groups
                             vertGroupNames = ob.vertex_groups.keys()
                             if vertGroupNames:
                                 currentVGroup = ''
                                 # Create a dictionary keyed by face id and listing, for each vertex, the vertex groups it belongs to
-                                vgroupsMap = [[] for _i in range(len(me_verts))]
-                                for v_idx, v_ls in enumerate(vgroupsMap):
-                                    v_ls[:] = [(vertGroupNames[g.group], g.weight) for g in me_verts[v_idx].groups]
-
-                        for f, f_index in face_index_pairs:
-                            f_smooth = f.use_smooth
-                            if f_smooth and smooth_groups:
-                                f_smooth = smooth_groups[f_index]
-                            f_mat = min(f.material_index, len(materials) - 1)
+                                vgroupsMap = [[(vertGroupNames[g.group], g.weight) for g in v.groups] for v in me.vertices]
+                                loops_vert_ls = loops_vert.tolist()
+                                faces_vgroup = [findVertexGroupName(loops_vert_ls[l_start:l_end], vgroupsMap)
+                                                for l_start, l_end in zip(faces_loop_offset[:-1].tolist(),
+                                                                          faces_loop_offset[1:].tolist())]
+                                del vgroupsMap, loops_vert_ls
+
+                        # Values written for each loop of the faces, in the order they are written.
+                        loops_values = [totverts + loops_vert]
+                        if faceuv:
+                            loops_values.append(totuvco + loops_uv)
+                        if EXPORT_NORMALS:
+                            loops_values.append(totno + loops_no_idx)
+                        loops_values = np.column_stack(loops_values)
+                        if faceuv:
+                            loop_fmt = " %d/%d/%d" if EXPORT_NORMALS else " %d/%d"  # vert, uv, normal
+                        else:
+                            loop_fmt = " %d//%d" if EXPORT_NORMALS else " %d"
+
+                        # Faces are written in runs sharing the same vertex group, material and smoothing,
+                        # the context switches only need to be checked at the start of each run.
+                        key_ids = np.array([material_names.index(name) for name in material_names], dtype=np.int64)
+                        runs_change = np.ones(num_faces, dtype=bool)
+                        runs_change[1:] = ((np.diff(key_ids[faces_material]) != 0) |
+                                           (np.diff(faces_smooth_group) != 0))
+                        if faces_vgroup is not None:
+                            runs_change[1:] |= np.array([a != b for a, b in zip(faces_vgroup, faces_vgroup[1:])], dtype=bool)
+                        runs_start = np.flatnonzero(runs_change).tolist()
+
+                        for run_start, run_end in zip(runs_start, runs_start[1:] + [num_faces]):
+                            f_smooth = int(faces_smooth_group[run_start])
+                            f_mat = int(faces_material[run_start])
 
                             # MAKE KEY
                             key = material_names[f_mat], None  # No image, use None instead.
 
                             # Write the vertex group
-                            if EXPORT_POLYGROUPS:
-                                if vertGroupNames:
-                                    # find what vertext group the face belongs to
-                                    vgroup_of_face = findVertexGroupName(f, vgroupsMap)
-                                    if vgroup_of_face != currentVGroup:
-                                        currentVGroup = vgroup_of_face
-                                        fw('g %s\n' % vgroup_of_face)
+                            if faces_vgroup is not None:
+                                # find what vertext group the face belongs to
+                                vgroup_of_face = faces_vgroup[run_start]
+                                if vgroup_of_face != currentVGroup:
+                                    currentVGroup = vgroup_of_face
+                                    fw('g %s\n' % vgroup_of_face)
 
                             # CHECK FOR CONTEXT SWITCH
                             if key == contextMat:
@@ -585,54 +651,26 @@ def write_file(filepath, objects, depsgraph, scene,
                             contextMat = key
                             if f_smooth != contextSmooth:
                                 if f_smooth:  # on now off
-                                    if smooth_groups:
-                                        f_smooth = smooth_groups[f_index]
-                                        fw('s %d\n' % f_smooth)
-                                    else:
-                                        fw('s 1\n')
+                                    fw('s %d\n' % f_smooth)
                                 else:  # was off now on
                                     fw('s off\n')
                                 contextSmooth = f_smooth
 
-                            f_v = [(vi, me_verts[v_idx], l_idx)
-                                   for vi, (v_idx, l_idx) in enumerate(zip(f.vertices, f.loop_indices))]
-
-                            fw('f')
-                            if faceuv:
-                                if EXPORT_NORMALS:
-                                    for vi, v, li in f_v:
-                                        fw(" %d/%d/%d" % (totverts + v.index,
-                                                          totuvco + uv_face_mapping[f_index][vi],
-                                                          totno + loops_to_normals[li],
-                                                          ))  # vert, uv, normal
-                                else:  # No Normals
-                                    for vi, v, li in f_v:
-                                        fw(" %d/%d" % (totverts + v.index,
-                                                       totuvco + uv_face_mapping[f_index][vi],
-                                                       ))  # vert, uv
-
-                                face_vert_index += len(f_v)
-
-                            else:  # No UV's
-                                if EXPORT_NORMALS:
-                                    for vi, v, li in f_v:
-                                        fw(" %d//%d" % (totverts + v.index, totno + loops_to_normals[li]))
-                                else:  # No Normals
-                                    for vi, v, li in f_v:
-                                        fw(" %d" % (totverts + v.index))
-
-                            fw('\n')
+                            write_faces(fw, loop_fmt, faces_loop_total[run_start:run_end],
+                                        loops_values[faces_loop_offset[run_start]:faces_loop_offset[run_end]])
 
                         subprogress2.step()
 
                         # Write edges.
-                        if EXPORT_EDGES:
-                            for ed in edges:
-                                if ed.is_loose:
-                                    fw('l %d %d\n' % (totverts + ed.vertices[0], totverts + ed.vertices[1]))
+                        if EXPORT_EDGES and len(edges):
+                            edges_verts = np.empty(len(edges) * 2, dtype=np.int64)
+                            edges.foreach_get("vertices", edges_verts)
+                            edges_loose = np.empty(len(edges), dtype=bool)
+                            edges.foreach_get("is_loose", edges_loose)
+                            write_rows(fw, 'l %d %d\n', totverts + edges_verts.reshape(-1, 2)[edges_loose])
 
                         # Make the indices global rather then per mesh
-                        totverts += len(me_verts)
+                        totverts += num_verts
                         totuvco += uv_unique_count
                         totno += no_unique_count
 
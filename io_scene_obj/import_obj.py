@@ -34,8 +34,10 @@ http://wiki.blender.org/index.php/Scripts/Manual/Import/wavefront_obj
 import array
 import os
 import time
+import warnings
 import bpy
 import mathutils
+import numpy as np
 
 from bpy_extras.io_utils import unpack_list
 from bpy_extras.image_utils import load_image
@@ -792,6 +794,150 @@ def create_mesh(new_objects,
         group.add(group_indices, 1.0, 'REPLACE')
 
 
+def create_mesh_arrays(new_objects,
+                       verts_loc,
+                       verts_nor,
+                       verts_tex,
+                       loops_loc,
+                       loops_nor,
+                       loops_tex,
+                       faces_loop_total,
+                       faces_material,
+                       faces_smooth_group,
+                       materials,
+                       unique_smooth_groups,
+                       dataname,
+                       ):
+    """
+    Same as create_mesh(), from the NumPy arrays of the fast parser: faces are given as loop totals, and
+    their material indices and smooth group ids (-1 for none). There are no edges nor invalid ngons to handle.
+    """
+    me = bpy.data.meshes.new(dataname)
+
+    for material in materials:
+        me.materials.append(material)
+
+    me.vertices.add(len(verts_loc))
+    me.loops.add(len(loops_loc))
+    me.polygons.add(len(faces_loop_total))
+
+    faces_loop_start = np.cumsum(faces_loop_total, dtype=np.int32) - faces_loop_total
+
+    me.vertices.foreach_set("co", verts_loc.ravel())
+    me.loops.foreach_set("vertex_index", loops_loc)
+    me.polygons.foreach_set("loop_start", faces_loop_start)
+    me.polygons.foreach_set("loop_total", faces_loop_total)
+    me.polygons.foreach_set("material_index", faces_material.astype(np.int32))
+    me.polygons.foreach_set("use_smooth", faces_smooth_group != -1)
+
+    if len(verts_nor) and me.loops:
+        # Note: we store 'temp' normals in loops, since validate() may alter final mesh,
+        #       we can only set custom lnors *after* calling it.
+        me.create_normals_split()
+        me.loops.foreach_set("normal", verts_nor[loops_nor].ravel())
+
+    if len(verts_tex) and me.polygons:
+        me.uv_layers.new(do_init=False)
+        me.uv_layers[0].data.foreach_set("uv", verts_tex[loops_tex].ravel())
+
+    me.validate(clean_customdata=False)  # *Very* important to not remove lnors here!
+    me.update(calc_edges=False, calc_edges_loose=False)
+
+    if unique_smooth_groups:
+        # Edges used by a single face of a smooth group are on its boundary, and sharp
+        in_group = np.repeat(faces_smooth_group != -1, faces_loop_total)
+        loops_next = np.arange(1, len(loops_loc) + 1, dtype=np.int32)
+        loops_next[faces_loop_start + faces_loop_total - 1] = faces_loop_start
+        loops_group = np.repeat(faces_smooth_group, faces_loop_total)[in_group].astype(np.int64)
+        edges_a = loops_loc[in_group].astype(np.int64)
+        edges_b = loops_loc[loops_next[in_group]].astype(np.int64)
+        num_verts = len(verts_loc)
+        edge_keys = np.minimum(edges_a, edges_b) * num_verts + np.maximum(edges_a, edges_b)
+        order = np.lexsort((edge_keys, loops_group))
+        edge_keys = edge_keys[order]
+        loops_group = loops_group[order]
+        is_first = np.ones(len(edge_keys), dtype=bool)
+        is_first[1:] = (edge_keys[1:] != edge_keys[:-1]) | (loops_group[1:] != loops_group[:-1])
+        firsts = np.flatnonzero(is_first)
+        users = np.diff(np.append(firsts, len(edge_keys)))
+        sharp_edges = np.unique(edge_keys[firsts[users == 1]])
+
+        if len(sharp_edges):
+            me_edges = np.empty(len(me.edges) * 2, dtype=np.int64)
+            me.edges.foreach_get("vertices", me_edges)
+            me_edges = me_edges.reshape(-1, 2)
+            me_edge_keys = me_edges.min(axis=1) * num_verts + me_edges.max(axis=1)
+            me.edges.foreach_set("use_edge_sharp", np.isin(me_edge_keys, sharp_edges))
+
+    if len(verts_nor):
+        clnors = np.empty(len(me.loops) * 3, dtype=np.float32)
+        me.loops.foreach_get("normal", clnors)
+
+        if not unique_smooth_groups:
+            me.polygons.foreach_set("use_smooth", np.ones(len(me.polygons), dtype=bool))
+
+        me.normals_split_custom_set(clnors.reshape(-1, 3))
+        me.use_auto_smooth = True
+
+    ob = bpy.data.objects.new(me.name, me)
+    new_objects.append(ob)
+
+
+def create_mesh_fast(new_objects, data, unique_materials, unique_smooth_groups, filepath, SPLIT_OB_OR_GROUP):
+    """
+    Create the mesh from what fast_parse() returns, like split_mesh() and create_mesh() do
+    (the fast parser only handles files with a single object).
+    """
+    verts_loc = data['verts_loc']
+    verts_nor = data['verts_nor']
+    verts_tex = data['verts_tex']
+    loops_loc = data['loops_loc']
+    faces_material = data['faces_material']
+    materials = list(unique_materials.values())
+    dataname = os.path.splitext((os.path.basename(filepath)))[0]
+
+    if not len(data['faces_loop_total']):
+        verts_nor = verts_nor[:0]
+        verts_tex = verts_tex[:0]
+
+    elif SPLIT_OB_OR_GROUP:
+        key = data['object_key']
+        if isinstance(key, bytes):
+            dataname = key.decode('utf-8', 'replace')
+        elif key:
+            dataname = "_".join(k.decode('utf-8', 'replace') for k in key)
+
+        # Only keep the vertices and materials used, in order of first use
+        used, first_use, loops_loc = np.unique(loops_loc, return_index=True, return_inverse=True)
+        order = np.argsort(first_use)
+        remap = np.empty(len(used), dtype=np.int32)
+        remap[order] = np.arange(len(used))
+        loops_loc = remap[loops_loc.ravel()]
+        verts_loc = verts_loc[used[order]]
+
+        used, first_use, faces_material = np.unique(faces_material, return_index=True, return_inverse=True)
+        order = np.argsort(first_use)
+        remap = np.empty(len(used), dtype=np.int32)
+        remap[order] = np.arange(len(used))
+        faces_material = remap[faces_material.ravel()]
+        materials = [materials[i] for i in used[order]]
+
+    create_mesh_arrays(new_objects,
+                       verts_loc,
+                       verts_nor,
+                       verts_tex,
+                       loops_loc,
+                       data['loops_nor'],
+                       data['loops_tex'],
+                       data['faces_loop_total'],
+                       faces_material,
+                       data['faces_smooth_group'],
+                       materials,
+                       unique_smooth_groups,
+                       dataname,
+                       )
+
+
 def create_nurbs(context_nurbs, vert_loc, new_objects):
     """
     Add nurbs object to blender, only support one type at the moment
@@ -902,6 +1048,344 @@ def any_number_as_int(svalue):
     return int(float(svalue))
 
 
+# Size of the chunks read by the fast parser, it works on one chunk at a time
+# (temporary arrays of the size of a chunk are needed for each of its characters).
+FAST_PARSE_CHUNK_SIZE = 1 << 22
+
+
+class FastParseUnsupported(Exception):
+    """The file uses something the fast parser does not handle, the regular parser has to be used."""
+
+
+class FastParseState:
+    """What the fast parser carries over from one chunk to the next, and its results."""
+
+    def __init__(self):
+        # Lists of arrays, one per chunk
+        self.verts_loc = []
+        self.verts_nor = []
+        self.verts_tex = []
+        self.loops_loc = []
+        self.loops_nor = []
+        self.loops_tex = []
+        self.faces_loop_total = []
+        self.faces_context = []  # (material, smooth group, object key) ids of each face, -1 for None
+
+        self.verts_loc_len = self.verts_nor_len = self.verts_tex_len = 0
+
+        self.material_libs = set()
+        self.unique_materials = {}
+        self.unique_smooth_groups = {}
+        self.material_ids = {}
+        self.smooth_group_ids = {}
+        self.object_key_ids = {}
+        self.context = (-1, -1, -1)
+        self.context_object_obpart = None
+        self.faces_object_key = None  # object key id of the faces, once there are faces
+
+
+def _fast_id(ids, value):
+    if value is None:
+        return -1
+    return ids.setdefault(value, len(ids))
+
+
+def _fast_parse_statements(chunk, starts, ends, state, object_name,
+                           use_smooth_groups, use_edges, use_split_objects, use_split_groups, use_groups_as_vgroups):
+    """
+    Handle the lines which are neither vertices nor faces (there are few of them) like load() does.
+    Returns the (material, smooth group, object key) context after each of them.
+    """
+    contexts = []
+    context_material, context_smooth_group, context_object_key = state.context
+
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        line = chunk[start:end]
+        line_split = line.split()
+        line_start = line_split[0]
+
+        if len(line_split) == 1 and line_start != b'end':
+            print("WARNING, skipping malformatted line: %s" % line.decode('UTF-8', 'replace').rstrip())
+
+        elif line_start in {b'v', b'vn', b'vt', b'f', b'cstype', b'curv', b'parm', b'deg', b'end'} or \
+                (use_edges and line_start == b'l'):
+            raise FastParseUnsupported(line_start.decode('UTF-8', 'replace'))
+
+        elif line_start == b's':
+            if use_smooth_groups:
+                smooth_group = line_value(line_split)
+                if smooth_group == b'off':
+                    smooth_group = None
+                elif smooth_group:  # is not None
+                    state.unique_smooth_groups[smooth_group] = None
+                context_smooth_group = _fast_id(state.smooth_group_ids, smooth_group)
+
+        elif line_start == b'o':
+            if use_split_objects:
+                state.context_object_obpart = object_name(line_value(line_split))
+                context_object_key = _fast_id(state.object_key_ids, state.context_object_obpart)
+
+        elif line_start == b'g':
+            if use_split_groups:
+                grppart = line_value(line_split)
+                obpart = state.context_object_obpart
+                context_object_key = _fast_id(state.object_key_ids, (obpart, grppart) if obpart else grppart)
+            elif use_groups_as_vgroups:
+                context_vgroup = line_value(line.split())
+                if context_vgroup and context_vgroup != b'(null)':
+                    raise FastParseUnsupported("vertex groups")
+
+        elif line_start == b'usemtl':
+            material = line_value(line.split())
+            state.unique_materials[material] = None
+            context_material = _fast_id(state.material_ids, material)
+
+        elif line_start == b'mtllib':
+            state.material_libs |= {os.fsdecode(f) for f in filenames_group_by_ext(line.lstrip()[7:].strip(), b'.mtl')}
+
+        contexts.append((context_material, context_smooth_group, context_object_key))
+
+    return contexts
+
+
+def _fast_parse_values(buf, tokens_cs, starts, ends, keyword_len, dtype):
+    """
+    Parse the values of the given lines (after their keyword) in one go.
+    Returns the flat values and the number of values on each line.
+    """
+    counts = tokens_cs[ends] - tokens_cs[starts] - 1
+    # Select all the characters after the keywords, line breaks included as separators
+    marks = np.zeros(len(buf) + 1, dtype=np.int8)
+    marks[starts + keyword_len] = 1
+    marks[ends + 1] = -1
+    text = buf[np.cumsum(marks[:-1], dtype=np.int8).view(bool)].tobytes()
+    del marks
+    if dtype is not float:
+        text = text.replace(b'/', b' ')
+    with warnings.catch_warnings():
+        # Parse errors are only reported as a warning
+        warnings.simplefilter('error')
+        try:
+            values = np.fromstring(text, dtype=dtype, sep=' ')
+        except (ValueError, DeprecationWarning):
+            raise FastParseUnsupported("unexpected values")
+    return values, counts
+
+
+def _fast_first_columns(values, counts, num, min_count):
+    """Return the first num values of each line as a (lines, num) array, padded with zeros."""
+    if len(values) != counts.sum() or counts.min() < min_count:
+        raise FastParseUnsupported("missing values")
+    if (counts == counts[0]).all() and counts[0] >= num:
+        return values.reshape(-1, counts[0])[:, :num].astype(np.float32)
+    offsets = np.cumsum(counts) - counts
+    columns = np.zeros((len(counts), num), dtype=np.float32)
+    for i in range(num):
+        has = counts > i
+        columns[has, i] = values[offsets[has] + i]
+    return columns
+
+
+def _fast_parse_chunk(chunk, state, object_name, use_smooth_groups, use_edges,
+                      use_split_objects, use_split_groups, use_groups_as_vgroups):
+    """Parse a chunk of complete lines (it must end with a line break)."""
+    if b'\\' in chunk:
+        raise FastParseUnsupported("multi-line statements")
+
+    buf = np.frombuffer(chunk, dtype=np.uint8)
+    size = len(buf)
+    ends = np.flatnonzero(buf == ord('\n'))
+    starts = np.empty_like(ends)
+    starts[:1] = 0
+    starts[1:] = ends[:-1] + 1
+
+    is_space = (buf == ord(' ')) | ((buf >= ord('\t')) & (buf <= ord('\r')))
+    token_start = ~is_space
+    token_start[1:] &= is_space[:-1]
+    # Chunks are far below 2**31 characters, int32 running counts are enough
+    tokens_cs = np.zeros(size + 1, dtype=np.int32)
+    np.cumsum(token_start, out=tokens_cs[1:])
+    line_tokens = tokens_cs[ends] - tokens_cs[starts]
+
+    # Kind of the lines from their first characters, keywords have to be followed by a space
+    c0 = buf[starts]
+    c1 = buf[np.minimum(starts + 1, size - 1)]
+    space1 = is_space[np.minimum(starts + 1, size - 1)]
+    space2 = is_space[np.minimum(starts + 2, size - 1)]
+    is_v = (c0 == ord('v')) & space1
+    is_vt = (c0 == ord('v')) & (c1 == ord('t')) & space2
+    is_vn = (c0 == ord('v')) & (c1 == ord('n')) & space2
+    is_f = (c0 == ord('f')) & space1
+    statement_lines = np.flatnonzero(~(is_v | is_vt | is_vn | is_f) & (line_tokens > 0) & (c0 != ord('#')))
+    del c0, c1, space1, space2, line_tokens
+
+    context_lines = np.concatenate(([-1], statement_lines))
+    contexts = [state.context]
+    contexts += _fast_parse_statements(
+        chunk, starts[statement_lines], ends[statement_lines], state, object_name,
+        use_smooth_groups, use_edges, use_split_objects, use_split_groups, use_groups_as_vgroups)
+    contexts = np.array(contexts, dtype=np.int32)
+    state.context = tuple(contexts[-1].tolist())
+
+    # Contexts of a face are the ones set by the last statement before it
+    face_lines = np.flatnonzero(is_f)
+    faces_context = contexts[np.searchsorted(context_lines, face_lines) - 1]
+    if len(face_lines):
+        # Checked before parsing any value, the regular parser handles several objects anyway
+        if state.faces_object_key is None:
+            state.faces_object_key = int(faces_context[0, 2])
+        if (faces_context[:, 2] != state.faces_object_key).any():
+            raise FastParseUnsupported("several objects")
+
+    for is_kind, keyword_len, num, min_count, data in (
+            (is_v, 1, 3, 3, state.verts_loc),
+            (is_vn, 2, 3, 3, state.verts_nor),
+            (is_vt, 2, 2, 1, state.verts_tex),
+    ):
+        if is_kind.any():
+            values, counts = _fast_parse_values(buf, tokens_cs, starts[is_kind], ends[is_kind], keyword_len, float)
+            data.append(_fast_first_columns(values, counts, num, min_count))
+
+    if len(face_lines):
+        face_starts = starts[face_lines]
+        face_ends = ends[face_lines]
+        values, loop_totals = _fast_parse_values(buf, tokens_cs, face_starts, face_ends, 1, np.int64)
+        if loop_totals.min() < 3:
+            raise FastParseUnsupported("edges or single vertex faces")
+
+        # All face corners have to be written the same way: v, v/vt, v/vt/vn or v//vn
+        in_faces = np.zeros(size + 1, dtype=np.int8)
+        in_faces[face_starts + 1] = 1
+        in_faces[face_ends + 1] = -1
+        in_faces = np.cumsum(in_faces[:-1], dtype=np.int8).view(bool)
+        token_end = ~is_space
+        token_end[:-1] &= is_space[1:]
+        corner_starts = np.flatnonzero(token_start & in_faces)
+        corner_ends = np.flatnonzero(token_end & in_faces) + 1
+        del in_faces, token_end
+        is_slash = buf == ord('/')
+        slashes_cs = np.zeros(size + 1, dtype=np.int32)
+        np.cumsum(is_slash, out=slashes_cs[1:])
+        doubles_cs = np.zeros(size + 1, dtype=np.int32)
+        np.cumsum(is_slash[:-1] & is_slash[1:], out=doubles_cs[2:])
+        slashes = np.unique(slashes_cs[corner_ends] - slashes_cs[corner_starts])
+        doubles = np.unique(doubles_cs[corner_ends] - doubles_cs[corner_starts + 1])
+        del is_slash, slashes_cs, doubles_cs, corner_starts, corner_ends
+        if len(slashes) != 1 or len(doubles) != 1:
+            raise FastParseUnsupported("mixed face formats")
+        # Column of the vertex, texture and normal indices
+        columns = {(0, 0): (0, None, None), (1, 0): (0, 1, None), (2, 0): (0, 1, 2), (2, 1): (0, None, 1)}.get(
+            (int(slashes[0]), int(doubles[0])))
+        num_columns = 1 + int(slashes[0]) - int(doubles[0])
+        if columns is None or len(values) != loop_totals.sum() * num_columns:
+            raise FastParseUnsupported("unexpected face format")
+        values = values.reshape(-1, num_columns)
+
+        # Relative (negative) indices count back from the amount of data read before the face
+        for column, is_kind, kind_len, loops in (
+                (columns[0], is_v, state.verts_loc_len, state.loops_loc),
+                (columns[1], is_vt, state.verts_tex_len, state.loops_tex),
+                (columns[2], is_vn, state.verts_nor_len, state.loops_nor),
+        ):
+            if column is None:
+                # Like load() does, missing indices default to 0
+                loops.append(np.zeros(len(values), dtype=np.int32))
+                continue
+            indices = values[:, column]
+            before = np.repeat(kind_len + np.cumsum(is_kind)[face_lines], loop_totals)
+            resolved = np.where(indices < 1, indices + before, indices - 1)
+            if loops is not state.loops_loc:
+                resolved[indices == 0] = 0
+            loops.append(resolved.astype(np.int32))
+
+        state.faces_loop_total.append(loop_totals.astype(np.int32))
+        state.faces_context.append(faces_context)
+
+    state.verts_loc_len += int(np.count_nonzero(is_v))
+    state.verts_tex_len += int(np.count_nonzero(is_vt))
+    state.verts_nor_len += int(np.count_nonzero(is_vn))
+
+
+def fast_parse(filepath, object_name, use_smooth_groups, use_edges,
+               use_split_objects, use_split_groups, use_groups_as_vgroups):
+    """
+    Parse plain v/vt/vn/f content with NumPy, a large chunk of the file at a time.
+    Raises FastParseUnsupported for anything else (nurbs, multi-line statements, polylines, invalid faces,
+    several objects...).
+    """
+    state = FastParseState()
+    parse_args = (state, object_name, use_smooth_groups, use_edges,
+                  use_split_objects, use_split_groups, use_groups_as_vgroups)
+
+    with open(filepath, 'rb') as f:
+        tail = b''
+        while True:
+            data = f.read(FAST_PARSE_CHUNK_SIZE)
+            if not data:
+                if tail.strip():
+                    _fast_parse_chunk(tail + b'\n', *parse_args)
+                break
+            data = tail + data
+            cut = data.rfind(b'\n') + 1
+            tail = data[cut:]
+            if cut:
+                _fast_parse_chunk(data[:cut], *parse_args)
+
+    def concatenate(arrays, shape, dtype):
+        return np.concatenate(arrays) if arrays else np.empty(shape, dtype=dtype)
+
+    verts_loc = concatenate(state.verts_loc, (0, 3), np.float32)
+    verts_nor = concatenate(state.verts_nor, (0, 3), np.float32)
+    verts_tex = concatenate(state.verts_tex, (0, 2), np.float32)
+    state.verts_loc = state.verts_nor = state.verts_tex = None
+    loops_loc = concatenate(state.loops_loc, 0, np.int32)
+    loops_nor = concatenate(state.loops_nor, 0, np.int32)
+    loops_tex = concatenate(state.loops_tex, 0, np.int32)
+    state.loops_loc = state.loops_nor = state.loops_tex = None
+    faces_loop_total = concatenate(state.faces_loop_total, 0, np.int32)
+    faces_context = concatenate(state.faces_context, (0, 3), np.int32)
+
+    if len(loops_loc) and (loops_loc.min() < 0 or loops_loc.max() >= len(verts_loc)):
+        raise FastParseUnsupported("invalid vertex indices")
+    for loops, verts in ((loops_nor, verts_nor), (loops_tex, verts_tex)):
+        if len(verts) and len(loops) and (loops.min() < 0 or loops.max() >= len(verts)):
+            raise FastParseUnsupported("invalid indices")
+
+    # Faces using a vertex more than once may be invalid ngons, which need tessellation
+    faces_loop_start = np.cumsum(faces_loop_total) - faces_loop_total
+    for loop_total in np.unique(faces_loop_total):
+        face_loops = loops_loc[faces_loop_start[faces_loop_total == loop_total, None] + np.arange(loop_total)]
+        face_loops.sort(axis=1)
+        if (face_loops[:, 1:] == face_loops[:, :-1]).any():
+            raise FastParseUnsupported("faces using a vertex more than once")
+
+    material_ids = faces_context[:, 0]
+    if (material_ids == -1).any():
+        # Like load() does, faces without material use a default one, added last
+        state.unique_materials[None] = None
+        material_ids = np.where(material_ids == -1, len(state.material_ids), material_ids)
+
+    object_key = None
+    if len(faces_context) and faces_context[0, 2] != -1:
+        object_key = list(state.object_key_ids)[faces_context[0, 2]]
+
+    return {
+        'verts_loc': verts_loc,
+        'verts_nor': verts_nor,
+        'verts_tex': verts_tex,
+        'loops_loc': loops_loc,
+        'loops_nor': loops_nor,
+        'loops_tex': loops_tex,
+        'faces_loop_total': faces_loop_total,
+        'faces_material': material_ids,
+        'faces_smooth_group': faces_context[:, 1],
+        'object_key': object_key,
+        'material_libs': state.material_libs,
+        'unique_materials': state.unique_materials,
+        'unique_smooth_groups': state.unique_smooth_groups,
+    }
+
+
 def load(context,
          filepath,
          *,
@@ -1016,231 +1500,248 @@ def load(context,
         skip_quick_vert = False
 
         progress.enter_substeps(3, "Parsing OBJ file...")
-        with open(filepath, 'rb') as f:
-            for line in f:
-                line_split = line.split()
-
-                if not line_split:
-                    continue
-
-                line_start = line_split[0]  # we compare with this a _lot_
-
-                if len(line_split) == 1 and not context_multi_line and line_start != b'end':
-                    print("WARNING, skipping malformatted line: %s" % line.decode('UTF-8', 'replace').rstrip())
-                    continue
-
-                # Handling vertex data are pretty similar, factorize that.
-                # Also, most OBJ files store all those on a single line, so try fast parsing for that first,
-                # and only fallback to full multi-line parsing when needed, this gives significant speed-up
-                # (~40% on affected code).
-                if line_start == b'v':
-                    vdata, vdata_len, do_quick_vert = verts_loc, 3, not skip_quick_vert
-                elif line_start == b'vn':
-                    vdata, vdata_len, do_quick_vert = verts_nor, 3, not skip_quick_vert
-                elif line_start == b'vt':
-                    vdata, vdata_len, do_quick_vert = verts_tex, 2, not skip_quick_vert
-                elif context_multi_line == b'v':
-                    vdata, vdata_len, do_quick_vert = verts_loc, 3, False
-                elif context_multi_line == b'vn':
-                    vdata, vdata_len, do_quick_vert = verts_nor, 3, False
-                elif context_multi_line == b'vt':
-                    vdata, vdata_len, do_quick_vert = verts_tex, 2, False
-                else:
-                    vdata_len = 0
-
-                if vdata_len:
-                    if do_quick_vert:
-                        try:
-                            vdata.append(list(map(float_func, line_split[1:vdata_len + 1])))
-                        except:
-                            do_quick_vert = False
-                            # In case we get too many failures on quick parsing, force fallback to full multi-line one.
-                            # Exception handling can become costly...
-                            quick_vert_failures += 1
-                            if quick_vert_failures > 10000:
-                                skip_quick_vert = True
-                    if not do_quick_vert:
-                        context_multi_line = handle_vec(line_start, context_multi_line, line_split,
-                                                        context_multi_line or line_start,
-                                                        vdata, vec, vdata_len)
-
-                elif line_start == b'f' or context_multi_line == b'f':
-                    if not context_multi_line:
-                        line_split = line_split[1:]
-                        # Instantiate a face
-                        face = create_face(context_material, context_smooth_group, context_object_key)
-                        (face_vert_loc_indices, face_vert_nor_indices, face_vert_tex_indices,
-                         _1, _2, _3, face_invalid_blenpoly) = face
-                        faces.append(face)
-                        face_items_usage.clear()
-                        verts_loc_len = len(verts_loc)
-                        verts_nor_len = len(verts_nor)
-                        verts_tex_len = len(verts_tex)
-                        if context_material is None:
-                            use_default_material = True
-                    # Else, use face_vert_loc_indices and face_vert_tex_indices previously defined and used the obj_face
-
-                    context_multi_line = b'f' if strip_slash(line_split) else b''
-
-                    for v in line_split:
-                        obj_vert = v.split(b'/')
-                        idx = int(obj_vert[0])  # Note that we assume here we cannot get OBJ invalid 0 index...
-                        vert_loc_index = (idx + verts_loc_len) if (idx < 1) else idx - 1
-                        # Add the vertex to the current group
-                        # *warning*, this wont work for files that have groups defined around verts
-                        if use_groups_as_vgroups and context_vgroup:
-                            vertex_groups[context_vgroup].append(vert_loc_index)
-                        # This a first round to quick-detect ngons that *may* use a same edge more than once.
-                        # Potential candidate will be re-checked once we have done parsing the whole face.
-                        if not face_invalid_blenpoly:
-                            # If we use more than once a same vertex, invalid ngon is suspected.
-                            if vert_loc_index in face_items_usage:
-                                face_invalid_blenpoly.append(True)
-                            else:
-                                face_items_usage.add(vert_loc_index)
-                        face_vert_loc_indices.append(vert_loc_index)
-
-                        # formatting for faces with normals and textures is
-                        # loc_index/tex_index/nor_index
-                        if len(obj_vert) > 1 and obj_vert[1] and obj_vert[1] != b'0':
-                            idx = int(obj_vert[1])
-                            face_vert_tex_indices.append((idx + verts_tex_len) if (idx < 1) else idx - 1)
-                        else:
-                            face_vert_tex_indices.append(0)
-
-                        if len(obj_vert) > 2 and obj_vert[2] and obj_vert[2] != b'0':
-                            idx = int(obj_vert[2])
-                            face_vert_nor_indices.append((idx + verts_nor_len) if (idx < 1) else idx - 1)
-                        else:
-                            face_vert_nor_indices.append(0)
-
-                    if not context_multi_line:
-                        # Means we have finished a face, we have to do final check if ngon is suspected to be blender-invalid...
-                        if face_invalid_blenpoly:
-                            face_invalid_blenpoly.clear()
+        fast_data = None
+        if float_func is float:
+            try:
+                fast_data = fast_parse(filepath, lambda name: unique_name(objects_names, name),
+                                       use_smooth_groups, use_edges,
+                                       use_split_objects, use_split_groups, use_groups_as_vgroups)
+            except FastParseUnsupported as e:
+                print("Fast parsing is not possible (%s), falling back to regular parsing" % e)
+                objects_names.clear()
+
+        if fast_data is not None:
+            verts_loc = fast_data['verts_loc']
+            faces = fast_data['faces_loop_total']
+            material_libs = fast_data['material_libs']
+            unique_materials = fast_data['unique_materials']
+            unique_smooth_groups = fast_data['unique_smooth_groups']
+        else:
+            with open(filepath, 'rb') as f:
+                for line in f:
+                    line_split = line.split()
+
+                    if not line_split:
+                        continue
+
+                    line_start = line_split[0]  # we compare with this a _lot_
+
+                    if len(line_split) == 1 and not context_multi_line and line_start != b'end':
+                        print("WARNING, skipping malformatted line: %s" % line.decode('UTF-8', 'replace').rstrip())
+                        continue
+
+                    # Handling vertex data are pretty similar, factorize that.
+                    # Also, most OBJ files store all those on a single line, so try fast parsing for that first,
+                    # and only fallback to full multi-line parsing when needed, this gives significant speed-up
+                    # (~40% on affected code).
+                    if line_start == b'v':
+                        vdata, vdata_len, do_quick_vert = verts_loc, 3, not skip_quick_vert
+                    elif line_start == b'vn':
+                        vdata, vdata_len, do_quick_vert = verts_nor, 3, not skip_quick_vert
+                    elif line_start == b'vt':
+                        vdata, vdata_len, do_quick_vert = verts_tex, 2, not skip_quick_vert
+                    elif context_multi_line == b'v':
+                        vdata, vdata_len, do_quick_vert = verts_loc, 3, False
+                    elif context_multi_line == b'vn':
+                        vdata, vdata_len, do_quick_vert = verts_nor, 3, False
+                    elif context_multi_line == b'vt':
+                        vdata, vdata_len, do_quick_vert = verts_tex, 2, False
+                    else:
+                        vdata_len = 0
+
+                    if vdata_len:
+                        if do_quick_vert:
+                            try:
+                                vdata.append(list(map(float_func, line_split[1:vdata_len + 1])))
+                            except:
+                                do_quick_vert = False
+                                # In case we get too many failures on quick parsing, force fallback to full multi-line one.
+                                # Exception handling can become costly...
+                                quick_vert_failures += 1
+                                if quick_vert_failures > 10000:
+                                    skip_quick_vert = True
+                        if not do_quick_vert:
+                            context_multi_line = handle_vec(line_start, context_multi_line, line_split,
+                                                            context_multi_line or line_start,
+                                                            vdata, vec, vdata_len)
+
+                    elif line_start == b'f' or context_multi_line == b'f':
+                        if not context_multi_line:
+                            line_split = line_split[1:]
+                            # Instantiate a face
+                            face = create_face(context_material, context_smooth_group, context_object_key)
+                            (face_vert_loc_indices, face_vert_nor_indices, face_vert_tex_indices,
+                             _1, _2, _3, face_invalid_blenpoly) = face
+                            faces.append(face)
                             face_items_usage.clear()
-                            prev_vidx = face_vert_loc_indices[-1]
-                            for vidx in face_vert_loc_indices:
-                                edge_key = (prev_vidx, vidx) if (prev_vidx < vidx) else (vidx, prev_vidx)
-                                if edge_key in face_items_usage:
+                            verts_loc_len = len(verts_loc)
+                            verts_nor_len = len(verts_nor)
+                            verts_tex_len = len(verts_tex)
+                            if context_material is None:
+                                use_default_material = True
+                        # Else, use face_vert_loc_indices and face_vert_tex_indices previously defined and used the obj_face
+
+                        context_multi_line = b'f' if strip_slash(line_split) else b''
+
+                        for v in line_split:
+                            obj_vert = v.split(b'/')
+                            idx = int(obj_vert[0])  # Note that we assume here we cannot get OBJ invalid 0 index...
+                            vert_loc_index = (idx + verts_loc_len) if (idx < 1) else idx - 1
+                            # Add the vertex to the current group
+                            # *warning*, this wont work for files that have groups defined around verts
+                            if use_groups_as_vgroups and context_vgroup:
+                                vertex_groups[context_vgroup].append(vert_loc_index)
+                            # This a first round to quick-detect ngons that *may* use a same edge more than once.
+                            # Potential candidate will be re-checked once we have done parsing the whole face.
+                            if not face_invalid_blenpoly:
+                                # If we use more than once a same vertex, invalid ngon is suspected.
+                                if vert_loc_index in face_items_usage:
                                     face_invalid_blenpoly.append(True)
-                                    break
-                                face_items_usage.add(edge_key)
-                                prev_vidx = vidx
+                                else:
+                                    face_items_usage.add(vert_loc_index)
+                            face_vert_loc_indices.append(vert_loc_index)
+
+                            # formatting for faces with normals and textures is
+                            # loc_index/tex_index/nor_index
+                            if len(obj_vert) > 1 and obj_vert[1] and obj_vert[1] != b'0':
+                                idx = int(obj_vert[1])
+                                face_vert_tex_indices.append((idx + verts_tex_len) if (idx < 1) else idx - 1)
+                            else:
+                                face_vert_tex_indices.append(0)
 
-                elif use_edges and (line_start == b'l' or context_multi_line == b'l'):
-                    # very similar to the face load function above with some parts removed
-                    if not context_multi_line:
-                        line_split = line_split[1:]
-                        # Instantiate a face
-                        face = create_face(context_material, context_smooth_group, context_object_key)
-                        face_vert_loc_indices = face[0]
-                        # XXX A bit hackish, we use special 'value' of face_vert_nor_indices (a single True item) to tag this
-                        #     as a polyline, and not a regular face...
-                        face[1][:] = [True]
-                        faces.append(face)
-                        if context_material is None:
-                            use_default_material = True
-                    # Else, use face_vert_loc_indices previously defined and used the obj_face
-
-                    context_multi_line = b'l' if strip_slash(line_split) else b''
-
-                    for v in line_split:
-                        obj_vert = v.split(b'/')
-                        idx = int(obj_vert[0]) - 1
-                        face_vert_loc_indices.append((idx + len(verts_loc) + 1) if (idx < 0) else idx)
-
-                elif line_start == b's':
-                    if use_smooth_groups:
-                        context_smooth_group = line_value(line_split)
-                        if context_smooth_group == b'off':
-                            context_smooth_group = None
-                        elif context_smooth_group:  # is not None
-                            unique_smooth_groups[context_smooth_group] = None
-
-                elif line_start == b'o':
-                    if use_split_objects:
-                        context_object_key = unique_name(objects_names, line_value(line_split))
-                        context_object_obpart = context_object_key
-                        # unique_objects[context_object_key]= None
-
-                elif line_start == b'g':
-                    if use_split_groups:
-                        grppart = line_value(line_split)
-                        context_object_key = (context_object_obpart, grppart) if context_object_obpart else grppart
-                        # print 'context_object_key', context_object_key
-                        # unique_objects[context_object_key]= None
-                    elif use_groups_as_vgroups:
-                        context_vgroup = line_value(line.split())
-                        if context_vgroup and context_vgroup != b'(null)':
-                            vertex_groups.setdefault(context_vgroup, [])
+                            if len(obj_vert) > 2 and obj_vert[2] and obj_vert[2] != b'0':
+                                idx = int(obj_vert[2])
+                                face_vert_nor_indices.append((idx + verts_nor_len) if (idx < 1) else idx - 1)
+                            else:
+                                face_vert_nor_indices.append(0)
+
+                        if not context_multi_line:
+                            # Means we have finished a face, we have to do final check if ngon is suspected to be blender-invalid...
+                            if face_invalid_blenpoly:
+                                face_invalid_blenpoly.clear()
+                                face_items_usage.clear()
+                                prev_vidx = face_vert_loc_indices[-1]
+                                for vidx in face_vert_loc_indices:
+                                    edge_key = (prev_vidx, vidx) if (prev_vidx < vidx) else (vidx, prev_vidx)
+                                    if edge_key in face_items_usage:
+                                        face_invalid_blenpoly.append(True)
+                                        break
+                                    face_items_usage.add(edge_key)
+                                    prev_vidx = vidx
+
+                    elif use_edges and (line_start == b'l' or context_multi_line == b'l'):
+                        # very similar to the face load function above with some parts removed
+                        if not context_multi_line:
+                            line_split = line_split[1:]
+                            # Instantiate a face
+                            face = create_face(context_material, context_smooth_group, context_object_key)
+                            face_vert_loc_indices = face[0]
+                            # XXX A bit hackish, we use special 'value' of face_vert_nor_indices (a single True item) to tag this
+                            #     as a polyline, and not a regular face...
+                            face[1][:] = [True]
+                            faces.append(face)
+                            if context_material is None:
+                                use_default_material = True
+                        # Else, use face_vert_loc_indices previously defined and used the obj_face
+
+                        context_multi_line = b'l' if strip_slash(line_split) else b''
+
+                        for v in line_split:
+                            obj_vert = v.split(b'/')
+                            idx = int(obj_vert[0]) - 1
+                            face_vert_loc_indices.append((idx + len(verts_loc) + 1) if (idx < 0) else idx)
+
+                    elif line_start == b's':
+                        if use_smooth_groups:
+                            context_smooth_group = line_value(line_split)
+                            if context_smooth_group == b'off':
+                                context_smooth_group = None
+                            elif context_smooth_group:  # is not None
+                                unique_smooth_groups[context_smooth_group] = None
+
+                    elif line_start == b'o':
+                        if use_split_objects:
+                            context_object_key = unique_name(objects_names, line_value(line_split))
+                            context_object_obpart = context_object_key
+                            # unique_objects[context_object_key]= None
+
+                    elif line_start == b'g':
+                        if use_split_groups:
+                            grppart = line_value(line_split)
+                            context_object_key = (context_object_obpart, grppart) if context_object_obpart else grppart
+                            # print 'context_object_key', context_object_key
+                            # unique_objects[context_object_key]= None
+                        elif use_groups_as_vgroups:
+                            context_vgroup = line_value(line.split())
+                            if context_vgroup and context_vgroup != b'(null)':
+                                vertex_groups.setdefault(context_vgroup, [])
+                            else:
+                                context_vgroup = None  # dont assign a vgroup
+
+                    elif line_start == b'usemtl':
+                        context_material = line_value(line.split())
+                        unique_materials[context_material] = None
+                    elif line_start == b'mtllib':  # usemap or usemat
+                        # can have multiple mtllib filenames per line, mtllib can appear more than once,
+                        # so make sure only occurrence of material exists
+                        material_libs |= {os.fsdecode(f) for f in filenames_group_by_ext(line.lstrip()[7:].strip(), b'.mtl')
+                        }
+
+                        # Nurbs support
+                    elif line_start == b'cstype':
+                        context_nurbs[b'cstype'] = line_value(line.split())  # 'rat bspline' / 'bspline'
+                    elif line_start == b'curv' or context_multi_line == b'curv':
+                        curv_idx = context_nurbs[b'curv_idx'] = context_nurbs.get(b'curv_idx', [])  # in case were multiline
+
+                        if not context_multi_line:
+                            context_nurbs[b'curv_range'] = float_func(line_split[1]), float_func(line_split[2])
+                            line_split[0:3] = []  # remove first 3 items
+
+                        if strip_slash(line_split):
+                            context_multi_line = b'curv'
                         else:
-                            context_vgroup = None  # dont assign a vgroup
-
-                elif line_start == b'usemtl':
-                    context_material = line_value(line.split())
-                    unique_materials[context_material] = None
-                elif line_start == b'mtllib':  # usemap or usemat
-                    # can have multiple mtllib filenames per line, mtllib can appear more than once,
-                    # so make sure only occurrence of material exists
-                    material_libs |= {os.fsdecode(f) for f in filenames_group_by_ext(line.lstrip()[7:].strip(), b'.mtl')
-                    }
-
-                    # Nurbs support
-                elif line_start == b'cstype':
-                    context_nurbs[b'cstype'] = line_value(line.split())  # 'rat bspline' / 'bspline'
-                elif line_start == b'curv' or context_multi_line == b'curv':
-                    curv_idx = context_nurbs[b'curv_idx'] = context_nurbs.get(b'curv_idx', [])  # in case were multiline
-
-                    if not context_multi_line:
-                        context_nurbs[b'curv_range'] = float_func(line_split[1]), float_func(line_split[2])
-                        line_split[0:3] = []  # remove first 3 items
-
-                    if strip_slash(line_split):
-                        context_multi_line = b'curv'
-                    else:
-                        context_multi_line = b''
+                            context_multi_line = b''
 
-                    for i in line_split:
-                        vert_loc_index = int(i) - 1
+                        for i in line_split:
+                            vert_loc_index = int(i) - 1
 
-                        if vert_loc_index < 0:
-                            vert_loc_index = len(verts_loc) + vert_loc_index + 1
+                            if vert_loc_index < 0:
+                                vert_loc_index = len(verts_loc) + vert_loc_index + 1
 
-                        curv_idx.append(vert_loc_index)
+                            curv_idx.append(vert_loc_index)
 
-                elif line_start == b'parm' or context_multi_line == b'parm':
-                    if context_multi_line:
-                        context_multi_line = b''
-                    else:
-                        context_parm = line_split[1]
-                        line_split[0:2] = []  # remove first 2
+                    elif line_start == b'parm' or context_multi_line == b'parm':
+                        if context_multi_line:
+                            context_multi_line = b''
+                        else:
+                            context_parm = line_split[1]
+                            line_split[0:2] = []  # remove first 2
 
-                    if strip_slash(line_split):
-                        context_multi_line = b'parm'
-                    else:
-                        context_multi_line = b''
-
-                    if context_parm.lower() == b'u':
-                        context_nurbs.setdefault(b'parm_u', []).extend([float_func(f) for f in line_split])
-                    elif context_parm.lower() == b'v':  # surfaces not supported yet
-                        context_nurbs.setdefault(b'parm_v', []).extend([float_func(f) for f in line_split])
-                    # else: # may want to support other parm's ?
-
-                elif line_start == b'deg':
-                    context_nurbs[b'deg'] = [int(i) for i in line.split()[1:]]
-                elif line_start == b'end':
-                    # Add the nurbs curve
-                    if context_object_key:
-                        context_nurbs[b'name'] = context_object_key
-                    nurbs.append(context_nurbs)
-                    context_nurbs = {}
-                    context_parm = b''
-
-                ''' # How to use usemap? deprecated?
-                elif line_start == b'usema': # usemap or usemat
-                    context_image= line_value(line_split)
-                '''
+                        if strip_slash(line_split):
+                            context_multi_line = b'parm'
+                        else:
+                            context_multi_line = b''
+
+                        if context_parm.lower() == b'u':
+                            context_nurbs.setdefault(b'parm_u', []).extend([float_func(f) for f in line_split])
+                        elif context_parm.lower() == b'v':  # surfaces not supported yet
+                            context_nurbs.setdefault(b'parm_v', []).extend([float_func(f) for f in line_split])
+                        # else: # may want to support other parm's ?
+
+                    elif line_start == b'deg':
+                        context_nurbs[b'deg'] = [int(i) for i in line.split()[1:]]
+                    elif line_start == b'end':
+                        # Add the nurbs curve
+                        if context_object_key:
+                            context_nurbs[b'name'] = context_object_key
+                        nurbs.append(context_nurbs)
+                        context_nurbs = {}
+                        context_parm = b''
+
+                    ''' # How to use usemap? deprecated?
+                    elif line_start == b'usema': # usemap or usemat
+                        context_image= line_value(line_split)
+                    '''
 
         progress.step("Done, loading materials and images...")
 
@@ -1261,21 +1762,25 @@ def load(context,
         # Split the mesh by objects/materials, may
         SPLIT_OB_OR_GROUP = bool(use_split_objects or use_split_groups)
 
-        for data in split_mesh(verts_loc, faces, unique_materials, filepath, SPLIT_OB_OR_GROUP):
-            verts_loc_split, faces_split, unique_materials_split, dataname, use_vnor, use_vtex = data
-            # Create meshes from the data, warning 'vertex_groups' wont support splitting
-            #~ print(dataname, use_vnor, use_vtex)
-            create_mesh(new_objects,
-                        use_edges,
-                        verts_loc_split,
-                        verts_nor if use_vnor else [],
-                        verts_tex if use_vtex else [],
-                        faces_split,
-                        unique_materials_split,
-                        unique_smooth_groups,
-                        vertex_groups,
-                        dataname,
-                        )
+        if fast_data is not None:
+            create_mesh_fast(new_objects, fast_data, unique_materials, unique_smooth_groups,
+                             filepath, SPLIT_OB_OR_GROUP)
+        else:
+            for data in split_mesh(verts_loc, faces, unique_materials, filepath, SPLIT_OB_OR_GROUP):
+                verts_loc_split, faces_split, unique_materials_split, dataname, use_vnor, use_vtex = data
+                # Create meshes from the data, warning 'vertex_groups' wont support splitting
+                #~ print(dataname, use_vnor, use_vtex)
+                create_mesh(new_objects,
+                            use_edges,
+                            verts_loc_split,
+                            verts_nor if use_vnor else [],
+                            verts_tex if use_vtex else [],
+                            faces_split,
+                            unique_materials_split,
+                            unique_smooth_groups,
+                            vertex_groups,
+                            dataname,
+                            )
 
         # nurbs support
         for context_nurbs in nurbs:
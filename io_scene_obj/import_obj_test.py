@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+
+import os
+import sys
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+import numpy as np
+
+
+# Minimal stand-ins for what load() uses besides parsing, no mesh is created (create_mesh() is never reached).
+
+class FakeProgressReport:
+    def __init__(self, wm):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def enter_substeps(self, *args):
+        pass
+
+    def step(self, *args):
+        pass
+
+    def leave_substeps(self, *args):
+        pass
+
+
+fake_bpy = types.ModuleType("bpy")
+fake_bpy.ops = types.SimpleNamespace(object=types.SimpleNamespace(select_all=types.SimpleNamespace(poll=lambda: False)))
+
+fake_context = types.SimpleNamespace(
+    window_manager=None,
+    view_layer=types.SimpleNamespace(
+        update=lambda: None,
+        active_layer_collection=types.SimpleNamespace(collection=None),
+    ),
+)
+
+# Outside of Blender, only the modules imported by import_obj are faked, the tested parsing does not use them.
+fake_modules = {}
+try:
+    import bpy
+except ImportError:
+    fake_modules = {name: types.ModuleType(name) for name in (
+        "mathutils", "bpy_extras", "bpy_extras.io_utils", "bpy_extras.image_utils",
+        "bpy_extras.wm_utils", "bpy_extras.wm_utils.progress_report")}
+    fake_modules["bpy"] = fake_bpy
+    fake_modules["bpy_extras.io_utils"].unpack_list = None
+    fake_modules["bpy_extras.image_utils"].load_image = None
+    fake_modules["bpy_extras.wm_utils.progress_report"].ProgressReport = FakeProgressReport
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+with mock.patch.dict(sys.modules, fake_modules):
+    if __name__ == '__main__':
+        import import_obj
+    else:
+        from . import import_obj
+
+
+OBJ = b"""# Two faces of a cube
+mtllib test.mtl
+o Cube
+v 0.0 0.0 0.0
+v 1.0 0.0 0.0
+v 1.0 1.0 0.0
+v 0.0 1.0 0.0
+v 0.0 0.0 1.0
+vt 0.0 0.0
+vt 1.0 0.0
+vt 1.0 1.0
+vn 0.0 0.0 -1.0
+vn 0.0 -1.0 0.0
+usemtl red
+s 1
+f 1/1/1 4/3/1 3/3/1 2/2/1
+usemtl blue
+s off
+f -5/-3/-1 -4/-2/-1 -1/-1/-1
+usemtl red
+f 2/2/2 3/3/2 5/1/2
+"""
+
+
+class FastParseTest(unittest.TestCase):
+    def write(self, data):
+        fd, filepath = tempfile.mkstemp(suffix=".obj")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        self.addCleanup(os.remove, filepath)
+        return filepath
+
+    def regular_parse(self, filepath):
+        """Faces as parsed by load() when the fast parser is not used."""
+        parsed = {}
+
+        def split_mesh(verts_loc, faces, unique_materials, filepath, SPLIT_OB_OR_GROUP):
+            parsed['verts_loc'] = np.array(verts_loc, dtype=np.float32).reshape(-1, 3)
+            parsed['faces'] = [(f[0], f[2], f[1], f[3], bool(f[4]), f[5]) for f in faces]
+            parsed['unique_materials'] = list(unique_materials)
+            return []
+
+        def fast_parse(*args):
+            raise import_obj.FastParseUnsupported("test")
+
+        with mock.patch.object(import_obj, "fast_parse", fast_parse), \
+                mock.patch.object(import_obj, "split_mesh", split_mesh), \
+                mock.patch.object(import_obj, "create_materials", lambda *args: None), \
+                mock.patch.object(import_obj, "ProgressReport", FakeProgressReport), \
+                mock.patch.object(import_obj, "bpy", fake_bpy):
+            import_obj.load(fake_context, filepath, global_matrix=object())
+        return parsed
+
+    def fast_parse(self, filepath):
+        """Faces as parsed by fast_parse(), in the same layout as regular_parse()."""
+        names = set()
+
+        def object_name(name):
+            names.add(name)
+            return name
+
+        data = import_obj.fast_parse(filepath, object_name, True, True, True, False, False)
+        materials = list(data['unique_materials'])
+        starts = np.cumsum(data['faces_loop_total']) - data['faces_loop_total']
+        faces = []
+        for start, total, material, smooth_group in zip(starts.tolist(), data['faces_loop_total'].tolist(),
+                                                        data['faces_material'].tolist(),
+                                                        data['faces_smooth_group'].tolist()):
+            loops = slice(start, start + total)
+            faces.append((data['loops_loc'][loops].tolist(), data['loops_tex'][loops].tolist(),
+                          data['loops_nor'][loops].tolist(), materials[material], smooth_group != -1,
+                          data['object_key']))
+        return {'verts_loc': data['verts_loc'], 'faces': faces, 'unique_materials': materials}
+
+    def assertSameParse(self, data):
+        filepath = self.write(data)
+        regular = self.regular_parse(filepath)
+        fast = self.fast_parse(filepath)
+        np.testing.assert_array_equal(fast['verts_loc'], regular['verts_loc'])
+        self.assertEqual(fast['faces'], regular['faces'])
+        self.assertEqual(fast['unique_materials'], regular['unique_materials'])
+        return fast
+
+    def assertFallback(self, data):
+        filepath = self.write(data)
+        with self.assertRaises(import_obj.FastParseUnsupported):
+            self.fast_parse(filepath)
+
+    def test_relative_indices(self):
+        fast = self.assertSameParse(OBJ)
+        self.assertEqual(fast['faces'][1][:3], ([0, 1, 4], [0, 1, 2], [1, 1, 1]))
+
+    def test_crlf(self):
+        self.assertSameParse(OBJ.replace(b"\n", b"\r\n"))
+
+    def test_no_final_newline(self):
+        fast = self.assertSameParse(OBJ.rstrip(b"\n"))
+        self.assertEqual(len(fast['faces']), 3)
+
+    def test_small_chunks(self):
+        with mock.patch.object(import_obj, "FAST_PARSE_CHUNK_SIZE", 40):
+            self.assertSameParse(OBJ)
+
+    def test_fallback_inline_comment(self):
+        self.assertFallback(OBJ.replace(b"f 2/2/2 3/3/2 5/1/2", b"f 2/2/2 3/3/2 5/1/2 # last face"))
+
+    def test_fallback_mixed_face_formats(self):
+        self.assertFallback(OBJ.replace(b"f 2/2/2 3/3/2 5/1/2", b"f 2 3 5"))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
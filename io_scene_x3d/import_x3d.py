@@ -22,10 +22,12 @@ DEBUG = False
 
 # This should work without a blender at all
 import os
+import re
 import shlex
 import math
 from math import sin, cos, pi
-from itertools import chain
+
+import numpy as np
 
 texture_cache = {}
 material_cache = {}
@@ -829,6 +831,10 @@ class vrmlNode(object):
             # Normal vrml
             array_data = child_array.array_data
 
+            if isinstance(array_data, np.ndarray):
+                # vrmlParser creates these, already flat
+                array_data = array_data.tolist()
+
         # print('array_data', array_data)
         if group == -1 or len(array_data) == 0:
             return array_data
@@ -873,6 +879,30 @@ class vrmlNode(object):
 
         return new_array
 
+    def getFieldAsNumpyArray(self, field, group, ancestry, dtype=np.float64):
+        """
+        Same as getFieldAsArray() as a NumPy array, (n, group) shaped or flat if group is 0
+        """
+        self_real = self.getRealNode()  # in case we're an instance
+
+        child_array = self_real.getFieldName(field, ancestry, True, SPLIT_COMMAS=True)
+
+        if child_array is not None and type(child_array) != list and isinstance(child_array.array_data, np.ndarray):
+            # vrmlParser creates these, no list is needed
+            array = child_array.array_data.astype(dtype, copy=False)
+        else:
+            array = np.array(self.getFieldAsArray(field, 0, ancestry), dtype=dtype)
+
+        if group <= 0:
+            return array
+
+        remainder = len(array) % group
+        if remainder:
+            print('\twarning, array was not aligned to requested grouping', group, 'remaining value', array[-remainder:])
+            array = array[:-remainder]
+
+        return array.reshape(-1, group)
+
     def getFieldAsStringArray(self, field, ancestry):
         """
         Get a list of strings
@@ -963,6 +993,16 @@ class vrmlNode(object):
 
         # print(self.id, self.getFilename())
 
+        self.loadInline(vrml_parse_inline_lines)
+
+        return new_i
+
+    def loadInline(self, parse_data):
+        """
+        Load the file of an Inline or EXTERNPROTO node,
+        parse_data(node, data) parses the file data into a new root node.
+        """
+
         # Check if this node was an inline or externproto
 
         url_ls = []
@@ -986,6 +1026,9 @@ class vrmlNode(object):
                     for f_split in ff.split('"'):
                         # print(f_split)
                         # "someextern.vrml#SomeID"
+                        if not f_split.strip():
+                            continue  # around the quotes
+
                         if '#' in f_split:
 
                             f_split, f_split_id = f_split.split('#')  # there should only be 1 # anyway
@@ -1034,22 +1077,9 @@ class vrmlNode(object):
                             # Tricky - inline another VRML
                             print('\tLoading Inline:"%s"...' % url)
 
-                            # Watch it! - backup lines
-                            lines_old = lines[:]
-
-                            lines[:] = vrmlFormat(data)
-
-                            lines.insert(0, '{')
-                            lines.insert(0, 'root_node____')
-                            lines.append('}')
-                            '''
-                            ff = open('/tmp/test.txt', 'w')
-                            ff.writelines([l+'\n' for l in lines])
-                            '''
-
                             child = vrmlNode(self, NODE_NORMAL, -1)
                             child.setRoot(url)  # initialized dicts
-                            child.parse(0)
+                            parse_data(child, data)
 
                             # if self.getExternprotoName():
                             if self.getExternprotoName():
@@ -1072,11 +1102,6 @@ class vrmlNode(object):
                                     else:
                                         print("\tEXTERNPROTO ID not found!:", extern_key)
 
-                            # Watch it! - restore lines
-                            lines[:] = lines_old
-
-        return new_i
-
     def __parse(self, i, IS_PROTO_DATA=False):
         '''
         print('parsing at', i, end="")
@@ -1279,10 +1304,35 @@ def gzipOpen(path):
     return data
 
 
-def vrml_parse(path):
+def vrml_parse_inline_lines(node, data):
+    """
+    Parse the data of an inline file into its root node, with vrmlFormat()
+    """
+    # Watch it! - backup lines
+    lines_old = lines[:]
+
+    lines[:] = vrmlFormat(data)
+
+    lines.insert(0, '{')
+    lines.insert(0, 'root_node____')
+    lines.append('}')
+    '''
+    ff = open('/tmp/test.txt', 'w')
+    ff.writelines([l+'\n' for l in lines])
+    '''
+
+    node.parse(0)
+
+    # Watch it! - restore lines
+    lines[:] = lines_old
+
+
+def vrml_parse_legacy(path):
     """
     Sets up the root node and returns it so load_web3d() can deal with the blender side of things.
     Return root (vrmlNode, '') or (None, 'Error String')
+
+    Line based parser, formats the whole file with vrmlFormat() first, see vrml_parse().
     """
     data = gzipOpen(path)
 
@@ -1326,6 +1376,503 @@ def vrml_parse(path):
     return root, ''
 
 
+# Streaming VRML parser, reads the file once without vrmlFormat()
+# and builds the same node tree as vrmlNode.parse()
+
+VRML_CHUNK_SIZE = 1 << 22  # characters read at once, up to the end of the line
+
+re_vrml_skip = re.compile(r'(?:[\s,]+|#[^\n]*)*')  # commas are white space in VRML
+re_vrml_token = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]]|[^\s,#"{}\[\]]+')
+re_vrml_comment = re.compile(r'#[^\n]*')
+re_vrml_numbers = re.compile(r'[\s,0-9.eE+\-]*')
+re_vrml_float = re.compile(r'[.eE]')
+
+VRML_NUMBER_START = frozenset('0123456789+-.')
+VRML_VALUES = {'TRUE', 'FALSE', 'NULL'}
+
+# Interface declarations of PROTO and Script nodes: kind type name [value]
+VRML_DECLARATIONS = {'field', 'exposedField', 'eventIn', 'eventOut',
+                     'initializeOnly', 'inputOutput', 'inputOnly', 'outputOnly'}
+
+# X3D classic encoding statements which are skipped, and their count of words
+VRML_SKIPPED_STATEMENTS = {'PROFILE': 1, 'COMPONENT': 1, 'UNIT': 3, 'META': 2, 'IMPORT': 1, 'EXPORT': 1}
+
+
+def vrml_number_array(values):
+    """
+    Numbers from a list of strings: an int array, or a float array if any of them isn't an int
+    """
+    for dtype in (np.int64, np.float64):
+        try:
+            return np.array(values, dtype=dtype)
+        except ValueError:
+            pass
+
+    try:
+        return np.array([int(val, 0) for val in values], dtype=np.int64)  # 0xFF hex values of images
+    except ValueError:
+        print('\tWarning, could not parse array data from field')
+        return np.empty(0)
+
+
+def vrml_number_text(text):
+    """
+    Numbers from a text with only numbers, commas and comments, see vrml_number_array()
+    Return None if the text holds anything else.
+    """
+    if '#' in text:
+        text = re_vrml_comment.sub('', text)
+
+    if not re_vrml_numbers.fullmatch(text):
+        return None
+
+    if ',' in text:
+        text = text.replace(',', ' ')
+
+    if not text or text.isspace():
+        return np.empty(0, dtype=np.int64)
+
+    dtype = np.float64 if re_vrml_float.search(text) else np.int64
+
+    import warnings
+    with warnings.catch_warnings():
+        # Older NumPy versions only warn when the text can't be read to its end
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            return np.fromstring(text, dtype=dtype, sep=' ')
+        except (ValueError, DeprecationWarning):
+            return None
+
+
+class vrmlTokenizer(object):
+    """
+    Split a VRML text file into tokens: brackets, strings (with their quotes),
+    names and numbers. White space, commas and comments are skipped.
+
+    The file is read in chunks of lines, not at once.
+    """
+    __slots__ = ('file',
+                 'buf',
+                 'pos',
+                 'eof',
+                 'pending',
+                 'lineno',
+                 'linepos')
+
+    def __init__(self, file):
+        self.file = file
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.pending = []  # peeked tokens
+        self.lineno = 1  # line number at linepos
+        self.linepos = 0
+
+    def read(self):
+        """ Read the next chunk of lines, '' at the end of the file """
+        if self.eof:
+            return ''
+
+        data = self.file.read(VRML_CHUNK_SIZE)
+        if data and data[-1] != '\n':
+            # Tokens other than strings don't span lines
+            data += self.file.readline()
+
+        if not data:
+            self.eof = True
+
+        return data
+
+    def fill(self):
+        """ Append the next chunk of lines to the unread data, return False at the end of the file """
+        data = self.read()
+        if not data:
+            return False
+
+        self.getLineNumber()
+        self.buf = self.buf[self.pos:] + data
+        self.pos = self.linepos = 0
+
+        return True
+
+    def skip(self):
+        """ Skip white space and comments, return False at the end of the file """
+        while True:
+            self.pos = re_vrml_skip.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return True
+
+            if not self.fill():
+                return False
+
+    def readToken(self):
+        while self.skip():
+            match = re_vrml_token.match(self.buf, self.pos)
+            if match is not None:
+                self.pos = match.end()
+                return match.group()
+
+            # A string which goes on in the next lines
+            if not self.fill():
+                print('\tWarning: string not terminated, line', self.getLineNumber())
+                token = self.buf[self.pos:] + '"'
+                self.pos = len(self.buf)
+                return token
+
+        return None
+
+    def getLineNumber(self):
+        self.lineno += self.buf.count('\n', self.linepos, self.pos)
+        self.linepos = self.pos
+        return self.lineno
+
+    # start of public interface
+
+    def next(self):
+        """ Next token, None at the end of the file """
+        if self.pending:
+            return self.pending.pop(0)
+
+        return self.readToken()
+
+    def peek(self, i=0):
+        """ Token after the next i tokens, without reading it """
+        while len(self.pending) <= i:
+            self.pending.append(self.readToken())
+
+        return self.pending[i]
+
+    def readNumbers(self):
+        """
+        Read an array of numbers up to its closing bracket at once,
+        return a NumPy array, or None (reading nothing) if the array holds other values
+        """
+        if self.pending or not self.skip() or self.buf[self.pos] not in VRML_NUMBER_START:
+            return None
+
+        end = self.buf.find(']', self.pos)
+        if end != -1:
+            array = vrml_number_text(self.buf[self.pos:end])
+            if array is not None:
+                self.pos = end + 1
+            return array
+
+        # A large array, read until its end and parse each chunk of lines
+        # (numbers don't span lines), the lines are only kept in case of failure
+        chunks = [self.buf[self.pos:]]
+        while end == -1:
+            data = self.read()
+            if not data:
+                break
+            chunks.append(data)
+            end = data.find(']')
+
+        arrays = None
+        if end != -1:
+            arrays = [vrml_number_text(text) for text in chunks[:-1]]
+            arrays.append(vrml_number_text(chunks[-1][:end]))
+            if any(array is None for array in arrays):
+                arrays = None
+
+        self.getLineNumber()
+        if arrays is None:
+            self.buf = ''.join(chunks)
+            self.pos = self.linepos = 0
+            return None
+
+        self.lineno += sum(text.count('\n') for text in chunks[:-1]) + chunks[-1].count('\n', 0, end)
+        self.buf = chunks[-1][end + 1:]
+        self.pos = self.linepos = 0
+
+        return np.concatenate(arrays)
+
+    # end of public interface
+
+
+class vrmlParser(object):
+    """
+    Recursive descent parser for VRML97 and X3D classic encoding
+    """
+    __slots__ = ('tokens',)
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+
+    def newNode(self, parent, node_type, node_id):
+        node = vrmlNode(parent, node_type, self.tokens.getLineNumber())
+        node.id = node_id
+
+        if node_id is None or node_type == NODE_REFERENCE:
+            return node
+
+        # fill in DEF/USE
+        key = node.getDefName()
+        if key is not None:
+            node.getDefDict()[key] = node
+
+        # If we're a proto instance, add the proto node as our child.
+        proto = node.getProtoDict().get(node.getSpec())
+        if proto is not None:
+            node.children.append(proto)
+
+        return node
+
+    def expect(self, token):
+        if self.tokens.peek() == token:
+            self.tokens.next()
+            return True
+
+        print('\tWarning: expected %r, not %r, line %d' % (token, self.tokens.peek(), self.tokens.getLineNumber()))
+        return False
+
+    def parseBody(self, node, closer):
+        """
+        Parse the fields, children and array values of node up to its closer (a bracket)
+        or to the end of the file if closer is None
+        """
+        tokens = self.tokens
+        numbers = []
+
+        while True:
+            token = tokens.next()
+            if token is None:
+                if closer is not None:
+                    print('\tWarning: unexpected end of file, expected %r' % closer)
+                break
+
+            c = token[0]
+            if c in VRML_NUMBER_START:
+                numbers.append(token)
+            elif c == '"' or token in VRML_VALUES:
+                node.fields.append([token])
+            elif token == '[':  # some files have these anonymous lists
+                self.parseArray(node, None)
+            elif token == '{':
+                self.parseNode(node, None)
+            elif token in {'}', ']'}:
+                if token == closer:
+                    break
+
+                print('\tWarning: wrong node ending %r, line %d' % (token, tokens.getLineNumber()))
+                if closer is not None:
+                    break
+            else:
+                self.parseStatement(node, token)
+
+        if numbers:
+            node.array_data = vrml_number_array(numbers)
+
+    def parseNode(self, parent, node_id):
+        """ Parse a node after its { """
+        node = self.newNode(parent, NODE_NORMAL, node_id)
+        self.parseBody(node, '}')
+
+        node.loadInline(vrml_parse_inline_stream)
+
+        return node
+
+    def parseArray(self, parent, node_id):
+        """ Parse an array after its [ """
+        node = self.newNode(parent, NODE_ARRAY, node_id)
+
+        array = self.tokens.readNumbers()
+        if array is not None:
+            node.array_data = array
+        else:
+            self.parseBody(node, ']')
+
+        return node
+
+    def parseReference(self, parent, node_id):
+        """ Parse the name after USE """
+        tokens = self.tokens
+        key = tokens.next()
+
+        node = self.newNode(parent, NODE_REFERENCE, node_id)
+        node.reference = node.getDefDict().get(key)
+        if node.reference is None:
+            print('\tWarning: reference', key, 'not found')
+            parent.children.remove(node)
+
+        if tokens.peek() == '{' and tokens.peek(1) == '}':
+            # USE sometimes has {} after it anyway
+            tokens.next()
+            tokens.next()
+
+    def parseDefinition(self, parent, node_id):
+        """ Parse the name and node after DEF """
+        tokens = self.tokens
+        key = tokens.next()
+        spec = tokens.next()
+
+        if self.expect('{'):
+            self.parseNode(parent, node_id + ('DEF', key, spec))
+
+    def parseProto(self, parent, node_type, keyword):
+        """ Parse a PROTO or an EXTERNPROTO, with its fields definitions """
+        tokens = self.tokens
+        key = tokens.next()
+
+        node = vrmlNode(parent, node_type, tokens.getLineNumber())
+        node.id = (keyword, key)
+        node.getProtoDict()[key] = node
+
+        if self.expect('['):
+            node.proto_node = self.newNode(node, NODE_ARRAY, None)
+            self.parseBody(node.proto_node, ']')
+            node.children.remove(node.proto_node)
+
+        if keyword == 'PROTO':
+            if self.expect('{'):
+                self.parseBody(node, '}')
+            return
+
+        # EXTERNPROTO urls, as fields
+        if tokens.peek() == '[':
+            tokens.next()
+            self.parseBody(node, ']')
+        elif tokens.peek() is not None and tokens.peek()[0] == '"':
+            node.fields.append([tokens.next()])
+
+        node.loadInline(vrml_parse_inline_stream)
+
+    def parseStatement(self, node, word):
+        """ Parse a statement starting with a name: a field, node, prototype or route """
+        tokens = self.tokens
+
+        if word == 'DEF':
+            self.parseDefinition(node, ())
+        elif word == 'USE':
+            self.parseReference(node, (word,))
+        elif word == 'PROTO':
+            self.parseProto(node, NODE_NORMAL, word)
+        elif word == 'EXTERNPROTO':
+            self.parseProto(node, NODE_ARRAY, word)
+        elif word == 'ROUTE':
+            # ROUTE vpPI.value_changed TO champFly001.set_position
+            node.fields.append([word, tokens.next(), tokens.next(), tokens.next()])
+        elif word in VRML_SKIPPED_STATEMENTS:
+            for i in range(VRML_SKIPPED_STATEMENTS[word]):
+                tokens.next()
+            if tokens.peek() == 'AS':  # IMPORT and EXPORT
+                tokens.next()
+                tokens.next()
+        elif word in VRML_DECLARATIONS:
+            # field SFColor legColor .8 .4 .7
+            self.parseField(node, (word, tokens.next(), tokens.next()))
+        elif tokens.peek() == '{':
+            tokens.next()
+            self.parseNode(node, (word,))
+        else:
+            self.parseField(node, (word,))
+
+    def parseField(self, node, words):
+        """ Parse the value of a field, a field definition when words[0] is 'field' """
+        tokens = self.tokens
+        token = tokens.peek()
+
+        if token == '[':
+            tokens.next()
+            self.parseArray(node, words)
+        elif token == 'DEF':
+            tokens.next()
+            self.parseDefinition(node, words)
+        elif token == 'USE':
+            tokens.next()
+            self.parseReference(node, words)
+        elif (token is not None and token[0] not in VRML_NUMBER_START and token[0] not in '"{}[]' and
+              token not in VRML_VALUES and token != 'IS' and tokens.peek(1) == '{'):
+            # SFNode value
+            tokens.next()
+            tokens.next()
+            self.parseNode(node, words + (token,))
+        else:
+            value = list(words)
+            if token == 'IS':
+                # diffuseColor IS legColor
+                value.append(tokens.next())
+                value.append(tokens.next())
+            else:
+                while token is not None and (token[0] in VRML_NUMBER_START or token[0] == '"' or
+                                             token in VRML_VALUES):
+                    value.append(tokens.next())
+                    token = tokens.peek()
+
+            if value[0] == 'field':
+                # field SFFloat creaseAngle 4
+                node.proto_field_defs.append(value)
+            else:
+                node.fields.append(value)
+
+    # start of public interface
+
+    def parse(self, root):
+        """ Parse the whole file into the root node """
+        self.parseBody(root, None)
+
+    # end of public interface
+
+
+def vrml_open(path):
+    """
+    Open a VRML file as text, gzip compressed or not
+    """
+    import gzip
+
+    with open(path, 'rb') as file:
+        compressed = file.read(2) == b'\x1f\x8b'
+
+    if compressed:
+        return gzip.open(path, 'rt', encoding='utf-8', errors='surrogateescape')
+
+    return open(path, 'r', encoding='utf-8', errors='surrogateescape')
+
+
+def vrml_parse_inline_stream(node, data):
+    """
+    Parse the data of an inline file into its root node, with vrmlParser
+    """
+    import io
+
+    node.id = ('root_node____',)
+    vrmlParser(vrmlTokenizer(io.StringIO(data))).parse(node)
+
+
+def vrml_parse(path):
+    """
+    Sets up the root node and returns it so load_web3d() can deal with the blender side of things.
+    Return root (vrmlNode, '') or (None, 'Error String')
+
+    The file is read once with vrmlTokenizer, arrays of numbers are read into NumPy arrays.
+    """
+    try:
+        file = vrml_open(path)
+    except OSError:
+        import traceback
+        traceback.print_exc()
+        return None, 'Failed to open file: ' + path
+
+    # Same nodes as vrml_parse_legacy()
+    root = vrmlNode(None, NODE_NORMAL, -1)
+    root.id = ('root_node____',)
+    root.setRoot(path)  # we need to set the root so we have a namespace and know the path in case of inlineing
+
+    node = vrmlNode(root, NODE_NORMAL, 1)
+    node.id = ('dymmy_node',)
+
+    with file:
+        vrmlParser(vrmlTokenizer(file)).parse(node)
+
+    if not node.children:
+        return None, 'Error: VRML file has no starting Node'
+
+    # This prints a load of text
+    if DEBUG:
+        print(root)
+
+    return root, ''
+
+
 # ====================== END VRML
 
 # ====================== X3d Support
@@ -1609,24 +2156,32 @@ def getFinalMatrix(node, mtx, ancestry, global_matrix):
 def importMesh_ApplyColors(bpymesh, geom, ancestry):
     colors = geom.getChildBySpec(['ColorRGBA', 'Color'])
     if colors:
-        if colors.getSpec() == 'ColorRGBA':
-            rgb = colors.getFieldAsArray('color', 4, ancestry)
-        else:
-            # Array of arrays; no need to flatten
-            rgb = [c + [1.0] for c in colors.getFieldAsArray('color', 3, ancestry)]
+        rgb = importMesh_ReadColors(colors, ancestry)
         lcol_layer = bpymesh.vertex_colors.new()
 
         if len(rgb) == len(bpymesh.vertices):
-            rgb = [rgb[l.vertex_index] for l in bpymesh.loops]
-            rgb = tuple(chain(*rgb))
-        elif len(rgb) == len(bpymesh.loops):
-            rgb = tuple(chain(*rgb))
-        else:
-            printf("WARNING not applying vertex colors, non matching numbers of vertices or loops (%d vs %d/%d)"
-                   "" % (len(rgb), len(bpymesh.vertices), len(bpymesh.loops)))
+            rgb = rgb[importMesh_LoopVertices(bpymesh)]
+        elif len(rgb) != len(bpymesh.loops):
+            print("WARNING not applying vertex colors, non matching numbers of vertices or loops (%d vs %d/%d)"
+                  "" % (len(rgb), len(bpymesh.vertices), len(bpymesh.loops)))
             return
 
-        lcol_layer.data.foreach_set("color", rgb)
+        lcol_layer.data.foreach_set("color", rgb.astype(np.float32).ravel())
+
+
+# RGBA colors of a Color or ColorRGBA node, as a (n, 4) array.
+def importMesh_ReadColors(colors, ancestry):
+    if colors.getSpec() == 'ColorRGBA':
+        return colors.getFieldAsNumpyArray('color', 4, ancestry)
+    rgb = colors.getFieldAsNumpyArray('color', 3, ancestry)
+    return np.hstack((rgb, np.ones((len(rgb), 1))))
+
+
+# Vertex index of every loop of the mesh, in loop order.
+def importMesh_LoopVertices(bpymesh):
+    vertex_index = np.empty(len(bpymesh.loops), dtype=np.int32)
+    bpymesh.loops.foreach_get("vertex_index", vertex_index)
+    return vertex_index
 
 
 # Assumes that the vertices have not been rearranged compared to the
@@ -1639,7 +2194,7 @@ def importMesh_ApplyNormals(bpymesh, geom, ancestry):
         return
 
     per_vertex = geom.getFieldAsBool('normalPerVertex', True, ancestry)
-    vectors = normals.getFieldAsArray('vector', 0, ancestry)
+    vectors = normals.getFieldAsNumpyArray('vector', 0, ancestry, np.float32)
     if per_vertex:
         bpymesh.vertices.foreach_set("normal", vectors)
     else:
@@ -1655,13 +2210,10 @@ def importMesh_ApplyNormals(bpymesh, geom, ancestry):
 # Vertex culling that we have in IndexedFaceSet is an unfortunate exception,
 # brought forth by a very specific issue.
 def importMesh_ReadVertices(bpymesh, geom, ancestry):
-    # We want points here as a flat array, but the caching logic in
-    # IndexedFaceSet presumes a 2D one.
-    # The case for caching is stronger over there.
     coord = geom.getChildBySpec('Coordinate')
-    points = coord.getFieldAsArray('point', 0, ancestry)
+    points = coord.getFieldAsNumpyArray('point', 0, ancestry, np.float32)
     bpymesh.vertices.add(len(points) // 3)
-    bpymesh.vertices.foreach_set("co", points)
+    bpymesh.vertices.foreach_set("co", points[:len(points) - len(points) % 3])
 
 
 # Assumes that the order of vertices matches the source file.
@@ -1675,15 +2227,12 @@ def importMesh_ApplyUVs(bpymesh, geom, ancestry):
     if not tex_coord:
         return
 
-    uvs = tex_coord.getFieldAsArray('point', 2, ancestry)
-    if not uvs:
+    uvs = tex_coord.getFieldAsNumpyArray('point', 2, ancestry, np.float32)
+    if not len(uvs):
         return
 
     d = bpymesh.uv_layers.new().data
-    uvs = [i for poly in bpymesh.polygons
-            for vidx in poly.vertices
-            for i in uvs[vidx]]
-    d.foreach_set('uv', uvs)
+    d.foreach_set('uv', uvs[importMesh_LoopVertices(bpymesh)].ravel())
 
 
 # Common steps for all triangle meshes once the geometry has been set:
@@ -1708,6 +2257,49 @@ def importMesh_ApplyTextureToLoops(bpymesh, loops):
 def flip(r, ccw):
     return r if ccw else r[::-1]
 
+
+# Splits an index array on -1: returns the indices without the separators
+# and the number of indices of each part. Empty parts are skipped.
+def importMesh_SplitIndex(index):
+    separators = index == -1
+    values = index[~separators]
+    counts = np.bincount(np.cumsum(separators)[~separators])
+    return values, counts[counts > 0]
+
+
+# Position of every index in the parts of the given sizes (see SplitIndex),
+# and the start of its part.
+def importMesh_PartOffsets(counts):
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    return np.arange(len(starts)) - starts, starts
+
+
+# Triangles of the strips of the given sizes, as a flat array of positions in
+# the concatenated strips. Strips of less than 3 vertices make no triangles.
+def importMesh_StripTriangles(counts, cw):
+    offsets, starts = importMesh_PartOffsets(counts)
+    base = np.flatnonzero(offsets + 2 < np.repeat(counts, counts))
+    odd = (offsets[base] + cw) % 2
+    return np.column_stack((base + odd, base + 1 - odd, base + 2)).ravel()
+
+
+# Same as StripTriangles() for fans.
+def importMesh_FanTriangles(counts, cw):
+    offsets, starts = importMesh_PartOffsets(counts)
+    base = np.flatnonzero((offsets > 0) & (offsets + 1 < np.repeat(counts, counts)))
+    return np.column_stack((starts[base], base + cw, base + 1 - cw)).ravel()
+
+
+# Sets the triangles of a mesh whose vertices have been set,
+# from a flat array of vertex indices.
+def importMesh_SetTriangles(bpymesh, index):
+    num_polys = len(index) // 3
+    bpymesh.loops.add(num_polys * 3)
+    bpymesh.polygons.add(num_polys)
+    bpymesh.polygons.foreach_set("loop_start", np.arange(0, num_polys * 3, 3, dtype=np.int32))
+    bpymesh.polygons.foreach_set("loop_total", np.full(num_polys, 3, dtype=np.int32))
+    bpymesh.polygons.foreach_set("vertices", index[:num_polys * 3].astype(np.int32))
+
 # -----------------------------------------------------------------------------------
 # Now specific geometry importers
 
@@ -1721,16 +2313,10 @@ def importMesh_IndexedTriangleSet(geom, ancestry):
     importMesh_ReadVertices(bpymesh, geom, ancestry)
 
     # Read the faces
-    index = geom.getFieldAsArray('index', 0, ancestry)
-    num_polys = len(index) // 3
+    index = geom.getFieldAsNumpyArray('index', 3, ancestry, np.int32)
     if not ccw:
-        index = [index[3 * i + j] for i in range(num_polys) for j in (1, 0, 2)]
-
-    bpymesh.loops.add(num_polys * 3)
-    bpymesh.polygons.add(num_polys)
-    bpymesh.polygons.foreach_set("loop_start", range(0, num_polys * 3, 3))
-    bpymesh.polygons.foreach_set("loop_total", (3,) * num_polys)
-    bpymesh.polygons.foreach_set("vertices", index)
+        index = index[:, (1, 0, 2)]
+    importMesh_SetTriangles(bpymesh, index.ravel())
 
     return importMesh_FinalizeTriangleMesh(bpymesh, geom, ancestry)
 
@@ -1743,31 +2329,8 @@ def importMesh_IndexedTriangleStripSet(geom, ancestry):
     importMesh_ReadVertices(bpymesh, geom, ancestry)
 
     # Read the faces
-    index = geom.getFieldAsArray('index', 0, ancestry)
-    while index[-1] == -1:
-        del index[-1]
-    ngaps = sum(1 for i in index if i == -1)
-    num_polys = len(index) - 2 - 3 * ngaps
-    bpymesh.loops.add(num_polys * 3)
-    bpymesh.polygons.add(num_polys)
-    bpymesh.polygons.foreach_set("loop_start", range(0, num_polys * 3, 3))
-    bpymesh.polygons.foreach_set("loop_total", (3,) * num_polys)
-
-    def triangles():
-        i = 0
-        odd = cw
-        while True:
-            yield index[i + odd]
-            yield index[i + 1 - odd]
-            yield index[i + 2]
-            odd = 1 - odd
-            i += 1
-            if i + 2 >= len(index):
-                return
-            if index[i + 2] == -1:
-                i += 3
-                odd = cw
-    bpymesh.polygons.foreach_set("vertices", [f for f in triangles()])
+    index, counts = importMesh_SplitIndex(geom.getFieldAsNumpyArray('index', 0, ancestry, np.int32))
+    importMesh_SetTriangles(bpymesh, index[importMesh_StripTriangles(counts, cw)])
     return importMesh_FinalizeTriangleMesh(bpymesh, geom, ancestry)
 
 
@@ -1779,30 +2342,8 @@ def importMesh_IndexedTriangleFanSet(geom, ancestry):
     importMesh_ReadVertices(bpymesh, geom, ancestry)
 
     # Read the faces
-    index = geom.getFieldAsArray('index', 0, ancestry)
-    while index[-1] == -1:
-        del index[-1]
-    ngaps = sum(1 for i in index if i == -1)
-    num_polys = len(index) - 2 - 3 * ngaps
-    bpymesh.loops.add(num_polys * 3)
-    bpymesh.polygons.add(num_polys)
-    bpymesh.polygons.foreach_set("loop_start", range(0, num_polys * 3, 3))
-    bpymesh.polygons.foreach_set("loop_total", (3,) * num_polys)
-
-    def triangles():
-        i = 0
-        j = 1
-        while True:
-            yield index[i]
-            yield index[i + j + cw]
-            yield index[i + j + 1 - cw]
-            j += 1
-            if i + j + 1 >= len(index):
-                return
-            if index[i + j + 1] == -1:
-                i = j + 2
-                j = 1
-    bpymesh.polygons.foreach_set("vertices", [f for f in triangles()])
+    index, counts = importMesh_SplitIndex(geom.getFieldAsNumpyArray('index', 0, ancestry, np.int32))
+    importMesh_SetTriangles(bpymesh, index[importMesh_FanTriangles(counts, cw)])
     return importMesh_FinalizeTriangleMesh(bpymesh, geom, ancestry)
 
 
@@ -1812,18 +2353,12 @@ def importMesh_TriangleSet(geom, ancestry):
     ccw = geom.getFieldAsBool('ccw', True, ancestry)
     bpymesh = bpy.data.meshes.new(name="TriangleSet")
     importMesh_ReadVertices(bpymesh, geom, ancestry)
-    n = len(bpymesh.vertices)
-    num_polys = n // 3
-    bpymesh.loops.add(num_polys * 3)
-    bpymesh.polygons.add(num_polys)
-    bpymesh.polygons.foreach_set("loop_start", range(0, num_polys * 3, 3))
-    bpymesh.polygons.foreach_set("loop_total", (3,) * num_polys)
+    num_polys = len(bpymesh.vertices) // 3
 
-    if ccw:
-        fv = [i for i in range(n)]
-    else:
-        fv = [3 * i + j for i in range(n // 3) for j in (1, 0, 2)]
-    bpymesh.polygons.foreach_set("vertices", fv)
+    fv = np.arange(num_polys * 3, dtype=np.int32)
+    if not ccw:
+        fv = fv.reshape(-1, 3)[:, (1, 0, 2)].ravel()
+    importMesh_SetTriangles(bpymesh, fv)
 
     return importMesh_FinalizeTriangleMesh(bpymesh, geom, ancestry)
 
@@ -1834,22 +2369,8 @@ def importMesh_TriangleStripSet(geom, ancestry):
     cw = 0 if geom.getFieldAsBool('ccw', True, ancestry) else 1
     bpymesh = bpy.data.meshes.new(name="TriangleStripSet")
     importMesh_ReadVertices(bpymesh, geom, ancestry)
-    counts = geom.getFieldAsArray('stripCount', 0, ancestry)
-    num_polys = sum([n - 2 for n in counts])
-    bpymesh.loops.add(num_polys * 3)
-    bpymesh.polygons.add(num_polys)
-    bpymesh.polygons.foreach_set("loop_start", range(0, num_polys * 3, 3))
-    bpymesh.polygons.foreach_set("loop_total", (3,) * num_polys)
-
-    def triangles():
-        b = 0
-        for i in range(0, len(counts)):
-            for j in range(0, counts[i] - 2):
-                yield b + j + (j + cw) % 2
-                yield b + j + 1 - (j + cw) % 2
-                yield b + j + 2
-            b += counts[i]
-    bpymesh.polygons.foreach_set("vertices", [x for x in triangles()])
+    counts = geom.getFieldAsNumpyArray('stripCount', 0, ancestry, np.int64)
+    importMesh_SetTriangles(bpymesh, importMesh_StripTriangles(counts, cw))
 
     return importMesh_FinalizeTriangleMesh(bpymesh, geom, ancestry)
 
@@ -1860,22 +2381,8 @@ def importMesh_TriangleFanSet(geom, ancestry):
     cw = 0 if geom.getFieldAsBool('ccw', True, ancestry) else 1
     bpymesh = bpy.data.meshes.new(name="TriangleStripSet")
     importMesh_ReadVertices(bpymesh, geom, ancestry)
-    counts = geom.getFieldAsArray('fanCount', 0, ancestry)
-    num_polys = sum([n - 2 for n in counts])
-    bpymesh.loops.add(num_polys * 3)
-    bpymesh.polygons.add(num_polys)
-    bpymesh.polygons.foreach_set("loop_start", range(0, num_polys * 3, 3))
-    bpymesh.polygons.foreach_set("loop_total", (3,) * num_polys)
-
-    def triangles():
-        b = 0
-        for i in range(0, len(counts)):
-            for j in range(1, counts[i] - 1):
-                yield b
-                yield b + j + cw
-                yield b + j + 1 - cw
-            b += counts[i]
-    bpymesh.polygons.foreach_set("vertices", [x for x in triangles()])
+    counts = geom.getFieldAsNumpyArray('fanCount', 0, ancestry, np.int64)
+    importMesh_SetTriangles(bpymesh, importMesh_FanTriangles(counts, cw))
     return importMesh_FinalizeTriangleMesh(bpymesh, geom, ancestry)
 
 
@@ -1891,156 +2398,112 @@ def importMesh_IndexedFaceSet(geom, ancestry):
 
     ccw = geom.getFieldAsBool('ccw', True, ancestry)
     coord = geom.getChildBySpec('Coordinate')
-    if coord.reference:
-        points = coord.getRealNode().parsed
-        # We need unflattened coord array here, while
-        # importMesh_ReadVertices uses flattened. Can't cache both :(
-        # TODO: resolve that somehow, so that vertex set can be effectively
-        # reused between different mesh types?
-    else:
-        points = coord.getFieldAsArray('point', 3, ancestry)
-        if coord.canHaveReferences():
-            coord.parsed = points
-    index = geom.getFieldAsArray('coordIndex', 0, ancestry)
-
-    while index and index[-1] == -1:
-        del index[-1]
-
-    if len(points) >= 2 * len(index):  # Need to cull
-        culled_points = []
-        cull = {}  # Maps old vertex indices to new ones
-        uncull = []  # Maps new indices to the old ones
-        new_index = 0
+    coord_real = coord.getRealNode()
+    points = coord_real.parsed if coord.reference else None
+    if points is None:
+        points = coord.getFieldAsNumpyArray('point', 3, ancestry)
+        if coord_real.canHaveReferences():
+            coord_real.parsed = points
+    index = geom.getFieldAsNumpyArray('coordIndex', 0, ancestry, np.int64)
+
+    used = np.flatnonzero(index != -1)
+    index = index[:used[-1] + 1 if len(used) else 0]
+
+    # Generate faces: the vertex index of every loop, and the number of
+    # loops of every face
+    loops, counts = importMesh_SplitIndex(index)
+    num_loops = len(loops)
+    loop_face = np.repeat(np.arange(len(counts)), counts)
+
+    # Cull the vertices if necessary, in order of first use
+    uncull = None  # Maps new indices to the old ones
+    if len(points) >= 2 * len(index) and num_loops:
+        uncull, firsts, inverse = np.unique(loops, return_index=True, return_inverse=True)
+        order = np.argsort(firsts)
+        cull = np.empty_like(order)  # Maps old vertex indices (in uncull order) to new ones
+        cull[order] = np.arange(len(order))
+        uncull = uncull[order]
+        loops = cull[inverse.reshape(-1)]
+        points = points[uncull]
+
+    # Loops in file order of each face, reversed if not ccw
+    if ccw:
+        loop_order = np.arange(num_loops)
     else:
-        uncull = cull = None
-
-    faces = []
-    face = []
-    # Generate faces. Cull the vertices if necessary,
-    for i in index:
-        if i == -1:
-            if face:
-                faces.append(flip(face, ccw))
-            face = []
-        else:
-            if cull is not None:
-                if not(i in cull):
-                    culled_points.append(points[i])
-                    cull[i] = new_index
-                    uncull.append(i)
-                    i = new_index
-                    new_index += 1
-                else:
-                    i = cull[i]
-            face.append(i)
-    if face:
-        faces.append(flip(face, ccw))  # The last face
-
-    if cull:
-        points = culled_points
+        offsets, starts = importMesh_PartOffsets(counts)
+        loop_order = starts + np.repeat(counts, counts) - 1 - offsets
+    loops = loops[loop_order]
 
     bpymesh = bpy.data.meshes.new(name="IndexedFaceSet")
-    bpymesh.from_pydata(points, [], faces)
+    bpymesh.vertices.add(len(points))
+    bpymesh.vertices.foreach_set("co", points.astype(np.float32).ravel())
+    bpymesh.loops.add(num_loops)
+    bpymesh.polygons.add(len(counts))
+    bpymesh.loops.foreach_set("vertex_index", loops.astype(np.int32))
+    bpymesh.polygons.foreach_set("loop_start", (np.cumsum(counts) - counts).astype(np.int32))
+    bpymesh.polygons.foreach_set("loop_total", counts.astype(np.int32))
+    if num_loops:
+        bpymesh.update(calc_edges=True)
     # No validation here. It throws off the per-face stuff.
 
     # Similar treatment for normal and color indices
 
     def processPerVertexIndex(ind):
-        if ind:
-            # Deflatten into an array of arrays by face; the latter might
-            # need to be flipped
-            i = 0
-            verts_by_face = []
-            for f in faces:
-                verts_by_face.append(flip(ind[i:i + len(f)], ccw))
-                i += len(f) + 1
-            return verts_by_face
-        elif uncull:
-            return [[uncull[v] for v in f] for f in faces]
+        if len(ind):
+            # Same layout as coordIndex: one -1 after each face, the loops
+            # might need to be flipped
+            return ind[(np.arange(num_loops) + loop_face)[loop_order]]
+        elif uncull is not None:
+            return uncull[loops]
         else:
-            return faces  # Reuse coordIndex, as per the spec
+            return loops  # Reuse coordIndex, as per the spec
 
     # Normals
     normals = geom.getChildBySpec('Normal')
     if normals:
         per_vertex = geom.getFieldAsBool('normalPerVertex', True, ancestry)
-        vectors = normals.getFieldAsArray('vector', 3, ancestry)
-        normal_index = geom.getFieldAsArray('normalIndex', 0, ancestry)
+        vectors = normals.getFieldAsNumpyArray('vector', 3, ancestry)
+        normal_index = geom.getFieldAsNumpyArray('normalIndex', 0, ancestry, np.int64)
         if per_vertex:
-            co = [co for f in processPerVertexIndex(normal_index)
-                     for v in f
-                     for co in vectors[v]]
-            bpymesh.vertices.foreach_set("normal", co)
+            co = vectors[processPerVertexIndex(normal_index)]
+            bpymesh.vertices.foreach_set("normal", co.astype(np.float32).ravel())
         else:
-            co = [co for (i, f) in enumerate(faces)
-                     for j in f
-                     for co in vectors[normal_index[i] if normal_index else i]]
-            bpymesh.polygons.foreach_set("normal", co)
+            co = vectors[normal_index[loop_face] if len(normal_index) else loop_face]
+            bpymesh.polygons.foreach_set("normal", co.astype(np.float32).ravel())
 
     # Apply vertex/face colors
     colors = geom.getChildBySpec(['ColorRGBA', 'Color'])
     if colors:
-        if colors.getSpec() == 'ColorRGBA':
-            rgb = colors.getFieldAsArray('color', 4, ancestry)
-        else:
-            # Array of arrays; no need to flatten
-            rgb = [c + [1.0] for c in colors.getFieldAsArray('color', 3, ancestry)]
+        rgb = importMesh_ReadColors(colors, ancestry)
 
         color_per_vertex = geom.getFieldAsBool('colorPerVertex', True, ancestry)
-        color_index = geom.getFieldAsArray('colorIndex', 0, ancestry)
+        color_index = geom.getFieldAsNumpyArray('colorIndex', 0, ancestry, np.int64)
 
         d = bpymesh.vertex_colors.new().data
         if color_per_vertex:
-            cco = [cco for f in processPerVertexIndex(color_index)
-                       for v in f
-                       for cco in rgb[v]]
-        elif color_index:  # Color per face with index
-            cco = [cco for (i, f) in enumerate(faces)
-                       for j in f
-                       for cco in rgb[color_index[i]]]
+            cco = rgb[processPerVertexIndex(color_index)]
+        elif len(color_index):  # Color per face with index
+            cco = rgb[color_index[loop_face]]
         else:  # Color per face without index
-            cco = [cco for (i, f) in enumerate(faces)
-                       for j in f
-                       for cco in rgb[i]]
-        d.foreach_set('color', cco)
+            cco = rgb[loop_face]
+        d.foreach_set('color', cco.astype(np.float32).ravel())
 
     # Texture coordinates (UVs)
     tex_coord = geom.getChildBySpec('TextureCoordinate')
     if tex_coord:
-        tex_coord_points = tex_coord.getFieldAsArray('point', 2, ancestry)
-        tex_index = geom.getFieldAsArray('texCoordIndex', 0, ancestry)
-        tex_index = processPerVertexIndex(tex_index)
-        loops = [co for f in tex_index
-                    for v in f
-                    for co in tex_coord_points[v]]
-    else:
-        x_min = x_max = y_min = y_max = z_min = z_max = None
-        for f in faces:
-            # Unused vertices don't participate in size; X3DOM does so
-            for v in f:
-                (x, y, z) = points[v]
-                if x_min is None or x < x_min:
-                    x_min = x
-                if x_max is None or x > x_max:
-                    x_max = x
-                if y_min is None or y < y_min:
-                    y_min = y
-                if y_max is None or y > y_max:
-                    y_max = y
-                if z_min is None or z < z_min:
-                    z_min = z
-                if z_max is None or z > z_max:
-                    z_max = z
-
-        mins = (x_min, y_min, z_min)
-        deltas = (x_max - x_min, y_max - y_min, z_max - z_min)
+        tex_coord_points = tex_coord.getFieldAsNumpyArray('point', 2, ancestry)
+        tex_index = geom.getFieldAsNumpyArray('texCoordIndex', 0, ancestry, np.int64)
+        loops_uv = tex_coord_points[processPerVertexIndex(tex_index)]
+    elif num_loops:
+        # Unused vertices don't participate in size; X3DOM does so
+        loop_points = points[loops]
+        mins = loop_points.min(axis=0)
+        deltas = loop_points.max(axis=0) - mins
         axes = [0, 1, 2]
         axes.sort(key=lambda a: (-deltas[a], a))
         # Tuple comparison breaks ties
         (s_axis, t_axis) = axes[0:2]
-        s_min = mins[s_axis]
         ds = deltas[s_axis]
-        t_min = mins[t_axis]
         dt = deltas[t_axis]
 
         # Avoid divide by zero T76303.
@@ -2049,13 +2512,12 @@ def importMesh_IndexedFaceSet(geom, ancestry):
         if not (dt > 0.0):
             dt = 1.0
 
-        def generatePointCoords(pt):
-            return (pt[s_axis] - s_min) / ds, (pt[t_axis] - t_min) / dt
-        loops = [co for f in faces
-                    for v in f
-                    for co in generatePointCoords(points[v])]
+        loops_uv = np.column_stack(((loop_points[:, s_axis] - mins[s_axis]) / ds,
+                                    (loop_points[:, t_axis] - mins[t_axis]) / dt))
+    else:
+        loops_uv = np.empty((0, 2))
 
-    importMesh_ApplyTextureToLoops(bpymesh, loops)
+    importMesh_ApplyTextureToLoops(bpymesh, loops_uv.astype(np.float32).ravel())
 
     bpymesh.validate()
     bpymesh.update()
@@ -3053,6 +3515,12 @@ def importShape_ProcessObject(
         if bpymat:
             bpydata.materials.append(bpymat)
 
+    importShape_CreateObject(bpycollection, vrmlname, bpydata, geom, node, ancestry, global_matrix)
+
+
+# Called from importShape to link a new object using bpydata, which
+# already has its material, for the node
+def importShape_CreateObject(bpycollection, vrmlname, bpydata, geom, node, ancestry, global_matrix):
     # Can transform data or object, better the object so we can instance
     # the data
     # bpymesh.transform(getFinalMatrix(node))
@@ -3147,6 +3615,17 @@ def importShape(bpycollection, node, ancestry, global_matrix):
     bpydata = None
     geom_spec = geom.getSpec()
 
+    # USE on a geometry node, with the same material and texture transform:
+    # the data is shared instead of built again, like for USE on a Shape
+    geom_real = geom.getRealNode()
+    if geom_real.parsed is not None:
+        (bpydata, cached_mat, cached_texmtx) = geom_real.parsed
+        if cached_mat is bpymat and cached_texmtx == texmtx:
+            importShape_CreateObject(
+                    bpycollection, vrmlname + "_" + geom_spec, bpydata, geom,
+                    node, ancestry, global_matrix)
+            return
+
     # ccw is handled by every geometry importer separately; some
     # geometries are easier to flip than others
     geom_fn = geometry_importers.get(geom_spec)
@@ -3159,6 +3638,9 @@ def importShape(bpycollection, node, ancestry, global_matrix):
                 bpycollection, vrmlname, bpydata, geom, geom_spec,
                 node, bpymat, tex_has_alpha, texmtx,
                 ancestry, global_matrix)
+
+        if geom_real.canHaveReferences():
+            geom_real.parsed = (bpydata, bpymat, texmtx)
     else:
         print('\tImportX3D warning: unsupported type "%s"' % geom_spec)
 
@@ -3492,7 +3974,8 @@ def load_web3d(
         PREF_FLAT=False,
         PREF_CIRCLE_DIV=16,
         global_matrix=None,
-        HELPER_FUNC=None
+        HELPER_FUNC=None,
+        PREF_LEGACY_PARSER=False
         ):
 
     # Used when adding blender primitives
@@ -3503,6 +3986,8 @@ def load_web3d(
     #root_node = vrml_parse('/_Cylinder.wrl')
     if filepath.lower().endswith('.x3d'):
         root_node, msg = x3d_parse(filepath)
+    elif PREF_LEGACY_PARSER:
+        root_node, msg = vrml_parse_legacy(filepath)
     else:
         root_node, msg = vrml_parse(filepath)
 